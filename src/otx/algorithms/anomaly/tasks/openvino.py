@@ -19,7 +19,10 @@ import json
 import os
 import random
 import tempfile
-from typing import Any, Dict, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from zipfile import ZipFile
 
 import nncf
@@ -38,6 +41,7 @@ from otx.algorithms.anomaly.configs.base.configuration import BaseAnomalyConfig
 from otx.algorithms.common.utils.ir import check_if_quantized
 from otx.algorithms.common.utils.utils import read_py_config
 from otx.api.configuration.configurable_parameters import ConfigurableParameters
+from otx.api.entities.dataset_item import DatasetItemEntity
 from otx.api.entities.datasets import DatasetEntity
 from otx.api.entities.inference_parameters import (
     InferenceParameters,
@@ -70,11 +74,115 @@ from otx.api.usecases.tasks.interfaces.optimization_interface import (
     OptimizationType,
 )
 from otx.api.utils.anomaly_utils import create_detection_annotation_from_anomaly_heatmap
+from otx.api.utils.profiling import InferenceProfiler
 from otx.api.utils.segmentation_utils import create_annotation_from_segmentation_map
 
 logger = get_logger(__name__)
 
 
+class OTXOpenVINOAnomalyInferencer(OpenVINOInferencer):
+    """Anomalib OpenVINO inferencer running on the OpenVINO runtime API with asynchronous inference.
+
+    The model is compiled for throughput, so that the images enqueued with ``enqueue_prediction`` are inferred
+    concurrently on several infer requests. The raw predictions are passed to the result handler, which is
+    responsible for post-processing them.
+
+    Args:
+        path (Union[str, Path, Tuple[bytes, bytes]]): Path to the xml or onnx file, or the xml and bin data.
+        metadata (Optional[Dict]): Metadata of the model. Defaults to None.
+        device (str): Device to run the inference on. Defaults to "CPU".
+        num_requests (int): Number of infer requests, 0 uses the optimal number for the device. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, Tuple[bytes, bytes]],
+        metadata: Optional[Dict] = None,
+        device: str = "CPU",
+        num_requests: int = 0,
+    ):
+        super().__init__(path=path, metadata=metadata, device=device)
+        self.infer_queue = ov.AsyncInferQueue(self.network, num_requests)
+        self.infer_queue.set_callback(self._async_callback)
+        self.callback_exceptions: List[Exception] = []
+        self.profiler = InferenceProfiler(enabled=False)
+
+    def load_model(self, path: Union[str, Path, Tuple[bytes, bytes]]) -> Tuple[str, str, ov.CompiledModel]:
+        """Read the model and compile it for throughput.
+
+        Args:
+            path (Union[str, Path, Tuple[bytes, bytes]]): Path to the xml or onnx file, or the xml and bin data.
+
+        Returns:
+            Tuple[str, str, ov.CompiledModel]: Input and output names together with the compiled model.
+        """
+        core = ov.Core()
+        if isinstance(path, tuple):
+            model = core.read_model(model=path[0], weights=path[1])
+        else:
+            model = core.read_model(str(path))
+        compiled_model = core.compile_model(model, self.device, {"PERFORMANCE_HINT": "THROUGHPUT"})
+        return model.inputs[0].any_name, model.outputs[0].any_name, compiled_model
+
+    @property
+    def num_requests(self) -> int:
+        """Number of infer requests run concurrently."""
+        return len(self.infer_queue)
+
+    def forward(self, image: np.ndarray) -> Dict[str, np.ndarray]:
+        """Forward-Pass input tensor to the model.
+
+        Args:
+            image (np.ndarray): Input tensor.
+
+        Returns:
+            Dict[str, np.ndarray]: Output predictions.
+        """
+        outputs = self.network({self.input_blob: image})
+        return {self.output_blob: outputs[self.network.output(0)]}
+
+    def get_metadata(self, image: np.ndarray) -> Dict[str, Any]:
+        """Returns the metadata for the post-processing of the predictions of the image."""
+        metadata = dict(self.metadata)
+        metadata["image_shape"] = image.shape[:2]
+        return metadata
+
+    def _async_callback(self, request: ov.InferRequest, callback_args: tuple) -> None:
+        """Pass the raw predictions of the finished infer request to its result handler."""
+        try:
+            id, metadata, result_handler, start_time = callback_args
+            self.profiler.record("async_inference", time.perf_counter() - start_time)
+            predictions = {self.output_blob: request.get_output_tensor(0).data.copy()}
+            result_handler(id, predictions, metadata)
+        except Exception as e:  # pylint: disable=broad-except
+            self.callback_exceptions.append(e)
+
+    def enqueue_prediction(
+        self, image: np.ndarray, id: int, result_handler: Callable[[int, Dict[str, np.ndarray], Dict], Any]
+    ) -> None:
+        """Runs async inference, it blocks while all the infer requests are busy.
+
+        Args:
+            image (np.ndarray): Input image.
+            id (int): Id of the image, passed to the result handler.
+            result_handler (Callable): Called with the id, the raw predictions and the metadata of the image.
+        """
+        if not self.infer_queue.is_ready():
+            with self.profiler.measure("request_wait"):
+                self.infer_queue.get_idle_request_id()
+        with self.profiler.measure("pre_process"):
+            inputs = {self.input_blob: self.pre_process(image)}
+        self.infer_queue.start_async(inputs, (id, self.get_metadata(image), result_handler, time.perf_counter()))
+
+    def await_all(self) -> None:
+        """Await all running infer requests if any, then raise the first exception of their callbacks."""
+        self.infer_queue.wait_all()
+        if self.callback_exceptions:
+            exception = self.callback_exceptions[0]
+            self.callback_exceptions = []
+            raise exception
+
+
 class OTXOpenVINOAnomalyDataloader:
     """Dataloader for loading OTX dataset into OTX OpenVINO Inferencer.
 
@@ -170,48 +278,103 @@ class OpenVINOTask(IInferenceTask, IEvaluationTask, IOptimizationTask, IDeployme
 
         logger.info("Start OpenVINO inference.")
         update_progress_callback = default_progress_callback
+        add_heatmap = True
+        enable_async_inference = True
+        profiler = None
         if inference_parameters is not None:
             update_progress_callback = inference_parameters.update_progress  # type: ignore
+            # the anomaly maps are not used to evaluate classification, only the predicted labels are
+            add_heatmap = not (inference_parameters.is_evaluation and self.task_type == TaskType.ANOMALY_CLASSIFICATION)
+            enable_async_inference = inference_parameters.enable_async_inference
+            profiler = inference_parameters.profiler
+        self.inferencer.profiler = profiler if profiler is not None else InferenceProfiler(enabled=False)
 
-        # This always assumes that threshold is available in the task environment's model
-        meta_data = self.get_metadata()
-        for idx, dataset_item in enumerate(dataset):
-            image_result = self.inferencer.predict(dataset_item.numpy, metadata=meta_data)
-
-            # TODO: inferencer should return predicted label and mask
-            pred_label = image_result.pred_score >= 0.5
-            pred_mask = (image_result.anomaly_map >= 0.5).astype(np.uint8)
-            probability = image_result.pred_score if pred_label else 1 - image_result.pred_score
-            if self.task_type == TaskType.ANOMALY_CLASSIFICATION:
-                label = self.anomalous_label if image_result.pred_score >= 0.5 else self.normal_label
-            elif self.task_type == TaskType.ANOMALY_SEGMENTATION:
-                annotations = create_annotation_from_segmentation_map(
-                    pred_mask, image_result.anomaly_map.squeeze(), {0: self.normal_label, 1: self.anomalous_label}
-                )
-                dataset_item.append_annotations(annotations)
-                label = self.normal_label if len(annotations) == 0 else self.anomalous_label
-            elif self.task_type == TaskType.ANOMALY_DETECTION:
-                annotations = create_detection_annotation_from_anomaly_heatmap(
-                    pred_mask, image_result.anomaly_map.squeeze(), {0: self.normal_label, 1: self.anomalous_label}
+        # the raw predictions are post-processed by a pool of workers while the next images are inferred
+        futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=max(self.inferencer.num_requests, 1)) as workers:
+
+            def add_prediction(id: int, predictions: Dict[str, np.ndarray], metadata: Dict) -> None:
+                futures.append(workers.submit(self._add_prediction, dataset[id], predictions, metadata, add_heatmap))
+
+            start_time = time.perf_counter()
+            dataset_size = len(dataset)
+            try:
+                for idx, dataset_item in enumerate(dataset):
+                    image = dataset_item.numpy
+                    if enable_async_inference:
+                        self.inferencer.enqueue_prediction(image, idx, add_prediction)
+                    else:
+                        with self.inferencer.profiler.measure("pre_process"):
+                            inputs = self.inferencer.pre_process(image)
+                        with self.inferencer.profiler.measure("forward"):
+                            predictions = self.inferencer.forward(inputs)
+                        metadata = self.inferencer.get_metadata(image)
+                        self._add_prediction(dataset_item, predictions, metadata, add_heatmap)
+                    update_progress_callback(int((idx + 1) / dataset_size * 100))
+            except BaseException:
+                # the running requests are awaited before the first error is raised, theirs are only logged
+                try:
+                    self.inferencer.await_all()
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.warning(f"Failed to wait for the running infer requests: {error}")
+                raise
+            # the callbacks of the running requests submit to the workers, which are shut down after this block
+            self.inferencer.await_all()
+            for future in futures:
+                future.result()
+            total_time = time.perf_counter() - start_time
+
+        logger.info(f"Avg time per image: {total_time / max(len(dataset), 1)} secs")
+        logger.info("OpenVINO inference completed")
+        return dataset
+
+    def _add_prediction(
+        self, dataset_item: DatasetItemEntity, predictions: Dict[str, np.ndarray], metadata: Dict, add_heatmap: bool
+    ) -> None:
+        """Post-process the raw predictions of the image and add them to its dataset item.
+
+        Args:
+            dataset_item (DatasetItemEntity): Dataset item of the image.
+            predictions (Dict[str, np.ndarray]): Raw predictions of the model.
+            metadata (Dict): Metadata of the image for the post-processing.
+            add_heatmap (bool): Whether the anomaly map is added to the metadata of the dataset item.
+        """
+        with self.inferencer.profiler.measure("post_process"):
+            output = self.inferencer.post_process(predictions, metadata=metadata)
+        pred_score = output["pred_score"]
+        anomaly_map = output["anomaly_map"]
+
+        # TODO: inferencer should return predicted label and mask
+        pred_label = pred_score >= 0.5
+        probability = pred_score if pred_label else 1 - pred_score
+        if self.task_type == TaskType.ANOMALY_CLASSIFICATION:
+            label = self.anomalous_label if pred_label else self.normal_label
+        elif self.task_type in (TaskType.ANOMALY_SEGMENTATION, TaskType.ANOMALY_DETECTION):
+            pred_mask = (anomaly_map >= 0.5).astype(np.uint8)
+            create_annotations = (
+                create_annotation_from_segmentation_map
+                if self.task_type == TaskType.ANOMALY_SEGMENTATION
+                else create_detection_annotation_from_anomaly_heatmap
+            )
+            with self.inferencer.profiler.measure("convert"):
+                annotations = create_annotations(
+                    pred_mask, anomaly_map.squeeze(), {0: self.normal_label, 1: self.anomalous_label}
                 )
-                dataset_item.append_annotations(annotations)
-                label = self.normal_label if len(annotations) == 0 else self.anomalous_label
-            else:
-                raise ValueError(f"Unknown task type: {self.task_type}")
+            dataset_item.append_annotations(annotations)
+            label = self.normal_label if len(annotations) == 0 else self.anomalous_label
+        else:
+            raise ValueError(f"Unknown task type: {self.task_type}")
 
-            dataset_item.append_labels([ScoredLabel(label=label, probability=float(probability))])
-            anomaly_map = (image_result.anomaly_map * 255).astype(np.uint8)
+        dataset_item.append_labels([ScoredLabel(label=label, probability=float(probability))])
+        if add_heatmap:
             heatmap_media = ResultMediaEntity(
                 name="Anomaly Map",
                 type="anomaly_map",
                 label=label,
                 annotation_scene=dataset_item.annotation_scene,
-                numpy=anomaly_map,
+                numpy=(anomaly_map * 255).astype(np.uint8),
             )
             dataset_item.append_metadata_item(heatmap_media)
-            update_progress_callback(int((idx + 1) / len(dataset) * 100))
-
-        return dataset
 
     def get_metadata(self) -> Dict:
         """Get Meta Data."""
@@ -368,15 +531,15 @@ class OpenVINOTask(IInferenceTask, IEvaluationTask, IOptimizationTask, IDeployme
             optimization_parameters.update_progress(100, None)
         logger.info("PTQ optimization completed")
 
-    def load_inferencer(self) -> OpenVINOInferencer:
+    def load_inferencer(self) -> OTXOpenVINOAnomalyInferencer:
         """Create the OpenVINO inferencer object.
 
         Returns:
-            OpenVINOInferencer object
+            OTXOpenVINOAnomalyInferencer object
         """
         if self.task_environment.model is None:
             raise Exception("task_environment.model is None. Cannot load weights.")
-        return OpenVINOInferencer(
+        return OTXOpenVINOAnomalyInferencer(
             path=(
                 self.task_environment.model.get_data("openvino.xml"),
                 self.task_environment.model.get_data("openvino.bin"),
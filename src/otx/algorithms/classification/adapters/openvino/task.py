@@ -79,6 +79,7 @@ from otx.api.usecases.tasks.interfaces.optimization_interface import (
     OptimizationType,
 )
 from otx.api.utils.dataset_utils import add_saliency_maps_to_dataset_item
+from otx.api.utils.profiling import InferenceProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -130,14 +131,18 @@ class ClassificationOpenVINOInferencer(IInferencer):
         self.converter = ClassificationToAnnotationConverter(self.label_schema)
         self.callback_exceptions: List[Exception] = []
         self.model.inference_adapter.set_callback(self._async_callback)
+        self.profiler = InferenceProfiler(enabled=False)
 
     def _async_callback(self, request: Any, callback_args: tuple) -> None:
         """Fetches the results of async inference."""
         try:
-            id, preprocessing_meta, result_handler = callback_args
+            id, preprocessing_meta, result_handler, start_time = callback_args
+            self.profiler.record("async_inference", time.perf_counter() - start_time)
             raw_prediction = self.model.inference_adapter.copy_raw_result(request)
-            processed_prediciton = self.model.postprocess(raw_prediction, preprocessing_meta)
-            annotation = self.converter.convert_to_annotation(processed_prediciton, preprocessing_meta)
+            with self.profiler.measure("post_process"):
+                processed_prediciton = self.model.postprocess(raw_prediction, preprocessing_meta)
+            with self.profiler.measure("convert"):
+                annotation = self.converter.convert_to_annotation(processed_prediciton, preprocessing_meta)
             aux_data = (
                 processed_prediciton.raw_scores,
                 processed_prediciton.saliency_map,
@@ -150,15 +155,21 @@ class ClassificationOpenVINOInferencer(IInferencer):
 
     def predict(self, image: np.ndarray) -> Tuple[ClassificationResult, AnnotationSceneEntity]:
         """Predict function of OpenVINO Classification Inferencer."""
-        cls_result = self.model(image)
-        return cls_result, self.converter.convert_to_annotation(cls_result)
+        # pre-processing, inference and post-processing of the model
+        with self.profiler.measure("model"):
+            cls_result = self.model(image)
+        with self.profiler.measure("convert"):
+            annotation_scene = self.converter.convert_to_annotation(cls_result)
+        return cls_result, annotation_scene
 
     def enqueue_prediction(self, image: np.ndarray, id: int, result_handler: Any) -> None:
         """Runs async inference."""
         if not self.model.is_ready():
-            self.model.await_any()
-        image, metadata = self.model.preprocess(image)
-        callback_data = id, metadata, result_handler
+            with self.profiler.measure("request_wait"):
+                self.model.await_any()
+        with self.profiler.measure("pre_process"):
+            image, metadata = self.model.preprocess(image)
+        callback_data = id, metadata, result_handler, time.perf_counter()
         self.model.inference_adapter.infer_async(image, callback_data)
 
     def await_all(self) -> None:
@@ -202,6 +213,7 @@ class ClassificationOpenVINOTask(IDeploymentTask, IInferenceTask, IEvaluationTas
         process_saliency_maps = False
         explain_predicted_classes = True
         enable_async_inference = True
+        profiler = None
 
         if inference_parameters is not None:
             update_progress_callback = inference_parameters.update_progress  # type: ignore
@@ -209,6 +221,8 @@ class ClassificationOpenVINOTask(IDeploymentTask, IInferenceTask, IEvaluationTas
             process_saliency_maps = inference_parameters.process_saliency_maps
             explain_predicted_classes = inference_parameters.explain_predicted_classes
             enable_async_inference = inference_parameters.enable_async_inference
+            profiler = inference_parameters.profiler
+        self.inferencer.profiler = profiler if profiler is not None else InferenceProfiler(enabled=False)
 
         def add_prediction(id: int, predicted_scene: AnnotationSceneEntity, aux_data: tuple):
             dataset_item = dataset[id]
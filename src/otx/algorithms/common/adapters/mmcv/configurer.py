@@ -448,7 +448,11 @@ class BaseConfigurer:
         mem_cache_size = _get_mem_cache_size(cfg)
 
         mode = "multiprocessing" if max_num_workers > 0 else "singleprocessing"
-        caching.MemCacheHandlerSingleton.create(mode, mem_cache_size)
+        eviction_policy = str(getattr(cfg.algo_backend, "mem_cache_eviction_policy", "lru")).lower()
+        caching.MemCacheHandlerSingleton.create(mode, mem_cache_size, eviction_policy)
+
+        enable_disk_cache = getattr(cfg.algo_backend, "enable_disk_cache", False)
+        caching.DiskCacheHandlerSingleton.create("persistent" if enable_disk_cache else "null")
 
         update_or_add_custom_hook(
             cfg,
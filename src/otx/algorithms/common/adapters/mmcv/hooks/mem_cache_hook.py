@@ -24,10 +24,22 @@ class MemCacheHook(Hook):
         self.handler.unfreeze()
 
     def after_epoch(self, runner):
-        """After epoch. Log the handler statistics.
+        """After epoch. Log the handler statistics and reset the counters for the next epoch.
 
         To prevent it from skipping the validation samples,
         this hook should have lower priority than CustomEvalHook.
         """
         self.handler.freeze()
         runner.logger.info(f"{self.handler}")
+
+        stats = self.handler.get_stats()
+        num_accesses = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / num_accesses if num_accesses > 0 else 0.0
+        runner.log_buffer.output.update(
+            {
+                "memcache_hit_rate": round(hit_rate, 4),
+                "memcache_evictions": stats["evictions"],
+                "memcache_used_bytes": stats["used_bytes"],
+            }
+        )
+        self.handler.reset_stats()
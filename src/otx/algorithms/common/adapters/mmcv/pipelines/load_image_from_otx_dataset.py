@@ -3,12 +3,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from tempfile import TemporaryDirectory
+from time import perf_counter
 from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 
 from otx.algorithms.common.utils.data import get_image
-from otx.core.data.caching import MemCacheHandlerError, MemCacheHandlerSingleton
+from otx.core.data.caching import (
+    DiskCacheHandlerError,
+    DiskCacheHandlerSingleton,
+    MemCacheHandlerError,
+    MemCacheHandlerSingleton,
+)
 
 _CACHE_DIR = TemporaryDirectory(prefix="img-cache-")  # pylint: disable=consider-using-with
 
@@ -56,6 +62,16 @@ class LoadImageFromOTXDataset:
 
         return mem_cache_handler
 
+    def _get_diskcache_handler(self):
+        """Get persistent disk cache handler."""
+        try:
+            disk_cache_handler = DiskCacheHandlerSingleton.get()
+        except DiskCacheHandlerError:
+            # Create a null handler
+            disk_cache_handler = DiskCacheHandlerSingleton.create(mode="null")
+
+        return disk_cache_handler
+
     def __call__(self, results: Dict[str, Any]):
         """Callback function of LoadImageFromOTXDataset."""
         img = None
@@ -67,9 +83,15 @@ class LoadImageFromOTXDataset:
 
         if img is None:
             # Get image (possibly from file cache)
-            img = get_image(results, _CACHE_DIR.name, to_float32=False)
+            start_time = perf_counter()
+            disk_cache_handler = self._get_diskcache_handler()
+            disk_key = disk_cache_handler.get_key(results["dataset_item"])
+            img = disk_cache_handler.get(disk_key)
+            if img is None:
+                img = get_image(results, _CACHE_DIR.name, to_float32=False)
+                disk_cache_handler.put(disk_key, img)
             if self._enable_memcache:
-                mem_cache_handler.put(key, img)
+                mem_cache_handler.put(key, img, cost=perf_counter() - start_time)
 
         if self._to_float32:
             img = img.astype(np.float32)
@@ -184,7 +206,7 @@ class LoadResizeDataFromOTXDataset(LoadImageFromOTXDataset):
         results["dataset_item"] = dataset_item
         return results
 
-    def _save_cache(self, results: Dict[str, Any]):
+    def _save_cache(self, results: Dict[str, Any], cost: Optional[float] = None):
         """Try to save pre-computed results to cache."""
         if not self._enable_outer_memcache:
             return
@@ -194,7 +216,7 @@ class LoadResizeDataFromOTXDataset(LoadImageFromOTXDataset):
         img = meta.pop("img")
 
         mem_cache_handler = self._get_memcache_handler()
-        mem_cache_handler.put(key, img, meta)
+        mem_cache_handler.put(key, img, meta, cost=cost)
 
     def __call__(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Callback function."""
@@ -202,9 +224,10 @@ class LoadResizeDataFromOTXDataset(LoadImageFromOTXDataset):
         cached_results = self._load_cache(results)
         if cached_results:
             return cached_results
+        start_time = perf_counter()
         results = self._load_img(results)
         results = self._load_ann_if_any(results)
         results.pop("dataset_item", None)  # Prevent deepcopy or caching
         results = self._resize_img_ann_if_any(results)
-        self._save_cache(results)
+        self._save_cache(results, cost=perf_counter() - start_time)
         return results
@@ -26,6 +26,13 @@ class StorageCacheScheme(ConfigurableEnum):
     TIFF = "TIFF"
 
 
+class MemCacheEvictionPolicy(ConfigurableEnum):
+    """This Enum represents the eviction policy of the memory cache."""
+
+    LRU = "lru"
+    COST = "cost"
+
+
 class BatchSizeAdaptType(ConfigurableEnum):
     """This Enum represents the type of adapting batch size.
 
@@ -30,7 +30,13 @@ from otx.api.configuration.elements import (
 )
 from otx.api.configuration.model_lifecycle import ModelLifecycle
 
-from .configuration_enums import BatchSizeAdaptType, InputSizePreset, POTQuantizationPreset, StorageCacheScheme
+from .configuration_enums import (
+    BatchSizeAdaptType,
+    InputSizePreset,
+    MemCacheEvictionPolicy,
+    POTQuantizationPreset,
+    StorageCacheScheme,
+)
 
 # pylint: disable=invalid-name
 
@@ -332,6 +338,16 @@ class BaseConfig(ConfigurableParameters):
             affects_outcome_of=ModelLifecycle.TRAINING,
         )
 
+        mem_cache_eviction_policy = selectable(
+            default_value=MemCacheEvictionPolicy.LRU,
+            header="Eviction policy of the memory cache",
+            description="LRU evicts the least recently used item first, COST evicts the item with the lowest "
+            "decoding cost per byte first",
+            editable=True,
+            visible_in_ui=False,
+            affects_outcome_of=ModelLifecycle.TRAINING,
+        )
+
         storage_cache_scheme = selectable(
             default_value=StorageCacheScheme.NONE,
             header="Scheme for storage cache",
@@ -340,6 +356,25 @@ class BaseConfig(ConfigurableParameters):
             visible_in_ui=False,
         )
 
+        enable_disk_cache = configurable_boolean(
+            default_value=False,
+            header="Enable persistent cache of decoded data",
+            description="Cache decoded data to the disk, so that the following runs and HPO trials reuse it",
+            visible_in_ui=False,
+            affects_outcome_of=ModelLifecycle.TRAINING,
+        )
+
+        num_conversion_workers = configurable_integer(
+            default_value=0,
+            min_value=0,
+            max_value=8,
+            header="Number of processes to convert the dataset",
+            description="Number of processes converting the dataset items when the dataset is loaded. "
+            "If the number of workers is set to zero, the items are converted in the main process.",
+            visible_in_ui=False,
+            affects_outcome_of=ModelLifecycle.NONE,
+        )
+
     @attrs
     class BaseTilingParameters(ParameterGroup):
         """BaseTilingParameters for OTX Algorithms."""
@@ -431,6 +466,15 @@ class BaseConfig(ConfigurableParameters):
             affects_outcome_of=ModelLifecycle.NONE,
         )
 
+        enable_lazy_tiling = configurable_boolean(
+            default_value=False,
+            header="Enable lazy tiling",
+            description="Keep only the tile windows in RAM and build each tile when it is fetched, "
+            "instead of caching the images and the annotations of all the tiles. "
+            "Images are loaded again from the dataset, so the memory cache should be enabled.",
+            affects_outcome_of=ModelLifecycle.NONE,
+        )
+
         object_tile_ratio = configurable_float(
             header="Object tile ratio",
             description="The desired ratio of min object size and tile size.",
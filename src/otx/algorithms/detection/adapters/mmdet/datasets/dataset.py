@@ -312,6 +312,7 @@ class ImageTilingDataset(OTXDetDataset):
             randomly select 5000 due to RAM OOM. Defaults to 5000.
         sampling_ratio (flaot): Ratio for sampling entire tile dataset.
         include_full_img (bool): Whether to include full image in the dataset.
+        lazy (bool): Whether to build each tile when it is fetched instead of caching all the tiles in RAM.
     """
 
     def __init__(
@@ -328,6 +329,7 @@ class ImageTilingDataset(OTXDetDataset):
         test_mode=False,
         sampling_ratio=1.0,
         include_full_img=False,
+        lazy=False,
     ):
         self.dataset = build_dataset(dataset)
         self.CLASSES = self.dataset.CLASSES
@@ -344,13 +346,14 @@ class ImageTilingDataset(OTXDetDataset):
             filter_empty_gt=filter_empty_gt if data_subset != Subset.TESTING else False,
             sampling_ratio=sampling_ratio if data_subset != Subset.TESTING else 1.0,
             include_full_img=include_full_img if data_subset != Subset.TESTING else True,
+            lazy=lazy,
         )
         self.flag = np.zeros(len(self), dtype=np.uint8)
         self.pipeline = Compose(pipeline)
         self.test_mode = test_mode
         self.num_samples = len(self.dataset)  # number of original samples
-        annotation = [self.get_ann_info(i) for i in range(len(self))]
-        self.evaluator = Evaluator(annotation, self.dataset.domain, self.CLASSES)
+        # tile annotations are built when evaluating, so that tile masks are not cropped up front
+        self.evaluator = Evaluator(self.tile_dataset.get_ann_infos, self.dataset.domain, self.CLASSES)
 
     def __len__(self) -> int:
         """Get the length of the dataset."""
@@ -4,8 +4,10 @@
 #
 
 import copy
+import multiprocessing as mp
 import uuid
-from itertools import product
+from collections.abc import Sequence
+from functools import partial
 from random import sample
 from time import time
 from typing import Callable, Dict, List, Tuple, Union
@@ -13,11 +15,14 @@ from typing import Callable, Dict, List, Tuple, Union
 import cv2
 import numpy as np
 from mmcv.ops import nms
-from mmdet.core import BitmapMasks, bbox2result
+from mmdet.core import bbox2result
 from tqdm import tqdm
 
 from otx.api.utils.dataset_utils import non_linear_normalization
 
+# Spawning the worker processes only pays off with enough images per process
+MIN_IMAGES_PER_PROC = 32
+
 
 def timeit(func) -> Callable:
     """Decorator to measure time of function execution.
@@ -38,6 +43,231 @@ def timeit(func) -> Callable:
     return wrapper
 
 
+def get_tile_boxes(height: int, width: int, tile_size: int, stride: int) -> np.ndarray:
+    """Get all the tile windows of an image in row-major order.
+
+    Args:
+        height (int): the height of the image.
+        width (int): the width of the image.
+        tile_size (int): the length of side of each tile.
+        stride (int): the distance between the top-left corners of the neighbouring tiles.
+
+    Returns:
+        np.ndarray: tile boxes (x1, y1, x2, y2) in shape (T, 4).
+    """
+    y_1, x_1 = np.meshgrid(np.arange(0, height, stride), np.arange(0, width, stride), indexing="ij")
+    x_2 = np.minimum(x_1 + tile_size, width)
+    y_2 = np.minimum(y_1 + tile_size, height)
+    return np.stack([x_1, y_1, x_2, y_2], axis=-1).reshape(-1, 4)
+
+
+def tile_boxes_overlap(tile_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Match all the tiles to all the boxes at once.
+
+    A box belongs to a tile if the intersection over the box area is one, i.e. the box lies inside the tile.
+
+    Args:
+        tile_boxes (np.ndarray): tile boxes in shape (T, 4).
+        boxes (np.ndarray): boxes in shape (N, 4).
+
+    Returns:
+        np.ndarray: boolean match matrix in shape (T, N).
+    """
+    tile_boxes = tile_boxes[:, None, :]
+    boxes = boxes[None, :, :4]
+    return (
+        (boxes[..., 0] > tile_boxes[..., 0])
+        & (boxes[..., 1] > tile_boxes[..., 1])
+        & (boxes[..., 2] < tile_boxes[..., 2])
+        & (boxes[..., 3] < tile_boxes[..., 3])
+    )
+
+
+def make_tile(
+    ann: Dict, dataset_idx: int, tile_box: Tuple[int, ...], matched_indices: np.ndarray, tile_size: int
+) -> Dict:
+    """Build the annotation of a tile from the ground-truth matched to it.
+
+    Masks are not cropped here, only the indices of the matched masks are kept in "gt_mask_indices".
+
+    Args:
+        ann (Dict): the image-level annotation without the image and masks, see ``Tile.get_tile_source()``.
+        dataset_idx (int): the image index the tile belongs to.
+        tile_box (Tuple[int, ...]): the tile coordinate (x1, y1, x2, y2) relative to the image.
+        matched_indices (np.ndarray): the indices of the ground-truth inside the tile.
+        tile_size (int): the length of side of each tile.
+
+    Returns:
+        Dict: tile annotation with some other useful information for data pipeline.
+    """
+    x_1, y_1, x_2, y_2 = tile_box
+    tile = dict(
+        ori_filename=ann["ori_filename"],
+        filename=ann["filename"],
+        full_res_image=False,
+        original_shape_=ann["img_shape"],
+        ori_shape=(y_2 - y_1, x_2 - x_1, 3),
+        img_shape=(y_2 - y_1, x_2 - x_1, 3),
+        tile_box=tuple(tile_box),
+        dataset_idx=dataset_idx,
+        gt_bboxes_ignore=ann["gt_bboxes_ignore"],
+        uuid=str(uuid.uuid4()),
+    )
+
+    if len(matched_indices):
+        for key in ("bbox_fields", "mask_fields", "seg_fields", "img_fields"):
+            tile[key] = list(ann[key])
+        tile_bboxes = ann["gt_bboxes"][matched_indices]
+        tile_bboxes[:, 0:4:2] = np.clip(tile_bboxes[:, 0:4:2] - x_1, 0, tile_size)
+        tile_bboxes[:, 1:4:2] = np.clip(tile_bboxes[:, 1:4:2] - y_1, 0, tile_size)
+        tile["gt_bboxes"] = tile_bboxes
+        tile["gt_labels"] = ann["gt_labels"][matched_indices]
+        if ann["with_mask"]:
+            tile["gt_mask_indices"] = matched_indices
+    else:
+        tile["gt_bboxes"] = np.zeros((0, 4), dtype=np.float32)
+        tile["gt_labels"] = np.array([], dtype=int)
+        if ann["with_mask"]:
+            tile["gt_masks"] = []
+    return tile
+
+
+def gen_tiles_single_img(
+    ann: Dict, dataset_idx: int, tile_size: int, stride: int, filter_empty_gt: bool = True
+) -> List[Dict]:
+    """Generate tile annotations for a single image.
+
+    This is a module-level function so that it can be sent to the worker processes.
+
+    Args:
+        ann (Dict): the image-level annotation without the image and masks, see ``Tile.get_tile_source()``.
+        dataset_idx (int): the image index the tiles belong to.
+        tile_size (int): the length of side of each tile.
+        stride (int): the distance between the top-left corners of the neighbouring tiles.
+        filter_empty_gt (bool): whether to drop the tiles without ground-truth.
+
+    Returns:
+        List[Dict]: a list of tile annotation with some other useful information for data pipeline.
+    """
+    height, width = ann["img_shape"][:2]
+    tile_boxes = get_tile_boxes(height, width, tile_size, stride)
+    matches = tile_boxes_overlap(tile_boxes, ann["gt_bboxes"])
+
+    tile_list = []
+    for tile_box, match in zip(tile_boxes.tolist(), matches):
+        matched_indices = np.flatnonzero(match)
+        if filter_empty_gt and len(matched_indices) == 0:
+            continue
+        tile_list.append(make_tile(ann, dataset_idx, tile_box, matched_indices, tile_size))
+    return tile_list
+
+
+class BoxIndex:
+    """Spatial index of the ground-truth boxes of an image to find the boxes inside a tile.
+
+    Boxes are sorted by their left coordinate, so a query only checks the boxes starting within the tile.
+
+    Args:
+        boxes (np.ndarray): boxes in shape (N, 4).
+    """
+
+    def __init__(self, boxes: np.ndarray):
+        self._boxes = boxes
+        self._order = np.argsort(boxes[:, 0], kind="stable")
+        self._sorted_x1 = boxes[self._order, 0]
+
+    def query(self, tile_box: Tuple[int, ...]) -> np.ndarray:
+        """Get the indices of the boxes inside the tile in ascending order."""
+        x_1, _, x_2, _ = tile_box
+        begin = int(np.searchsorted(self._sorted_x1, x_1, side="right"))
+        end = int(np.searchsorted(self._sorted_x1, x_2, side="left"))
+        candidates = self._order[begin:end]
+        match = tile_boxes_overlap(np.array([tile_box]), self._boxes[candidates])[0]
+        return np.sort(candidates[match])
+
+
+class LazyTileList(Sequence):
+    """Tile annotations which are built on access.
+
+    Only the tile windows ``(image_idx, x1, y1, x2, y2)`` are stored,
+    so the memory is proportional to the number of images and their annotations instead of the number of tiles.
+
+    Args:
+        windows (np.ndarray): tile windows in shape (M, 5).
+        full_res (np.ndarray): whether each window is the full-size image, in shape (M, ).
+        sources (List[Dict]): the image-level annotations without the image and masks.
+        box_indices (List[BoxIndex]): the spatial index of the ground-truth boxes for each image.
+        tile_size (int): the length of side of each tile.
+    """
+
+    def __init__(
+        self,
+        windows: np.ndarray,
+        full_res: np.ndarray,
+        sources: List[Dict],
+        box_indices: List[BoxIndex],
+        tile_size: int,
+    ):
+        self.windows = windows
+        self.full_res = full_res
+        self._sources = sources
+        self._box_indices = box_indices
+        self._tile_size = tile_size
+
+    def __len__(self) -> int:
+        """Total number of tiles."""
+        return len(self.windows)
+
+    def __getitem__(self, idx):
+        """Get the annotation of a tile or a sub-list of tiles if idx is a slice."""
+        if isinstance(idx, slice):
+            return self.subset(np.arange(len(self))[idx])
+
+        image_idx, *tile_box = self.windows[idx].tolist()
+        source = self._sources[image_idx]
+        if self.full_res[idx]:
+            return self._make_full_res_tile(source, image_idx)
+
+        matched_indices = self._box_indices[image_idx].query(tile_box)
+        return make_tile(source, image_idx, tile_box, matched_indices, self._tile_size)
+
+    @staticmethod
+    def _make_full_res_tile(source: Dict, image_idx: int) -> Dict:
+        height, width = source["img_shape"][:2]
+        tile = dict(
+            ori_filename=source["ori_filename"],
+            filename=source["filename"],
+            full_res_image=True,
+            original_shape_=source["img_shape"],
+            ori_shape=source["img_shape"],
+            img_shape=source["img_shape"],
+            tile_box=(0, 0, width, height),
+            dataset_idx=image_idx,
+            index=source["index"],
+            gt_bboxes_ignore=source["gt_bboxes_ignore"],
+            gt_bboxes=source["gt_bboxes"].copy(),
+            gt_labels=source["gt_labels"].copy(),
+            uuid=str(uuid.uuid4()),
+        )
+        for key in ("bbox_fields", "mask_fields", "seg_fields", "img_fields"):
+            tile[key] = list(source[key])
+        if source["with_mask"]:
+            tile["gt_mask_indices"] = np.arange(len(source["gt_bboxes"]))
+        else:
+            tile["gt_masks"] = []
+        return tile
+
+    def subset(self, indices: np.ndarray) -> "LazyTileList":
+        """Get the tiles at the given indices without building them."""
+        return LazyTileList(
+            self.windows[indices], self.full_res[indices], self._sources, self._box_indices, self._tile_size
+        )
+
+    def sample(self, num: int) -> "LazyTileList":
+        """Randomly sample tiles without building them."""
+        return self.subset(np.random.choice(len(self), size=num, replace=False))
+
+
 # pylint: disable=too-many-instance-attributes, too-many-arguments
 class Tile:
     """Tile and merge datasets.
@@ -61,9 +291,12 @@ class Tile:
             boxes of the dataset's classes will be filtered out. This option
             only works when `test_mode=False`, i.e., we never filter images
             during tests. Defaults to True.
-        nproc (int, optional): Processes used for processing masks. Default: 4.
+        nproc (int, optional): Processes used for generating tile annotations. Default: 2.
         sampling_ratio (float): Ratio for sampling entire tile dataset. Default: 1.0.(No sample)
         include_full_img (bool): Whether to include full-size image for inference or training. Default: False.
+        lazy (bool): Whether to keep only the tile windows and build each tile when it is fetched,
+            instead of caching the images and all tile annotations in RAM.
+            Images are loaded again from the dataset, so the memory cache should be enabled. Default: False.
     """
 
     def __init__(
@@ -80,6 +313,7 @@ class Tile:
         nproc: int = 2,
         sampling_ratio: float = 1.0,
         include_full_img: bool = False,
+        lazy: bool = False,
     ):
         self.min_area_ratio = min_area_ratio
         self.filter_empty_gt = filter_empty_gt
@@ -100,17 +334,34 @@ class Tile:
                 break
 
         self.dataset = dataset
-        self.tiles_all, self.cached_results = self.gen_tile_ann(include_full_img)
+        self.lazy = lazy
+        self._loaded_result: Tuple[int, Dict] = (-1, {})
+        if lazy:
+            self.tiles_all, self.cached_results = self.gen_lazy_tile_ann(include_full_img)
+        else:
+            self.tiles_all, self.cached_results = self.gen_tile_ann(include_full_img)
         self.sample_num = max(int(len(self.tiles_all) * sampling_ratio), 1)
         if sampling_ratio < 1.0:
-            self.tiles = sample(self.tiles_all, self.sample_num)
+            self.tiles = self.sample_tiles()
         else:
             self.tiles = self.tiles_all
 
+    def sample_tiles(self) -> Union[List[Dict], LazyTileList]:
+        """Randomly sample `sample_num` tiles from the entire tile dataset.
+
+        Lazy tiles are sampled without being built.
+        """
+        if isinstance(self.tiles_all, LazyTileList):
+            return self.tiles_all.sample(self.sample_num)
+        return sample(self.tiles_all, self.sample_num)
+
     @timeit
     def gen_tile_ann(self, include_full_img) -> Tuple[List[Dict], List[Dict]]:
         """Generate tile annotations and cache the original image-level annotations.
 
+        Tile windows of each image are matched to its ground-truth at once.
+        Images are processed by ``nproc`` worker processes if the dataset is large enough to pay off.
+
         Returns:
             tiles: a list of tile annotations with some other useful information for data pipeline.
             cache_result: a list of original image-level annotations.
@@ -119,19 +370,74 @@ class Tile:
         tiles = []
         cache_result = []
         for result in tqdm(self.dataset, desc="Loading dataset annotations..."):
+            self.random_select_gt(result, self.max_annotation)
             cache_result.append(result)
 
-        pbar = tqdm(total=len(self.dataset) * 2, desc="Generating tile annotations...")
-        for idx, result in enumerate(cache_result):
-            if include_full_img:
+        sources = [self.get_tile_source(result) for result in cache_result]
+        if include_full_img:
+            for idx, result in enumerate(cache_result):
                 tiles.append(self.gen_single_img(result, dataset_idx=idx))
-            pbar.update(1)
 
-        for idx, result in enumerate(cache_result):
-            tiles.extend(self.gen_tiles_single_img(result, dataset_idx=idx))
-            pbar.update(1)
+        gen_tiles = partial(
+            gen_tiles_single_img, tile_size=self.tile_size, stride=self.stride, filter_empty_gt=self.filter_empty_gt
+        )
+        pbar = tqdm(total=len(sources), desc="Generating tile annotations...")
+        if self.nproc > 1 and len(sources) >= self.nproc * MIN_IMAGES_PER_PROC:
+            ctx = mp.get_context("spawn")
+            with ctx.Pool(self.nproc) as p:
+                for tile_list in p.starmap(gen_tiles, zip(sources, range(len(sources)))):
+                    tiles.extend(tile_list)
+                    pbar.update(1)
+        else:
+            for idx, source in enumerate(sources):
+                tiles.extend(gen_tiles(source, idx))
+                pbar.update(1)
+        pbar.close()
+
+        if cache_result:
+            height, width = cache_result[0]["img_shape"][:2]
+            num_patches = len(get_tile_boxes(height, width, self.tile_size, self.stride))
+            num_tiles = sum(1 for tile in tiles if tile["dataset_idx"] == 0 and not tile["full_res_image"])
+            print(f"image: {height}x{width} ~ tile_size: {self.tile_size}")
+            print(f"{num_patches} tiles -> {num_tiles} tiles after filtering")
         return tiles, cache_result
 
+    @timeit
+    def gen_lazy_tile_ann(self, include_full_img) -> Tuple[LazyTileList, List[Dict]]:
+        """Generate the tile windows and cache the image-level annotations without images and masks.
+
+        Returns:
+            tiles: tile annotations which are built on access.
+            cache_result: a list of image-level annotations without images and masks.
+        """
+        sources = []
+        full_windows = []
+        tile_windows = []
+        for idx, result in enumerate(tqdm(self.dataset, desc="Generating tile windows...")):
+            source = self.get_tile_source(result)
+            source.update(index=result.get("index", idx), height=result.get("height"), width=result.get("width"))
+            sources.append(source)
+
+            height, width = source["img_shape"][:2]
+            full_windows.append((idx, 0, 0, width, height))
+            tile_boxes = get_tile_boxes(height, width, self.tile_size, self.stride)
+            if self.filter_empty_gt:
+                tile_boxes = tile_boxes[tile_boxes_overlap(tile_boxes, source["gt_bboxes"]).any(axis=1)]
+            tile_windows.append(np.column_stack([np.full(len(tile_boxes), idx), tile_boxes]))
+
+        if include_full_img:
+            tile_windows.insert(0, np.array(full_windows).reshape(-1, 5))
+        if tile_windows:
+            windows = np.concatenate(tile_windows).astype(np.int32)
+        else:
+            windows = np.zeros((0, 5), dtype=np.int32)
+        full_res = np.zeros(len(windows), dtype=bool)
+        if include_full_img:
+            full_res[: len(full_windows)] = True
+
+        box_indices = [BoxIndex(source["gt_bboxes"]) for source in sources]
+        return LazyTileList(windows, full_res, sources, box_indices, self.tile_size), sources
+
     def random_select_gt(self, result: Dict, num: int):
         """Randomly select ground truth masks for each image.
 
@@ -169,7 +475,6 @@ class Tile:
         result["gt_masks"] = result["gt_masks"] if "gt_masks" in result else []
         return result
 
-    # pylint: disable=too-many-locals
     def gen_tiles_single_img(self, result: Dict, dataset_idx: int) -> List[Dict]:
         """Generate tile annotation for a single image.
 
@@ -180,47 +485,29 @@ class Tile:
         Returns:
             List[Dict]: a list of tile annotation with some other useful information for data pipeline.
         """
-        tile_list = []
         self.random_select_gt(result, self.max_annotation)
-        gt_bboxes = result.get("gt_bboxes", np.zeros((0, 4), dtype=np.float32))
-        gt_masks = result.get("gt_masks", None)
-        gt_bboxes_ignore = result.get("gt_bboxes_ignore", np.zeros((0, 4), dtype=np.float32))
-        gt_labels = result.get("gt_labels", np.array([], dtype=np.int64))
-        img_shape = result.get("img_shape")
-        height, width = img_shape[:2]
-        _tile = self.prepare_result(result)
-
-        num_patches_h = (height + self.stride - 1) // self.stride
-        num_patches_w = (width + self.stride - 1) // self.stride
-        for (_, _), (loc_i, loc_j) in zip(
-            product(range(num_patches_h), range(num_patches_w)),
-            product(
-                range(0, height, self.stride),
-                range(0, width, self.stride),
-            ),
-        ):
-            x_1 = loc_j
-            x_2 = min(loc_j + self.tile_size, width)
-            y_1 = loc_i
-            y_2 = min(loc_i + self.tile_size, height)
-            tile = copy.deepcopy(_tile)
-            tile["full_res_image"] = False
-            tile["original_shape_"] = img_shape
-            tile["ori_shape"] = (y_2 - y_1, x_2 - x_1, 3)
-            tile["img_shape"] = tile["ori_shape"]
-            tile["tile_box"] = (x_1, y_1, x_2, y_2)
-            tile["dataset_idx"] = dataset_idx
-            tile["gt_bboxes_ignore"] = gt_bboxes_ignore
-            tile["uuid"] = str(uuid.uuid4())
-            self.tile_ann_assignment(tile, np.array([[x_1, y_1, x_2, y_2]]), gt_bboxes, gt_masks, gt_labels)
-            # filter empty ground truth
-            if self.filter_empty_gt and len(tile["gt_labels"]) == 0:
-                continue
-            tile_list.append(tile)
-        if dataset_idx == 0:
-            print(f"image: {height}x{width} ~ tile_size: {self.tile_size}")
-            print(f"{num_patches_h}x{num_patches_w} tiles -> {len(tile_list)} tiles after filtering")
-        return tile_list
+        return gen_tiles_single_img(
+            self.get_tile_source(result), dataset_idx, self.tile_size, self.stride, self.filter_empty_gt
+        )
+
+    def get_tile_source(self, result: Dict) -> Dict:
+        """Get the part of the image-level result required to generate the tile annotations.
+
+        The image and masks are left out, so that the source is cheap to send to the worker processes.
+
+        Args:
+            result (Dict): the original image-level result (i.e. the original image annotation)
+
+        Returns:
+            Dict: the annotation to be passed to ``gen_tiles_single_img()``.
+        """
+        source = self.prepare_result(result)
+        source["img_shape"] = result.get("img_shape")
+        source["gt_bboxes"] = result.get("gt_bboxes", np.zeros((0, 4), dtype=np.float32))
+        source["gt_bboxes_ignore"] = result.get("gt_bboxes_ignore", np.zeros((0, 4), dtype=np.float32))
+        source["gt_labels"] = result.get("gt_labels", np.array([], dtype=np.int64))
+        source["with_mask"] = result.get("gt_masks", None) is not None
+        return source
 
     def prepare_result(self, result: Dict) -> Dict:
         """Prepare results dict for pipeline.
@@ -241,69 +528,37 @@ class Tile:
         )
         return result_template
 
-    def tile_ann_assignment(
-        self,
-        tile_result: Dict,
-        tile_box: np.ndarray,
-        gt_bboxes: np.ndarray,
-        gt_masks: BitmapMasks,
-        gt_labels: np.ndarray,
-    ):
-        """Assign new annotation to this tile.
+    def get_tile_masks(self, tile: Dict):
+        """Crop the ground-truth masks of the tile from the image-level masks.
 
-        Ground-truth is discarded if the overlap with this tile is lower than
-        min_area_ratio.
+        Masks are cropped lazily, i.e. only when the tile is actually used.
 
         Args:
-            tile_result (Dict): the tile-level result (i.e. the tile annotation)
-            tile_box (np.ndarray): the coordinate for this tile box (i.e. the tile coordinate relative to the image)
-            gt_bboxes (np.ndarray): the original image-level boxes
-            gt_masks (BitmapMasks): the original image-level masks
-            gt_labels (np.ndarray): the original image-level labels
+            tile (Dict): the tile-level result (i.e. the tile annotation)
+
+        Returns:
+            BitmapMasks | PolygonMasks | list: the masks of the tile.
         """
-        x_1, y_1 = tile_box[0][:2]
-        matched_indices = self.tile_boxes_overlap(tile_box, gt_bboxes)
-
-        if len(matched_indices):
-            tile_lables = gt_labels[matched_indices][:]
-            tile_bboxes = gt_bboxes[matched_indices][:]
-            tile_bboxes[:, 0] -= x_1
-            tile_bboxes[:, 1] -= y_1
-            tile_bboxes[:, 2] -= x_1
-            tile_bboxes[:, 3] -= y_1
-            tile_bboxes[:, 0] = np.maximum(0, tile_bboxes[:, 0])
-            tile_bboxes[:, 1] = np.maximum(0, tile_bboxes[:, 1])
-            tile_bboxes[:, 2] = np.minimum(self.tile_size, tile_bboxes[:, 2])
-            tile_bboxes[:, 3] = np.minimum(self.tile_size, tile_bboxes[:, 3])
-            tile_result["gt_bboxes"] = tile_bboxes
-            tile_result["gt_labels"] = tile_lables
-            tile_result["gt_masks"] = gt_masks[matched_indices].crop(tile_box[0]) if gt_masks is not None else []
+        if "gt_mask_indices" not in tile:
+            return tile.get("gt_masks", [])
+        if self.lazy:
+            gt_masks = self.load_result(tile["dataset_idx"])["gt_masks"]
         else:
-            tile_result.pop("bbox_fields")
-            tile_result.pop("mask_fields")
-            tile_result.pop("seg_fields")
-            tile_result.pop("img_fields")
-            tile_result["gt_bboxes"] = np.zeros((0, 4), dtype=np.float32)
-            tile_result["gt_labels"] = np.array([], dtype=int)
-            tile_result["gt_masks"] = []
+            gt_masks = self.cached_results[tile["dataset_idx"]]["gt_masks"]
+        return gt_masks[tile["gt_mask_indices"]].crop(np.array(tile["tile_box"]))
 
-        if gt_masks is None:
-            tile_result.pop("gt_masks")
-
-    def tile_boxes_overlap(self, tile_box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
-        """Compute overlapping ratio over boxes.
+    def load_result(self, dataset_idx: int) -> Dict:
+        """Load the image-level result in lazy mode, the last loaded one is kept for the following tiles.
 
         Args:
-            tile_box (np.ndarray): box in shape (1, 4).
-            boxes (np.ndarray): boxes in shape (N, 4).
+            dataset_idx (int): the image index
 
         Returns:
-            np.ndarray: matched indices.
+            Dict: the original image-level result
         """
-        x1, y1, x2, y2 = tile_box[0]
-        match_indices = (boxes[:, 0] > x1) & (boxes[:, 1] > y1) & (boxes[:, 2] < x2) & (boxes[:, 3] < y2)
-        match_indices = np.argwhere(match_indices == 1).flatten()
-        return match_indices
+        if self._loaded_result[0] != dataset_idx:
+            self._loaded_result = (dataset_idx, self.dataset[dataset_idx])
+        return self._loaded_result[1]
 
     def multiclass_nms(
         self, boxes: np.ndarray, scores: np.ndarray, idxs: np.ndarray, iou_threshold: float, max_num: int
@@ -385,6 +640,9 @@ class Tile:
         Returns:
             dict: Training/test data.
         """
+        if self.lazy:
+            return self._get_lazy_item(idx)
+
         result = copy.deepcopy(self.tiles[idx])
         dataset_idx = result["dataset_idx"]
         x_1, y_1, x_2, y_2 = result["tile_box"]
@@ -393,6 +651,31 @@ class Tile:
         if self.img2fp32:
             cropped_tile = cropped_tile.astype(np.float32)
         result["img"] = cropped_tile
+        if "gt_mask_indices" in result:
+            result["gt_masks"] = self.get_tile_masks(result)
+            result.pop("gt_mask_indices")
+        return result
+
+    def _get_lazy_item(self, idx: int) -> Dict:
+        tile = self.tiles[idx]
+        dataset_idx = tile["dataset_idx"]
+        x_1, y_1, x_2, y_2 = tile["tile_box"]
+        ori_result = self.load_result(dataset_idx)
+
+        if tile["full_res_image"]:
+            result = self.gen_single_img(copy.copy(ori_result), dataset_idx)
+        else:
+            result = tile
+            result["gt_bboxes_ignore"] = result["gt_bboxes_ignore"].copy()
+            if "gt_mask_indices" in result:
+                result["gt_masks"] = self.get_tile_masks(result)
+                result.pop("gt_mask_indices")
+            self.random_select_gt(result, self.max_annotation)
+
+        cropped_tile = ori_result["img"][y_1:y_2, x_1:x_2, :]
+        if self.img2fp32:
+            cropped_tile = cropped_tile.astype(np.float32)
+        result["img"] = cropped_tile
         return result
 
     # pylint: disable=too-many-locals
@@ -478,14 +761,32 @@ class Tile:
             dict: Annotation info of specified index.
         """
         ann = {}
-        if "gt_bboxes" in self.tiles[idx]:
-            ann["bboxes"] = self.tiles[idx]["gt_bboxes"]
-        if "gt_masks" in self.tiles[idx]:
-            ann["masks"] = self.tiles[idx]["gt_masks"]
-        if "gt_labels" in self.tiles[idx]:
-            ann["labels"] = self.tiles[idx]["gt_labels"]
+        tile = self.tiles[idx]
+        if "gt_bboxes" in tile:
+            ann["bboxes"] = tile["gt_bboxes"]
+        if "gt_masks" in tile or "gt_mask_indices" in tile:
+            ann["masks"] = self.get_tile_masks(tile)
+        if "gt_labels" in tile:
+            ann["labels"] = tile["gt_labels"]
         return ann
 
+    def get_ann_infos(self) -> List[Dict]:
+        """Get the annotations of all tiles, e.g. for evaluation.
+
+        The tiles are visited image by image, so that each image-level result is loaded once in lazy mode.
+
+        Returns:
+            List[Dict]: Annotation info of each tile.
+        """
+        if isinstance(self.tiles, LazyTileList):
+            dataset_indices = self.tiles.windows[:, 0]
+        else:
+            dataset_indices = np.array([tile["dataset_idx"] for tile in self.tiles], dtype=np.int64)
+        ann_infos: List[Dict] = [{} for _ in range(len(self))]
+        for idx in np.argsort(dataset_indices, kind="stable").tolist():
+            ann_infos[idx] = self.get_ann_info(idx)
+        return ann_infos
+
     def merge_vectors(self, feature_vectors: List[np.ndarray]) -> np.ndarray:
         """Merge tile-level feature vectors to image-level feature vector.
 
@@ -15,7 +15,7 @@
 # and limitations under the License.
 
 import multiprocessing as mp
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import mmcv
 import numpy as np
@@ -230,22 +230,40 @@ class Evaluator:
     """OTX Evaluator for mAP and mIoU.
 
     Args:
-            annotation (list(dict)): ground truth annotation
+            annotation (list(dict) | callable): ground truth annotation, or a function returning it.
+                A function is called on each evaluation and its annotation is not kept afterwards.
             domain (Domain): OTX algorithm domain
             classes (list): list of classes
             nproc (int, optional): number of processes. Defaults to 4.
     """
 
-    def __init__(self, annotation: List[Dict], domain: Domain, classes: List[str], nproc=4):
+    def __init__(
+        self, annotation: Union[List[Dict], Callable[[], List[Dict]]], domain: Domain, classes: List[str], nproc=4
+    ):
         self.domain = domain
         self.classes = classes
         self.num_classes = len(classes)
-        if domain != Domain.DETECTION:
-            self.annotation = self.get_gt_instance_masks(annotation)
+        self.get_annotation: Optional[Callable[[], List[Dict]]] = None
+        self.annotation: Optional[List] = None
+        if callable(annotation):
+            self.get_annotation = annotation
         else:
-            self.annotation = annotation
+            self.annotation = self.format_annotation(annotation)
         self.nproc = nproc
 
+    def format_annotation(self, annotation: List[Dict]) -> List:
+        """Format ground truth annotation for the domain.
+
+        Args:
+            annotation (List[Dict]): per-image ground truth annotation
+
+        Returns:
+            List: per-image annotation for detection, per-class ground truth instance mask list otherwise
+        """
+        if self.domain != Domain.DETECTION:
+            return self.get_gt_instance_masks(annotation)
+        return annotation
+
     def get_gt_instance_masks(self, annotation: List[Dict]):
         """Format ground truth instance mask annotation.
 
@@ -292,18 +310,21 @@ class Evaluator:
                 cls_dets.append((det_bboxes, det_masks))
         return cls_dets, cls_scores
 
-    def evaluate_mask(self, results, logger, iou_thr):
+    def evaluate_mask(self, results, logger, iou_thr, annotation=None):
         """Evaluate mask results.
 
         Args:
             results (list): list of prediction
             logger (Logger): OTX logger
             iou_thr (float): IoU threshold
+            annotation (list, optional): per-class ground truth instance mask list. Defaults to ``self.annotation``.
 
         Returns:
             metric: mAP and mIoU metric
         """
-        assert len(results) == len(self.annotation[0]), "number of images should be equal!"
+        if annotation is None:
+            annotation = self.annotation
+        assert len(results) == len(annotation[0]), "number of images should be equal!"
         num_imgs = len(results)
         eval_results = []
 
@@ -312,7 +333,7 @@ class Evaluator:
             for class_id in range(self.num_classes):
                 # get gt and det bboxes of this class
                 cls_dets, cls_scores = self.get_mask_det_results(results, class_id)
-                cls_gts = self.annotation[class_id]
+                cls_gts = annotation[class_id]
 
                 # compute tp and fp for each image with multiple processes
                 tpfpmiou = p.starmap(
@@ -375,13 +396,17 @@ class Evaluator:
         Returns:
             metric: mAP and mIoU metric
         """
+        annotation = self.annotation
+        if annotation is None:
+            assert self.get_annotation is not None
+            annotation = self.format_annotation(self.get_annotation())
         if self.domain == Domain.DETECTION:
             return eval_map(
                 results,
-                self.annotation,
+                annotation,
                 scale_ranges=scale_ranges,
                 iou_thr=iou_thr,
                 dataset=self.classes,
                 logger=logger,
             )
-        return self.evaluate_mask(results, logger, iou_thr)
+        return self.evaluate_mask(results, logger, iou_thr, annotation)
@@ -3,8 +3,6 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-from random import sample
-
 from mmcv.runner import HOOKS, Hook
 
 
@@ -21,4 +19,4 @@ class TileSamplingHook(Hook):
         """Sample tiles from training datset when epoch starts."""
         if hasattr(runner.data_loader.dataset, "tile_dataset"):
             tile_dataset = runner.data_loader.dataset.tile_dataset
-            tile_dataset.tiles = sample(tile_dataset.tiles_all, tile_dataset.sample_num)
+            tile_dataset.tiles = tile_dataset.sample_tiles()
@@ -134,6 +134,7 @@ def patch_tiling(config, hparams, dataset=None):
             tile_size=int(hparams.tiling_parameters.tile_size),
             overlap_ratio=float(hparams.tiling_parameters.tile_overlap),
             max_per_img=int(hparams.tiling_parameters.tile_max_number),
+            lazy=bool(hparams.tiling_parameters.enable_lazy_tiling),
         )
         config.update(
             ConfigDict(
@@ -21,7 +21,9 @@ import os
 import tempfile
 import time
 import warnings
-from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 from zipfile import ZipFile
 
 import attr
@@ -31,7 +33,7 @@ import openvino.runtime as ov
 from addict import Dict as ADDict
 from nncf.common.quantization.structs import QuantizationPreset
 from openvino.model_api.adapters import OpenvinoAdapter, create_core
-from openvino.model_api.models import ImageModel, Model
+from openvino.model_api.models import ImageModel, MaskRCNNModel, Model
 from openvino.model_api.tilers import DetectionTiler, InstanceSegmentationTiler
 
 from otx.algorithms.common.utils import OTXOpenVinoDataLoader
@@ -86,6 +88,7 @@ from otx.api.usecases.tasks.interfaces.optimization_interface import (
     OptimizationType,
 )
 from otx.api.utils.dataset_utils import add_saliency_maps_to_dataset_item
+from otx.api.utils.profiling import InferenceProfiler
 
 logger = get_logger()
 
@@ -105,6 +108,7 @@ class BaseInferencerWithConverter(IInferencer):
         self.converter = converter
         self.callback_exceptions: List[Exception] = []
         self.is_callback_set = False
+        self.profiler = InferenceProfiler(enabled=False)
 
     def pre_process(self, image: np.ndarray) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
         """Pre-process function of OpenVINO Detection Inferencer."""
@@ -122,10 +126,14 @@ class BaseInferencerWithConverter(IInferencer):
 
     def predict(self, image: np.ndarray):
         """Predict function of OpenVINO Detection Inferencer."""
-        image, metadata = self.pre_process(image)
-        raw_predictions = self.forward(image)
-        detections = self.model.postprocess(raw_predictions, metadata)
-        predictions = self.converter.convert_to_annotation(detections, metadata)
+        with self.profiler.measure("pre_process"):
+            image, metadata = self.pre_process(image)
+        with self.profiler.measure("forward"):
+            raw_predictions = self.forward(image)
+        with self.profiler.measure("post_process"):
+            detections = self.model.postprocess(raw_predictions, metadata)
+        with self.profiler.measure("convert"):
+            predictions = self.converter.convert_to_annotation(detections, metadata)
         if "feature_vector" not in raw_predictions or "saliency_map" not in raw_predictions:
             warnings.warn(
                 "Could not find Feature Vector and Saliency Map in OpenVINO output. "
@@ -133,10 +141,11 @@ class BaseInferencerWithConverter(IInferencer):
             )
             features = (None, None)
         else:
-            features = (
-                detections.feature_vector.reshape(-1),
-                self.get_saliency_map(detections),
-            )
+            with self.profiler.measure("saliency_map"):
+                features = (
+                    detections.feature_vector.reshape(-1),
+                    self.get_saliency_map(detections),
+                )
         return predictions, features
 
     def forward(self, image: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
@@ -146,10 +155,13 @@ class BaseInferencerWithConverter(IInferencer):
     def _async_callback(self, request: Any, callback_args: tuple) -> None:
         """Fetches the results of async inference."""
         try:
-            id, preprocessing_meta, result_handler = callback_args
+            id, preprocessing_meta, result_handler, start_time = callback_args
+            self.profiler.record("async_inference", time.perf_counter() - start_time)
             prediction = self.model.inference_adapter.copy_raw_result(request)
-            detections = self.model.postprocess(prediction, preprocessing_meta)
-            processed_prediciton = self.converter.convert_to_annotation(detections, preprocessing_meta)
+            with self.profiler.measure("post_process"):
+                detections = self.model.postprocess(prediction, preprocessing_meta)
+            with self.profiler.measure("convert"):
+                processed_prediciton = self.converter.convert_to_annotation(detections, preprocessing_meta)
 
             if "feature_vector" not in prediction or "saliency_map" not in prediction:
                 warnings.warn(
@@ -158,10 +170,11 @@ class BaseInferencerWithConverter(IInferencer):
                 )
                 features = (None, None)
             else:
-                features = (
-                    copy.deepcopy(detections.feature_vector.reshape(-1)),
-                    self.get_saliency_map(detections),
-                )
+                with self.profiler.measure("saliency_map"):
+                    features = (
+                        copy.deepcopy(detections.feature_vector.reshape(-1)),
+                        self.get_saliency_map(detections),
+                    )
 
             result_handler(id, processed_prediciton, features)
 
@@ -175,9 +188,11 @@ class BaseInferencerWithConverter(IInferencer):
             self.is_callback_set = True
 
         if not self.model.is_ready():
-            self.model.await_any()
-        image, metadata = self.pre_process(image)
-        callback_data = id, metadata, result_handler
+            with self.profiler.measure("request_wait"):
+                self.model.await_any()
+        with self.profiler.measure("pre_process"):
+            image, metadata = self.pre_process(image)
+        callback_data = id, metadata, result_handler, time.perf_counter()
         self.model.inference_adapter.infer_async(image, callback_data)
 
     def await_all(self) -> None:
@@ -313,6 +328,8 @@ class OpenVINOTileClassifierWrapper(BaseInferencerWithConverter):
         device (str, optional): device to run inference on, such as CPU, GPU or MYRIAD. Defaults to "CPU".
         num_requests (int, optional): number of request for OpenVINO adapter. Defaults to 1.
         mode (str, optional): run inference in sync or async mode. Defaults to "async".
+        max_pending_merges (int, optional): maximum number of images waiting to be merged in async mode.
+            Defaults to 2.
     """
 
     def __init__(
@@ -327,6 +344,7 @@ class OpenVINOTileClassifierWrapper(BaseInferencerWithConverter):
         device: str = "CPU",
         num_requests: int = 1,
         mode: str = "async",
+        max_pending_merges: int = 2,
     ):  # pylint: disable=too-many-arguments
         assert mode in ["async", "sync"], "mode should be async or sync"
         classifier = None
@@ -355,6 +373,12 @@ class OpenVINOTileClassifierWrapper(BaseInferencerWithConverter):
             self.tiler = DetectionTiler(inferencer.model, tiler_config, execution_mode=mode)
 
         super().__init__(inferencer.configuration, inferencer.model, inferencer.converter)
+        self.max_pending_merges = max_pending_merges
+        self._merge_executor: Optional[ThreadPoolExecutor] = None
+        self._merge_futures: Deque[Future] = deque()
+        # (id, image shape, tile coordinates, result handler) of the images whose tiles are being inferred
+        self._pending_images: Deque[Tuple[int, Tuple[int, ...], List, Any]] = deque()
+        self._postprocess_state: Optional[bool] = None
 
     def predict(self, image: np.ndarray) -> Tuple[AnnotationSceneEntity, Tuple[np.ndarray, np.ndarray]]:
         """Run prediction by tiling image to small patches.
@@ -366,15 +390,104 @@ class OpenVINOTileClassifierWrapper(BaseInferencerWithConverter):
             detections: AnnotationSceneEntity
             features: list including feature vector and saliency map
         """
-        detections = self.tiler(image)
-        annotations = self.converter.convert_to_annotation(detections, metadata={"original_shape": image.shape})
-        features = (
-            detections.feature_vector.reshape(-1),
-            self.get_saliency_map(detections),
-        )
+        with self.profiler.measure("tiled_inference"):
+            detections = self.tiler(image)
+        return self._convert_detections(detections, image.shape)
+
+    def _convert_detections(
+        self, detections: Any, shape: Tuple[int, ...]
+    ) -> Tuple[AnnotationSceneEntity, Tuple[np.ndarray, np.ndarray]]:
+        with self.profiler.measure("convert"):
+            annotations = self.converter.convert_to_annotation(detections, metadata={"original_shape": shape})
+        with self.profiler.measure("saliency_map"):
+            features = (
+                detections.feature_vector.reshape(-1),
+                self.get_saliency_map(detections),
+            )
 
         return annotations, features
 
+    def enqueue_prediction(self, image: np.ndarray, id: int, result_handler: Any) -> None:
+        """Submit the tiles of the image to the infer requests without waiting for the previous images.
+
+        Tiles of consecutive images share the infer requests of the model,
+        and the tiles of an image are merged on a worker thread once all of them are inferred.
+        """
+        if self.tiler.execution_mode != "async":
+            raise RuntimeError("Tiled async inference requires the tiler in async mode.")
+
+        if self._merge_executor is None:
+            self._merge_executor = ThreadPoolExecutor(max_workers=1)
+            if isinstance(self.model, MaskRCNNModel):
+                # Tiles are merged with the instance masks, same as InstanceSegmentationTiler.__call__()
+                self._postprocess_state = self.model.postprocess_semantic_masks
+                self.model.postprocess_semantic_masks = False
+
+        async_pipeline = self.tiler.async_pipeline
+        tile_coords = self.tiler._filter_tiles(image, self.tiler._tile(image))  # pylint: disable=protected-access
+        for tile_idx, coord in enumerate(tile_coords):
+            tile = self.tiler._crop_tile(image, coord)  # pylint: disable=protected-access
+            async_pipeline.submit_data(tile, (id, tile_idx))
+        self._pending_images.append((id, image.shape, tile_coords, result_handler))
+        self._dispatch_merges(wait=False)
+
+    def _dispatch_merges(self, wait: bool) -> None:
+        """Send the images whose tiles are all inferred to the merge thread in the submission order."""
+        assert self._merge_executor is not None, "The merge thread is started by enqueue_prediction()"
+        async_pipeline = self.tiler.async_pipeline
+        if async_pipeline.callback_exceptions:
+            raise async_pipeline.callback_exceptions[0]
+
+        while self._pending_images:
+            id, shape, tile_coords, result_handler = self._pending_images[0]
+            keys = [(id, tile_idx) for tile_idx in range(len(tile_coords))]
+            if not wait and any(key not in async_pipeline.completed_results for key in keys):
+                break
+            self._pending_images.popleft()
+            raw_results = [async_pipeline.get_raw_result(key) for key in keys]
+            self._merge_futures.append(
+                self._merge_executor.submit(self._merge_tiles, id, shape, tile_coords, raw_results, result_handler)
+            )
+
+        # Bound the number of images whose raw results are held in memory
+        while self._merge_futures and (
+            self._merge_futures[0].done() or len(self._merge_futures) > self.max_pending_merges
+        ):
+            self._merge_futures.popleft().result()
+
+    def _merge_tiles(
+        self, id: int, shape: Tuple[int, ...], tile_coords: List, raw_results: List, result_handler: Any
+    ) -> None:
+        tile_results = []
+        with self.profiler.measure("post_process"):
+            for coord, (raw_result, _, preprocessing_meta, _) in zip(tile_coords, raw_results):
+                predictions = self.model.postprocess(raw_result, preprocessing_meta)
+                tile_result = self.tiler._postprocess_tile(predictions, coord)  # pylint: disable=protected-access
+                tile_results.append(tile_result)
+        with self.profiler.measure("merge"):
+            detections = self.tiler._merge_results(tile_results, shape)  # pylint: disable=protected-access
+        result_handler(id, *self._convert_detections(detections, shape))
+
+    def await_all(self) -> None:
+        """Await all the tiles in the infer requests and all the images being merged."""
+        if self._merge_executor is None:
+            super().await_all()
+            return
+
+        try:
+            self.tiler.async_pipeline.await_all()
+            self._dispatch_merges(wait=True)
+            while self._merge_futures:
+                self._merge_futures.popleft().result()
+        finally:
+            self._pending_images.clear()
+            self._merge_futures.clear()
+            self._merge_executor.shutdown()
+            self._merge_executor = None
+            if self._postprocess_state is not None:
+                self.model.postprocess_semantic_masks = self._postprocess_state
+                self._postprocess_state = None
+
 
 class OpenVINODetectionTask(IDeploymentTask, IInferenceTask, IEvaluationTask, IOptimizationTask):
     """Task implementation for OTXDetection using OpenVINO backend."""
@@ -501,15 +614,15 @@ class OpenVINODetectionTask(IDeploymentTask, IInferenceTask, IEvaluationTask, IO
             process_saliency_maps = inference_parameters.process_saliency_maps
             explain_predicted_classes = inference_parameters.explain_predicted_classes
             enable_async_inference = inference_parameters.enable_async_inference
+            profiler = inference_parameters.profiler
         else:
             update_progress_callback = default_progress_callback
             add_saliency_map = True
             process_saliency_maps = False
             explain_predicted_classes = True
             enable_async_inference = True
-
-        if self.config.tiling_parameters.enable_tiling:
-            enable_async_inference = False
+            profiler = None
+        self.inferencer.profiler = profiler if profiler is not None else InferenceProfiler(enabled=False)
 
         def add_prediction(id: int, predicted_scene: AnnotationSceneEntity, aux_data: tuple):
             dataset_item = dataset[id]
@@ -551,9 +664,7 @@ class OpenVINODetectionTask(IDeploymentTask, IInferenceTask, IEvaluationTask, IO
                 add_prediction(i - 1, predicted_scene, features)
 
             update_progress_callback(int(i / dataset_size * 100), None)
-            end_time = time.perf_counter() - start_time
-            logger.info(f"{end_time} secs")
-            total_time += end_time
+            total_time += time.perf_counter() - start_time
 
         self.inferencer.await_all()
 
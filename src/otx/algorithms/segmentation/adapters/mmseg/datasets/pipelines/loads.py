@@ -55,7 +55,7 @@ class LoadResizeDataFromOTXDataset(load_image_base.LoadResizeDataFromOTXDataset)
             results["gt_semantic_seg"] = img[:, :, -1]
         return results
 
-    def _save_cache(self, results: Dict[str, Any]):
+    def _save_cache(self, results: Dict[str, Any], cost: Optional[float] = None):
         """Try to save pre-computed results to cache."""
         if not self._enable_outer_memcache:
             return
@@ -69,7 +69,7 @@ class LoadResizeDataFromOTXDataset(load_image_base.LoadResizeDataFromOTXDataset)
                 img = np.concatenate((img, mask[:, :, np.newaxis]), axis=-1)
 
         mem_cache_handler = self._get_memcache_handler()
-        mem_cache_handler.put(key, img, meta)
+        mem_cache_handler.put(key, img, meta, cost=cost)
 
 
 @PIPELINES.register_module()
@@ -72,6 +72,7 @@ from otx.api.usecases.tasks.interfaces.optimization_interface import (
     IOptimizationTask,
     OptimizationType,
 )
+from otx.api.utils.profiling import InferenceProfiler
 
 logger = get_logger()
 
@@ -123,18 +124,25 @@ class OpenVINOSegmentationInferencer(IInferencer):
         self.converter = SegmentationToAnnotationConverter(label_schema)
         self.callback_exceptions: List[Exception] = []
         self.model.inference_adapter.set_callback(self._async_callback)
+        self.profiler = InferenceProfiler(enabled=False)
 
     def predict(self, image: np.ndarray) -> Tuple[ImageResultWithSoftPrediction, AnnotationSceneEntity]:
         """Perform a prediction for a given input image."""
-        result = self.model(image)
-        return result, self.converter.convert_to_annotation(result)
+        # pre-processing, inference and post-processing of the model
+        with self.profiler.measure("model"):
+            result = self.model(image)
+        with self.profiler.measure("convert"):
+            annotation_scene = self.converter.convert_to_annotation(result)
+        return result, annotation_scene
 
     def enqueue_prediction(self, image: np.ndarray, id: int, result_handler: Any) -> None:
         """Runs async inference."""
         if not self.model.is_ready():
-            self.model.await_any()
-        image, metadata = self.model.preprocess(image)
-        callback_data = id, metadata, result_handler
+            with self.profiler.measure("request_wait"):
+                self.model.await_any()
+        with self.profiler.measure("pre_process"):
+            image, metadata = self.model.preprocess(image)
+        callback_data = id, metadata, result_handler, time.perf_counter()
         self.model.inference_adapter.infer_async(image, callback_data)
 
     def await_all(self) -> None:
@@ -144,10 +152,13 @@ class OpenVINOSegmentationInferencer(IInferencer):
     def _async_callback(self, request: Any, callback_args: tuple) -> None:
         """Fetches the results of async inference."""
         try:
-            id, preprocessing_meta, result_handler = callback_args
+            id, preprocessing_meta, result_handler, start_time = callback_args
+            self.profiler.record("async_inference", time.perf_counter() - start_time)
             raw_prediction = self.model.inference_adapter.copy_raw_result(request)
-            processed_prediciton = self.model.postprocess(raw_prediction, preprocessing_meta)
-            annotation = self.converter.convert_to_annotation(processed_prediciton, preprocessing_meta)
+            with self.profiler.measure("post_process"):
+                processed_prediciton = self.model.postprocess(raw_prediction, preprocessing_meta)
+            with self.profiler.measure("convert"):
+                annotation = self.converter.convert_to_annotation(processed_prediciton, preprocessing_meta)
             result_handler(id, annotation, processed_prediciton.feature_vector, processed_prediciton.saliency_map)
 
         except Exception as e:
@@ -196,11 +207,14 @@ class OpenVINOSegmentationTask(IDeploymentTask, IInferenceTask, IEvaluationTask,
             dump_soft_prediction = not inference_parameters.is_evaluation
             process_soft_prediction = inference_parameters.process_saliency_maps
             enable_async_inference = inference_parameters.enable_async_inference
+            profiler = inference_parameters.profiler
         else:
             update_progress_callback = default_progress_callback
             dump_soft_prediction = True
             process_soft_prediction = False
             enable_async_inference = True
+            profiler = None
+        self.inferencer.profiler = profiler if profiler is not None else InferenceProfiler(enabled=False)
 
         def add_prediction(
             id: int,
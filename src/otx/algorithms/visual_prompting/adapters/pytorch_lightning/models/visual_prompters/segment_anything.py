@@ -195,17 +195,18 @@ class SegmentAnything(LightningModule):
             point_coords (Tensor): Coordinates of sparse input prompts,
                 corresponding to both point inputs and box inputs.
                 Boxes are encoded using two points, one for the top-left corner and one for the bottom-right corner.
-                Coordinates must already be transformed to long-side 1024. Has a batch index of length 1.
+                Coordinates must already be transformed to long-side 1024.
+                Has a batch index with one item per prompt, all the prompts are decoded with the same image embedding.
             point_labels (Tensor): Labels for the sparse input prompts.
                 0 is a negative input point, 1 is a positive input point,
                 2 is a top-left box corner, 3 is a bottom-right box corner, and -1 is a padding point.
                 If there is no box input, a single padding point with label -1 and
                 coordinates (0.0, 0.0) should be concatenated.
-            mask_input (Tensor): A mask input to the model with shape 1x1x256x256.
+            mask_input (Tensor): A mask input to the model with shape Bx1x256x256.
                 This must be supplied even if there is no mask input. In this case, it can just be zeros.
             has_mask_input (Tensor): An indicator for the mask input.
                 1 indicates a mask input, 0 indicates no mask input.
-                This input has 1x1 shape due to supporting openvino input layout.
+                This input has Bx1 shape due to supporting openvino input layout.
             orig_size (Tensor): The size of the input image in (H,W) format, before any transformation.
                 This input has 1x2 shape due to supporting openvino input layout.
         """
@@ -275,14 +276,16 @@ class SegmentAnything(LightningModule):
         """Embed the mask input.
 
         Args:
-            input_mask (Tensor): A mask input to the model with shape 1x1x256x256.
+            input_mask (Tensor): A mask input to the model with shape Bx1x256x256, one per prompt.
                 This must be supplied even if there is no mask input. In this case, it can just be zeros.
-            has_mask_input (Tensor): An indicator for the mask input.
+            has_mask_input (Tensor): An indicator for the mask input with shape Bx1.
                 1 indicates a mask input, 0 indicates no mask input.
 
         Returns:
             mask_embedding (Tensor): The embedded mask input.
         """
+        # broadcast the indicator of each prompt over its mask embedding
+        has_mask_input = has_mask_input.reshape(-1, 1, 1, 1)
         mask_embedding = has_mask_input * self.prompt_encoder.mask_downscaling(input_mask)
         mask_embedding = mask_embedding + (1 - has_mask_input) * self.prompt_encoder.no_mask_embed.weight.reshape(
             1, -1, 1, 1
@@ -283,9 +283,14 @@ class InferenceTask(IInferenceTask, IEvaluationTask, IExportTask, IUnload):
                 embed_dim = self.model.prompt_encoder.embed_dim
                 embed_size = self.model.prompt_encoder.image_embedding_size
                 mask_input_size = [4 * x for x in embed_size]
+                # all the prompts of an image can be decoded in one request
                 dynamic_axes = {
-                    "point_coords": {1: "num_points"},
-                    "point_labels": {1: "num_points"},
+                    "point_coords": {0: "num_prompts", 1: "num_points"},
+                    "point_labels": {0: "num_prompts", 1: "num_points"},
+                    "mask_input": {0: "num_prompts"},
+                    "has_mask_input": {0: "num_prompts"},
+                    "iou_predictions": {0: "num_prompts"},
+                    "low_res_masks": {0: "num_prompts"},
                 }
                 dummy_inputs = {
                     "image_embeddings": torch.zeros(1, embed_dim, *embed_size, dtype=torch.float),
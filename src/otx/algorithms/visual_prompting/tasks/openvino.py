@@ -14,12 +14,15 @@
 # See the License for the specific language governing permissions
 # and limitations under the License.
 
+import hashlib
 import io
 import json
 import os
 import random
 import tempfile
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 from zipfile import ZipFile
@@ -80,6 +83,60 @@ from otx.api.usecases.tasks.interfaces.optimization_interface import (
 logger = get_logger()
 
 
+class ImageEmbeddingCache:
+    """Least recently used cache of the image embeddings computed by the image encoder.
+
+    The embeddings are keyed by a digest of the image of the dataset item, cropped to its ROI, so that prompting the
+    same image again skips the image encoder, even if the image is loaded again into new objects. The metadata of the
+    image pre-processing is kept with the embeddings, since the prompts are pre-processed with it.
+
+    Args:
+        max_size (int): Maximum number of cached embeddings, the least recently used ones are removed above it.
+            Defaults to 8.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._embeddings: "OrderedDict[bytes, Tuple[Dict[str, Any], Dict[str, np.ndarray]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of cached embeddings."""
+        return len(self._embeddings)
+
+    @staticmethod
+    def get_key(image: np.ndarray) -> bytes:
+        """Returns the key of an image, a digest of its shape, type and pixels."""
+        image = np.ascontiguousarray(image)
+        _hash = hashlib.blake2b(digest_size=16)
+        _hash.update(f"{image.shape}{image.dtype}".encode("utf-8"))
+        _hash.update(image.data)
+        return _hash.digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        """Returns the cached metadata and embeddings of an image key, None if they are not cached."""
+        with self._lock:
+            cached = self._embeddings.get(key)
+            if cached is not None:
+                self._embeddings.move_to_end(key)
+            return cached
+
+    def put(self, key: bytes, meta: Dict[str, Any], image_embeddings: Dict[str, np.ndarray]) -> None:
+        """Caches the metadata and embeddings of an image key."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._embeddings[key] = (meta, image_embeddings)
+            self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.max_size:
+                self._embeddings.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all the cached embeddings."""
+        with self._lock:
+            self._embeddings.clear()
+
+
 class OpenVINOVisualPromptingInferencer(IInferencer):
     """Inferencer implementation for Visual Prompting using OpenVINO backend.
 
@@ -95,8 +152,13 @@ class OpenVINOVisualPromptingInferencer(IInferencer):
         device (str): Device to run inference on, such as CPU, GPU or MYRIAD. Defaults to "CPU".
         num_requests (int) : Maximum number of requests that the inferencer can make.
             Good value is the number of available cores. Defaults to 1.
+        embedding_cache_size (int): Number of image embeddings kept to skip the image encoder when the same image
+            is prompted again, 0 disables the cache. Defaults to 8.
     """
 
+    # Decoder inputs which have one item per prompt
+    _PROMPT_INPUTS = ("point_coords", "point_labels", "mask_input", "has_mask_input")
+
     def __init__(
         self,
         hparams: VisualPromptingBaseConfig,
@@ -105,6 +167,7 @@ class OpenVINOVisualPromptingInferencer(IInferencer):
         weight_files: Optional[Dict[str, Union[str, Path, bytes, None]]] = {},
         device: str = "CPU",
         num_requests: int = 1,
+        embedding_cache_size: int = 8,
     ):
 
         assert all(module in model_files for module in ["image_encoder", "decoder"])
@@ -137,15 +200,27 @@ class OpenVINOVisualPromptingInferencer(IInferencer):
         self.converter = VisualPromptingToAnnotationConverter()
         self.labels = label_schema.get_labels(include_empty=False)
         self.transform = get_transform()  # TODO (sungchul): insert args
+        self.embedding_cache = ImageEmbeddingCache(embedding_cache_size)
+        self.decoder_batched = self.is_decoder_batched()
 
     def pre_process(  # type: ignore
         self, dataset_item: DatasetItemEntity, extra_processing: bool = False
     ) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
         """Pre-process function of OpenVINO Visual Prompting Inferencer for image encoder."""
-        images, meta = self.model["image_encoder"].preprocess(dataset_item.numpy, extra_processing)
+        images, meta = self.pre_process_image(dataset_item.numpy, extra_processing)
+        prompts = self.pre_process_prompts(dataset_item, meta)
+        return images, meta, prompts
+
+    def pre_process_image(
+        self, image: np.ndarray, extra_processing: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Pre-process the image of a dataset item for the image encoder."""
+        return self.model["image_encoder"].preprocess(image, extra_processing)
+
+    def pre_process_prompts(self, dataset_item: DatasetItemEntity, meta: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pre-process the prompts of a dataset item for the decoder with the metadata of its image."""
         prompts = OTXVisualPromptingDataset.get_prompts(dataset_item, self.labels)  # to be replaced
-        prompts = self.model["decoder"].preprocess(prompts, meta)
-        return images, meta, prompts  # type: ignore
+        return self.model["decoder"].preprocess(prompts, meta)  # type: ignore
 
     def post_process(
         self, prediction: Dict[str, np.ndarray], metadata: Dict[str, Any]
@@ -156,23 +231,44 @@ class OpenVINOVisualPromptingInferencer(IInferencer):
         return annotation, hard_prediction, soft_prediction
 
     def predict(self, dataset_item: DatasetItemEntity) -> List[Annotation]:  # type: ignore
-        """Perform a prediction for a given input image."""
-        # forward image encoder
-        images, meta, prompts = self.pre_process(dataset_item)
-        image_embeddings = self.forward(images)
+        """Perform a prediction for a given input image.
+
+        The image pre-processing and the image encoder are skipped if the embeddings of the image are cached,
+        and all the prompts are decoded in one request if the decoder accepts a batch of prompts.
+        """
+        image = dataset_item.numpy
+        key = self.embedding_cache.get_key(image)
+        cached = self.embedding_cache.get(key)
+        if cached is None:
+            # forward image encoder
+            images, meta = self.pre_process_image(image)
+            image_embeddings = self.forward(images)
+            self.embedding_cache.put(key, meta, image_embeddings)
+        else:
+            meta, image_embeddings = cached
+        prompts = self.pre_process_prompts(dataset_item, meta)
+
+        metadatas = [{"label": prompt.pop("label"), "original_size": prompt.pop("orig_size")} for prompt in prompts]
+        if len(prompts) > 1 and self.decoder_batched:
+            # forward decoder once to get the predicted masks of all the prompts
+            inputs = {name: np.concatenate([prompt[name] for prompt in prompts]) for name in self._PROMPT_INPUTS}
+            inputs.update(image_embeddings)
+            predictions = self.forward_decoder(inputs)
+            prompt_predictions = [
+                {name: value[idx : idx + 1] for name, value in predictions.items()} for idx in range(len(prompts))
+            ]
+        else:
+            prompt_predictions = []
+            for prompt in prompts:
+                prompt.update(image_embeddings)
+
+                # forward decoder to get predicted mask
+                prompt_predictions.append(self.forward_decoder(prompt))
 
         annotations: List[Annotation] = []
         hard_predictions: List[np.ndarray] = []
         soft_predictions: List[np.ndarray] = []
-        for prompt in prompts:
-            label = prompt.pop("label")
-            orig_size = prompt.pop("orig_size")
-            prompt.update(image_embeddings)
-
-            # forward decoder to get predicted mask
-            prediction = self.forward_decoder(prompt)
-            metadata = {"label": label, "original_size": orig_size}
-
+        for prediction, metadata in zip(prompt_predictions, metadatas):
             # set annotation for eval
             annotation, hard_prediction, soft_prediction = self.post_process(prediction, metadata)
             annotations.extend(annotation)
@@ -180,6 +276,14 @@ class OpenVINOVisualPromptingInferencer(IInferencer):
             soft_predictions.append(soft_prediction)
         return annotations
 
+    def is_decoder_batched(self) -> bool:
+        """Whether the decoder has a dynamic prompt dimension to decode all the prompts of an image at once.
+
+        Decoders exported before the prompt dimension was dynamic take a single prompt per request.
+        """
+        inputs = self.model["decoder"].inputs
+        return all(name in inputs and inputs[name].shape[0] == -1 for name in self._PROMPT_INPUTS)
+
     def forward(self, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """Forward function of OpenVINO Visual Prompting Inferencer."""
         return self.model["image_encoder"].infer_sync(inputs)
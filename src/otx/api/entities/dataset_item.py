@@ -10,8 +10,9 @@ import copy
 from inspect import signature
 import itertools
 import logging
+import weakref
 from threading import Lock
-from typing import List, Optional, Sequence, Set, Tuple, TypeVar, Union
+from typing import Callable, List, Optional, Sequence, Set, Tuple, TypeVar, Union
 from bson import ObjectId
 import numpy as np
 
@@ -124,10 +125,44 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
             self.__metadata = metadata
 
         self.__ignored_labels: Set[LabelEntity] = set() if ignored_labels is None else set(ignored_labels)
+        self.__change_callback: Optional[Callable[["DatasetItemEntity"], None]] = None
+        self.__change_listeners: Optional[List[weakref.WeakMethod]] = None
+
+    def set_change_callback(self, callback: Optional[Callable[["DatasetItemEntity"], None]]) -> None:
+        """Sets the function called with the item when it is changed, e.g. by a dataset which creates it on demand.
+
+        The changes made through the setters and the ``append_*`` and ``set_*`` methods of the item are reported,
+        not the changes made to the annotation scene or the ROI annotation objects themselves.
+        """
+        self.__change_callback = callback
+
+    def add_change_listener(self, listener: Callable[["DatasetItemEntity", str], None]) -> None:
+        """Adds a method called with the item and the name of the changed attribute when the item is changed.
+
+        This is used e.g. by the indexes of the datasets containing the item. The same changes as for the change
+        callback are reported, and the listener is referenced weakly, so that it does not keep its object alive.
+
+        Args:
+            listener (Callable[[DatasetItemEntity, str], None]): Bound method to call.
+        """
+        # a new list is made, as a shallow copy of the item shares it
+        listeners = [ref for ref in self.__change_listeners or [] if ref() is not None]
+        listeners.append(weakref.WeakMethod(listener))
+        self.__change_listeners = listeners
+
+    def _notify_change(self, attribute: str) -> None:
+        """Calls the change callback and the change listeners of the item, if any."""
+        if self.__change_callback is not None:
+            self.__change_callback(self)
+        for ref in self.__change_listeners or []:
+            listener = ref()
+            if listener is not None:
+                listener(self, attribute)
 
     def set_metadata(self, metadata: List[MetadataItemEntity]):
         """Sets the metadata."""
         self.__metadata = metadata
+        self._notify_change("metadata")
 
     def get_metadata(self) -> List[MetadataItemEntity]:
         """Returns the metadata."""
@@ -141,6 +176,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
     @ignored_labels.setter
     def ignored_labels(self, value: Union[List[LabelEntity], Tuple[LabelEntity, ...], Set[LabelEntity]]):
         self.__ignored_labels = set(value)
+        self._notify_change("ignored_labels")
 
     def __repr__(self):
         """String representation of the dataset item."""
@@ -165,6 +201,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
             if roi is None:
                 roi = Annotation(Rectangle.generate_full_box(), labels=[])
             self.__roi = roi
+        self._notify_change("roi")
 
     @property
     def subset(self) -> Subset:
@@ -174,6 +211,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
     @subset.setter
     def subset(self, value: Subset):
         self.__subset = value
+        self._notify_change("subset")
 
     @property
     def media(self) -> IMedia2DEntity:
@@ -243,6 +281,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
     @annotation_scene.setter
     def annotation_scene(self, value: AnnotationSceneEntity):
         self.__annotation_scene = value
+        self._notify_change("annotation_scene")
 
     def get_annotations(
         self,
@@ -338,6 +377,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
             )
 
         self.annotation_scene.append_annotations(validated_annotations)
+        self._notify_change("annotation_scene")
 
     def get_roi_labels(
         self,
@@ -417,6 +457,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
                 self.roi.append_label(label)
             if label not in roi_annotation.get_labels(include_empty=True):
                 roi_annotation.append_label(label)
+        self._notify_change("annotation_scene")
 
     def __eq__(self, other):
         """Compares if two DatasetItems are equal.
@@ -453,6 +494,8 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
         for name, value in vars(self).items():
             if "__roi_lock" in name:
                 setattr(clone, name, Lock())
+            elif "__change_callback" in name or "__change_listeners" in name:
+                setattr(clone, name, None)  # the clone is not the item of the callback and listeners
             elif "__annotation_scene" in name:
                 pass  # Keep the same instance
             else:
@@ -487,6 +530,7 @@ class DatasetItemEntity(metaclass=abc.ABCMeta):
             model (Optional[ModelEntity]): model that was used to generated metadata
         """
         self.__metadata.append(MetadataItemEntity(data=data, model=model))
+        self._notify_change("metadata")
 
     def get_metadata_by_name_and_model(self, name: str, model: Optional[ModelEntity]) -> Sequence[MetadataItemEntity]:
         """Returns a metadata item with `name` and generated by `model`.
@@ -545,6 +589,7 @@ class DatasetItemEntityWithID(DatasetItemEntity):
         :param value: a unique ID to set
         """
         self._id_ = value
+        self._notify_change("id_")
 
     def __eq__(self, other):
         return super().__eq__(other) and self.id_ == other.id_
@@ -5,12 +5,33 @@
 
 # pylint: disable=redefined-builtin, invalid-name
 
+import bisect
 import collections.abc
 import copy
+import heapq
 import itertools
 import logging
+import threading
+import weakref
+from collections import OrderedDict
 from enum import Enum
-from typing import Generic, Iterator, List, Optional, TypeVar, Union, cast, overload
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 from bson.objectid import ObjectId
 
@@ -85,6 +106,149 @@ class DatasetIterator(collections.abc.Iterator):
 TDatasetItemEntity = TypeVar("TDatasetItemEntity", bound="DatasetItemEntity")
 
 
+class _DatasetIndex:
+    """Secondary indexes of the items of a DatasetEntity.
+
+    Each item is indexed by its slot, its position when it was indexed. The slot of a removed item is recorded as
+    removed instead of renumbering the other slots, and the position of an item is its slot minus the number of
+    removed slots before it. The subset, object and id indexes are updated when items are appended or removed, and
+    the label index is built on demand.
+
+    The index listens to the changes of its items. It goes stale when the subset or the id of an item changes, and
+    drops the label index when the annotations of an item change.
+
+    Args:
+        items (Sequence): Items of the dataset.
+    """
+
+    def __init__(self, items: Sequence):
+        self.stale = False
+        self.num_slots = 0
+        self.removed_slots: List[int] = []
+        self.subset_slots: Dict[Subset, List[int]] = {}
+        self.item_slots: Dict[int, int] = {}
+        self.id_slots: Dict[ID, int] = {}
+        self.label_slots: Optional[Dict[LabelEntity, List[int]]] = None
+        self.has_duplicates = False
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        """Returns the number of indexed items."""
+        return self.num_slots - len(self.removed_slots)
+
+    def is_valid(self, items: Sequence) -> bool:
+        """Whether the index is up to date with the items."""
+        return not self.stale and len(self) == len(items)
+
+    def add(self, item) -> None:
+        """Index an item appended to the dataset."""
+        slot = self.num_slots
+        self.num_slots += 1
+        self.subset_slots.setdefault(item.subset, []).append(slot)
+        # the first slot of the items and of the ids is kept, like list.index
+        if self.item_slots.setdefault(id(item), slot) != slot:
+            self.has_duplicates = True
+        id_ = getattr(item, "id_", None)
+        if id_ is not None and self.id_slots.setdefault(id_, slot) != slot:
+            self.has_duplicates = True
+        if isinstance(item, DatasetItemEntity):
+            item.add_change_listener(self.item_changed)
+            if self.label_slots is not None:
+                for label in item.annotation_scene.get_labels(include_empty=True):
+                    self.label_slots.setdefault(label, []).append(slot)
+        else:
+            self.label_slots = None
+
+    def remove(self, position: int, item) -> None:
+        """Unindex the item removed from a position of the dataset."""
+        if self.has_duplicates:
+            # the other slot of a duplicated item or id is not known
+            self.stale = True
+            return
+        slot = self.get_slot(position)
+        bisect.insort(self.removed_slots, slot)
+        subset_slots = self.subset_slots[item.subset]
+        del subset_slots[bisect.bisect_left(subset_slots, slot)]
+        del self.item_slots[id(item)]
+        id_ = getattr(item, "id_", None)
+        if id_ is not None:
+            del self.id_slots[id_]
+        self.label_slots = None
+
+    def item_changed(self, item: DatasetItemEntity, attribute: str) -> None:
+        """Called when an item is changed through its setters or its ``append_*`` and ``set_*`` methods."""
+        if attribute == "annotation_scene":
+            self.label_slots = None
+        elif attribute in ("subset", "id_") and id(item) in self.item_slots:
+            self.stale = True
+
+    def get_position(self, slot: int) -> int:
+        """Returns the position of the item of a slot."""
+        return slot - bisect.bisect_left(self.removed_slots, slot)
+
+    def get_positions(self, slots: List[int]) -> List[int]:
+        """Returns the positions of the items of the slots, the slots themselves if no item was removed."""
+        if not self.removed_slots:
+            return slots
+        return [self.get_position(slot) for slot in slots]
+
+    def get_slot(self, position: int) -> int:
+        """Returns the slot of the item at a position, i.e. the first slot with position + 1 items up to it."""
+        low, high = position, position + len(self.removed_slots)
+        while low < high:
+            middle = (low + high) // 2
+            if middle + 1 - bisect.bisect_right(self.removed_slots, middle) > position:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def get_slots(self) -> Iterator[int]:
+        """Returns the slots of the items in the dataset order."""
+        removed_slots = set(self.removed_slots)
+        return (slot for slot in range(self.num_slots) if slot not in removed_slots)
+
+
+class _SubsetItems(collections.abc.Sequence):
+    """Items of a dataset at the given positions, shared by a subset of the dataset instead of copied.
+
+    The dataset copies its item list before changing it, so the view is not affected by the later changes.
+
+    Args:
+        items (Sequence): Items of the dataset.
+        positions (List[int]): Positions of the items of the subset.
+    """
+
+    def __init__(self, items: Sequence, positions: List[int]):
+        self._items = items
+        self._positions = positions
+
+    def __len__(self) -> int:
+        """Returns the number of items."""
+        return len(self._positions)
+
+    def __getitem__(self, key):
+        """Returns the item at a position, or the list of items of a slice."""
+        if isinstance(key, slice):
+            return [self._items[position] for position in self._positions[key]]
+        return self._items[self._positions[key]]
+
+    def __iter__(self) -> Iterator:
+        """Returns an iterator over the items."""
+        return map(self._items.__getitem__, self._positions)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the items with a list or another view."""
+        if isinstance(other, (list, _SubsetItems)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Returns the representation of the item list."""
+        return repr(list(self))
+
+
 class DatasetEntity(Generic[TDatasetItemEntity]):
     """A dataset consists of a list of DatasetItemEntities and a purpose.
 
@@ -141,6 +305,16 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         This subset is also a DatasetEntity. The entities in the subset dataset refer to the same entities as
         in the original dataset. Altering one of the objects in the subset, will also alter them in the original.
 
+    ## Indexes
+
+        The positions of the items of each subset, of each item, of each item id and of each label are indexed, so
+        that getting a subset, finding and removing an item do not scan the whole dataset. The index is built when
+        first needed and updated when items are appended or removed. It is rebuilt after an item changes its subset
+        or id, and the label index after an item changes its annotations, through the setters and the ``append_*``
+        methods of the item. Changes made to the annotation scene object itself are not tracked.
+
+        The subsets share the item list of the dataset until either of them is changed.
+
     Args:
         items (Optional[List[DatasetItemEntity]]): A list of dataset items to create dataset with. Defaults to None.
         purpose (DatasetPurpose): Purpose for dataset. Refer to :class:`DatasetPurpose` for more info.
@@ -152,8 +326,11 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         items: Optional[List[TDatasetItemEntity]] = None,
         purpose: DatasetPurpose = DatasetPurpose.INFERENCE,
     ):
-        self._items = [] if items is None else items
+        self._items: Sequence[TDatasetItemEntity] = [] if items is None else items
         self._purpose = purpose
+        self._index: Optional[_DatasetIndex] = None
+        # whether the item list is shared with subsets and has to be copied before it is changed
+        self._items_shared = False
 
     @property
     def purpose(self) -> DatasetPurpose:
@@ -168,6 +345,38 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
     def purpose(self, value: DatasetPurpose) -> None:
         self._purpose = value
 
+    def _get_index(self) -> _DatasetIndex:
+        """Returns the index of the items, rebuilt if it is out of date."""
+        if self._index is None or not self._index.is_valid(self._items):
+            self._index = _DatasetIndex(self._items)
+        return self._index
+
+    def _own_items(self) -> list:
+        """Returns the item list to be changed, copied first if it is shared with subsets."""
+        if self._items_shared or not isinstance(self._items, list):
+            self._items = list(self._items)
+            self._items_shared = False
+            # the slot lists of the index may be shared with the subsets too
+            self._index = None
+        return self._items
+
+    def _with_items(self, items: Sequence) -> "DatasetEntity":
+        """Returns a dataset of the given items, with the purpose of this dataset."""
+        dataset = DatasetEntity[TDatasetItemEntity](purpose=self.purpose)
+        dataset._items = items
+        return dataset
+
+    def _get_subset_items(self, subsets: List[Subset]) -> Sequence:
+        """Returns a view of the items of the subsets in the dataset order, from the subset index."""
+        index = self._get_index()
+        slots = [index.subset_slots[subset] for subset in set(subsets) if subset in index.subset_slots]
+        if len(slots) == 1:
+            positions = index.get_positions(slots[0])
+        else:
+            positions = index.get_positions(list(heapq.merge(*slots)))
+        self._items_shared = True
+        return _SubsetItems(self._items, positions)
+
     def _fetch(self, key: Union[slice, int]) -> Union[DatasetItemEntity, List[DatasetItemEntity]]:
         """Fetch the given entity/entities from the items.
 
@@ -233,9 +442,9 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         items: List[DatasetItemEntity]
 
         if isinstance(other, DatasetEntity):
-            items = self._items + list(other)
+            items = list(self._items) + list(other)
         elif isinstance(other, list):
-            items = self._items + [o for o in other if isinstance(o, DatasetItemEntity)]
+            items = list(self._items) + [o for o in other if isinstance(o, DatasetItemEntity)]
         else:
             raise ValueError(f"Cannot add other of type {type(other)}")
 
@@ -349,11 +558,7 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         Returns:
             DatasetEntity: DatasetEntity with items matching subsets
         """
-        dataset = DatasetEntity(
-            items=[item for item in self._items if item.subset in set(subsets)],
-            purpose=self.purpose,
-        )
-        return dataset
+        return self._with_items(self._get_subset_items(subsets))
 
     def get_subset(self, subset: Subset) -> "DatasetEntity":
         """Returns a new DatasetEntity with just the dataset items matching the subset.
@@ -372,16 +577,13 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         Returns:
             DatasetEntity: DatasetEntity with items matching subset
         """
-        dataset = DatasetEntity(
-            items=[item for item in self._items if item.subset == subset],
-            purpose=self.purpose,
-        )
-        return dataset
+        return self._with_items(self._get_subset_items([subset]))
 
     def remove(self, item: TDatasetItemEntity) -> None:
         """Remove an item from the items.
 
-        This function calls remove_at_indices function.
+        This function calls remove_at_indices function. The item is found by identity from the index, or else
+        compared with the items of the dataset.
 
         Args:
             item (DatasetItemEntity): the item to be deleted.
@@ -389,8 +591,12 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         Raises:
             ValueError: if the input item is not in the dataset
         """
-        index = self._items.index(item)
-        self.remove_at_indices([index])
+        index = self._get_index()
+        slot = index.item_slots.get(id(item))
+        position = index.get_position(slot) if slot is not None else None
+        if position is None or self._items[position] is not item:
+            position = self._items.index(item)
+        self.remove_at_indices([position])
 
     def append(self, item: TDatasetItemEntity) -> None:
         """Append a DatasetItemEntity to the dataset.
@@ -413,7 +619,13 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
 
         if item.media is None:
             raise ValueError("Media in dataset item cannot be None")
-        self._items.append(item)
+        items = self._own_items()
+        items.append(item)
+        if self._index is not None:
+            if not self._index.stale and len(self._index) == len(items) - 1:
+                self._index.add(item)
+            else:
+                self._index = None
 
     def sort_items(self) -> None:
         """Order the dataset items. Does nothing here, but may be overridden in child classes.
@@ -423,14 +635,77 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         """
 
     def remove_at_indices(self, indices: List[int]) -> None:
-        """Delete items based on the `indices`.
+        """Delete items based on the `indices`, in a single pass over the items.
 
         Args:
             indices (List[int]): the indices of the items that will be deleted from the items.
+
+        Raises:
+            IndexError: if an index is out of range
         """
-        indices.sort(reverse=True)  # sort in descending order
-        for i_item in indices:
-            del self._items[i_item]
+        num_items = len(self._items)
+        removed_indices = set()
+        for index in indices:
+            if not -num_items <= index < num_items:
+                raise IndexError(f"Index {index} is out of range for a dataset of {num_items} items.")
+            removed_indices.add(index % num_items)
+        # the item list is updated in place, as it may be shared with the caller, unless it is shared with subsets
+        items = self._own_items()
+        dataset_index = self._index if self._index is not None and self._index.is_valid(items) else None
+        if len(removed_indices) == 1:
+            position = removed_indices.pop()
+            removed_item = items.pop(position)
+            if dataset_index is not None:
+                dataset_index.remove(position, removed_item)
+        else:
+            items[:] = [item for position, item in enumerate(items) if position not in removed_indices]
+            dataset_index = None
+        self._index = dataset_index
+
+    def get_index_by_id(self, id_: ID) -> int:
+        """Returns the position of the first item with the given id.
+
+        Args:
+            id_ (ID): id of the item, only the items with an id (e.g. DatasetItemEntityWithID) are indexed.
+
+        Raises:
+            ValueError: if no item has the id
+
+        Returns:
+            int: position of the item in the dataset
+        """
+        index = self._get_index()
+        slot = index.id_slots.get(id_)
+        if slot is None:
+            raise ValueError(f"No item with id {id_} is in the dataset.")
+        return index.get_position(slot)
+
+    def get_indices_with_label(self, label: LabelEntity, include_empty: bool = False) -> List[int]:
+        """Returns the positions of the items whose annotations have the label.
+
+        Note: This does not respect the ROI of the dataset items, like get_labels.
+
+        Args:
+            label (LabelEntity): label of the items.
+            include_empty (bool): set to True to find the items with an empty label. Defaults to False.
+
+        Returns:
+            List[int]: positions of the items in the dataset
+        """
+        index = self._get_index()
+        label_slots = index.label_slots
+        if label_slots is None:
+            label_slots = {}
+            for slot, item in zip(index.get_slots(), self):
+                if id(item) not in index.item_slots:
+                    # an item created on demand is told to the index too
+                    item.add_change_listener(index.item_changed)
+                for item_label in item.annotation_scene.get_labels(include_empty=True):
+                    label_slots.setdefault(item_label, []).append(slot)
+            index.label_slots = label_slots
+        if label.is_empty and not include_empty:
+            return []
+        return list(index.get_positions(label_slots.get(label, [])))
 
     def get_labels(self, include_empty: bool = False) -> List[LabelEntity]:
         """Returns the list of all unique labels that are in the dataset.
@@ -445,3 +720,208 @@ class DatasetEntity(Generic[TDatasetItemEntity]):
         """
         label_set = set(itertools.chain(*[item.annotation_scene.get_labels(include_empty) for item in self]))
         return list(label_set)
+
+
+class LazyDatasetItem(NamedTuple):
+    """Entry of a LazyDatasetEntity for an item which is created when it is accessed.
+
+    Attributes:
+        key (Hashable): Key from which the item is created.
+        subset (Subset): Subset of the item.
+    """
+
+    key: Hashable
+    subset: Subset
+
+
+class _LazyItemStore(Generic[TDatasetItemEntity]):
+    """Items created by a LazyDatasetEntity, shared with the datasets derived from it.
+
+    The most recently used items are kept in a cache, and an item is not created again while it is alive. An item
+    changed after it is created is pinned, so that the change is not lost when the item is evicted from the cache.
+
+    Args:
+        create_item (Callable[[Any], DatasetItemEntity]): Function creating the item of a key.
+        cache_size (int): Number of items kept in the cache.
+    """
+
+    def __init__(self, create_item: Callable[[Any], TDatasetItemEntity], cache_size: int):
+        self.create_item = create_item
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Hashable, TDatasetItemEntity]" = OrderedDict()
+        self._pinned: Dict[Hashable, TDatasetItemEntity] = {}
+        self._alive: Dict[Hashable, weakref.ref] = {}
+        # reentrant, as the items may be garbage collected while it is held
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable) -> TDatasetItemEntity:
+        """Returns the item of a key, it is created if no item of the key is alive."""
+        with self._lock:
+            item = self._find(key)
+        if item is None:
+            created_item = self.create_item(key)
+        with self._lock:
+            if item is None:
+                # the item may have been created by another thread meanwhile
+                item = self._find(key)
+                if item is None:
+                    item = created_item
+                    item.set_change_callback(partial(self._pin, key))
+                    self._alive[key] = weakref.ref(item, partial(self._forget, key))
+            if self.cache_size > 0 and key not in self._pinned:
+                self._cache[key] = item
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return item
+
+    def get_key(self, item: TDatasetItemEntity) -> Optional[Hashable]:
+        """Returns the key of an item created by the store, None if it was not."""
+        with self._lock:
+            for key, ref in self._alive.items():
+                if ref() is item:
+                    return key
+        return None
+
+    def _find(self, key: Hashable) -> Optional[TDatasetItemEntity]:
+        item = self._pinned.get(key)
+        if item is None:
+            ref = self._alive.get(key)
+            item = ref() if ref is not None else None
+        return item
+
+    def _pin(self, key: Hashable, item: TDatasetItemEntity) -> None:
+        with self._lock:
+            ref = self._alive.get(key)
+            # a shallow copy of the item shares its change callback
+            if ref is not None and ref() is item:
+                self._pinned[key] = item
+                if key in self._cache:
+                    del self._cache[key]
+
+    def _forget(self, key: Hashable, ref: weakref.ref) -> None:
+        with self._lock:
+            if self._alive.get(key) is ref:
+                del self._alive[key]
+
+
+class LazyDatasetEntity(DatasetEntity[TDatasetItemEntity]):
+    """A dataset whose items are created on demand.
+
+    The dataset only keeps the keys and the subsets of its items. An item is created by ``create_item`` when it is
+    accessed, and the most recently used items are kept in a cache shared with the subsets of the dataset.
+
+    An item is not created again while it is referenced. The items changed through their setters and their
+    ``append_*`` and ``set_*`` methods are kept by the dataset, other changes are lost when the item is evicted from
+    the cache and no longer referenced. Appended items are kept in the dataset as they are.
+
+    Example:
+        >>> dataset = LazyDatasetEntity(keys=["a.jpg", "b.jpg"], create_item=create_item, subsets=subsets)
+        >>> first_item = dataset[0]  # create_item("a.jpg")
+        >>> training_subset = dataset.get_subset(Subset.TRAINING)  # no item is created
+
+    Args:
+        keys (Sequence[Hashable]): Keys of the items.
+        create_item (Callable[[Hashable], DatasetItemEntity]): Function creating the item of a key.
+        subsets (Sequence[Subset]): Subset of each item.
+        purpose (DatasetPurpose): Purpose for dataset. Defaults to DatasetPurpose.INFERENCE.
+        cache_size (int): Number of items kept in the cache. Defaults to 1024.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Hashable],
+        create_item: Callable[[Any], TDatasetItemEntity],
+        subsets: Sequence[Subset],
+        purpose: DatasetPurpose = DatasetPurpose.INFERENCE,
+        cache_size: int = 1024,
+    ):
+        if len(keys) != len(subsets):
+            raise ValueError(f"{len(keys)} keys are given for {len(subsets)} subsets.")
+        items = [LazyDatasetItem(key, subset) for key, subset in zip(keys, subsets)]
+        super().__init__(items=items, purpose=purpose)  # type: ignore[arg-type]
+        self._store = _LazyItemStore[TDatasetItemEntity](create_item, cache_size)
+
+    def _with_items(self, items: Sequence) -> "LazyDatasetEntity":
+        """Returns a dataset of the given entries, which shares the items created by this dataset."""
+        dataset = LazyDatasetEntity[TDatasetItemEntity]([], self._store.create_item, [], self.purpose)
+        dataset._items = items
+        dataset._store = self._store
+        return dataset
+
+    def _fetch(self, key: Union[slice, int]) -> Union[DatasetItemEntity, List[DatasetItemEntity]]:
+        """Fetch the given entity/entities, creating the items which are not in the cache."""
+        if isinstance(key, int):
+            item = self._items[key]
+            if isinstance(item, LazyDatasetItem):
+                return self._store.get(item.key)
+            return item
+        return super()._fetch(key)
+
+    def __repr__(self):
+        """Returns string representation of the dataset."""
+        return f"{self.__class__.__name__}(size={len(self)}, purpose={self.purpose})"
+
+    def __add__(self, other: Union["DatasetEntity", List[DatasetItemEntity]]) -> "DatasetEntity":
+        """Returns a new dataset which contains the items of self added with the input dataset.
+
+        The items of self stay lazy, the other items are kept as they are.
+
+        Args:
+            other (Union[DatasetEntity, List[DatasetItemEntity]]): dataset to be added to output
+
+        Returns:
+            DatasetEntity: new dataset with the items of self added with the input dataset
+        """
+        if isinstance(other, DatasetEntity):
+            items = list(self._items) + list(other)
+        elif isinstance(other, list):
+            items = list(self._items) + [o for o in other if isinstance(o, DatasetItemEntity)]
+        else:
+            raise ValueError(f"Cannot add other of type {type(other)}")
+        return self._with_items(items)
+
+    def get_combined_subset(self, subsets: List[Subset]) -> "DatasetEntity":
+        """Returns a new lazy dataset with just the dataset items matching the subsets, without creating them.
+
+        Args:
+            subsets (List): List of subsets to return.
+
+        Returns:
+            DatasetEntity: DatasetEntity with items matching subsets
+        """
+        return self._with_items(self._get_subset_items(subsets))
+
+    def get_subset(self, subset: Subset) -> "DatasetEntity":
+        """Returns a new lazy dataset with just the dataset items matching the subset, without creating them.
+
+        Args:
+            subset (Subset): `Subset` to return.
+
+        Returns:
+            DatasetEntity: DatasetEntity with items matching subset
+        """
+        return self._with_items(self._get_subset_items([subset]))
+
+    def remove(self, item: TDatasetItemEntity) -> None:
+        """Remove an item from the items, without creating the other items.
+
+        An item created by the dataset is found by its key, even if it was evicted from the cache.
+
+        Args:
+            item (DatasetItemEntity): the item to be deleted.
+
+        Raises:
+            ValueError: if the input item is not in the dataset
+        """
+        key = self._store.get_key(item)
+        entries = cast(Sequence[Union[LazyDatasetItem, DatasetItemEntity]], self._items)
+        for index, entry in enumerate(entries):
+            if isinstance(entry, LazyDatasetItem):
+                is_item = key is not None and entry.key == key
+            else:
+                is_item = entry == item
+            if is_item:
+                self.remove_at_indices([index])
+                return
+        raise ValueError(f"{item} is not in the dataset.")
@@ -6,7 +6,10 @@
 
 
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from otx.api.utils.profiling import InferenceProfiler
 
 
 # pylint: disable=unused-argument
@@ -32,6 +35,7 @@ class InferenceParameters:
         explain_predicted_classes: If set to True, provide explanations only for predicted classes.
             Otherwise, explain all classes.
         enable_async_inference: Enables async inference to increase performance.
+        profiler: Profiler recording the latency of the stages of the inferencer, if any.
     """
 
     is_evaluation: bool = False
@@ -41,3 +45,4 @@ class InferenceParameters:
     process_saliency_maps: bool = False
     explain_predicted_classes: bool = True
     enable_async_inference: bool = True
+    profiler: Optional["InferenceProfiler"] = None
@@ -138,6 +138,28 @@ class Polygon(Shape):
         """Returns hash of the Polygon object."""
         return hash(str(self))
 
+    @classmethod
+    def from_numpy(cls, points: np.ndarray, modification_date: Optional[datetime.datetime] = None) -> "Polygon":
+        """Creates a polygon from an array of normalized coordinates.
+
+        The coordinates are clipped to [0, 1] at once, instead of point by point in ``Point``.
+
+        Args:
+            points (np.ndarray): Array of shape (N, 2) with the x and y coordinates of the points.
+            modification_date (Optional[datetime.datetime]): last modified date
+
+        Returns:
+            Polygon: polygon formed by the points
+        """
+        x_coordinates, y_coordinates = np.clip(points, a_min=0.0, a_max=1.0).T
+        polygon_points = []
+        for x, y in zip(x_coordinates, y_coordinates):
+            point = Point.__new__(Point)
+            point.x = x
+            point.y = y
+            polygon_points.append(point)
+        return cls(polygon_points, modification_date)
+
     def normalize_wrt_roi_shape(self, roi_shape: Rectangle) -> "Polygon":
         """Transforms from the `roi` coordinate system to the normalized coordinate system.
 
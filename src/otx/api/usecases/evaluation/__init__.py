@@ -7,6 +7,7 @@
 from .accuracy import Accuracy
 from .averaging import MetricAverageMethod
 from .basic_operations import (
+    SegmentationConfusionMatrix,
     get_intersections_and_cardinalities,
     intersection_box,
     intersection_over_union,
@@ -28,4 +29,5 @@ __all__ = [
     "precision_per_class",
     "recall_per_class",
     "get_intersections_and_cardinalities",
+    "SegmentationConfusionMatrix",
 ]
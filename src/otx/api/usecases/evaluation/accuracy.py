@@ -7,10 +7,9 @@
 
 import copy
 import logging
-from typing import List, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from sklearn.metrics import confusion_matrix as sklearn_confusion_matrix
 
 from otx.api.entities.dataset_item import DatasetItemEntity
 from otx.api.entities.datasets import DatasetEntity
@@ -196,65 +195,100 @@ def recall_metrics_group(confusion_matrix: MatrixMetric) -> MetricsGroup:
     )
 
 
-def __get_gt_and_predicted_label_indices_from_resultset(
+def __get_label_to_index(labels: List[LabelEntity]) -> Dict[LabelEntity, int]:
+    """Returns a mapping from each label to its first index in the labels."""
+    label_to_index: Dict[LabelEntity, int] = {}
+    for idx, label in enumerate(labels):
+        label_to_index.setdefault(label, idx)
+    return label_to_index
+
+
+def __get_gt_and_predicted_label_matrices_from_resultset(
     resultset: ResultSetEntity,
-) -> Tuple[List[Set[int]], List[Set[int]]]:
-    """Returns the label indices lists for ground truth and prediction datasets in a tuple.
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the multi-hot label matrices for ground truth and prediction datasets in a tuple.
 
     Args:
         resultset
 
     Returns:
-        a tuple containing two lists. The first list contains the ground truth label indices, and the second contains
-        the prediction label indices.
+        a tuple containing two boolean matrices of shape (N, L), N being the number of dataset items and L the number
+        of task labels including the empty label. The first one contains the ground truth labels, and the second
+        contains the predicted labels.
     """
-    true_label_idx = []
-    predicted_label_idx = []
-
     gt_dataset: DatasetEntity = resultset.ground_truth_dataset
     pred_dataset: DatasetEntity = resultset.prediction_dataset
 
     gt_dataset.sort_items()
     pred_dataset.sort_items()
 
-    # Iterate over each dataset item, and collect the labels for this item (pred and gt)
     task_labels = resultset.model.configuration.get_label_schema().get_labels(include_empty=True)
+    label_to_index = __get_label_to_index(task_labels)
+
+    # Collect the (item, label index) pairs of each dataset item (pred and gt)
+    true_rows: List[int] = []
+    true_cols: List[int] = []
+    pred_rows: List[int] = []
+    pred_cols: List[int] = []
+    n_items = 0
     for gt_item, pred_item in zip(gt_dataset, pred_dataset):
         if isinstance(gt_item, DatasetItemEntity) and isinstance(pred_item, DatasetItemEntity):
-            true_label_idx.append({task_labels.index(label) for label in gt_item.get_roi_labels(task_labels)})
-            predicted_label_idx.append({task_labels.index(label) for label in pred_item.get_roi_labels(task_labels)})
+            for rows, cols, item in ((true_rows, true_cols, gt_item), (pred_rows, pred_cols, pred_item)):
+                for label in item.get_roi_labels():
+                    label_idx = label_to_index.get(label)
+                    if label_idx is not None:
+                        rows.append(n_items)
+                        cols.append(label_idx)
+            n_items += 1
 
-    return true_label_idx, predicted_label_idx
+    true_labels = np.zeros((n_items, len(task_labels)), dtype=bool)
+    true_labels[true_rows, true_cols] = True
+    predicted_labels = np.zeros((n_items, len(task_labels)), dtype=bool)
+    predicted_labels[pred_rows, pred_cols] = True
+    return true_labels, predicted_labels
 
 
 def __compute_unnormalized_confusion_matrices_for_label_group(
-    true_label_idx: List[Set[int]],
-    predicted_label_idx: List[Set[int]],
+    true_labels: np.ndarray,
+    predicted_labels: np.ndarray,
     label_group: LabelGroup,
     task_labels: List[LabelEntity],
+    label_to_index: Optional[Dict[LabelEntity, int]] = None,
 ) -> MatrixMetric:
     """Returns matrix metric for a certain label group.
 
+    If an item has several labels of a multiclass group, only the one that comes first in the task labels is counted
+    for the item, as the lowest label index was picked from the label index sets before.
+
     Args:
-        true_label_idx (List[Set[int]]): list of sets of label indices for the ground truth dataset
-        predicted_label_idx (List[Set[int]]): list of sets of label indices for the prediction dataset
+        true_labels (np.ndarray): multi-hot matrix of the label indices for the ground truth dataset
+        predicted_labels (np.ndarray): multi-hot matrix of the label indices for the prediction dataset
         label_group (LabelGroup): label group to compute the confusion matrix for
         task_labels (List[LabelEntity]): list of labels for the task
+        label_to_index (Optional[Dict[LabelEntity, int]]): index of each label in task_labels, computed if not given
 
     Returns:
         MatrixMetric: confusion matrix for the label group
     """
+    if label_to_index is None:
+        label_to_index = __get_label_to_index(task_labels)
     map_task_labels_idx_to_group_idx = {
-        task_labels.index(label): i_group for i_group, label in enumerate(label_group.labels)
+        label_to_index[label]: i_group for i_group, label in enumerate(label_group.labels)
     }
     set_group_labels_idx = set(map_task_labels_idx_to_group_idx.keys())
     group_label_names = [task_labels[label_idx].name for label_idx in set_group_labels_idx]
 
+    # task label indices of the group in ascending order and their index in the group
+    group_labels_idx = np.array(sorted(set_group_labels_idx), dtype=int)
+    group_idx = np.array([map_task_labels_idx_to_group_idx[label_idx] for label_idx in group_labels_idx], dtype=int)
+    true_group_labels = true_labels[:, group_labels_idx]
+    pred_group_labels = predicted_labels[:, group_labels_idx]
+
     if len(group_label_names) == 1:
         # Single-class
         # we use "not" to make presence of a class to be at index 0, while the absence of it at index 1
-        y_true = [int(not set_group_labels_idx.issubset(true_labels)) for true_labels in true_label_idx]
-        y_pred = [int(not set_group_labels_idx.issubset(pred_labels)) for pred_labels in predicted_label_idx]
+        y_true = (~true_group_labels[:, 0]).astype(int)
+        y_pred = (~pred_group_labels[:, 0]).astype(int)
         group_label_names += [f"~ {group_label_names[0]}"]
         column_labels = group_label_names.copy()
         remove_last_row = False
@@ -262,29 +296,20 @@ def __compute_unnormalized_confusion_matrices_for_label_group(
         # Multiclass
         undefined_idx = len(group_label_names)  # to define missing value
 
-        # find the intersections between GT and task labels, and Prediction and task labels
-        true_intersections = [true_labels.intersection(set_group_labels_idx) for true_labels in true_label_idx]
-        pred_intersections = [pred_labels.intersection(set_group_labels_idx) for pred_labels in predicted_label_idx]
-
-        # map the intersection to 0-index value
-        y_true = [
-            map_task_labels_idx_to_group_idx[list(true_intersection)[0]]
-            if len(true_intersection) != 0
-            else undefined_idx
-            for true_intersection in true_intersections
-        ]
-        y_pred = [
-            map_task_labels_idx_to_group_idx[list(pred_intersection)[0]]
-            if len(pred_intersection) != 0
-            else undefined_idx
-            for pred_intersection in pred_intersections
-        ]
+        # map the first group label of each item to 0-index value, the last column is set for the missing value
+        group_idx = np.append(group_idx, undefined_idx)
+        missing = np.ones((len(true_group_labels), 1), dtype=bool)
+        y_true = group_idx[np.hstack([true_group_labels, missing]).argmax(axis=1)]
+        y_pred = group_idx[np.hstack([pred_group_labels, missing]).argmax(axis=1)]
 
         column_labels = group_label_names.copy()
         column_labels.append("Other")
         remove_last_row = True
 
-    matrix_data = sklearn_confusion_matrix(y_true, y_pred, labels=list(range(len(column_labels))))
+    n_columns = len(column_labels)
+    matrix_data = np.bincount(y_true * n_columns + y_pred, minlength=n_columns * n_columns).reshape(
+        n_columns, n_columns
+    )
     if remove_last_row:
         # matrix clean up
         matrix_data = np.delete(matrix_data, -1, 0)
@@ -319,16 +344,14 @@ def compute_unnormalized_confusion_matrices_from_resultset(
         raise ValueError("Cannot compute the confusion matrix of an empty result set.")
 
     unnormalized_confusion_matrices: List[MatrixMetric] = []
-    (
-        true_label_idx,
-        predicted_label_idx,
-    ) = __get_gt_and_predicted_label_indices_from_resultset(resultset)
+    true_labels, predicted_labels = __get_gt_and_predicted_label_matrices_from_resultset(resultset)
     task_labels = resultset.model.configuration.get_label_schema().get_labels(include_empty=False)
+    label_to_index = __get_label_to_index(task_labels)
 
     # Confusion matrix computation
     for label_group in resultset.model.configuration.get_label_schema().get_groups():
         matrix = __compute_unnormalized_confusion_matrices_for_label_group(
-            true_label_idx, predicted_label_idx, label_group, task_labels
+            true_labels, predicted_labels, label_group, task_labels, label_to_index
         )
         unnormalized_confusion_matrices.append(matrix)
 
@@ -5,7 +5,7 @@
 #
 
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 
@@ -16,9 +16,113 @@ from otx.api.entities.shapes.rectangle import Rectangle
 NumberPerLabel = Dict[Optional[LabelEntity], int]
 
 
+class SegmentationConfusionMatrix:
+    """Confusion matrix between reference and prediction masks accumulated image by image.
+
+    The pixel values of the masks are label indices: 0 is the background and ``i + 1`` is ``labels[i]``.
+    Each update adds the pixels of one image to the matrix with a single ``np.bincount``, so the masks do not need to
+    be kept in memory and the memory does not depend on the number of images.
+    Values outside of this range are counted in an extra "other" row and column.
+
+    Args:
+        labels (List[LabelEntity]): labels in the masks
+    """
+
+    def __init__(self, labels: List[LabelEntity]):
+        self.labels = list(labels)
+        self._other_index = len(self.labels) + 1
+        # Rows are the reference values, columns are the prediction values
+        self.matrix = np.zeros((len(self.labels) + 2, len(self.labels) + 2), dtype=np.int64)
+        # Matching pixels with the same value outside of the label range
+        self._n_other_matches = 0
+
+    def update(self, reference: np.ndarray, prediction: np.ndarray):
+        """Adds the pixels of a reference mask and a prediction mask of one image.
+
+        Args:
+            reference (np.ndarray): reference mask
+            prediction (np.ndarray): prediction mask with the same number of pixels
+
+        Raises:
+            ValueError: if the masks have different sizes
+        """
+        reference = np.asarray(reference).ravel()
+        prediction = np.asarray(prediction).ravel()
+        if reference.size != prediction.size:
+            raise ValueError(
+                f"Reference and prediction masks should have the same size, got {reference.size} and {prediction.size}"
+            )
+        if reference.size == 0:
+            return
+
+        reference = self.__to_indices(reference, prediction)
+        prediction = self.__to_indices(prediction, None)
+        num_classes = len(self.matrix)
+        counts = np.bincount(reference * num_classes + prediction, minlength=num_classes * num_classes)
+        self.matrix += counts.reshape(num_classes, num_classes)
+
+    def __to_indices(self, mask: np.ndarray, other_mask: Optional[np.ndarray]) -> np.ndarray:
+        """Returns the mask as int64 indices of the matrix, with the values outside of the label range as "other".
+
+        If other_mask is given, the pixels equal in both masks outside of the label range are counted as matches.
+        """
+        mask = mask.astype(np.int64, copy=False)
+        if mask.min() >= 0 and mask.max() < self._other_index:
+            return mask
+        outside = (mask < 0) | (mask >= self._other_index)
+        if other_mask is not None:
+            self._n_other_matches += int(np.count_nonzero(outside & (mask == other_mask)))
+        return np.where(outside, self._other_index, mask)
+
+    def get_intersections_and_cardinalities(self) -> Tuple[NumberPerLabel, NumberPerLabel]:
+        """Returns the intersections and cardinalities of the accumulated masks.
+
+        Returns:
+            Tuple[NumberPerLabel, NumberPerLabel]: (all_intersections, all_cardinalities), the ``None`` key holds
+                the numbers over all the non background pixels.
+        """
+        diagonal = self.matrix.diagonal()
+        reference_areas = self.matrix.sum(axis=1)
+        prediction_areas = self.matrix.sum(axis=0)
+        n_pixels = int(self.matrix.sum())
+
+        all_intersections: NumberPerLabel = {}
+        all_cardinalities: NumberPerLabel = {}
+        for i, label in enumerate(self.labels):
+            label_num = i + 1
+            all_intersections[label] = int(diagonal[label_num])
+            all_cardinalities[label] = int(reference_areas[label_num] + prediction_areas[label_num])
+        all_intersections[None] = int(diagonal[1 : self._other_index].sum()) + self._n_other_matches
+        all_cardinalities[None] = 2 * n_pixels - int(reference_areas[0] + prediction_areas[0])
+        return all_intersections, all_cardinalities
+
+    def get_dice_per_label(self) -> Dict[LabelEntity, float]:
+        """Returns the Dice coefficient 2 * intersection / cardinality of each label, 0 for absent labels."""
+        intersections, cardinalities = self.get_intersections_and_cardinalities()
+        return {
+            label: 2 * intersections[label] / cardinalities[label] if cardinalities[label] > 0 else 0.0
+            for label in self.labels
+        }
+
+    def get_iou_per_label(self) -> Dict[LabelEntity, float]:
+        """Returns the intersection over union of each label, 0 for absent labels."""
+        intersections, cardinalities = self.get_intersections_and_cardinalities()
+        iou_per_label = {}
+        for label in self.labels:
+            union = cardinalities[label] - intersections[label]
+            iou_per_label[label] = intersections[label] / union if union > 0 else 0.0
+        return iou_per_label
+
+    def get_mean_iou(self) -> float:
+        """Returns the mean intersection over union of the labels present in the references or predictions."""
+        _, cardinalities = self.get_intersections_and_cardinalities()
+        scores = [iou for label, iou in self.get_iou_per_label().items() if cardinalities[label] > 0]
+        return sum(scores) / len(scores) if scores else 0.0
+
+
 def get_intersections_and_cardinalities(
-    references: List[np.ndarray],
-    predictions: List[np.ndarray],
+    references: Iterable[np.ndarray],
+    predictions: Iterable[np.ndarray],
     labels: List[LabelEntity],
 ) -> Tuple[NumberPerLabel, NumberPerLabel]:
     """Returns all intersections and cardinalities between reference masks and prediction masks.
@@ -27,8 +131,8 @@ def get_intersections_and_cardinalities(
     number of intersection/cardinality pixels
 
     Args:
-        references (List[np.ndarray]): reference masks,s one mask per image
-        predictions (List[np.ndarray]): prediction masks, one mask per image
+        references (Iterable[np.ndarray]): reference masks,s one mask per image
+        predictions (Iterable[np.ndarray]): prediction masks, one mask per image
         labels (List[LabelEntity]): labels in input masks
 
     Returns:
@@ -36,21 +140,10 @@ def get_intersections_and_cardinalities(
     """
 
     # TODO [Soobee] : Add score for background label and align the calculation method with validation
-    all_intersections: NumberPerLabel = {label: 0 for label in labels}
-    all_intersections[None] = 0
-    all_cardinalities: NumberPerLabel = {label: 0 for label in labels}
-    all_cardinalities[None] = 0
+    confusion_matrix = SegmentationConfusionMatrix(labels)
     for reference, prediction in zip(references, predictions):
-        intersection = np.where(reference == prediction, reference, 0)
-        all_intersections[None] += np.count_nonzero(intersection)
-        all_cardinalities[None] += np.count_nonzero(reference) + np.count_nonzero(prediction)
-        for i, label in enumerate(labels):
-            label_num = i + 1
-            all_intersections[label] += np.count_nonzero(intersection == label_num)
-            reference_area = np.count_nonzero(reference == label_num)
-            prediction_area = np.count_nonzero(prediction == label_num)
-            all_cardinalities[label] += reference_area + prediction_area
-    return all_intersections, all_cardinalities
+        confusion_matrix.update(reference, prediction)
+    return confusion_matrix.get_intersections_and_cardinalities()
 
 
 def intersection_box(box1: Rectangle, box2: Rectangle) -> Optional[List[float]]:
@@ -19,9 +19,7 @@ from otx.api.entities.metrics import (
 )
 from otx.api.entities.resultset import ResultSetEntity
 from otx.api.usecases.evaluation.averaging import MetricAverageMethod
-from otx.api.usecases.evaluation.basic_operations import (
-    get_intersections_and_cardinalities,
-)
+from otx.api.usecases.evaluation.basic_operations import SegmentationConfusionMatrix
 from otx.api.usecases.evaluation.performance_provider_interface import (
     IPerformanceProvider,
 )
@@ -114,14 +112,12 @@ class DiceAverage(IPerformanceProvider):
         resultset_labels = set(resultset.prediction_dataset.get_labels() + resultset.ground_truth_dataset.get_labels())
         model_labels = set(resultset.model.configuration.get_label_schema().get_labels(include_empty=False))
         labels = sorted(resultset_labels.intersection(model_labels))
-        hard_predictions = []
-        hard_references = []
-        for prediction_item, reference_item in zip(
-            list(resultset.prediction_dataset), list(resultset.ground_truth_dataset)
-        ):
+        # The masks of each image are added to the confusion matrix and discarded right away
+        confusion_matrix = SegmentationConfusionMatrix(labels)
+        for prediction_item, reference_item in zip(resultset.prediction_dataset, resultset.ground_truth_dataset):
             try:
-                hard_predictions.append(mask_from_dataset_item(prediction_item, labels))
-                hard_references.append(mask_from_dataset_item(reference_item, labels))
+                hard_prediction = mask_from_dataset_item(prediction_item, labels)
+                hard_reference = mask_from_dataset_item(reference_item, labels)
             except:
                 # when item consists of masks with Image properties
                 # TODO (sungchul): how to add condition to check if polygon or mask?
@@ -140,12 +136,11 @@ class DiceAverage(IPerformanceProvider):
                     combined_mask = np.expand_dims(combined_mask, axis=2)
                     return combined_mask
 
-                hard_predictions.append(combine_masks(prediction_item.get_annotations()))
-                hard_references.append(combine_masks(reference_item.get_annotations()))
+                hard_prediction = combine_masks(prediction_item.get_annotations())
+                hard_reference = combine_masks(reference_item.get_annotations())
+            confusion_matrix.update(hard_reference, hard_prediction)
 
-        all_intersection, all_cardinality = get_intersections_and_cardinalities(
-            hard_references, hard_predictions, labels
-        )
+        all_intersection, all_cardinality = confusion_matrix.get_intersections_and_cardinalities()
 
         return cls.compute_dice_using_intersection_and_cardinality(all_intersection, all_cardinality, average)
 
@@ -4,7 +4,7 @@
 #
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
@@ -35,6 +35,47 @@ from otx.api.utils.shape_factory import ShapeFactory
 logger = logging.getLogger(__name__)
 ALL_CLASSES_NAME = "All Classes"
 
+# Columnar representation of the boxes of an image, one record per box
+BOX_DTYPE = np.dtype(
+    [
+        ("x1", np.float64),
+        ("y1", np.float64),
+        ("x2", np.float64),
+        ("y2", np.float64),
+        ("class_id", np.int32),
+        ("score", np.float64),
+    ]
+)
+
+
+def boxes_to_array(
+    boxes: Sequence[Tuple[float, float, float, float, str, float]], class_ids: Dict[str, int]
+) -> np.ndarray:
+    """Converts a list of box tuples to a structured array of BOX_DTYPE.
+
+    Class names are matched case-insensitively, names missing in class_ids are added to it with a new id.
+
+    Args:
+        boxes (Sequence[Tuple[float, float, float, float, str, float]]): List of boxes.
+            a box: [x1: float, y1, x2, y2, class: str, score: float]
+        class_ids (Dict[str, int]): Mapping from the lower case class names to the class ids.
+
+    Returns:
+        np.ndarray: Structured array of BOX_DTYPE with one record per box.
+    """
+    records = []
+    for x1, y1, x2, y2, class_name, score in boxes:
+        class_id = class_ids.setdefault(class_name.lower(), len(class_ids))
+        records.append((x1, y1, x2, y2, class_id, score))
+    return np.array(records, dtype=BOX_DTYPE)
+
+
+def _box_coordinates(boxes: Union[np.ndarray, Sequence[Tuple[float, float, float, float, str, float]]]) -> np.ndarray:
+    """Returns the (x1, y1, x2, y2) coordinates of a structured array of BOX_DTYPE or a list of boxes."""
+    if isinstance(boxes, np.ndarray) and boxes.dtype.names is not None:
+        return np.stack([boxes["x1"], boxes["y1"], boxes["x2"], boxes["y2"]], axis=1)
+    return np.array([box[:4] for box in boxes], dtype=float).reshape(-1, 4)
+
 
 def intersection_box(
     box1: Tuple[float, float, float, float, str, float], box2: Tuple[float, float, float, float, str, float]
@@ -90,8 +131,8 @@ def bounding_box_intersection_over_union(
 
 
 def get_iou_matrix(
-    ground_truth: List[Tuple[float, float, float, float, str, float]],
-    predicted: List[Tuple[float, float, float, float, str, float]],
+    ground_truth: Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]],
+    predicted: Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]],
 ) -> np.ndarray:
     """Constructs an iou matrix of shape [num_ground_truth_boxes, num_predicted_boxes].
 
@@ -99,32 +140,62 @@ def get_iou_matrix(
     An iou matrix corresponds to a single image
 
     Args:
-        ground_truth (List[Tuple[float, float, float, float, str, float]]): List of ground truth boxes.
-            Each box is a list of (x,y) coordinates and a label.
+        ground_truth (Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]): Ground truth boxes,
+            a structured array of BOX_DTYPE or a list of boxes.
             a box: [x1: float, y1, x2, y2, class: str, score: float]
             boxes_per_image: [box1, box2, …]
-            boxes1: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
-        predicted (List[Tuple[float, float, float, float, str, float]]): List of predicted boxes.
-            Each box is a list of (x,y) coordinates and a label.
+        predicted (Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]): Predicted boxes,
+            a structured array of BOX_DTYPE or a list of boxes.
             a box: [x1: float, y1, x2, y2, class: str, score: float]
             boxes_per_image: [box1, box2, …]
-            boxes2: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
 
     Returns:
         np.ndarray: IoU matrix of shape [ground_truth_boxes, predicted_boxes]
     """
-    matrix = np.array(
-        [[bounding_box_intersection_over_union(gts, preds) for preds in predicted] for gts in ground_truth]
-    )
-    return matrix
+    if len(ground_truth) == 0 or len(predicted) == 0:
+        return np.zeros((len(ground_truth), len(predicted)))
+
+    return _box_iou_matrix(_box_coordinates(ground_truth), _box_coordinates(predicted))
+
+
+def _box_iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """Vectorized version of bounding_box_intersection_over_union for all pairs of boxes1 and boxes2.
+
+    The operations are done in the same order so that the values are identical to the scalar version.
+
+    Args:
+        boxes1 (np.ndarray): Boxes in (x1, y1, x2, y2) format, shape (N, 4).
+        boxes2 (np.ndarray): Boxes in (x1, y1, x2, y2) format, shape (M, 4).
+
+    Raises:
+        ValueError: In case an IoU is outside of [0.0, 1.0]
+
+    Returns:
+        np.ndarray: IoU matrix of shape [N, M]
+    """
+    x_left = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+    y_top = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+    x_right = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+    y_bottom = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+
+    intersection_area = (x_right - x_left) * (y_bottom - y_top)
+    bb1_area = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    bb2_area = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union_area = bb1_area[:, None] + bb2_area[None, :] - intersection_area
+
+    valid = (x_right > x_left) & (y_bottom > y_top) & (union_area != 0)
+    iou = np.divide(intersection_area, union_area, out=np.zeros_like(intersection_area), where=valid)
+    if np.any((iou < 0.0) | (iou > 1.0)):
+        raise ValueError(f"intersection over union should be in range [0,1], actual={iou[(iou < 0.0) | (iou > 1.0)]}")
+    return iou
 
 
 def get_n_false_negatives(iou_matrix: np.ndarray, iou_threshold: float) -> int:
     """Get the number of false negatives inside the IoU matrix for a given threshold.
 
-    The first loop accounts for all the ground truth boxes which do not have a high enough iou with any predicted
+    The first term accounts for all the ground truth boxes which do not have a high enough iou with any predicted
     box (they go undetected)
-    The second loop accounts for the much rarer case where two ground truth boxes are detected by the same predicted
+    The second term accounts for the much rarer case where two ground truth boxes are detected by the same predicted
     box. The principle is that each ground truth box requires a unique prediction box
 
     Args:
@@ -134,14 +205,55 @@ def get_n_false_negatives(iou_matrix: np.ndarray, iou_threshold: float) -> int:
     Returns:
         int: Number of false negatives
     """
-    n_false_negatives = 0
-    for row in iou_matrix:
-        if max(row) < iou_threshold:
-            n_false_negatives += 1
-    for column in np.rot90(iou_matrix):
-        indices = np.where(column > iou_threshold)
-        n_false_negatives += max(len(indices[0]) - 1, 0)
-    return n_false_negatives
+    n_false_negatives = np.count_nonzero(iou_matrix.max(axis=1) < iou_threshold)
+    n_false_negatives += np.maximum(np.count_nonzero(iou_matrix > iou_threshold, axis=0) - 1, 0).sum()
+    return int(n_false_negatives)
+
+
+def get_n_false_negatives_per_prefix(iou_matrix: np.ndarray, order: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Get the number of false negatives when only the first k predicted boxes in the given order are kept.
+
+    This is a cumulative version of get_n_false_negatives: a ground truth box is detected from the first
+    predicted box whose IoU reaches the threshold, and the duplicated detections of each predicted box are
+    summed in the given order. It allows evaluating the thresholds which keep a prefix of the sorted predictions
+    (e.g. confidence thresholds with the predictions sorted by descending score) with a single IoU matrix.
+
+    Args:
+        iou_matrix (np.ndarray): IoU matrix of shape [ground_truth_boxes, predicted_boxes]
+        order (np.ndarray): Indices of the candidate predicted boxes in the order they are kept.
+        iou_threshold (float): IoU threshold to use for the false negatives.
+
+    Returns:
+        np.ndarray: Number of false negatives for k = 0, 1, …, len(order) kept predicted boxes.
+    """
+    n_true = iou_matrix.shape[0]
+    if n_true == 0 or len(order) == 0:
+        return np.full(len(order) + 1, n_true, dtype=int)
+
+    matrix = iou_matrix[:, order]
+    detected = matrix >= iou_threshold
+    first_detection = np.argmax(detected, axis=1)[detected.any(axis=1)]
+    n_detected = np.cumsum(np.bincount(first_detection + 1, minlength=len(order) + 1))
+    n_duplicates = np.maximum(np.count_nonzero(matrix > iou_threshold, axis=0) - 1, 0)
+    return n_true - n_detected + np.concatenate([[0], np.cumsum(n_duplicates)])
+
+
+class _ClassMatches:
+    """This class caches the IoU matrix of the boxes of one class in one image.
+
+    Args:
+        ground_truth_boxes (np.ndarray): Ground truth boxes of the image, structured array of BOX_DTYPE.
+        predicted_boxes (np.ndarray): Predicted boxes of the image, structured array of BOX_DTYPE.
+        class_id (int): Id of the class.
+    """
+
+    def __init__(self, ground_truth_boxes: np.ndarray, predicted_boxes: np.ndarray, class_id: int):
+        class_ground_truth_boxes = ground_truth_boxes[ground_truth_boxes["class_id"] == class_id]
+        self.predicted_indices = np.flatnonzero(predicted_boxes["class_id"] == class_id)
+        class_predicted_boxes = predicted_boxes[self.predicted_indices]
+        self.n_true = len(class_ground_truth_boxes)
+        self.scores = class_predicted_boxes["score"]
+        self.iou_matrix = get_iou_matrix(class_ground_truth_boxes, class_predicted_boxes)
 
 
 class _Metrics:
@@ -245,27 +357,48 @@ class _OverallResults:
 class _FMeasureCalculator:
     """This class contains the functions to calculate FMeasure.
 
+    The boxes of each image are stored in a structured array of BOX_DTYPE with integer class ids,
+    lists of box tuples are converted on initialization.
+
     Args:
-        ground_truth_boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]):
+        ground_truth_boxes_per_image (Sequence[Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]]):
                 a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
+                boxes_per_image: [box1, box2, …] or structured array of BOX_DTYPE
                 ground_truth_boxes_per_image: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
-        prediction_boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]):
+        prediction_boxes_per_image (Sequence[Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]]):
                 a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
+                boxes_per_image: [box1, box2, …] or structured array of BOX_DTYPE
                 predicted_boxes_per_image: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
+        class_ids (Optional[Dict[str, int]]): Mapping from the lower case class names to the class ids of the boxes.
+            Defaults to None, the ids are then assigned while converting the lists of box tuples.
     """
 
     def __init__(
         self,
-        ground_truth_boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]],
-        prediction_boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]],
+        ground_truth_boxes_per_image: Sequence[Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]],
+        prediction_boxes_per_image: Sequence[Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]],
+        class_ids: Optional[Dict[str, int]] = None,
     ):
-        self.ground_truth_boxes_per_image = ground_truth_boxes_per_image
-        self.prediction_boxes_per_image = prediction_boxes_per_image
+        self.class_ids: Dict[str, int] = {} if class_ids is None else class_ids
+        self.ground_truth_boxes_per_image = self.__as_arrays(ground_truth_boxes_per_image)
+        self.prediction_boxes_per_image = self.__as_arrays(prediction_boxes_per_image)
         self.confidence_range = [0.025, 1.0, 0.025]
         self.nms_range = [0.1, 1, 0.05]
         self.default_confidence_threshold = 0.35
+        self.__class_matches: Dict[str, List[_ClassMatches]] = {}
+
+    def __as_arrays(
+        self, boxes_per_image: Sequence[Union[np.ndarray, List[Tuple[float, float, float, float, str, float]]]]
+    ) -> List[np.ndarray]:
+        """Converts the boxes of each image to a structured array of BOX_DTYPE if needed."""
+        return [
+            boxes if isinstance(boxes, np.ndarray) else boxes_to_array(boxes, self.class_ids)
+            for boxes in boxes_per_image
+        ]
+
+    def __get_class_id(self, class_name: str) -> int:
+        """Returns the id of a class, -1 if no box has this class."""
+        return self.class_ids.get(class_name.lower(), -1)
 
     def evaluate_detections(
         self,
@@ -335,7 +468,9 @@ class _FMeasureCalculator:
         """Returns the results for confidence threshold in range confidence_range.
 
         Varies confidence based on confidence_range, the results are appended in a dictionary and returned, it also
-        returns the best f_measure found and the confidence threshold used to get said f_measure
+        returns the best f_measure found and the confidence threshold used to get said f_measure.
+        The predictions kept by a confidence threshold are the first ones in descending order of score, so all the
+        thresholds are evaluated in a single cumulative sweep over the cached IoU matrices.
 
         Args:
             classes (List[str]): Names of classes to be evaluated.
@@ -348,12 +483,17 @@ class _FMeasureCalculator:
         result = _AggregatedResults(classes)
         result.best_threshold = 0.1
 
-        for confidence_threshold in np.arange(*confidence_range):
-            result_point = self.evaluate_classes(
-                classes=classes.copy(),
-                iou_threshold=iou_threshold,
-                confidence_threshold=confidence_threshold,
-            )
+        confidence_thresholds = np.arange(*confidence_range)
+
+        def select_by_confidence(_image_idx: int, matches: _ClassMatches) -> Tuple[np.ndarray, np.ndarray]:
+            order = np.argsort(-matches.scores, kind="stable")
+            n_selected = np.count_nonzero(matches.scores[:, None] > confidence_thresholds[None, :], axis=0)
+            return order, n_selected
+
+        result_points = self.__sweep_thresholds(
+            classes, iou_threshold, len(confidence_thresholds), select_by_confidence
+        )
+        for confidence_threshold, result_point in zip(confidence_thresholds, result_points):
             all_classes_f_measure = result_point[ALL_CLASSES_NAME].f_measure
             result.all_classes_f_measure_curve.append(all_classes_f_measure)
 
@@ -378,7 +518,8 @@ class _FMeasureCalculator:
         First, we calculate the critical nms of each box, meaning the nms_threshold
         that would cause it to be disappear
         This is an expensive O(n**2) operation, however, doing this makes filtering for every single nms_threshold much
-        faster at O(n)
+        faster at O(n). The predictions kept by a NMS threshold are the first ones in ascending order of critical nms,
+        so all the thresholds are evaluated in a single cumulative sweep over the cached IoU matrices.
 
         Args:
             classes (List[str]): List of classes
@@ -393,20 +534,21 @@ class _FMeasureCalculator:
         result.best_f_measure = min_f_measure
         result.best_threshold = 0.5
 
-        critical_nms_per_image = self.__get_critical_nms(self.prediction_boxes_per_image, cross_class_nms)
-
-        for nms_threshold in np.arange(*self.nms_range):
-            predicted_boxes_per_image_per_nms = self.__filter_nms(
-                self.prediction_boxes_per_image, critical_nms_per_image, nms_threshold
-            )
-            boxes_pair_for_nms = _FMeasureCalculator(
-                self.ground_truth_boxes_per_image, predicted_boxes_per_image_per_nms
-            )
-            result_point = boxes_pair_for_nms.evaluate_classes(
-                classes=classes.copy(),
-                iou_threshold=iou_threshold,
-                confidence_threshold=self.default_confidence_threshold,
-            )
+        critical_nms_per_image = [
+            np.array(critical_nms, dtype=float)
+            for critical_nms in self.__get_critical_nms(self.prediction_boxes_per_image, cross_class_nms)
+        ]
+        nms_thresholds = np.arange(*self.nms_range)
+
+        def select_by_nms(image_idx: int, matches: _ClassMatches) -> Tuple[np.ndarray, np.ndarray]:
+            candidates = np.flatnonzero(matches.scores > self.default_confidence_threshold)
+            critical_nms = critical_nms_per_image[image_idx][matches.predicted_indices[candidates]]
+            order = candidates[np.argsort(critical_nms, kind="stable")]
+            n_selected = np.count_nonzero(critical_nms[:, None] < nms_thresholds[None, :], axis=0)
+            return order, n_selected
+
+        result_points = self.__sweep_thresholds(classes, iou_threshold, len(nms_thresholds), select_by_nms)
+        for nms_threshold, result_point in zip(nms_thresholds, result_points):
             all_classes_f_measure = result_point[ALL_CLASSES_NAME].f_measure
             result.all_classes_f_measure_curve.append(all_classes_f_measure)
 
@@ -454,6 +596,90 @@ class _FMeasureCalculator:
         result[ALL_CLASSES_NAME] = all_classes_counters.calculate_f_measure()
         return result
 
+    def __get_class_matches(self, class_name: str) -> List[_ClassMatches]:
+        """Returns the cached IoU matrices of the boxes of a class for each image.
+
+        Args:
+            class_name (str): Name of the class
+
+        Returns:
+            List[_ClassMatches]: IoU matrix between the ground truth and the predicted boxes of the class per image.
+        """
+        key = class_name.lower()
+        if key not in self.__class_matches:
+            class_id = self.__get_class_id(class_name)
+            self.__class_matches[key] = [
+                _ClassMatches(ground_truth_boxes, predicted_boxes, class_id)
+                for ground_truth_boxes, predicted_boxes in zip(
+                    self.ground_truth_boxes_per_image, self.prediction_boxes_per_image
+                )
+            ]
+        return self.__class_matches[key]
+
+    def __sweep_thresholds(
+        self,
+        classes: List[str],
+        iou_threshold: float,
+        n_thresholds: int,
+        select_predictions: Callable[[int, _ClassMatches], Tuple[np.ndarray, np.ndarray]],
+    ) -> List[Dict[str, _Metrics]]:
+        """Returns the metrics of each class for a sequence of thresholds filtering the predictions.
+
+        It is equivalent to calling evaluate_classes with the predictions kept by each threshold, but the IoU matrix
+        of each image and class is computed once and the counters of all thresholds are derived from it.
+
+        Args:
+            classes (List[str]): List of classes to be evaluated.
+            iou_threshold (float): IoU threshold to use for false negatives.
+            n_thresholds (int): Number of thresholds.
+            select_predictions (Callable[[int, _ClassMatches], Tuple[np.ndarray, np.ndarray]]): Function which
+                returns, for an image index and its class matches, the candidate predictions in the order they are
+                kept and the number of them kept by each threshold.
+
+        Returns:
+            List[Dict[str, _Metrics]]: The metrics (e.g. F-measure) for each class for each threshold.
+        """
+        classes = [class_name for class_name in classes if class_name != ALL_CLASSES_NAME]
+        counters_per_class: Dict[str, List[_ResultCounters]] = {}
+        for class_name in classes:
+            if len(self.ground_truth_boxes_per_image) == 0:
+                logger.warning("No ground truth images supplied for f-measure calculation.")
+                counters_per_class[class_name] = [_ResultCounters(0, 0, 0) for _ in range(n_thresholds)]
+                continue
+
+            n_false_negatives = np.zeros(n_thresholds, dtype=int)
+            n_predicted = np.zeros(n_thresholds, dtype=int)
+            n_true = 0
+            for image_idx, matches in enumerate(self.__get_class_matches(class_name)):
+                order, n_selected = select_predictions(image_idx, matches)
+                n_false_negatives_per_prefix = get_n_false_negatives_per_prefix(
+                    matches.iou_matrix, order, iou_threshold
+                )
+                n_false_negatives += n_false_negatives_per_prefix[n_selected]
+                n_predicted += n_selected
+                n_true += matches.n_true
+            counters_per_class[class_name] = [
+                _ResultCounters(int(n_false_negatives[idx]), n_true, int(n_predicted[idx]))
+                for idx in range(n_thresholds)
+            ]
+
+        result_points = []
+        for idx in range(n_thresholds):
+            result_point: Dict[str, _Metrics] = {}
+            all_classes_counters = _ResultCounters(0, 0, 0)
+            for class_name in classes:
+                counters = counters_per_class[class_name][idx]
+                if len(self.ground_truth_boxes_per_image) == 0:
+                    result_point[class_name] = _Metrics(0.0, 0.0, 0.0)
+                else:
+                    result_point[class_name] = counters.calculate_f_measure()
+                all_classes_counters.n_false_negatives += counters.n_false_negatives
+                all_classes_counters.n_true += counters.n_true
+                all_classes_counters.n_predicted += counters.n_predicted
+            result_point[ALL_CLASSES_NAME] = all_classes_counters.calculate_f_measure()
+            result_points.append(result_point)
+        return result_points
+
     def get_f_measure_for_class(
         self, class_name: str, iou_threshold: float, confidence_threshold: float
     ) -> Tuple[_Metrics, _ResultCounters]:
@@ -472,15 +698,17 @@ class _FMeasureCalculator:
             Tuple[_Metrics, _ResultCounters]: a structure containing the statistics (e.g. f_measure) and a structure
             containing the intermediated counters used to derive the stats (e.g. num. false positives)
         """
-        class_ground_truth_boxes_per_image = self.__filter_class(self.ground_truth_boxes_per_image, class_name)
+        class_id = self.__get_class_id(class_name)
+        class_ground_truth_boxes_per_image = self.__filter_class(self.ground_truth_boxes_per_image, class_id)
         confidence_predicted_boxes_per_image = self.__filter_confidence(
             self.prediction_boxes_per_image, confidence_threshold
         )
-        class_predicted_boxes_per_image = self.__filter_class(confidence_predicted_boxes_per_image, class_name)
+        class_predicted_boxes_per_image = self.__filter_class(confidence_predicted_boxes_per_image, class_id)
         if len(class_ground_truth_boxes_per_image) > 0:
             boxes_pair_per_class = _FMeasureCalculator(
                 ground_truth_boxes_per_image=class_ground_truth_boxes_per_image,
                 prediction_boxes_per_image=class_predicted_boxes_per_image,
+                class_ids=self.class_ids,
             )
             result_counters = boxes_pair_per_class.get_counters(iou_threshold=iou_threshold)
             result_metrics = result_counters.calculate_f_measure()
@@ -492,9 +720,7 @@ class _FMeasureCalculator:
         return results
 
     @staticmethod
-    def __get_critical_nms(
-        boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]], cross_class_nms: bool = False
-    ) -> List[List[float]]:
+    def __get_critical_nms(boxes_per_image: List[np.ndarray], cross_class_nms: bool = False) -> List[List[float]]:
         """Return list of critical NMS values for each box in each image.
 
         Maps each predicted box to the highest nms-threshold which would suppress that box, aka the smallest
@@ -504,107 +730,69 @@ class _FMeasureCalculator:
         other box of the same class and higher confidence score.
 
         Args:
-            boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]): List of predicted boxes per
-                image.
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
+            boxes_per_image (List[np.ndarray]): List of predicted boxes per image, structured arrays of BOX_DTYPE.
             cross_class_nms (bool): Whether to use cross class NMS.
 
         Returns:
             List[List[float]]: List of critical NMS values for each box in each image.
         """
-        critical_nms_per_image = []
+        critical_nms_per_image: List[List[float]] = []
         for boxes in boxes_per_image:
-            critical_nms_per_box = []
-            for box1 in boxes:
-                highest_losing_iou = 0.0
-                for box2 in boxes:
-                    iou = bounding_box_intersection_over_union(box1, box2)
-                    if (
-                        (cross_class_nms or box1[FMeasure.box_class_index] == box2[FMeasure.box_class_index])
-                        # TODO boxes Tuple should be refactored to dataclass.
-                        and box1[FMeasure.box_score_index] < box2[FMeasure.box_score_index]  # type: ignore[operator]
-                        and iou > highest_losing_iou
-                    ):
-                        highest_losing_iou = iou
-                critical_nms_per_box.append(highest_losing_iou)
-            critical_nms_per_image.append(critical_nms_per_box)
+            if len(boxes) == 0:
+                critical_nms_per_image.append([])
+                continue
+            iou = get_iou_matrix(boxes, boxes)
+            losing = boxes["score"][:, None] < boxes["score"][None, :]
+            if not cross_class_nms:
+                losing &= boxes["class_id"][:, None] == boxes["class_id"][None, :]
+            highest_losing_iou = np.where(losing, iou, 0.0).max(axis=1)
+            critical_nms_per_image.append(highest_losing_iou.tolist())
         return critical_nms_per_image
 
     @staticmethod
     def __filter_nms(
-        boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]],
-        critical_nms: List[List[float]],
-        nms_threshold: float,
-    ) -> List[List[Tuple[float, float, float, float, str, float]]]:
+        boxes_per_image: List[np.ndarray], critical_nms: List[List[float]], nms_threshold: float
+    ) -> List[np.ndarray]:
         """Filters out predicted boxes whose critical nms is higher than the given nms_threshold.
 
         Args:
-            boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]): List of boxes per image.
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
+            boxes_per_image (List[np.ndarray]): List of boxes per image, structured arrays of BOX_DTYPE.
             critical_nms (List[List[float]]): List of list of critical nms for each box in each image
             nms_threshold (float): NMS threshold used for filtering
 
         Returns:
-            List[List[Tuple[float, float, float, float, str, float]]]: List of list of filtered boxes in each image
+            List[np.ndarray]: List of filtered boxes in each image
         """
-        new_boxes_per_image = []
-        for boxes, boxes_nms in zip(boxes_per_image, critical_nms):
-            new_boxes = []
-            for box, nms in zip(boxes, boxes_nms):
-                if nms < nms_threshold:
-                    new_boxes.append(box)
-            new_boxes_per_image.append(new_boxes)
-        return new_boxes_per_image
+        return [
+            boxes[np.asarray(boxes_nms, dtype=float) < nms_threshold]
+            for boxes, boxes_nms in zip(boxes_per_image, critical_nms)
+        ]
 
     @staticmethod
-    def __filter_class(
-        boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]], class_name: str
-    ) -> List[List[Tuple[float, float, float, float, str, float]]]:
+    def __filter_class(boxes_per_image: List[np.ndarray], class_id: int) -> List[np.ndarray]:
         """Filters boxes to only keep members of one class.
 
         Args:
-            boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]): a list of lists of boxes
-            class_name (str): Name of the class for which the boxes are filtered
+            boxes_per_image (List[np.ndarray]): List of boxes per image, structured arrays of BOX_DTYPE.
+            class_id (int): Id of the class for which the boxes are filtered
 
         Returns:
-            List[List[Tuple[float, float, float, float, str, float]]]: a list of lists of boxes
+            List[np.ndarray]: List of filtered boxes in each image
         """
-        filtered_boxes_per_image = []
-        for boxes in boxes_per_image:
-            filtered_boxes = []
-            for box in boxes:
-                # TODO boxes Tuple should be refactored to dataclass. This way we can access box.class
-                if box[FMeasure.box_class_index].lower() == class_name.lower():  # type: ignore[union-attr]
-                    filtered_boxes.append(box)
-            filtered_boxes_per_image.append(filtered_boxes)
-        return filtered_boxes_per_image
+        return [boxes[boxes["class_id"] == class_id] for boxes in boxes_per_image]
 
     @staticmethod
-    def __filter_confidence(
-        boxes_per_image: List[List[Tuple[float, float, float, float, str, float]]], confidence_threshold: float
-    ) -> List[List[Tuple[float, float, float, float, str, float]]]:
+    def __filter_confidence(boxes_per_image: List[np.ndarray], confidence_threshold: float) -> List[np.ndarray]:
         """Filters boxes to only keep ones with higher confidence than a given confidence threshold.
 
         Args:
-            boxes_per_image (List[List[Tuple[float, float, float, float, str, float]]]):
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
+            boxes_per_image (List[np.ndarray]): List of boxes per image, structured arrays of BOX_DTYPE.
             confidence_threshold (float): Confidence threshold
 
         Returns:
-            List[List[Tuple[float, float, float, float, str, float]]]: Boxes with higher confidence than the given
-                threshold.
+            List[np.ndarray]: Boxes with higher confidence than the given threshold.
         """
-        filtered_boxes_per_image = []
-        for boxes in boxes_per_image:
-            filtered_boxes = []
-            for box in boxes:
-                if float(box[FMeasure.box_score_index]) > confidence_threshold:
-                    filtered_boxes.append(box)
-            filtered_boxes_per_image.append(filtered_boxes)
-        return filtered_boxes_per_image
+        return [boxes[boxes["score"] > confidence_threshold] for boxes in boxes_per_image]
 
     def get_counters(self, iou_threshold: float) -> _ResultCounters:
         """Return counts of true positives, false positives and false negatives for a given iou threshold.
@@ -678,9 +866,13 @@ class FMeasure(IPerformanceProvider):
 
         labels = resultset.model.configuration.get_label_schema().get_labels(include_empty=False)
         classes = [label.name for label in labels]
+        class_ids: Dict[str, int] = {}
+        for label in labels:
+            class_ids.setdefault(label.name.lower(), len(class_ids))
         boxes_pair = _FMeasureCalculator(
-            FMeasure.__get_boxes_from_dataset_as_list(ground_truth_dataset, labels),
-            FMeasure.__get_boxes_from_dataset_as_list(prediction_dataset, labels),
+            FMeasure.__get_boxes_from_dataset_as_arrays(ground_truth_dataset, class_ids),
+            FMeasure.__get_boxes_from_dataset_as_arrays(prediction_dataset, class_ids),
+            class_ids=class_ids,
         )
         result = boxes_pair.evaluate_detections(
             result_based_nms_threshold=vary_nms_threshold,
@@ -816,43 +1008,40 @@ class FMeasure(IPerformanceProvider):
         return Performance(score=score, dashboard_metrics=dashboard_metrics)
 
     @staticmethod
-    def __get_boxes_from_dataset_as_list(
-        dataset: DatasetEntity, labels: List[LabelEntity]
-    ) -> List[List[Tuple[float, float, float, float, str, float]]]:
-        """Return list of boxes from dataset.
+    def __get_boxes_from_dataset_as_arrays(dataset: DatasetEntity, class_ids: Dict[str, int]) -> List[np.ndarray]:
+        """Return the boxes of each item in the dataset as a structured array of BOX_DTYPE.
 
         Explanation of output shape:
-            a box: [x1: float, y1, x2, y2, class: str, score: float]
-            boxes_per_image: [box1, box2, …]
+            a box: (x1: float, y1, x2, y2, class_id: int, score: float)
+            boxes_per_image: structured array of BOX_DTYPE with one record per box
             ground_truth_boxes_per_image: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
 
         Args:
             dataset (DatasetEntity): Dataset to get boxes from.
-            labels (List[LabelEntity]): Labels to get boxes for.
+            class_ids (Dict[str, int]): Mapping from the lower case names of the labels to get boxes for to class ids.
 
         Returns:
-            List[List[Tuple[float, float, float, float, str, float]]]: List of boxes for each image in the dataset.
+            List[np.ndarray]: Boxes for each image in the dataset.
         """
         boxes_per_image = []
         converted_types_to_box = set()
-        label_names = {label.name for label in labels}
         for item in dataset:
-            boxes: List[Tuple[float, float, float, float, str, float]] = []
+            records: List[Tuple[float, float, float, float, int, float]] = []
             roi_as_box = Annotation(ShapeFactory.shape_as_rectangle(item.roi.shape), labels=[])
             for annotation in item.annotation_scene.annotations:
+                class_records = [
+                    (class_ids[label.name.lower()], label.probability)
+                    for label in annotation.get_labels()
+                    if label.name.lower() in class_ids
+                ]
+                if len(class_records) == 0:
+                    continue
                 shape_as_box = ShapeFactory.shape_as_rectangle(annotation.shape)
                 box = shape_as_box.normalize_wrt_roi_shape(roi_as_box.shape)
-                n_boxes_before = len(boxes)
-                boxes.extend(
-                    [
-                        (box.x1, box.y1, box.x2, box.y2, label.name, label.probability)
-                        for label in annotation.get_labels()
-                        if label.name in label_names
-                    ]
-                )
-                if not isinstance(annotation.shape, Rectangle) and len(boxes) > n_boxes_before:
+                records.extend((box.x1, box.y1, box.x2, box.y2, class_id, score) for class_id, score in class_records)
+                if not isinstance(annotation.shape, Rectangle):
                     converted_types_to_box.add(annotation.shape.__class__.__name__)
-            boxes_per_image.append(boxes)
+            boxes_per_image.append(np.array(records, dtype=BOX_DTYPE))
         if len(converted_types_to_box) > 0:
             logger.warning(
                 f"The shapes of types {tuple(converted_types_to_box)} have been converted to their "
@@ -16,6 +16,7 @@ from otx.api.usecases.exportable_code.demo.demo_package import (
     ChainExecutor,
     ModelContainer,
     SyncExecutor,
+    ThroughputExecutor,
     create_visualizer,
 )
 
@@ -52,8 +53,9 @@ def build_argparser():
     args.add_argument(
         "-it",
         "--inference_type",
-        help="Optional. Type of inference for single model.",
-        choices=["sync", "async"],
+        help="Optional. Type of inference for single model. The throughput type pipelines the frames "
+        "through decoding, inference and rendering stages, and reports the latency of each stage.",
+        choices=["sync", "async", "throughput"],
         default="sync",
         type=str,
     )
@@ -78,6 +80,14 @@ def build_argparser():
         default="CPU",
         type=str,
     )
+    args.add_argument(
+        "-nireq",
+        "--num_requests",
+        help="Optional. Number of infer requests for the throughput inference type. "
+        "Default value 0 uses the optimal number of the device.",
+        default=0,
+        type=int,
+    )
     args.add_argument(
         "--output",
         default=None,
@@ -92,6 +102,7 @@ EXECUTORS = {
     "sync": SyncExecutor,
     "async": AsyncExecutor,
     "chain": ChainExecutor,
+    "throughput": ThroughputExecutor,
 }
 
 
@@ -113,7 +124,12 @@ def main():
     # create models
     models = []
     for model_dir in args.models:
-        model = ModelContainer(model_dir, device=args.device)
+        if args.inference_type == "throughput":
+            model = ModelContainer(
+                model_dir, device=args.device, num_requests=args.num_requests, performance_hint="THROUGHPUT"
+            )
+        else:
+            model = ModelContainer(model_dir, device=args.device)
         models.append(model)
 
     inferencer = get_inferencer_class(args.inference_type, models)
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-from .executors import AsyncExecutor, ChainExecutor, SyncExecutor
+from .executors import AsyncExecutor, ChainExecutor, SyncExecutor, ThroughputExecutor
 from .model_container import ModelContainer
 from .utils import create_output_converter, create_visualizer
 
@@ -12,6 +12,7 @@ __all__ = [
     "SyncExecutor",
     "AsyncExecutor",
     "ChainExecutor",
+    "ThroughputExecutor",
     "create_output_converter",
     "create_visualizer",
     "ModelContainer",
@@ -7,9 +7,11 @@
 from .asynchronous import AsyncExecutor
 from .sync_pipeline import ChainExecutor
 from .synchronous import SyncExecutor
+from .throughput import ThroughputExecutor
 
 __all__ = [
     "SyncExecutor",
     "AsyncExecutor",
     "ChainExecutor",
+    "ThroughputExecutor",
 ]
@@ -0,0 +1,240 @@
+"""Throughput executor based on ModelAPI."""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from otx.api.usecases.exportable_code.demo.demo_package.model_container import (
+    ModelContainer,
+)
+from otx.api.usecases.exportable_code.demo.demo_package.utils import (
+    create_output_converter,
+)
+from otx.api.usecases.exportable_code.streamer import ThreadedStreamer, get_streamer
+from otx.api.usecases.exportable_code.visualizers import Visualizer
+from otx.api.utils.vis_utils import dump_frames
+
+
+class StageMetrics:
+    """Thread-safe latency of the stages of the pipeline and its end-to-end throughput."""
+
+    STAGES = ("decode", "preprocess", "inference", "postprocess", "render")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._total_time: Dict[str, float] = defaultdict(float)
+        self._count: Dict[str, int] = defaultdict(int)
+        self._start_time = time.perf_counter()
+        self._end_time: Optional[float] = None
+        self.num_frames = 0
+
+    def update(self, stage: str, start_time: float) -> None:
+        """Add the latency of a stage which started at start_time."""
+        elapsed = time.perf_counter() - start_time
+        with self._lock:
+            self._total_time[stage] += elapsed
+            self._count[stage] += 1
+
+    def start(self) -> None:
+        """Start measuring the end-to-end throughput."""
+        self._start_time = time.perf_counter()
+        self._end_time = None
+        self.num_frames = 0
+
+    def stop(self) -> None:
+        """Stop measuring the end-to-end throughput."""
+        self._end_time = time.perf_counter()
+
+    def get_latency(self, stage: str) -> Optional[float]:
+        """Returns the mean latency of the stage in seconds."""
+        with self._lock:
+            if not self._count[stage]:
+                return None
+            return self._total_time[stage] / self._count[stage]
+
+    def get_fps(self) -> Optional[float]:
+        """Returns the number of rendered frames per second."""
+        elapsed = (self._end_time or time.perf_counter()) - self._start_time
+        return self.num_frames / elapsed if elapsed > 0 and self.num_frames else None
+
+    def report(self) -> str:
+        """Returns the metrics report."""
+        lines = ["Metrics report:"]
+        for stage in self.STAGES:
+            latency = self.get_latency(stage)
+            lines.append(f"\t{stage} latency: " + (f"{latency * 1e3:.1f} ms" if latency is not None else "N/A"))
+        fps = self.get_fps()
+        lines.append("\tFPS: " + (f"{fps:.1f}" if fps is not None else "N/A"))
+        return "\n".join(lines)
+
+
+class _FrameState:
+    """Inference state of a frame whose inputs are inferred on different infer requests.
+
+    Args:
+        frame_id (int): index of the frame in the stream
+        frame (np.ndarray): image
+        num_inputs (int): number of model inputs of the frame
+    """
+
+    def __init__(self, frame_id: int, frame: np.ndarray, num_inputs: int) -> None:
+        self.frame_id = frame_id
+        self.frame = frame
+        self.coords: List[Optional[List[int]]] = [None] * num_inputs
+        self.preprocess_metas: List[Optional[dict]] = [None] * num_inputs
+        self.raw_results: List[Any] = [None] * num_inputs
+        self.error: Optional[Exception] = None
+        self.infer_start_time = 0.0
+        self.inferred = threading.Event()
+        self._remaining = num_inputs
+        self._lock = threading.Lock()
+
+    def set_raw_result(self, index: int, raw_result: Any, error: Optional[Exception] = None) -> None:
+        """Store the raw result of an input, the frame is inferred after the last one."""
+        self.raw_results[index] = raw_result
+        with self._lock:
+            if error is not None and self.error is None:
+                self.error = error
+            self._remaining -= 1
+            if self._remaining == 0:
+                self.inferred.set()
+
+
+class ThroughputExecutor:
+    """Throughput executor pipelining the frames through decoding, inference and rendering stages.
+
+    The frames are decoded on a thread, the inputs of consecutive frames (their tiles if tiling is enabled)
+    share the infer requests of the model, and the predictions are postprocessed and drawn by a pool of workers
+    while the main thread shows the frames in their input order. At most max_queue_size frames are in flight.
+
+    Args:
+        model (ModelContainer): model for inference, created with the number of infer requests to use
+        visualizer (Visualizer): visualizer of inference results
+        num_workers (int): number of workers postprocessing and drawing the predictions. Defaults to 2.
+        max_queue_size (Optional[int]): maximum number of frames in flight. Defaults to None,
+            twice the number of infer requests.
+    """
+
+    def __init__(
+        self,
+        model: ModelContainer,
+        visualizer: Visualizer,
+        num_workers: int = 2,
+        max_queue_size: Optional[int] = None,
+    ) -> None:
+        self.model = model
+        self.core_model = model.core_model
+        self.visualizer = visualizer
+        self.converter = create_output_converter(model.task_type, model.labels, model.model_parameters)
+        self.num_workers = num_workers
+        num_requests = len(self.core_model.inference_adapter.async_queue)
+        self.max_queue_size = max_queue_size if max_queue_size else 2 * num_requests
+        self.core_model.inference_adapter.set_callback(self._on_inferred)
+        self.metrics = StageMetrics()
+
+    def _on_inferred(self, request: Any, callback_args: Tuple[_FrameState, int]) -> None:
+        """Callback of the infer requests storing the raw result of an input."""
+        state, index = callback_args
+        try:
+            state.set_raw_result(index, self.core_model.inference_adapter.copy_raw_result(request))
+        except Exception as error:  # pylint: disable=broad-except
+            state.set_raw_result(index, None, error)
+
+    def submit(self, frame_id: int, frame: np.ndarray) -> _FrameState:
+        """Preprocess the inputs of the frame and start their inference.
+
+        It blocks while all the infer requests are busy.
+        """
+        start_time = time.perf_counter()
+        inputs = self.model.split(frame)
+        state = _FrameState(frame_id, frame, len(inputs))
+        preprocessed_inputs = []
+        for index, (input_data, coord) in enumerate(inputs):
+            preprocessed_input, state.preprocess_metas[index] = self.core_model.preprocess(input_data)
+            state.coords[index] = coord
+            preprocessed_inputs.append(preprocessed_input)
+        self.metrics.update("preprocess", start_time)
+
+        state.infer_start_time = time.perf_counter()
+        for index, preprocessed_input in enumerate(preprocessed_inputs):
+            self.core_model.infer_async_raw(preprocessed_input, (state, index))
+        return state
+
+    def render_result(self, state: _FrameState) -> np.ndarray:
+        """Wait for the inference of the frame, then postprocess and draw its predictions.
+
+        It is called within the tile_postprocessing context of the model.
+        """
+        state.inferred.wait()
+        self.metrics.update("inference", state.infer_start_time)
+        if state.error is not None:
+            raise state.error
+
+        start_time = time.perf_counter()
+        predictions = [
+            self.core_model.postprocess(raw_result, meta)
+            for raw_result, meta in zip(state.raw_results, state.preprocess_metas)
+        ]
+        predictions, frame_meta = self.model.merge(state.frame, predictions, state.coords)
+        annotation_scene = self.converter.convert_to_annotation(predictions, frame_meta)
+        output = self.visualizer.draw(state.frame, annotation_scene, frame_meta)
+        self.metrics.update("postprocess", start_time)
+        return output
+
+    def run(self, input_stream: Union[int, str], loop: bool = False) -> None:
+        """Run demo using input stream (image, video stream, camera)."""
+        streamer = get_streamer(input_stream, loop)
+        saved_frames = []
+        pending: Deque[Future] = deque()
+        stop_visualization = False
+
+        def show_next() -> None:
+            nonlocal stop_visualization
+            output = pending.popleft().result()
+            start_time = time.perf_counter()
+            self.visualizer.show(output)
+            if self.visualizer.output:
+                saved_frames.append(output)
+            if self.visualizer.is_quit():
+                stop_visualization = True
+            self.metrics.num_frames += 1
+            self.metrics.update("render", start_time)
+            # visualize video not faster than the original FPS
+            self.visualizer.video_delay(time.perf_counter() - start_time, streamer)
+
+        self.metrics.start()
+        # the postprocessing mode of the model is shared by the workers, so it is set for the whole run
+        with self.model.tile_postprocessing(), ThreadPoolExecutor(max_workers=max(self.num_workers, 1)) as workers:
+            frames = iter(ThreadedStreamer(streamer, buffer_size=self.max_queue_size, mode="thread"))
+            frame_id = 0
+            try:
+                while not stop_visualization:
+                    start_time = time.perf_counter()
+                    frame = next(frames, None)
+                    if frame is None:
+                        break
+                    self.metrics.update("decode", start_time)
+                    state = self.submit(frame_id, frame)
+                    pending.append(workers.submit(self.render_result, state))
+                    frame_id += 1
+                    # show the frames which are ready, and wait for the oldest one if too many are in flight
+                    while pending and (pending[0].done() or len(pending) >= self.max_queue_size):
+                        show_next()
+                while pending and not stop_visualization:
+                    show_next()
+            finally:
+                frames.close()  # type: ignore[attr-defined]
+                self.core_model.await_all()
+                for future in pending:
+                    future.cancel()
+        self.metrics.stop()
+
+        dump_frames(saved_frames, self.visualizer.output, input_stream, streamer)
+        print(self.metrics.report())
@@ -5,12 +5,13 @@
 
 import importlib
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, Tuple, Union
+from typing import Any, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 from openvino.model_api.adapters import OpenvinoAdapter, create_core
-from openvino.model_api.models import ImageModel, Model
+from openvino.model_api.models import ImageModel, MaskRCNNModel, Model
 from openvino.model_api.tilers import DetectionTiler, InstanceSegmentationTiler
 
 from otx.api.entities.label_schema import LabelSchemaEntity
@@ -26,10 +27,23 @@ class ModelContainer:
 
     Args:
         model_dir (Path): path to model directory
+        device (str): device to run model on. Defaults to "CPU".
+        num_requests (int): number of infer requests, 0 uses the optimal number of the device. Defaults to 0.
+        performance_hint (Optional[str]): OpenVINO performance hint, "LATENCY" or "THROUGHPUT", which sets the
+            number of streams of the device. Defaults to None, the default of the device.
     """
 
-    def __init__(self, model_dir: Path, device="CPU") -> None:
-        model_adapter = OpenvinoAdapter(create_core(), get_model_path(model_dir / "model.xml"), device=device)
+    def __init__(
+        self, model_dir: Path, device="CPU", num_requests: int = 0, performance_hint: Optional[str] = None
+    ) -> None:
+        plugin_config = {"PERFORMANCE_HINT": performance_hint} if performance_hint else None
+        model_adapter = OpenvinoAdapter(
+            create_core(),
+            get_model_path(model_dir / "model.xml"),
+            device=device,
+            plugin_config=plugin_config,
+            max_num_requests=num_requests,
+        )
 
         try:
             config_data = model_adapter.model.get_rt_info(["otx_config"])
@@ -142,6 +156,59 @@ class ModelContainer:
         detections = self.tiler(frame)
         return detections, {"original_shape": frame.shape}
 
+    def split(self, frame: np.ndarray) -> List[Tuple[np.ndarray, Optional[List[int]]]]:
+        """Split the frame into the inputs of the model for the asynchronous inference.
+
+        Args:
+            frame (np.ndarray): image
+        Returns:
+            List: model inputs with their tile coordinates, the frame without coordinates if tiling is disabled
+        """
+        if not self.tiler:
+            return [(frame, None)]
+        # pylint: disable=protected-access
+        tile_coords = self.tiler._tile(frame)
+        tile_coords = self.tiler._filter_tiles(frame, tile_coords)
+        return [(self.tiler._crop_tile(frame, coord), coord) for coord in tile_coords]
+
+    @contextmanager
+    def tile_postprocessing(self) -> Iterator[None]:
+        """Context in which the core model postprocesses the predictions of the inputs returned by split.
+
+        As in InstanceSegmentationTiler.__call__, MaskRCNN masks are not pasted into the tiles, merge pastes them
+        into the frame.
+        """
+        if not isinstance(self.tiler, InstanceSegmentationTiler) or not isinstance(self.core_model, MaskRCNNModel):
+            yield
+            return
+        postprocess_semantic_masks = self.core_model.postprocess_semantic_masks
+        self.core_model.postprocess_semantic_masks = False
+        try:
+            yield
+        finally:
+            self.core_model.postprocess_semantic_masks = postprocess_semantic_masks
+
+    def merge(self, frame: np.ndarray, predictions: List[Any], coords: List[Optional[List[int]]]) -> Tuple[Any, dict]:
+        """Merge the postprocessed predictions of the inputs returned by split into the prediction of the frame.
+
+        Args:
+            frame (np.ndarray): image
+            predictions (List): predictions of the inputs, postprocessed within tile_postprocessing
+            coords (List): tile coordinates of the inputs
+        Returns:
+            annotation_scene (AnnotationScene): prediction
+            frame_meta (Dict): dict with original shape
+        """
+        frame_meta = {"original_shape": frame.shape}
+        if not self.tiler:
+            prediction = predictions[0]
+            if self._task_type == TaskType.DETECTION:
+                prediction = detection2array(prediction.objects)
+            return prediction, frame_meta
+        # pylint: disable=protected-access
+        tile_results = [self.tiler._postprocess_tile(pred, coord) for pred, coord in zip(predictions, coords)]
+        return self.tiler._merge_results(tile_results, frame.shape), frame_meta
+
     def __call__(self, input_data: np.ndarray) -> Tuple[Any, dict]:
         """Infer entry wrapper."""
         if self.tiler:
@@ -5,12 +5,15 @@
 #
 
 import abc
+import itertools
 import multiprocessing
 import os
 import queue
 import sys
+import threading
 from enum import Enum
-from typing import Iterator, Union
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -67,24 +70,162 @@ class BaseStreamer(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
 
-def _process_run(streamer: BaseStreamer, buffer: multiprocessing.Queue) -> None:
-    """Private function that is run by the thread.
+class _SharedFrameRing:
+    """Ring buffer of frames in shared memory for handing frames over from a child process.
+
+    The shared memory is allocated by the consumer with a fixed number of slots sized from the first frame, which is
+    sent through the overflow queue. The producer waits for a free slot, writes the frame and its shape in the slot
+    and signals it as filled, the consumer reads the slots in the same order and frees them again.
+    Frames which do not fit in a slot are sent through the overflow queue instead.
+
+    Args:
+        num_slots (int): Number of frame slots.
+    """
 
-    Waits for the buffer to gain space for timeout seconds while it is full.
-    If no space was available within this time the function will exit
+    # Slot header of int64 values: status, number of dimensions and up to 6 dimensions
+    _HEADER_SIZE = 8
+    _HEADER_NBYTES = _HEADER_SIZE * 8
+    _MAX_NDIM = _HEADER_SIZE - 2
+    _FRAME, _OVERFLOW, _END = 1, 2, 3
+
+    def __init__(self, num_slots: int) -> None:
+        self.num_slots = max(num_slots, 1)
+        self.free_slots = multiprocessing.Semaphore(self.num_slots)
+        self.filled_slots = multiprocessing.Semaphore(0)
+        self.overflow: multiprocessing.Queue = multiprocessing.Queue()
+        self.setup: multiprocessing.Queue = multiprocessing.Queue()
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.dtype = np.dtype(np.uint8)
+        self.slot_nbytes = 0
+        self.position = 0
+
+    def allocate(self, frame: np.ndarray) -> None:
+        """Allocates the slots for frames like the given one and sends them to the producer."""
+        self.dtype = frame.dtype
+        self.slot_nbytes = -(-frame.nbytes // self._HEADER_NBYTES) * self._HEADER_NBYTES
+        size = self.num_slots * (self._HEADER_NBYTES + self.slot_nbytes)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.setup.put((self.shm.name, self.dtype.str, self.slot_nbytes))
+
+    def attach(self) -> bool:
+        """Attaches the producer to the slots allocated by the consumer, returns False if the consumer stopped."""
+        setup = self.setup.get()
+        if setup is None:
+            return False
+        name, dtype, self.slot_nbytes = setup
+        self.dtype = np.dtype(dtype)
+        self.shm = shared_memory.SharedMemory(name=name)
+        return True
+
+    def _slot(self, position: int) -> Tuple[np.ndarray, int]:
+        """Returns the header and the data offset of the slot at the position."""
+        assert self.shm is not None
+        offset = (position % self.num_slots) * (self._HEADER_NBYTES + self.slot_nbytes)
+        header: np.ndarray = np.ndarray((self._HEADER_SIZE,), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        return header, offset + self._HEADER_NBYTES
+
+    def put(self, frame: Optional[np.ndarray]) -> None:
+        """Writes the frame in the next slot, None marks the end of the stream."""
+        self.free_slots.acquire()
+        header, offset = self._slot(self.position)
+        if frame is None:
+            header[0] = self._END
+        elif frame.dtype == self.dtype and frame.nbytes <= self.slot_nbytes and frame.ndim <= self._MAX_NDIM:
+            header[0] = self._FRAME
+            header[1] = frame.ndim
+            header[2 : 2 + frame.ndim] = frame.shape
+            data = np.ndarray(frame.shape, dtype=self.dtype, buffer=self.shm.buf, offset=offset)  # type: ignore
+            data[...] = frame
+        else:
+            header[0] = self._OVERFLOW
+            self.overflow.put(frame)
+        self.position += 1
+        self.filled_slots.release()
+
+    def get(self, timeout: float) -> Optional[np.ndarray]:
+        """Reads the frame of the next slot, returns None at the end of the stream.
+
+        Raises:
+            queue.Empty: If no slot was filled within timeout seconds.
+        """
+        if not self.filled_slots.acquire(timeout=timeout):
+            raise queue.Empty
+        header, offset = self._slot(self.position)
+        frame: Optional[np.ndarray]
+        if header[0] == self._END:
+            frame = None
+        elif header[0] == self._OVERFLOW:
+            frame = self.overflow.get()
+        else:
+            shape = tuple(header[2 : 2 + header[1]].tolist())
+            # Copy out of the slot so that the frame stays valid after the slot is reused
+            frame = np.ndarray(shape, dtype=self.dtype, buffer=self.shm.buf, offset=offset).copy()  # type: ignore
+        self.position += 1
+        self.free_slots.release()
+        return frame
+
+    def close(self, unlink: bool = False) -> None:
+        """Releases the slots, they are removed if unlink is True."""
+        if self.shm is None:
+            # Unblock the producer waiting for the slots
+            self.setup.put(None)
+            return
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+        self.shm = None
+
+
+def _process_run(streamer: BaseStreamer, buffer: _SharedFrameRing) -> None:
+    """Private function that is run by the process.
+
+    The first frame is sent through the overflow queue so that the consumer can allocate the slots of the
+    ring buffer, the remaining frames are written into the slots.
 
     streamer (BaseStreamer): The streamer to retrieve frames from
-    buffer (multiprocessing.Queue): The buffer to place the retrieved frames in
+    buffer (_SharedFrameRing): The buffer to place the retrieved frames in
     """
-    for frame in streamer:
-        buffer.put(frame)
+    frames = iter(streamer)
+    first_frame = next(frames, None)
+    buffer.overflow.put(first_frame)
+    if first_frame is None or not buffer.attach():
+        return
+    try:
+        for frame in frames:
+            buffer.put(frame)
+        buffer.put(None)
+    finally:
+        buffer.close()
+
+
+def _thread_run(streamer: BaseStreamer, buffer: queue.Queue, stop: threading.Event) -> None:
+    """Private function that is run by the thread.
+
+    streamer (BaseStreamer): The streamer to retrieve frames from
+    buffer (queue.Queue): The buffer to place the retrieved frames in, None marks the end of the stream
+    stop (threading.Event): Stops the thread when it is set
+    """
+    for frame in itertools.chain(streamer, [None]):
+        while not stop.is_set():
+            try:
+                buffer.put(frame, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        if stop.is_set():
+            return
 
 
 class ThreadedStreamer(BaseStreamer):
-    """Runs a BaseStreamer on a separate thread.
+    """Runs a BaseStreamer on a separate process or thread.
+
+    In the "process" mode the frames are handed over through a ring buffer in shared memory, the slots of which are
+    sized from the first frame. The "thread" mode runs the streamer on a thread of this process without copying the
+    frames, it suits the streamers which release the GIL while decoding like the OpenCV ones.
 
     streamer (BaseStreamer): The streamer to run on a thread
     buffer_size (int): Number of frame to buffer internally. Defaults to 2.
+    mode (str): Either "process" or "thread". Defaults to "process".
 
     Example:
         >>> streamer = VideoStreamer(path="../demo.mp4")
@@ -93,9 +234,12 @@ class ThreadedStreamer(BaseStreamer):
         ...    pass
     """
 
-    def __init__(self, streamer: BaseStreamer, buffer_size: int = 2) -> None:
+    def __init__(self, streamer: BaseStreamer, buffer_size: int = 2, mode: str = "process") -> None:
+        if mode not in ("process", "thread"):
+            raise ValueError(f"{mode} is unknown mode of ThreadedStreamer, use process or thread.")
         self.buffer_size = buffer_size
         self.streamer = streamer
+        self.mode = mode
 
     def __iter__(self) -> Iterator[np.ndarray]:
         """Get frames from streamer and yield them.
@@ -103,26 +247,80 @@ class ThreadedStreamer(BaseStreamer):
         Yields:
             Iterator[np.ndarray]: Yield the image or video frame.
         """
-        buffer: multiprocessing.Queue = multiprocessing.Queue(maxsize=self.buffer_size)
-        process = multiprocessing.Process(target=_process_run, args=(self.streamer, buffer))
+        if self.mode == "thread":
+            yield from self._iter_thread()
+        else:
+            yield from self._iter_process()
+
+    def _iter_thread(self) -> Iterator[np.ndarray]:
+        """Yield the frames of the streamer running on a thread."""
+        buffer: queue.Queue = queue.Queue(maxsize=max(self.buffer_size, 1))
+        stop = threading.Event()
+        thread = threading.Thread(target=_thread_run, args=(self.streamer, buffer, stop))
         # Make thread a daemon so that it will exit when the main program exits as well
+        thread.daemon = True
+        thread.start()
+
+        try:
+            while True:
+                try:
+                    frame = buffer.get(timeout=0.1)
+                except queue.Empty:
+                    if not thread.is_alive():
+                        break
+                    continue
+                if frame is None:
+                    break
+                yield frame
+        finally:
+            stop.set()
+            thread.join(timeout=0.1)
+
+    def _iter_process(self) -> Iterator[np.ndarray]:
+        """Yield the frames of the streamer running on a process through the shared memory."""
+        buffer = _SharedFrameRing(self.buffer_size)
+        # Share the resource tracker with the process so that the shared memory it attaches to is not seen as leaked
+        resource_tracker.ensure_running()
+        process = multiprocessing.Process(target=_process_run, args=(self.streamer, buffer))
+        # Make process a daemon so that it will exit when the main program exits as well
         process.daemon = True
         process.start()
 
         try:
-            while process.is_alive() or not buffer.empty():
+            # The first frame comes through the queue to size the shared memory
+            first_frame = None
+            while process.is_alive() or not buffer.overflow.empty():
                 try:
-                    yield buffer.get(timeout=0.1)
+                    first_frame = buffer.overflow.get(timeout=0.1)
+                    break
                 except queue.Empty:
                     pass
+            if first_frame is None:
+                return
+            buffer.allocate(first_frame)
+            yield first_frame
+
+            while True:
+                try:
+                    frame = buffer.get(timeout=0.1)
+                except queue.Empty:
+                    if process.is_alive():
+                        continue
+                    try:
+                        # Last frame which might have been put right before the process exited
+                        frame = buffer.get(timeout=0)
+                    except queue.Empty:
+                        break
+                if frame is None:
+                    break
+                yield frame
         except GeneratorExit:
             process.terminate()
         finally:
             process.join(timeout=0.1)
-            # The kill() function is only available in Python 3.7.
-            # Skip it if running an older Python version.
-            if sys.version_info >= (3, 7) and process.exitcode is None:
+            if process.exitcode is None:
                 process.kill()
+            buffer.close(unlink=True)
 
     def get_type(self) -> MediaType:
         """Get type of internal streamer.
@@ -312,6 +510,7 @@ def get_streamer(
     input_stream: Union[int, str] = 0,
     loop: bool = False,
     threaded: bool = False,
+    threaded_mode: str = "process",
 ) -> BaseStreamer:
     """Get streamer object based on the file path or camera device index provided.
 
@@ -319,6 +518,7 @@ def get_streamer(
         input_stream (Union[int, str]): Path to file or directory or index for camera.
         loop (bool): Enable reading the input in a loop. Defaults to False.
         threaded (bool): Run streaming on a separate thread. Threaded streaming option. Defaults to False.
+        threaded_mode (str): Run the threaded streaming on a "process" or a "thread". Defaults to "process".
 
     Returns:
         BaseStreamer: Streamer object.
@@ -330,14 +530,14 @@ def get_streamer(
         try:
             streamer = reader(input_stream, loop)  # type: ignore
             if threaded:
-                streamer = ThreadedStreamer(streamer)
+                streamer = ThreadedStreamer(streamer, mode=threaded_mode)
             return streamer
         except (InvalidInput, OpenError) as error:
             errors.append(error)
     try:
         streamer = CameraStreamer(input_stream)  # type: ignore
         if threaded:
-            streamer = ThreadedStreamer(streamer)
+            streamer = ThreadedStreamer(streamer, mode=threaded_mode)
         return streamer
     except (InvalidInput, OpenError) as error:
         errors.append(error)
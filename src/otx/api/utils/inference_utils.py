@@ -0,0 +1,313 @@
+"""Utils for the inference of large datasets in bounded memory."""
+
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import copy
+import glob
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from bson.objectid import ObjectId
+
+from otx.api.entities.annotation import (
+    Annotation,
+    AnnotationSceneEntity,
+    AnnotationSceneKind,
+)
+from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.id import ID
+from otx.api.entities.inference_parameters import InferenceParameters
+from otx.api.entities.label import Domain, LabelEntity
+from otx.api.entities.metadata import FloatMetadata, FloatType, IMetadata
+from otx.api.entities.result_media import ResultMediaEntity
+from otx.api.entities.scored_label import ScoredLabel
+from otx.api.entities.shapes.ellipse import Ellipse
+from otx.api.entities.shapes.polygon import Point, Polygon
+from otx.api.entities.shapes.rectangle import Rectangle
+from otx.api.entities.shapes.shape import ShapeType
+from otx.api.entities.tensor import TensorEntity
+from otx.api.usecases.tasks.interfaces.inference_interface import IInferenceTask
+
+# Kinds of the metadata items kept in the prediction shards
+_TENSOR, _RESULT_MEDIA, _FLOAT = 0, 1, 2
+
+
+def _get_label_key(label: LabelEntity) -> str:
+    """Returns the key of a label, its name if it has no ID."""
+    return str(label.id_) if label.id_ else label.name
+
+
+def _get_chunk_parameters(
+    inference_parameters: InferenceParameters, start: int, chunk_size: int, dataset_size: int
+) -> InferenceParameters:
+    """Returns the inference parameters of a chunk, whose progress is reported over the whole dataset."""
+    update_progress = inference_parameters.update_progress
+
+    def update_chunk_progress(progress: int, score: Optional[float] = None):
+        return update_progress(int((start + progress / 100 * chunk_size) / dataset_size * 100), score)
+
+    chunk_parameters = copy.copy(inference_parameters)
+    chunk_parameters.update_progress = update_chunk_progress
+    return chunk_parameters
+
+
+def stream_infer(
+    task: IInferenceTask,
+    dataset: DatasetEntity,
+    inference_parameters: Optional[InferenceParameters] = None,
+    chunk_size: int = 256,
+) -> Iterator[DatasetEntity]:
+    """Infer the dataset in chunks and yield the predicted chunks one by one.
+
+    Unlike ``task.infer(dataset.with_empty_annotations())``, the prediction items of a chunk are only created when
+    the chunk is inferred and their metadata list is not shared with the input items, so that the predictions,
+    saliency maps and representation vectors of a chunk are freed as soon as the caller drops it.
+    Peak memory then depends on the chunk size instead of the dataset size.
+
+    Example:
+        >>> store = PredictionStore("predictions", labels=label_schema.get_labels(include_empty=True))
+        >>> for predicted_chunk in stream_infer(task, dataset, InferenceParameters(), chunk_size=512):
+        ...     store.append(predicted_chunk)
+
+    Args:
+        task (IInferenceTask): Task to infer the dataset with.
+        dataset (DatasetEntity): Dataset to infer, its items are not modified.
+        inference_parameters (Optional[InferenceParameters]): Inference parameters, the progress is reported over
+            the whole dataset. Defaults to None.
+        chunk_size (int): Number of items inferred at once. Defaults to 256.
+
+    Yields:
+        DatasetEntity: Prediction items of the next chunk, in the order of the dataset.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size should be positive, got {chunk_size}.")
+    if inference_parameters is None:
+        inference_parameters = InferenceParameters()
+
+    dataset_size = len(dataset)
+    for start in range(0, dataset_size, chunk_size):
+        chunk: DatasetEntity = DatasetEntity(purpose=dataset.purpose)
+        for index in range(start, min(start + chunk_size, dataset_size)):
+            dataset_item = dataset[index]
+            roi = copy.copy(dataset_item.roi)
+            roi.id_ = ID(ObjectId())
+            roi.set_labels([])
+            chunk.append(
+                dataset_item.wrap(
+                    annotation_scene=AnnotationSceneEntity(annotations=[], kind=AnnotationSceneKind.PREDICTION),
+                    roi=roi,
+                    metadata=list(dataset_item.get_metadata()),
+                )
+            )
+        chunk_parameters = _get_chunk_parameters(inference_parameters, start, len(chunk), dataset_size)
+        yield task.infer(chunk, chunk_parameters)
+
+
+class PredictionStore:
+    """On-disk store of the predictions of a dataset, written as one compressed npz shard per chunk.
+
+    The annotations (rectangles, ellipses and polygons with their scored labels) and the tensor, result media and
+    float metadata of the items are kept as flat arrays, so that a shard is loaded without pickle.
+    Other metadata items (e.g. the video metadata of the inputs) are not stored.
+
+    Args:
+        path (str): Directory of the shards, created if it does not exist.
+        labels (Sequence[LabelEntity]): Labels of the predictions, to restore the stored labels. Labels which
+            are not in this list are restored from their stored name and domain. Defaults to ().
+        compress (bool): Whether the shards are compressed. Defaults to True.
+    """
+
+    def __init__(self, path: str, labels: Sequence[LabelEntity] = (), compress: bool = True):
+        self.path = path
+        self.labels = {_get_label_key(label): label for label in labels}
+        self.compress = compress
+        os.makedirs(path, exist_ok=True)
+        self._num_items = 0
+        for shard_path in self.get_shard_paths():
+            with np.load(shard_path, allow_pickle=False) as shard:
+                self._num_items += len(shard["item_index"])
+
+    def __len__(self) -> int:
+        """Returns the number of stored items."""
+        return self._num_items
+
+    def get_shard_paths(self) -> List[str]:
+        """Returns the paths of the shards in the order of the items."""
+        return sorted(glob.glob(os.path.join(self.path, "shard_*.npz")))
+
+    def _iter_shards(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Load the shards one by one."""
+        for shard_path in self.get_shard_paths():
+            with np.load(shard_path, allow_pickle=False) as shard:
+                yield dict(shard)
+
+    def append(self, predicted_dataset: DatasetEntity) -> str:
+        """Write the predictions of the items as a new shard, the items are numbered after the stored ones.
+
+        Args:
+            predicted_dataset (DatasetEntity): Predicted items, e.g. a chunk yielded by ``stream_infer``.
+
+        Returns:
+            str: Path of the shard.
+        """
+        label_index: Dict[str, int] = {}
+        label_table: List[LabelEntity] = []
+
+        def get_label_index(label: Optional[LabelEntity]) -> int:
+            if label is None:
+                return -1
+            key = _get_label_key(label)
+            if key not in label_index:
+                label_index[key] = len(label_table)
+                label_table.append(label)
+            return label_index[key]
+
+        annotation_item: List[int] = []
+        shape_type: List[int] = []
+        boxes: List[Tuple[float, float, float, float]] = []
+        num_points: List[int] = []
+        points: List[Tuple[float, float]] = []
+        label_annotation: List[int] = []
+        label_indices: List[int] = []
+        label_probability: List[float] = []
+        metadata_item: List[int] = []
+        metadata_kind: List[int] = []
+        metadata_names: List[str] = []
+        metadata_types: List[str] = []
+        metadata_label: List[int] = []
+        arrays: Dict[str, np.ndarray] = {}
+        for item_index, dataset_item in enumerate(predicted_dataset):
+            for annotation in dataset_item.get_annotations():
+                shape = annotation.shape
+                if isinstance(shape, Polygon):
+                    boxes.append((0.0, 0.0, 0.0, 0.0))
+                    num_points.append(len(shape.points))
+                    points.extend((point.x, point.y) for point in shape.points)
+                elif isinstance(shape, (Rectangle, Ellipse)):
+                    boxes.append((shape.x1, shape.y1, shape.x2, shape.y2))
+                    num_points.append(0)
+                else:
+                    raise TypeError(f"Unsupported shape {type(shape).__name__}.")
+                for scored_label in annotation.get_labels():
+                    label_annotation.append(len(annotation_item))
+                    label_indices.append(get_label_index(scored_label.label))
+                    label_probability.append(scored_label.probability)
+                annotation_item.append(item_index)
+                shape_type.append(int(shape.type))
+
+            for metadata in dataset_item.get_metadata():
+                data = metadata.data
+                if isinstance(data, TensorEntity):
+                    kind, data_type, label, array = _TENSOR, "", None, data.numpy
+                elif isinstance(data, ResultMediaEntity):
+                    kind, data_type, label, array = _RESULT_MEDIA, data.type, data.label, data.numpy
+                elif isinstance(data, FloatMetadata):
+                    kind, data_type, label, array = _FLOAT, data.float_type.name, None, np.array(data.value)
+                else:
+                    continue
+                arrays[f"metadata_{len(metadata_item)}"] = np.asarray(array)
+                metadata_item.append(item_index)
+                metadata_kind.append(kind)
+                metadata_names.append(data.name)
+                metadata_types.append(data_type)
+                metadata_label.append(get_label_index(label))
+
+        arrays.update(
+            item_index=np.arange(self._num_items, self._num_items + len(predicted_dataset), dtype=np.int64),
+            annotation_item=np.array(annotation_item, dtype=np.int64),
+            shape_type=np.array(shape_type, dtype=np.int8),
+            boxes=np.array(boxes, dtype=np.float64).reshape(-1, 4),
+            num_points=np.array(num_points, dtype=np.int64),
+            points=np.array(points, dtype=np.float64).reshape(-1, 2),
+            label_annotation=np.array(label_annotation, dtype=np.int64),
+            label_index=np.array(label_indices, dtype=np.int64),
+            label_probability=np.array(label_probability, dtype=np.float64),
+            label_ids=np.array([str(label.id_) if label.id_ else "" for label in label_table], dtype=str),
+            label_names=np.array([label.name for label in label_table], dtype=str),
+            label_domains=np.array([label.domain.name for label in label_table], dtype=str),
+            metadata_item=np.array(metadata_item, dtype=np.int64),
+            metadata_kind=np.array(metadata_kind, dtype=np.int8),
+            metadata_names=np.array(metadata_names, dtype=str),
+            metadata_types=np.array(metadata_types, dtype=str),
+            metadata_label=np.array(metadata_label, dtype=np.int64),
+        )
+        shard_path = os.path.join(self.path, f"shard_{len(self.get_shard_paths()):06d}.npz")
+        save = np.savez_compressed if self.compress else np.savez
+        save(shard_path, **arrays)
+        self._num_items += len(predicted_dataset)
+        return shard_path
+
+    def _get_label(self, shard: Dict[str, np.ndarray], index: int) -> Optional[LabelEntity]:
+        """Restore a label of the label table of the shard."""
+        if index < 0:
+            return None
+        label_id, name = str(shard["label_ids"][index]), str(shard["label_names"][index])
+        key = label_id or name
+        if key not in self.labels:
+            self.labels[key] = LabelEntity(
+                name=name,
+                domain=Domain[str(shard["label_domains"][index])],
+                id=ID(label_id) if label_id else None,
+            )
+        return self.labels[key]
+
+    def __iter__(self) -> Iterator[Tuple[int, AnnotationSceneEntity, List[IMetadata]]]:
+        """Iterate over the predictions of the items, one shard is loaded at a time.
+
+        Yields:
+            Tuple[int, AnnotationSceneEntity, List[IMetadata]]: Index of the item, its predicted annotations and
+                its metadata.
+        """
+        for shard in self._iter_shards():
+            labels = [self._get_label(shard, index) for index in range(len(shard["label_ids"]))]
+            points_ends: List[int] = np.cumsum(shard["num_points"]).tolist()
+            num_labels = np.bincount(shard["label_annotation"], minlength=len(shard["annotation_item"]))
+            label_ends: List[int] = np.cumsum(num_labels).tolist()
+
+            annotations: List[List[Annotation]] = [[] for _ in shard["item_index"]]
+            label_begin = 0
+            for index, item_index in enumerate(shard["annotation_item"].tolist()):
+                num_points = int(shard["num_points"][index])
+                if shard["shape_type"][index] == ShapeType.POLYGON:
+                    polygon_points = shard["points"][points_ends[index] - num_points : points_ends[index]]
+                    shape = Polygon(points=[Point(x, y) for x, y in polygon_points.tolist()])
+                else:
+                    shape_class = Rectangle if shard["shape_type"][index] == ShapeType.RECTANGLE else Ellipse
+                    shape = shape_class(*shard["boxes"][index].tolist())
+                scored_labels = [
+                    ScoredLabel(labels[label], probability=float(probability))
+                    for label, probability in zip(
+                        shard["label_index"][label_begin : label_ends[index]].tolist(),
+                        shard["label_probability"][label_begin : label_ends[index]].tolist(),
+                    )
+                ]
+                label_begin = label_ends[index]
+                annotations[item_index].append(Annotation(shape, labels=scored_labels))
+
+            scenes = [
+                AnnotationSceneEntity(annotations=item_annotations, kind=AnnotationSceneKind.PREDICTION)
+                for item_annotations in annotations
+            ]
+            metadata: List[List[IMetadata]] = [[] for _ in shard["item_index"]]
+            for index, item_index in enumerate(shard["metadata_item"].tolist()):
+                name, array = str(shard["metadata_names"][index]), shard[f"metadata_{index}"]
+                data: IMetadata
+                if shard["metadata_kind"][index] == _TENSOR:
+                    data = TensorEntity(name=name, numpy=array)
+                elif shard["metadata_kind"][index] == _RESULT_MEDIA:
+                    data = ResultMediaEntity(
+                        name=name,
+                        type=str(shard["metadata_types"][index]),
+                        annotation_scene=scenes[item_index],
+                        numpy=array,
+                        label=labels[shard["metadata_label"][index]] if shard["metadata_label"][index] >= 0 else None,
+                    )
+                else:
+                    data = FloatMetadata(name, float(array), FloatType[str(shard["metadata_types"][index])])
+                metadata[item_index].append(data)
+
+            for item_index, scene, item_metadata in zip(shard["item_index"].tolist(), scenes, metadata):
+                yield item_index, scene, item_metadata
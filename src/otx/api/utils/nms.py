@@ -1,45 +1,241 @@
 """NMS Module."""
 
-# Copyright (C) 2021-2022 Intel Corporation
+# Copyright (C) 2021-2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import heapq
+from typing import List, Optional, Tuple
+
 import numpy as np
 
+# Maximum number of candidate box pairs whose IoU is computed at once
+_PAIR_CHUNK_SIZE = 1 << 22
 
-def nms(boxes, scores, thresh):
-    """Adapted NMS implementation from OMZ: model_zoo/model_api/models/utils.py#L181."""
-    # pylint: disable=too-many-locals
 
+def _box_iou_pairs(boxes: np.ndarray, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Compute IoU of the box pairs (first[k], second[k])."""
     x1, y1, x2, y2 = boxes.T
+    width = np.maximum(0.0, np.minimum(x2[first], x2[second]) - np.maximum(x1[first], x1[second]))
+    height = np.maximum(0.0, np.minimum(y2[first], y2[second]) - np.maximum(y1[first], y1[second]))
+    intersection = width * height
     areas = (x2 - x1) * (y2 - y1)
+    union = areas[first] + areas[second] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection, dtype=float), where=union != 0)
+
+
+def _overlapping_pairs(boxes: np.ndarray, idxs: Optional[np.ndarray] = None):
+    """Find all the box pairs which overlap horizontally with a sweep over the sorted left coordinates.
+
+    Only boxes with the same index in ``idxs`` are paired, if it is given.
+    Pairs are yielded in chunks so that the memory does not grow quadratically with the number of boxes.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: indices of the first and second boxes of each pair.
+    """
+    if idxs is None:
+        groups = [np.arange(len(boxes))]
+    else:
+        groups = [np.flatnonzero(idxs == idx) for idx in np.unique(idxs)]
+
+    for members in groups:
+        order = members[np.argsort(boxes[members, 0], kind="stable")]
+        sorted_x1 = boxes[order, 0]
+        # Boxes after position p whose left side is inside box p
+        ends = np.searchsorted(sorted_x1, boxes[order, 2], side="left")
+        counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+
+        begin = 0
+        cum_counts = np.cumsum(counts)
+        while begin < len(order):
+            # Split the sweep so that a chunk has about _PAIR_CHUNK_SIZE pairs
+            offset = cum_counts[begin - 1] if begin > 0 else 0
+            end = max(int(np.searchsorted(cum_counts, offset + _PAIR_CHUNK_SIZE, side="right")), begin + 1)
+            chunk_counts = counts[begin:end]
+            first = np.repeat(np.arange(begin, end), chunk_counts)
+            # Position of each pair within the run of its first box
+            run_starts = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+            second = first + 1 + np.arange(len(first)) - run_starts
+            yield order[first], order[second]
+            begin = end
+
+
+def _suppression_graph(
+    boxes: np.ndarray, rank: np.ndarray, thresh: float, idxs: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build the CSR graph from each box to the lower ranked boxes it suppresses.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: indptr and indices (in rank) of the graph, ordered by rank.
+    """
+    sources, targets = [], []
+    for first, second in _overlapping_pairs(boxes, idxs):
+        overlap = _box_iou_pairs(boxes, first, second)
+        suppress = overlap > thresh
+        first_rank, second_rank = rank[first[suppress]], rank[second[suppress]]
+        sources.append(np.minimum(first_rank, second_rank))
+        targets.append(np.maximum(first_rank, second_rank))
+
+    source = np.concatenate(sources) if sources else np.zeros(0, dtype=int)
+    target = np.concatenate(targets) if targets else np.zeros(0, dtype=int)
+    order = np.argsort(source, kind="stable")
+    indptr = np.zeros(len(boxes) + 1, dtype=int)
+    np.cumsum(np.bincount(source, minlength=len(boxes)), out=indptr[1:])
+    return indptr, target[order]
+
+
+def _greedy_nms(
+    boxes: np.ndarray, scores: np.ndarray, thresh: float, max_num: int = 0, idxs: Optional[np.ndarray] = None
+) -> List[int]:
+    """Greedy NMS over a sparse graph of the overlapping boxes."""
+    if len(boxes) == 0:
+        return []
+
     order = scores.argsort()[::-1]
+    if thresh < 0:
+        # Every box overlaps more than the threshold
+        if idxs is None:
+            return order[:1].tolist()
+        _, first = np.unique(idxs[order], return_index=True)
+        keep = order[np.sort(first)]
+        return (keep[:max_num] if max_num > 0 else keep).tolist()
 
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(len(order))
+    indptr, indices = _suppression_graph(boxes, rank, thresh, idxs)
+    # Plain ints are cheaper to slice with in the loop below
+    bounds: List[int] = indptr.tolist()
+
+    max_num = max_num if max_num > 0 else len(order)
+    suppressed = np.zeros(len(order), dtype=bool)
     keep = []
-    while order.size > 0:
-        i = order[0]
+    for i in range(len(order)):
+        if suppressed[i]:
+            continue
         keep.append(i)
+        if len(keep) >= max_num:
+            break
+        suppressed[indices[bounds[i] : bounds[i + 1]]] = True
+
+    return order[keep].tolist()
+
 
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
+def nms(boxes, scores, thresh, max_num=0):
+    """Non-maximum suppression of the boxes with the overlap higher than the threshold.
 
-        width = np.maximum(0.0, xx2 - xx1)
-        height = np.maximum(0.0, yy2 - yy1)
-        intersection = width * height
+    Only the box pairs overlapping horizontally are compared, they are found by a sweep over the boxes
+    sorted by their left coordinate, and the greedy suppression runs over this sparse overlap graph.
+    The result is identical to the OMZ implementation (model_zoo/model_api/models/utils.py#L181).
+
+    Args:
+        boxes (np.ndarray): boxes in (x1, y1, x2, y2) format, shape (N, 4).
+        scores (np.ndarray): scores of the boxes, shape (N, ).
+        thresh (float): boxes overlapping a kept box with IoU higher than this value are suppressed.
+        max_num (int, optional): stop when this number of boxes are kept, no limit if it is not positive.
+            Defaults to 0.
 
-        union = areas[i] + areas[order[1:]] - intersection
-        overlap = np.divide(
-            intersection,
-            union,
-            out=np.zeros_like(intersection, dtype=float),
-            where=union != 0,
-        )
+    Returns:
+        list: indices of the kept boxes in descending order of scores.
+    """
+    return _greedy_nms(np.asarray(boxes), np.asarray(scores), thresh, max_num)
+
+
+def batched_nms(boxes, scores, idxs, thresh, max_num=0):
+    """NMS performed independently for each index in idxs, e.g. the class labels.
+
+    Args:
+        boxes (np.ndarray): boxes in (x1, y1, x2, y2) format, shape (N, 4).
+        scores (np.ndarray): scores of the boxes, shape (N, ).
+        idxs (np.ndarray): boxes are only suppressed by the boxes with the same index, shape (N, ).
+        thresh (float): IoU threshold.
+        max_num (int, optional): stop when this number of boxes are kept, no limit if it is not positive.
+            Defaults to 0.
+
+    Returns:
+        list: indices of the kept boxes in descending order of scores.
+    """
+    return _greedy_nms(np.asarray(boxes), np.asarray(scores), thresh, max_num, np.asarray(idxs))
+
+
+def soft_nms(
+    boxes,
+    scores,
+    sigma=0.5,
+    iou_threshold=0.3,
+    score_threshold=0.001,
+    method="gaussian",
+    max_num=0,
+    idxs=None,
+):
+    """Soft-NMS which decays the scores of the overlapping boxes instead of suppressing them.
+
+    Args:
+        boxes (np.ndarray): boxes in (x1, y1, x2, y2) format, shape (N, 4).
+        scores (np.ndarray): scores of the boxes, shape (N, ).
+        sigma (float, optional): sigma of the gaussian decay. Defaults to 0.5.
+        iou_threshold (float, optional): IoU threshold of the linear decay. Defaults to 0.3.
+        score_threshold (float, optional): boxes whose decayed score is lower than this value are dropped.
+            Defaults to 0.001.
+        method (str, optional): "gaussian" or "linear". Defaults to "gaussian".
+        max_num (int, optional): stop when this number of boxes are kept, no limit if it is not positive.
+            Defaults to 0.
+        idxs (np.ndarray, optional): if given, boxes only decay the boxes with the same index. Defaults to None.
+
+    Returns:
+        tuple: (keep, scores), indices of the kept boxes in the selection order and their decayed scores.
+    """
+    if method not in ("gaussian", "linear"):
+        raise ValueError(f"{method} is unknown soft-NMS method, use gaussian or linear.")
+
+    boxes = np.asarray(boxes)
+    decayed = np.asarray(scores, dtype=float).copy()
+    if len(boxes) == 0:
+        return [], np.zeros(0)
+
+    # Only the overlapping boxes decay each other
+    firsts, seconds, overlaps = [], [], []
+    for first, second in _overlapping_pairs(boxes, None if idxs is None else np.asarray(idxs)):
+        overlap = _box_iou_pairs(boxes, first, second)
+        mask = overlap > 0
+        firsts += [first[mask], second[mask]]
+        seconds += [second[mask], first[mask]]
+        overlaps += [overlap[mask], overlap[mask]]
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    overlap = np.concatenate(overlaps)
+    order = np.argsort(first, kind="stable")
+    neighbors, neighbor_overlaps = second[order], overlap[order]
+    indptr = np.zeros(len(boxes) + 1, dtype=int)
+    np.cumsum(np.bincount(first, minlength=len(boxes)), out=indptr[1:])
+
+    max_num = max_num if max_num > 0 else len(boxes)
+    done = np.zeros(len(boxes), dtype=bool)
+    heap = [(-score, idx) for idx, score in enumerate(decayed.tolist())]
+    heapq.heapify(heap)
+    keep = []
+    while heap and len(keep) < max_num:
+        score, idx = heapq.heappop(heap)
+        if done[idx] or -score != decayed[idx]:
+            # Stale entry of a box which is already kept or decayed
+            continue
+        if -score < score_threshold:
+            break
+        done[idx] = True
+        keep.append(idx)
 
-        order = order[np.where(overlap <= thresh)[0] + 1]
+        begin, end = indptr[idx], indptr[idx + 1]
+        targets, target_overlaps = neighbors[begin:end], neighbor_overlaps[begin:end]
+        alive = ~done[targets]
+        targets, target_overlaps = targets[alive], target_overlaps[alive]
+        if method == "gaussian":
+            weights = np.exp(-(target_overlaps**2) / sigma)
+        else:
+            weights = np.where(target_overlaps > iou_threshold, 1.0 - target_overlaps, 1.0)
+        decayed[targets] *= weights
+        for target in targets[weights < 1.0].tolist():
+            heapq.heappush(heap, (-decayed[target], target))
 
-    return keep
+    return keep, decayed[keep]
 
 
 def multiclass_nms(
@@ -49,10 +245,8 @@ def multiclass_nms(
 ):
     """Multi-class NMS.
 
-    strategy: in order to perform NMS independently per class,
-    we add an offset to all the boxes. The offset is dependent
-    only on the class idx, and is large enough so that boxes
-    from different classes do not overlap
+    NMS is performed independently per class,
+    boxes are only compared with the boxes of the same class.
 
     Args:
         detections (np.ndarray): labels, scores and boxes
@@ -65,12 +259,7 @@ def multiclass_nms(
     labels = detections[:, 0]
     scores = detections[:, 1]
     boxes = detections[:, 2:]
-    max_coordinate = boxes.max()
-    offsets = labels.astype(boxes.dtype) * (max_coordinate + 1)
-    boxes_for_nms = boxes + offsets[:, None]
-    keep = nms(boxes_for_nms, scores, iou_threshold)
-    if max_num > 0:
-        keep = keep[:max_num]
-    keep = np.array(keep)
+    keep = batched_nms(boxes, scores, labels, iou_threshold, max_num)
+    keep = np.array(keep, dtype=int)
     det = detections[keep]
     return det, keep
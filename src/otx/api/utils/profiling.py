@@ -0,0 +1,153 @@
+"""Profiling of the stages of the inferencers."""
+
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class InferenceProfiler:
+    """Records the latency of the stages of an inferencer, and optionally captures a profile of the inference.
+
+    The inferencers record their stages (e.g. ``pre_process``, ``forward``, ``post_process``, ``convert``),
+    the time waited for a free infer request (``request_wait``) and the time from the submission of an async
+    request to its callback (``async_inference``). Recording is thread-safe, so that the callbacks of the
+    async requests can record their stages.
+
+    Example:
+        >>> profiler = InferenceProfiler(capture="cprofile")
+        >>> with profiler.capture_profile():
+        ...     task.infer(dataset, InferenceParameters(profiler=profiler))
+        >>> profiler.export("profile.json")
+
+    Args:
+        enabled (bool): Whether the latencies are recorded, a disabled profiler has no overhead. Defaults to True.
+        capture (Optional[str]): Profiler run by ``capture_profile``, "cprofile" or "torch". Defaults to None.
+        top_k (int): Number of functions or operators of the captured profile in the summary. Defaults to 30.
+    """
+
+    PERCENTILES = (50, 95, 99)
+    CAPTURE_MODES = ("cprofile", "torch")
+
+    def __init__(self, enabled: bool = True, capture: Optional[str] = None, top_k: int = 30):
+        if capture is not None and capture not in self.CAPTURE_MODES:
+            raise ValueError(f"{capture} is not supported, use one of {self.CAPTURE_MODES}.")
+        self.enabled = enabled
+        self.capture = capture
+        self.top_k = top_k
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._profile: List[Dict[str, Any]] = []
+
+    def record(self, stage: str, elapsed: float) -> None:
+        """Record the latency of a stage in seconds."""
+        if self.enabled:
+            with self._lock:
+                self._latencies[stage].append(elapsed)
+
+    def measure(self, stage: str) -> ContextManager:
+        """Returns a context manager recording the latency of the stage run in it."""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(stage)
+
+    @contextmanager
+    def _measure(self, stage: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start_time)
+
+    @contextmanager
+    def capture_profile(self) -> Iterator[None]:
+        """Capture a profile of the code run in the context with the capture profiler, if any."""
+        if self.capture == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._profile = self._get_cprofile_summary(profile)
+        elif self.capture == "torch":
+            import torch  # pylint: disable=import-outside-toplevel
+
+            with torch.profiler.profile() as torch_profile:
+                yield
+            self._profile = self._get_torch_profile_summary(torch_profile)
+        else:
+            yield
+
+    def _get_cprofile_summary(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        """Returns the functions of the cProfile profile with the highest cumulative time."""
+        stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+        functions = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[: self.top_k]
+        return [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": num_calls,
+                "total_time_ms": total_time * 1e3,
+                "cumulative_time_ms": cumulative_time * 1e3,
+            }
+            for (filename, line, name), (_, num_calls, total_time, cumulative_time, _) in functions
+        ]
+
+    def _get_torch_profile_summary(self, torch_profile: Any) -> List[Dict[str, Any]]:
+        """Returns the operators of the torch profile with the highest total CPU time."""
+        events = sorted(torch_profile.key_averages(), key=lambda event: event.cpu_time_total, reverse=True)
+        return [
+            {
+                "operator": event.key,
+                "calls": event.count,
+                "cpu_time_total_ms": event.cpu_time_total / 1e3,
+                "cuda_time_total_ms": event.cuda_time_total / 1e3,
+            }
+            for event in events[: self.top_k]
+        ]
+
+    def reset(self) -> None:
+        """Remove the recorded latencies and the captured profile."""
+        with self._lock:
+            self._latencies.clear()
+            self._profile = []
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Returns the latency histogram of each stage in milliseconds, and the captured profile if any."""
+        with self._lock:
+            latencies = {stage: np.array(values) * 1e3 for stage, values in self._latencies.items()}
+        stages: Dict[str, Dict[str, float]] = {}
+        for stage, values in latencies.items():
+            stage_summary = {"count": len(values), "total_ms": float(values.sum()), "mean_ms": float(values.mean())}
+            percentiles: List[float] = np.asarray(np.percentile(values, self.PERCENTILES)).tolist()
+            for percentile, value in zip(self.PERCENTILES, percentiles):
+                stage_summary[f"p{percentile}_ms"] = value
+            stage_summary["max_ms"] = float(values.max())
+            stages[stage] = stage_summary
+        summary: Dict[str, Any] = {"stages": stages}
+        if self.capture is not None:
+            summary[self.capture] = self._profile
+        return summary
+
+    def report(self) -> str:
+        """Returns a table of the latency histograms of the stages."""
+        columns = ["count", "mean_ms"] + [f"p{percentile}_ms" for percentile in self.PERCENTILES] + ["max_ms"]
+        lines = [f"{'stage':<20}" + "".join(f"{column:>12}" for column in columns)]
+        for stage, summary in self.get_summary()["stages"].items():
+            lines.append(f"{stage:<20}{summary['count']:>12}" + "".join(f"{summary[c]:>12.2f}" for c in columns[1:]))
+        return "\n".join(lines)
+
+    def export(self, path: str) -> None:
+        """Save the summary as a JSON file."""
+        with open(path, "w", encoding="UTF-8") as file:
+            json.dump(self.get_summary(), file, indent=4)
@@ -4,25 +4,129 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import hashlib
+import os
+import threading
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
-from typing import List, Optional, Sequence, Tuple, cast
+from typing import Hashable, List, Optional, Sequence, Tuple, cast
 
 import cv2
 import numpy as np
 from bson import ObjectId
+from shapely.geometry import Polygon as shapely_polygon
 
-from otx.api.entities.annotation import Annotation
+from otx.api.entities.annotation import Annotation, AnnotationSceneKind
 from otx.api.entities.dataset_item import DatasetItemEntity
 from otx.api.entities.id import ID
 from otx.api.entities.label import LabelEntity
 from otx.api.entities.scored_label import ScoredLabel
 from otx.api.entities.shapes.polygon import Point, Polygon
+from otx.api.entities.shapes.shape import ShapeEntity
 from otx.api.utils.shape_factory import ShapeFactory
 
 
+class MaskCache:
+    """Least recently used cache of the masks created from the annotations of dataset items.
+
+    The masks are stored run-length encoded, so that a label map with a few regions only takes a few bytes.
+
+    Args:
+        max_bytes: Maximum size of the encoded masks, the least recently used masks are removed above it
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._masks: "OrderedDict[Hashable, Tuple[Tuple[int, ...], np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of cached masks."""
+        return len(self._masks)
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Returns a new array with the cached mask, None if the key is not cached."""
+        with self._lock:
+            encoded = self._masks.get(key)
+            if encoded is None:
+                return None
+            self._masks.move_to_end(key)
+        shape, values, lengths = encoded
+        return np.repeat(values, lengths).reshape(shape)
+
+    def put(self, key: Hashable, mask: np.ndarray):
+        """Caches the mask with the key."""
+        flat = mask.ravel()
+        starts = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+        if flat.size > 0:
+            starts = np.concatenate([[0], starts])
+        values = flat[starts]
+        lengths = np.diff(np.append(starts, flat.size)).astype(np.int32)
+        with self._lock:
+            if key in self._masks:
+                self.nbytes -= self.__encoded_nbytes(self._masks.pop(key))
+            self._masks[key] = (mask.shape, values, lengths)
+            self.nbytes += values.nbytes + lengths.nbytes
+            while self.nbytes > self.max_bytes and len(self._masks) > 0:
+                self.nbytes -= self.__encoded_nbytes(self._masks.popitem(last=False)[1])
+
+    def clear(self):
+        """Removes all the cached masks."""
+        with self._lock:
+            self._masks.clear()
+            self.nbytes = 0
+
+    @staticmethod
+    def __encoded_nbytes(encoded: Tuple[Tuple[int, ...], np.ndarray, np.ndarray]) -> int:
+        """Returns the size of an encoded mask."""
+        return encoded[1].nbytes + encoded[2].nbytes
+
+
+#: Cache of the masks created by mask_from_dataset_item for the user annotations
+MASK_CACHE = MaskCache()
+
+
+def _update_shape_hash(_hash, shape: ShapeEntity):
+    """Adds the type and the coordinates of a shape to the hash."""
+    if isinstance(shape, Polygon):
+        coordinates = [coordinate for point in shape.points for coordinate in (point.x, point.y)]
+    else:
+        coordinates = [shape.x1, shape.y1, shape.x2, shape.y2]  # type: ignore[attr-defined]
+    _hash.update(int(shape.type).to_bytes(1, "little"))
+    _hash.update(len(coordinates).to_bytes(8, "little"))
+    _hash.update(np.array(coordinates, dtype=np.float64).tobytes())
+
+
+def _mask_cache_key(dataset_item: DatasetItemEntity, labels: List[LabelEntity]) -> Optional[Hashable]:
+    """Returns the key of the mask of a dataset item in the mask cache, None if it should not be cached.
+
+    Only the user annotations are cached, predictions are usually seen once.
+    The key is a digest of everything the mask is created from: the size and the ROI of the item, the shapes and
+    the labels of its annotations, its ignored labels and the label order. It does not depend on the identity of
+    the objects, so that an item created again with the same annotations, e.g. by a lazy dataset, hits the cache.
+    """
+    annotation_scene = dataset_item.annotation_scene
+    if annotation_scene.kind != AnnotationSceneKind.ANNOTATION:
+        return None
+    _hash = hashlib.blake2b(digest_size=16)
+    _hash.update(f"{dataset_item.width}x{dataset_item.height}".encode("utf-8"))
+    _update_shape_hash(_hash, dataset_item.roi.shape)
+    for annotation in annotation_scene.annotations:
+        _update_shape_hash(_hash, annotation.shape)
+        _hash.update(repr([str(label.id_) for label in annotation.get_labels(include_empty=True)]).encode("utf-8"))
+    _hash.update(repr([str(label.id_) for label in dataset_item.ignored_labels]).encode("utf-8"))
+    _hash.update(repr([(str(label.id_), label.name) for label in labels]).encode("utf-8"))
+    return _hash.digest()
+
+
 def mask_from_dataset_item(
-    dataset_item: DatasetItemEntity, labels: List[LabelEntity], use_otx_adapter: bool = True
+    dataset_item: DatasetItemEntity,
+    labels: List[LabelEntity],
+    use_otx_adapter: bool = True,
+    cache: Optional[MaskCache] = MASK_CACHE,
 ) -> np.ndarray:
     """Creates a mask from dataset item.
 
@@ -34,15 +138,27 @@ def mask_from_dataset_item(
         dataset_item: Item to make mask for
         labels: The labels to use for creating the mask. The order of
             the labels determines the class index.
+        use_otx_adapter: Create the mask from the annotations if True,
+            otherwise load it from the mask file
+        cache: Cache of the masks created from the user annotations,
+            keyed by the dataset item, its annotations and the labels.
+            Set to None to always create the mask.
 
     Returns:
         Numpy array of mask
     """
-    # todo: cache this so that it does not have to be redone for all the same media
-    if use_otx_adapter:
-        mask = mask_from_annotation(dataset_item.get_annotations(), labels, dataset_item.width, dataset_item.height)
-    else:
-        mask = mask_from_file(dataset_item)
+    if not use_otx_adapter:
+        return mask_from_file(dataset_item)
+
+    key = _mask_cache_key(dataset_item, labels) if cache is not None else None
+    if key is not None:
+        mask = cache.get(key)  # type: ignore[union-attr]
+        if mask is not None:
+            return mask
+
+    mask = mask_from_annotation(dataset_item.get_annotations(), labels, dataset_item.width, dataset_item.height)
+    if key is not None:
+        cache.put(key, mask)  # type: ignore[union-attr]
     return mask
 
 
@@ -81,11 +197,9 @@ def mask_from_annotation(
         2d numpy array of mask
     """
 
-    mask = np.zeros(shape=(height, width), dtype=np.uint8)
+    class_indices = []
+    contour_points = []
     for annotation in annotations:
-        shape = annotation.shape
-        if not isinstance(shape, Polygon):
-            shape = ShapeFactory.shape_as_polygon(annotation.shape)
         known_labels = [
             label for label in annotation.get_labels() if isinstance(label, ScoredLabel) and label.get_label() in labels
         ]
@@ -93,14 +207,22 @@ def mask_from_annotation(
             # Skip unknown shapes
             continue
 
-        label_to_compare = known_labels[0].get_label()
-
-        class_idx = labels.index(label_to_compare) + 1
-        contour = []
-        for point in shape.points:
-            contour.append([int(point.x * width), int(point.y * height)])
+        shape = annotation.shape
+        if not isinstance(shape, Polygon):
+            shape = ShapeFactory.shape_as_polygon(annotation.shape)
+        class_indices.append(labels.index(known_labels[0].get_label()) + 1)
+        contour_points.append([(point.x, point.y) for point in shape.points])
 
-        mask = cv2.drawContours(mask, np.asarray([contour]), 0, (class_idx, class_idx, class_idx), -1)
+    mask = np.zeros(shape=(height, width), dtype=np.uint8)
+    if len(contour_points) > 0:
+        # Convert the points of all the polygons at once
+        lengths = [len(points) for points in contour_points]
+        points = np.array([point for points in contour_points for point in points], dtype=np.float64).reshape(-1, 2)
+        points = (points * np.array([width, height], dtype=np.float64)).astype(np.int32)
+        # Polygons are filled one by one, later annotations overwrite the earlier ones where they overlap
+        for class_idx, contour in zip(class_indices, np.split(points, np.cumsum(lengths)[:-1])):
+            if len(contour) > 0:
+                cv2.fillPoly(mask, [contour], class_idx)
 
     mask = np.expand_dims(mask, axis=2)
 
@@ -180,11 +302,95 @@ def get_subcontours(contour: Contour) -> List[Contour]:
     return subcontours
 
 
-def create_annotation_from_segmentation_map(
-    hard_prediction: np.ndarray, soft_prediction: np.ndarray, label_map: dict
-) -> List[Annotation]:
-    """Creates polygons from the soft predictions.
+def _get_label_polygons(
+    hard_prediction: np.ndarray, soft_prediction: np.ndarray, label_index: int
+) -> List[Tuple[np.ndarray, float]]:
+    """Extracts the polygons of one label from the segmentation map.
+
+    The probability of each polygon is the mean soft prediction inside of it, computed on its bounding box.
+
+    Args:
+        hard_prediction: hard prediction containing the final label index per pixel
+        soft_prediction: soft prediction of the label with shape H x W
+        label_index: index of the label in the hard prediction
+
+    Returns:
+        List of (points, probability) of the polygons, the points are normalized (x, y) coordinates
+        of shape N x 2
+    """
+    height, width = hard_prediction.shape[:2]
+    label_index_map = (hard_prediction == label_index).astype(np.uint8) * 255
+
+    # Contour retrieval mode CCOMP (Connected components) creates a two-level
+    # hierarchy of contours
+    contours, hierarchies = cv2.findContours(label_index_map, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
+
+    polygons: List[Tuple[np.ndarray, float]] = []
+    if hierarchies is None:
+        return polygons
+
+    for contour, hierarchy in zip(contours, hierarchies[0]):
+        if len(contour) <= 2 or cv2.contourArea(contour) < 1.0:
+            continue
+
+        if hierarchy[3] != -1:
+            # If contour hierarchy[3] != -1 then contour has a parent and
+            # therefore is a hole
+            # Do not allow holes in segmentation masks to be filled silently,
+            # but trigger warning instead
+            warnings.warn(
+                "The geometry of the segmentation map you are converting is "
+                "not fully supported. A hole was found and will be filled.",
+                UserWarning,
+            )
+            continue
 
+        # In this case a contour does not represent a hole
+        # Split contour into subcontours that do not have self intersections.
+        subcontours = get_subcontours([(x, y) for x, y in contour[:, 0].tolist()])
+        for subcontour in subcontours:
+            subcontour_points = np.array(subcontour, dtype=np.int32)
+            # compute probability of the shape on the bounding box of the subcontour
+            x, y, box_width, box_height = cv2.boundingRect(subcontour_points)
+            mask = np.zeros((box_height, box_width), dtype=np.uint8)
+            cv2.drawContours(
+                mask,
+                subcontour_points.reshape(-1, 1, 1, 2),
+                contourIdx=-1,
+                color=1,
+                thickness=-1,
+                offset=(-x, -y),
+            )
+            probability = cv2.mean(soft_prediction[y : y + box_height, x : x + box_width], mask)[0]
+
+            # convert the list of points to a closed polygon
+            points = subcontour_points / np.array([width - 1, height - 1], dtype=np.float64)
+            points = np.clip(points, 0.0, 1.0)
+
+            if shapely_polygon(points).area > 0:
+                # Contour is a closed polygon with area > 0
+                polygons.append((points, probability))
+            else:
+                # Contour is a closed polygon with area == 0
+                warnings.warn(
+                    "The geometry of the segmentation map you are converting "
+                    "is not fully supported. Polygons with a area of zero "
+                    "will be removed.",
+                    UserWarning,
+                )
+    return polygons
+
+
+def create_polygons_from_segmentation_map(
+    hard_prediction: np.ndarray,
+    soft_prediction: np.ndarray,
+    label_map: dict,
+    num_workers: Optional[int] = None,
+) -> List[Tuple[int, np.ndarray, float]]:
+    """Creates polygons from the soft predictions as arrays.
+
+    This is the fast path of `create_annotation_from_segmentation_map` for callers which only need the
+    polygons, e.g. to serialize them, without creating the annotation entities.
     Background label will be ignored and not be converted to polygons.
 
     Args:
@@ -199,87 +405,78 @@ def create_annotation_from_segmentation_map(
         label_map: dictionary mapping labels to an index. It is assumed
             that the first item in the dictionary corresponds to the
             background label and will therefore be ignored.
+        num_workers: number of threads processing the labels in
+            parallel. Defaults to None, one thread per label up to the
+            number of CPUs.
 
     Returns:
-        List of shapes
+        List of (label index, points, probability) of the polygons in the order of label_map,
+        the points are normalized (x, y) coordinates of shape N x 2
     """
-    # pylint: disable=too-many-locals
-    height, width = hard_prediction.shape[:2]
-    img_class = hard_prediction.swapaxes(0, 1)
-
-    # pylint: disable=too-many-nested-blocks
-    annotations: List[Annotation] = []
-    for label_index, label in label_map.items():
-        # Skip background
-        if label_index == 0:
-            continue
+    label_indices = [label_index for label_index in label_map if label_index != 0]
 
+    def get_polygons(label_index: int) -> List[Tuple[np.ndarray, float]]:
         # obtain current label soft prediction
         if len(soft_prediction.shape) == 3:
             current_label_soft_prediction = soft_prediction[:, :, label_index]
         else:
             current_label_soft_prediction = soft_prediction
+        return _get_label_polygons(hard_prediction, current_label_soft_prediction, label_index)
+
+    if num_workers is None:
+        num_workers = min(len(label_indices), os.cpu_count() or 1)
+    if num_workers > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            polygons_per_label = list(executor.map(get_polygons, label_indices))
+    else:
+        polygons_per_label = [get_polygons(label_index) for label_index in label_indices]
+
+    return [
+        (label_index, points, probability)
+        for label_index, polygons in zip(label_indices, polygons_per_label)
+        for points, probability in polygons
+    ]
 
-        obj_group = img_class == label_index
-        label_index_map = (obj_group.T.astype(int) * 255).astype(np.uint8)
-
-        # Contour retrieval mode CCOMP (Connected components) creates a two-level
-        # hierarchy of contours
-        contours, hierarchies = cv2.findContours(label_index_map, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
-
-        if hierarchies is not None:
-            for contour, hierarchy in zip(contours, hierarchies[0]):
-                if len(contour) <= 2 or cv2.contourArea(contour) < 1.0:
-                    continue
-
-                if hierarchy[3] == -1:
-                    # In this case a contour does not represent a hole
-                    contour = list((point[0][0], point[0][1]) for point in contour)
-
-                    # Split contour into subcontours that do not have self intersections.
-                    subcontours = get_subcontours(contour)
-                    for subcontour in subcontours:
-                        # compute probability of the shape
-                        mask = np.zeros(hard_prediction.shape, dtype=np.uint8)
-                        cv2.drawContours(
-                            mask,
-                            np.asarray([[[x, y]] for x, y in subcontour]),
-                            contourIdx=-1,
-                            color=1,
-                            thickness=-1,
-                        )
-                        probability = cv2.mean(current_label_soft_prediction, mask)[0]
-
-                        # convert the list of points to a closed polygon
-                        points = [Point(x=x / (width - 1), y=y / (height - 1)) for x, y in subcontour]
-                        polygon = Polygon(points=points)
-
-                        if polygon.get_area() > 0:
-                            # Contour is a closed polygon with area > 0
-                            annotations.append(
-                                Annotation(
-                                    shape=polygon,
-                                    labels=[ScoredLabel(label, probability)],
-                                    id=ID(ObjectId()),
-                                )
-                            )
-                        else:
-                            # Contour is a closed polygon with area == 0
-                            warnings.warn(
-                                "The geometry of the segmentation map you are converting "
-                                "is not fully supported. Polygons with a area of zero "
-                                "will be removed.",
-                                UserWarning,
-                            )
-                else:
-                    # If contour hierarchy[3] != -1 then contour has a parent and
-                    # therefore is a hole
-                    # Do not allow holes in segmentation masks to be filled silently,
-                    # but trigger warning instead
-                    warnings.warn(
-                        "The geometry of the segmentation map you are converting is "
-                        "not fully supported. A hole was found and will be filled.",
-                        UserWarning,
-                    )
 
+def create_annotation_from_segmentation_map(
+    hard_prediction: np.ndarray,
+    soft_prediction: np.ndarray,
+    label_map: dict,
+    num_workers: Optional[int] = None,
+) -> List[Annotation]:
+    """Creates polygons from the soft predictions.
+
+    Background label will be ignored and not be converted to polygons.
+
+    Args:
+        hard_prediction: hard prediction containing the final label
+            index per pixel. See function
+            `create_hard_prediction_from_soft_prediction`.
+        soft_prediction: soft prediction with shape H x W x N_labels,
+            where soft_prediction[:, :, 0] is the soft prediction for
+            background. If soft_prediction is of H x W shape, it is
+            assumed that this soft prediction will be applied for all
+            labels.
+        label_map: dictionary mapping labels to an index. It is assumed
+            that the first item in the dictionary corresponds to the
+            background label and will therefore be ignored.
+        num_workers: number of threads processing the labels in
+            parallel. Defaults to None, one thread per label up to the
+            number of CPUs.
+
+    Returns:
+        List of shapes
+    """
+    annotations: List[Annotation] = []
+    for label_index, points, probability in create_polygons_from_segmentation_map(
+        hard_prediction, soft_prediction, label_map, num_workers
+    ):
+        polygon = Polygon(points=[Point(x=x, y=y) for x, y in points.tolist()])
+        annotations.append(
+            Annotation(
+                shape=polygon,
+                labels=[ScoredLabel(label_map[label_index], probability)],
+                id=ID(ObjectId()),
+            )
+        )
     return annotations
@@ -490,6 +490,9 @@ class ConfigManager:  # pylint: disable=too-many-instance-attributes
                     dataset_config.update({f"{subset}_ann_files": self.data_config[f"{subset}_subset"]["ann_files"]})
                 if "file_list" in self.data_config[f"{subset}_subset"]:
                     dataset_config.update({f"{subset}_file_list": self.data_config[f"{subset}_subset"]["file_list"]})
+        algo_backend = getattr(hyper_parameters, "algo_backend", None)
+        # the options of the data configuration can still set the number of conversion workers
+        dataset_config["num_workers"] = getattr(algo_backend, "num_conversion_workers", 0)
         if "options" in self.data_config:
             dataset_config.update(self.data_config["options"])
         if hyper_parameters is not None:
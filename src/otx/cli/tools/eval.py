@@ -15,15 +15,21 @@
 # and limitations under the License.
 
 import json
+from contextlib import nullcontext
 from pathlib import Path
 
 # Update environment variables for CLI use
 import otx.cli  # noqa: F401
+from otx.api.entities.datasets import DatasetEntity
 from otx.api.entities.inference_parameters import InferenceParameters
 from otx.api.entities.model_template import TaskType
+from otx.api.entities.result_media import ResultMediaEntity
 from otx.api.entities.resultset import ResultSetEntity
 from otx.api.entities.subset import Subset
 from otx.api.entities.task_environment import TaskEnvironment
+from otx.api.entities.tensor import TensorEntity
+from otx.api.utils.inference_utils import PredictionStore, stream_infer
+from otx.api.utils.profiling import InferenceProfiler
 from otx.cli.manager import ConfigManager
 from otx.cli.utils.importing import get_impl_class
 from otx.cli.utils.io import read_model
@@ -67,11 +73,42 @@ def get_args():
         default=None,
         help="The data.yaml path want to use in train task.",
     )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Path of a JSON file where the latency histograms of the inference stages are saved.",
+    )
+    parser.add_argument(
+        "--profile-capture",
+        choices=InferenceProfiler.CAPTURE_MODES,
+        default=None,
+        help="Also capture a cProfile or torch profiler profile of the inference into the --profile file.",
+    )
+    parser.add_argument(
+        "--infer-chunk-size",
+        type=int,
+        default=0,
+        help="Infer the test dataset in chunks of this number of items instead of at once, "
+        "so that the saliency maps and representation vectors of only one chunk are held at a time. "
+        "The predicted annotations of all the items are kept for the evaluation. "
+        "Not supported for visual prompting.",
+    )
+    parser.add_argument(
+        "--save-predictions",
+        type=str,
+        default=None,
+        help="Path of a directory where the predictions are saved as npz shards, one per inferred chunk.",
+    )
 
     add_hyper_parameters_sub_parser(parser, hyper_parameters, modes=("INFERENCE",))
     override_param = get_override_param(params)
 
-    return parser.parse_args(), override_param
+    args = parser.parse_args()
+    if args.profile_capture and not args.profile:
+        parser.error("--profile-capture requires --profile.")
+
+    return args, override_param
 
 
 def check_label_schemas(label_schema_a, label_schema_b):
@@ -136,13 +173,43 @@ def main():
     task = task_class(task_environment=environment)
 
     validation_dataset = dataset.get_subset(Subset.TESTING)
-    predicted_validation_dataset = task.infer(
-        # temp (sungchul): remain annotation for visual prompting
-        validation_dataset
-        if getattr(task, "task_type", None) == TaskType.VISUAL_PROMPTING
-        else validation_dataset.with_empty_annotations(),
-        InferenceParameters(is_evaluation=False),
+    profiler = InferenceProfiler(capture=args.profile_capture) if args.profile else None
+    inference_parameters = InferenceParameters(is_evaluation=False, profiler=profiler)
+    store = (
+        PredictionStore(args.save_predictions, labels=label_schema.get_labels(include_empty=True))
+        if args.save_predictions
+        else None
     )
+    with profiler.capture_profile() if profiler is not None else nullcontext():
+        if args.infer_chunk_size > 0 and getattr(task, "task_type", None) != TaskType.VISUAL_PROMPTING:
+            predicted_validation_dataset = DatasetEntity(purpose=validation_dataset.purpose)
+            for predicted_chunk in stream_infer(task, validation_dataset, inference_parameters, args.infer_chunk_size):
+                if store is not None:
+                    store.append(predicted_chunk)
+                for predicted_item in predicted_chunk:
+                    # only the predicted annotations are evaluated, the saliency maps and representation vectors
+                    # are freed with the chunk
+                    predicted_item.set_metadata(
+                        [
+                            metadata
+                            for metadata in predicted_item.get_metadata()
+                            if not isinstance(metadata.data, (TensorEntity, ResultMediaEntity))
+                        ]
+                    )
+                    predicted_validation_dataset.append(predicted_item)
+        else:
+            predicted_validation_dataset = task.infer(
+                # temp (sungchul): remain annotation for visual prompting
+                validation_dataset
+                if getattr(task, "task_type", None) == TaskType.VISUAL_PROMPTING
+                else validation_dataset.with_empty_annotations(),
+                inference_parameters,
+            )
+            if store is not None:
+                store.append(predicted_validation_dataset)
+    if profiler is not None:
+        print(profiler.report())
+        profiler.export(args.profile)
 
     resultset = ResultSetEntity(
         model=environment.model,
@@ -15,6 +15,7 @@
 # and limitations under the License.
 
 import json
+from contextlib import nullcontext
 from pathlib import Path
 
 # Update environment variables for CLI use
@@ -27,6 +28,7 @@ from otx.api.entities.resultset import ResultSetEntity
 from otx.api.entities.subset import Subset
 from otx.api.entities.task_environment import TaskEnvironment
 from otx.api.usecases.tasks.interfaces.optimization_interface import OptimizationType
+from otx.api.utils.profiling import InferenceProfiler
 from otx.cli.manager import ConfigManager
 from otx.cli.utils.importing import get_impl_class
 from otx.cli.utils.io import read_model, save_model_data
@@ -73,11 +75,27 @@ def get_args():
         help="Location where the intermediate output of the task will be stored.",
         default=None,
     )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help="Path of a JSON file where the latency histograms of the inference stages are saved.",
+    )
+    parser.add_argument(
+        "--profile-capture",
+        choices=InferenceProfiler.CAPTURE_MODES,
+        default=None,
+        help="Also capture a cProfile or torch profiler profile of the inference into the --profile file.",
+    )
 
     add_hyper_parameters_sub_parser(parser, hyper_parameters)
     override_param = get_override_param(params)
 
-    return parser.parse_args(), override_param
+    args = parser.parse_args()
+    if args.profile_capture and not args.profile:
+        parser.error("--profile-capture requires --profile.")
+
+    return args, override_param
 
 
 def main():
@@ -147,13 +165,18 @@ def main():
     save_model_data(output_model, output_path)
 
     validation_dataset = dataset.get_subset(Subset.VALIDATION)
-    predicted_validation_dataset = task.infer(
-        # temp (sungchul): remain annotation for visual prompting
-        validation_dataset
-        if getattr(task, "task_type", None) == TaskType.VISUAL_PROMPTING
-        else validation_dataset.with_empty_annotations(),
-        InferenceParameters(is_evaluation=False),
-    )
+    profiler = InferenceProfiler(capture=args.profile_capture) if args.profile else None
+    with profiler.capture_profile() if profiler is not None else nullcontext():
+        predicted_validation_dataset = task.infer(
+            # temp (sungchul): remain annotation for visual prompting
+            validation_dataset
+            if getattr(task, "task_type", None) == TaskType.VISUAL_PROMPTING
+            else validation_dataset.with_empty_annotations(),
+            InferenceParameters(is_evaluation=False, profiler=profiler),
+        )
+    if profiler is not None:
+        print(profiler.report())
+        profiler.export(args.profile)
 
     resultset = ResultSetEntity(
         model=output_model,
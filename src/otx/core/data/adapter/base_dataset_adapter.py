@@ -7,11 +7,16 @@
 # pylint: disable=invalid-name, too-many-locals, too-many-instance-attributes, unused-argument, too-many-arguments
 
 import abc
+import gc
+import multiprocessing
 import os
 from abc import abstractmethod
+from collections import deque
+from contextlib import contextmanager
 from copy import deepcopy
 from difflib import get_close_matches
-from typing import Any, Dict, List, Optional, Union
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import cv2
 import datumaro
@@ -22,6 +27,7 @@ from datumaro.components.annotation import Categories as DatumCategories
 from datumaro.components.dataset import Dataset as DatumDataset
 from datumaro.components.dataset import DatasetSubset as DatumDatasetSubset
 from datumaro.components.dataset import eager_mode
+from datumaro.components.dataset_base import DatasetItem as DatumDatasetItem
 from datumaro.components.media import Image as DatumImage
 from datumaro.components.media import MediaElement as DatumMediaElement
 
@@ -31,7 +37,8 @@ from otx.api.entities.annotation import (
     AnnotationSceneKind,
     NullAnnotationSceneEntity,
 )
-from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.dataset_item import DatasetItemEntity
+from otx.api.entities.datasets import DatasetEntity, LazyDatasetEntity
 from otx.api.entities.id import ID
 from otx.api.entities.image import Image
 from otx.api.entities.label import LabelEntity
@@ -39,12 +46,75 @@ from otx.api.entities.label_schema import LabelGroup, LabelGroupType, LabelSchem
 from otx.api.entities.media import IMediaEntity
 from otx.api.entities.model_template import TaskType
 from otx.api.entities.scored_label import ScoredLabel
-from otx.api.entities.shapes.polygon import Point, Polygon
+from otx.api.entities.shapes.polygon import Polygon
 from otx.api.entities.shapes.rectangle import Rectangle
+from otx.api.entities.shapes.shape import ShapeType
 from otx.api.entities.subset import Subset
 from otx.core.data.caching.storage_cache import init_arrow_cache
 
 
+class ShapeData(NamedTuple):
+    """Shape of an annotation converted by a dataset adapter, before the OTX entities are created.
+
+    Attributes:
+        shape_type (ShapeType): RECTANGLE or POLYGON.
+        points (np.ndarray): Normalized (x, y) coordinates of shape (N, 2), the two corners of a rectangle or
+            the vertices of a polygon.
+        label (int): Index of the label in the label entities.
+    """
+
+    shape_type: ShapeType
+    points: np.ndarray
+    label: int
+
+
+class ItemConversion(NamedTuple):
+    """Annotations of a Datumaro item converted by a dataset adapter.
+
+    Attributes:
+        shapes (List[ShapeData]): Shapes of the item.
+        used_labels (List[int]): Labels used by the annotations of the item, in order of appearance.
+        keep (bool): Whether the item is added to the dataset.
+    """
+
+    shapes: List[ShapeData]
+    used_labels: List[int]
+    keep: bool
+
+
+_CONVERSION_WORKER: Dict[str, "BaseDatasetAdapter"] = {}
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the garbage collector, the conversion only allocates objects which it would scan repeatedly for nothing."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _init_conversion_worker(adapter: "BaseDatasetAdapter"):
+    """Set the adapter of a conversion worker, which is inherited from the main process as it is forked.
+
+    The garbage collector of the worker is disabled, since the worker only converts items.
+    """
+    _CONVERSION_WORKER["adapter"] = adapter
+    gc.disable()
+
+
+def _convert_chunk(keys: List[Tuple[Subset, str, str]]) -> List[ItemConversion]:
+    """Convert a chunk of items given by their subset, id and Datumaro subset in a conversion worker."""
+    adapter = _CONVERSION_WORKER["adapter"]
+    return [
+        adapter._convert_item(subset, adapter.dataset[subset].get(item_id, datumaro_subset))
+        for subset, item_id, datumaro_subset in keys
+    ]
+
+
 class BaseDatasetAdapter(metaclass=abc.ABCMeta):
     """Base dataset adapter for all of downstream tasks to use Datumaro.
 
@@ -63,6 +133,10 @@ class BaseDatasetAdapter(metaclass=abc.ABCMeta):
         unlabeled_file_list (Optional[str]): Path of unlabeled file list
         encryption_key (Optional[str]): Encryption key to load an encrypted dataset
                                         (only required for DatumaroBinary format)
+        num_workers (int): Number of processes converting the Datumaro items to OTX entities,
+                           0 converts them in the main process
+        lazy (bool): Whether get_otx_dataset returns a LazyDatasetEntity, which creates the items from the Datumaro
+                     dataset when they are accessed (only supported by the detection and segmentation adapters)
 
     Since all adapters can be used for training and validation,
     the default value of train/val/test_data_roots was set to None.
@@ -72,6 +146,8 @@ class BaseDatasetAdapter(metaclass=abc.ABCMeta):
     For the test phase, train_data_roots and val_data_root are not used.
     """
 
+    conversion_chunk_size = 1000
+
     def __init__(
         self,
         task_type: TaskType,
@@ -85,10 +161,14 @@ class BaseDatasetAdapter(metaclass=abc.ABCMeta):
         unlabeled_file_list: Optional[str] = None,
         cache_config: Optional[Dict[str, Any]] = None,
         encryption_key: Optional[str] = None,
+        num_workers: int = 0,
+        lazy: bool = False,
         **kwargs,
     ):
         self.task_type = task_type
         self.domain = task_type.domain
+        self.num_workers = num_workers
+        self.lazy = lazy
         self.data_type: str
         self.is_train_phase: bool
 
@@ -206,6 +286,107 @@ class BaseDatasetAdapter(metaclass=abc.ABCMeta):
         """Get DatasetEntity."""
         raise NotImplementedError
 
+    def _convert_item(self, subset: Subset, datumaro_item: DatumDatasetItem) -> ItemConversion:
+        """Convert the annotations of a Datumaro item, it is run by the conversion workers.
+
+        Adapters creating their dataset items from the converted annotations override it,
+        by default the item is kept without any shape.
+        """
+        return ItemConversion(shapes=[], used_labels=[], keep=True)
+
+    def _convert_items(self) -> Iterator[Tuple[Subset, DatumDatasetItem, ItemConversion]]:
+        """Yields the Datumaro items of all the subsets in order, along with their converted annotations.
+
+        The items are converted in chunks of conversion_chunk_size items. If num_workers > 0, the chunks are converted
+        by forked processes, with at most two chunks per worker in flight. The OTX entities are created by the caller,
+        so that they share the label entities. The garbage collector is paused while a chunk is converted or
+        received from a worker, not while the items are consumed by the caller.
+        """
+        items = (
+            (subset, datumaro_item)
+            for subset, subset_data in self.dataset.items()
+            for _, datumaro_items in subset_data.subsets().items()
+            for datumaro_item in datumaro_items
+        )
+        if self.num_workers <= 0 or "fork" not in multiprocessing.get_all_start_methods():
+            while True:
+                chunk = list(islice(items, self.conversion_chunk_size))
+                if not chunk:
+                    return
+                with _gc_paused():
+                    conversions = [self._convert_item(subset, datumaro_item) for subset, datumaro_item in chunk]
+                for (subset, datumaro_item), conversion in zip(chunk, conversions):
+                    yield subset, datumaro_item, conversion
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(self.num_workers, initializer=_init_conversion_worker, initargs=(self,)) as pool:
+            pending: Deque = deque()
+            while True:
+                chunk = list(islice(items, self.conversion_chunk_size))
+                if chunk:
+                    keys = [(subset, datumaro_item.id, datumaro_item.subset) for subset, datumaro_item in chunk]
+                    pending.append((chunk, pool.apply_async(_convert_chunk, (keys,))))
+                if not pending:
+                    break
+                if not chunk or len(pending) > 2 * self.num_workers:
+                    chunk, result = pending.popleft()
+                    with _gc_paused():
+                        conversions = result.get()
+                    for (subset, datumaro_item), conversion in zip(chunk, conversions):
+                        yield subset, datumaro_item, conversion
+
+    def _create_dataset_item(
+        self, subset: Subset, datumaro_item: DatumDatasetItem, conversion: ItemConversion
+    ) -> DatasetItemEntity:
+        """Create the dataset item of a converted Datumaro item."""
+        raise NotImplementedError
+
+    def _create_lazy_dataset_item(self, key: Tuple[Subset, str, str]) -> DatasetItemEntity:
+        """Convert again the Datumaro item of a key of the lazy dataset, and create its dataset item."""
+        subset, item_id, datumaro_subset = key
+        datumaro_item = self.dataset[subset].get(item_id, datumaro_subset)
+        return self._create_dataset_item(subset, datumaro_item, self._convert_item(subset, datumaro_item))
+
+    def _get_converted_dataset(self) -> DatasetEntity:
+        """Convert the Datumaro items to a DatasetEntity and remove the unused label entities.
+
+        If lazy, only the keys of the items which are kept are collected, and the items of the LazyDatasetEntity
+        are converted again when they are accessed.
+        """
+        # the label indices of the converted shapes refer to the label entities before the unused ones are removed
+        self._shape_label_entities = self.label_entities
+        used_labels: Dict[int, None] = {}
+        dataset_items: List[DatasetItemEntity] = []
+        keys: List[Tuple[Subset, str, str]] = []
+        for subset, datumaro_item, conversion in self._convert_items():
+            used_labels.update(dict.fromkeys(conversion.used_labels))
+            if not conversion.keep:
+                continue
+            if self.lazy:
+                keys.append((subset, datumaro_item.id, datumaro_item.subset))
+            else:
+                dataset_items.append(self._create_dataset_item(subset, datumaro_item, conversion))
+        self.remove_unused_label_entities(list(used_labels))
+
+        if self.lazy:
+            return LazyDatasetEntity(keys, self._create_lazy_dataset_item, subsets=[key[0] for key in keys])
+        return DatasetEntity(items=dataset_items)
+
+    def _get_shape_annotation(self, shape_data: ShapeData) -> Annotation:
+        """Get the annotation entity of a converted shape."""
+        if shape_data.shape_type == ShapeType.RECTANGLE:
+            x1, y1, x2, y2 = shape_data.points.ravel().tolist()
+            shape = Rectangle(x1=x1, y1=y1, x2=x2, y2=y2)
+        else:
+            shape = Polygon.from_numpy(shape_data.points)
+        return Annotation(shape, labels=[ScoredLabel(label=self._shape_label_entities[shape_data.label])])
+
+    @staticmethod
+    def _get_media_scale(datumaro_media: DatumMediaElement) -> np.ndarray:
+        """Get the (width, height) of the media to normalize the coordinates."""
+        height, width = datumaro_media.size
+        return np.array([width, height], dtype=np.float64)
+
     def get_label_schema(self) -> LabelSchemaEntity:
         """Get Label Schema."""
         return self._generate_default_label_schema(self.label_entities)
@@ -336,17 +517,12 @@ class BaseDatasetAdapter(metaclass=abc.ABCMeta):
         self, annotation: DatumAnnotation, width: int, height: int, num_polygons: int = -1
     ) -> Annotation:
         """Get polygon entity."""
-        polygon = Polygon(
-            points=[
-                Point(x=annotation.points[i] / width, y=annotation.points[i + 1] / height)
-                for i in range(0, len(annotation.points), 2)
-            ]
-        )
-        step = 1 if num_polygons == -1 else len(polygon.points) // num_polygons
-        points = [polygon.points[i] for i in range(0, len(polygon.points), step)]
+        points = np.asarray(annotation.points, dtype=np.float64).reshape(-1, 2) / (width, height)
+        if num_polygons != -1:
+            points = points[:: len(points) // num_polygons]
 
         return Annotation(
-            Polygon(points),
+            Polygon.from_numpy(points),
             labels=[ScoredLabel(label=self.label_entities[annotation.label])],
         )
 
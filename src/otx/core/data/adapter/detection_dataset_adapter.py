@@ -5,16 +5,23 @@
 #
 
 # pylint: disable=invalid-name, too-many-locals, no-member, too-many-nested-blocks
-from typing import List
+from typing import Dict, List
 
+import numpy as np
 from datumaro.components.annotation import AnnotationType as DatumAnnotationType
+from datumaro.components.dataset_base import DatasetItem as DatumDatasetItem
 
 from otx.api.entities.dataset_item import DatasetItemEntityWithID
 from otx.api.entities.datasets import DatasetEntity
 from otx.api.entities.image import Image
 from otx.api.entities.model_template import TaskType
+from otx.api.entities.shapes.shape import ShapeType
 from otx.api.entities.subset import Subset
-from otx.core.data.adapter.base_dataset_adapter import BaseDatasetAdapter
+from otx.core.data.adapter.base_dataset_adapter import (
+    BaseDatasetAdapter,
+    ItemConversion,
+    ShapeData,
+)
 
 
 class DetectionDatasetAdapter(BaseDatasetAdapter):
@@ -28,39 +35,60 @@ class DetectionDatasetAdapter(BaseDatasetAdapter):
         # Prepare label information
         label_information = self._prepare_label_information(self.dataset)
         self.label_entities = label_information["label_entities"]
-        dataset_items: List[DatasetItemEntityWithID] = []
-        used_labels: List[int] = []
-        for subset, subset_data in self.dataset.items():
-            for _, datumaro_items in subset_data.subsets().items():
-                for datumaro_item in datumaro_items:
-                    image = self.datum_media_2_otx_media(datumaro_item.media)
-                    assert isinstance(image, Image)
-                    shapes = []
-                    for ann in datumaro_item.annotations:
-                        if (
-                            self.task_type in (TaskType.INSTANCE_SEGMENTATION, TaskType.ROTATED_DETECTION)
-                            and ann.type == DatumAnnotationType.polygon
-                        ):
-                            if self._is_normal_polygon(ann):
-                                shapes.append(self._get_polygon_entity(ann, image.width, image.height))
-                        if self.task_type is TaskType.DETECTION and ann.type == DatumAnnotationType.bbox:
-                            if self._is_normal_bbox(ann.points[0], ann.points[1], ann.points[2], ann.points[3]):
-                                shapes.append(self._get_normalized_bbox_entity(ann, image.width, image.height))
+        return self._get_converted_dataset()
 
-                        if ann.label not in used_labels:
-                            used_labels.append(ann.label)
+    def _create_dataset_item(
+        self, subset: Subset, datumaro_item: DatumDatasetItem, conversion: ItemConversion
+    ) -> DatasetItemEntityWithID:
+        """Create the dataset item of a converted Datumaro item, with the Datumaro item id."""
+        image = self.datum_media_2_otx_media(datumaro_item.media)
+        assert isinstance(image, Image)
+        shapes = [self._get_shape_annotation(shape_data) for shape_data in conversion.shapes]
+        return DatasetItemEntityWithID(
+            image,
+            self._get_ann_scene_entity(shapes),
+            subset=subset,
+            id_=datumaro_item.id,
+        )
 
-                    if (
-                        len(shapes) > 0
-                        or subset == Subset.UNLABELED
-                        or (subset != Subset.TRAINING and len(datumaro_item.annotations) == 0)
-                    ):
-                        dataset_item = DatasetItemEntityWithID(
-                            image,
-                            self._get_ann_scene_entity(shapes),
-                            subset=subset,
-                            id_=datumaro_item.id,
-                        )
-                        dataset_items.append(dataset_item)
-        self.remove_unused_label_entities(used_labels)
-        return DatasetEntity(items=dataset_items)
+    def _convert_item(self, subset: Subset, datumaro_item: DatumDatasetItem) -> ItemConversion:
+        """Convert the bboxes or the polygons of a Datumaro item to shapes, normalized all at once."""
+        shape_types: List[ShapeType] = []
+        labels: List[int] = []
+        num_points: List[int] = []
+        coordinates: List[float] = []
+        used_labels: Dict[int, None] = {}
+        convert_polygons = self.task_type in (TaskType.INSTANCE_SEGMENTATION, TaskType.ROTATED_DETECTION)
+        convert_bboxes = self.task_type is TaskType.DETECTION
+        for ann in datumaro_item.annotations:
+            if convert_polygons and ann.type == DatumAnnotationType.polygon:
+                points = ann.points
+                if self._is_normal_polygon(ann):
+                    shape_types.append(ShapeType.POLYGON)
+                    labels.append(ann.label)
+                    num_points.append(len(points) // 2)
+                    coordinates.extend(points)
+            if convert_bboxes and ann.type == DatumAnnotationType.bbox:
+                points = ann.points
+                if self._is_normal_bbox(points[0], points[1], points[2], points[3]):
+                    shape_types.append(ShapeType.RECTANGLE)
+                    labels.append(ann.label)
+                    num_points.append(2)
+                    coordinates.extend(points)
+
+            used_labels[ann.label] = None
+
+        shapes: List[ShapeData] = []
+        if shape_types:
+            points = np.array(coordinates, dtype=np.float64).reshape(-1, 2) / self._get_media_scale(datumaro_item.media)
+            start = 0
+            for shape_type, label, end in zip(shape_types, labels, num_points):
+                shapes.append(ShapeData(shape_type, points[start : start + end], label))
+                start += end
+
+        keep = (
+            len(shapes) > 0
+            or subset == Subset.UNLABELED
+            or (subset != Subset.TRAINING and len(datumaro_item.annotations) == 0)
+        )
+        return ItemConversion(shapes, list(used_labels), keep)
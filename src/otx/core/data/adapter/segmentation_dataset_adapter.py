@@ -15,6 +15,7 @@ import tqdm
 from datumaro.components.annotation import AnnotationType as DatumAnnotationType
 from datumaro.components.annotation import Mask
 from datumaro.components.dataset import Dataset as DatumDataset
+from datumaro.components.dataset_base import DatasetItem as DatumDatasetItem
 from datumaro.plugins.data_formats.common_semantic_segmentation import (
     CommonSemanticSegmentationBase,
     make_categories,
@@ -24,13 +25,17 @@ from datumaro.util.meta_file_util import parse_meta_file
 from skimage.segmentation import felzenszwalb
 
 from otx.algorithms.common.utils.logger import get_logger
-from otx.api.entities.annotation import Annotation
 from otx.api.entities.dataset_item import DatasetItemEntity
 from otx.api.entities.datasets import DatasetEntity
 from otx.api.entities.id import ID
 from otx.api.entities.image import Image
+from otx.api.entities.shapes.shape import ShapeType
 from otx.api.entities.subset import Subset
-from otx.core.data.adapter.base_dataset_adapter import BaseDatasetAdapter
+from otx.core.data.adapter.base_dataset_adapter import (
+    BaseDatasetAdapter,
+    ItemConversion,
+    ShapeData,
+)
 
 # pylint: disable=invalid-name, too-many-locals, no-member, too-many-nested-blocks, too-many-branches,
 # pylint: too-many-arguments
@@ -48,8 +53,6 @@ class SegmentationDatasetAdapter(BaseDatasetAdapter):
         label_information = self._prepare_label_information(self.dataset)
         self.label_entities = label_information["label_entities"]
 
-        dataset_items: List[DatasetItemEntity] = []
-        used_labels: List[int] = []
         self.updated_label_id: Dict[int, int] = {}
 
         if hasattr(self, "data_type_candidates"):
@@ -65,33 +68,38 @@ class SegmentationDatasetAdapter(BaseDatasetAdapter):
             # with "common_semantic_segmentation", so we can use it.
             self.set_common_labels()
 
-        for subset, subset_data in self.dataset.items():
-            for _, datumaro_items in subset_data.subsets().items():
-                for datumaro_item in datumaro_items:
-                    image = self.datum_media_2_otx_media(datumaro_item.media)
-                    assert isinstance(image, Image)
-                    shapes: List[Annotation] = []
-                    for ann in datumaro_item.annotations:
-                        if ann.type == DatumAnnotationType.mask:
-                            # TODO: consider case -> didn't include the background information
-                            datumaro_polygons = MasksToPolygons.convert_mask(ann)
-                            for d_polygon in datumaro_polygons:
-                                new_label = self.updated_label_id.get(d_polygon.label, None)
-                                if new_label is not None:
-                                    d_polygon.label = new_label
-                                else:
-                                    continue
-
-                                shapes.append(self._get_polygon_entity(d_polygon, image.width, image.height))
-                                if d_polygon.label not in used_labels:
-                                    used_labels.append(d_polygon.label)
-
-                    if len(shapes) > 0 or subset == Subset.UNLABELED:
-                        dataset_item = DatasetItemEntity(image, self._get_ann_scene_entity(shapes), subset=subset)
-                        dataset_items.append(dataset_item)
-
-        self.remove_unused_label_entities(used_labels)
-        return DatasetEntity(items=dataset_items)
+        return self._get_converted_dataset()
+
+    def _create_dataset_item(
+        self, subset: Subset, datumaro_item: DatumDatasetItem, conversion: ItemConversion
+    ) -> DatasetItemEntity:
+        """Create the dataset item of a converted Datumaro item."""
+        image = self.datum_media_2_otx_media(datumaro_item.media)
+        assert isinstance(image, Image)
+        shapes = [self._get_shape_annotation(shape_data) for shape_data in conversion.shapes]
+        return DatasetItemEntity(image, self._get_ann_scene_entity(shapes), subset=subset)
+
+    def _convert_item(self, subset: Subset, datumaro_item: DatumDatasetItem) -> ItemConversion:
+        """Convert the masks of a Datumaro item to normalized polygons."""
+        shapes: List[ShapeData] = []
+        used_labels: Dict[int, None] = {}
+        scale: Optional[np.ndarray] = None
+        for ann in datumaro_item.annotations:
+            if ann.type == DatumAnnotationType.mask:
+                # TODO: consider case -> didn't include the background information
+                datumaro_polygons = MasksToPolygons.convert_mask(ann)
+                for d_polygon in datumaro_polygons:
+                    new_label = self.updated_label_id.get(d_polygon.label, None)
+                    if new_label is None:
+                        continue
+
+                    if scale is None:
+                        scale = self._get_media_scale(datumaro_item.media)
+                    points = np.asarray(d_polygon.points, dtype=np.float64).reshape(-1, 2) / scale
+                    shapes.append(ShapeData(ShapeType.POLYGON, points, new_label))
+                    used_labels[new_label] = None
+
+        return ItemConversion(shapes, list(used_labels), len(shapes) > 0 or subset == Subset.UNLABELED)
 
     def set_voc_labels(self):
         """Set labels for common_semantic_segmentation dataset."""
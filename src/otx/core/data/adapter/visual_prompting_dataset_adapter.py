@@ -34,7 +34,8 @@ class VisualPromptingDatasetAdapter(SegmentationDatasetAdapter):
         self.label_entities = label_information["label_entities"]
 
         dataset_items: List[DatasetItemEntity] = []
-        used_labels: List[int] = []
+        # ordered set of the used labels
+        used_labels: Dict[int, None] = {}
         self.updated_label_id: Dict[int, int] = {}
 
         if hasattr(self, "data_type_candidates"):
@@ -76,14 +77,13 @@ class VisualPromptingDatasetAdapter(SegmentationDatasetAdapter):
                                         continue
 
                                     shapes.append(self._get_polygon_entity(d_polygon, image.width, image.height))
-                                    if d_polygon.label not in used_labels:
-                                        used_labels.append(d_polygon.label)
+                                    used_labels[d_polygon.label] = None
 
-                        if ann.label not in used_labels and ann.type != DatumAnnotationType.mask:
-                            used_labels.append(ann.label)
+                        if ann.type != DatumAnnotationType.mask:
+                            used_labels[ann.label] = None
 
                     if len(shapes) > 0:
                         dataset_item = DatasetItemEntity(image, self._get_ann_scene_entity(shapes), subset=subset)
                         dataset_items.append(dataset_item)
-        self.remove_unused_label_entities(used_labels)
+        self.remove_unused_label_entities(list(used_labels))
         return DatasetEntity(items=dataset_items)
@@ -3,7 +3,14 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+from .disk_cache_handler import DiskCacheHandlerError, DiskCacheHandlerSingleton
 from .mem_cache_handler import MemCacheHandlerError, MemCacheHandlerSingleton
 from .storage_cache import init_arrow_cache
 
-__all__ = ["MemCacheHandlerSingleton", "MemCacheHandlerError", "init_arrow_cache"]
+__all__ = [
+    "MemCacheHandlerSingleton",
+    "MemCacheHandlerError",
+    "DiskCacheHandlerSingleton",
+    "DiskCacheHandlerError",
+    "init_arrow_cache",
+]
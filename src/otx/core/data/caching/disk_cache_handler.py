@@ -0,0 +1,237 @@
+"""Persistent on-disk cache of decoded samples shared across processes and runs."""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import hashlib
+import os
+import shutil
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from otx.algorithms.common.utils.logger import get_logger
+from otx.core.file import OTX_CACHE
+
+logger = get_logger()
+DECODED_CACHE = os.path.join(OTX_CACHE, "decoded")
+DEFAULT_DISK_CACHE_SIZE = 10 * 1024**3
+
+
+class DiskCacheHandlerError(Exception):
+    """Exception class for DiskCacheHandler."""
+
+
+class DiskCacheHandlerBase:
+    """Null disk cache handler which never stores anything."""
+
+    def get_key(self, dataset_item: Any) -> Optional[str]:  # pylint: disable=unused-argument
+        """Get the content-addressed key of the dataset item or None if it cannot be cached."""
+        return None
+
+    def get(self, key: Optional[str]) -> Optional[np.ndarray]:  # pylint: disable=unused-argument
+        """Try to look up the cached sample with the given key."""
+        return None
+
+    def put(self, key: Optional[str], data: np.ndarray) -> bool:  # pylint: disable=unused-argument
+        """Try to store the sample with the given key."""
+        return False
+
+
+class DiskCacheHandler(DiskCacheHandlerBase):
+    """Persistent cache of decoded samples in ``.npy`` files which are memory-mapped on lookup.
+
+    A sample is addressed by the content of its source, i.e. the media path, its size and modification time
+    and the region of interest, so that later runs and parallel HPO trials can reuse it
+    without decoding the source again.
+    Files are written to a temporary path and atomically renamed, so concurrent writers are safe.
+
+    The cache is bounded by ``max_size``: when a new sample makes it larger, the least recently used samples
+    (by modification time, which is refreshed on lookup) are removed until it is below 90% of the limit.
+    The sizes of the samples written by other processes are counted when the cache directory is scanned,
+    i.e. at creation and on eviction. The whole cache can be removed with ``clear()``
+    or by deleting the cache directory.
+
+    Args:
+        cache_dir (str): The directory to store the samples.
+        max_size (int): The maximum size of the cached samples (bytes).
+    """
+
+    def __init__(self, cache_dir: str = DECODED_CACHE, max_size: int = DEFAULT_DISK_CACHE_SIZE):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        os.makedirs(cache_dir, exist_ok=True)
+        self._used_bytes = sum(size for _, size, _ in self._list_samples())
+
+    @property
+    def cache_dir(self) -> str:
+        """Get the directory to store the samples."""
+        return self._cache_dir
+
+    @property
+    def used_bytes(self) -> int:
+        """Get the size of the cached samples known by this process (bytes)."""
+        return self._used_bytes
+
+    def get_key(self, dataset_item: Any) -> Optional[str]:
+        """Get the content-addressed key of the dataset item.
+
+        Args:
+            dataset_item (DatasetItemEntity): The dataset item to be decoded.
+
+        Returns:
+            Optional[str]: The key or None if the media is not backed by a file.
+        """
+        path = getattr(dataset_item.media, "path", None)
+        if path is None:
+            return None
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        roi = dataset_item.roi.shape
+        _hash = hashlib.sha256()
+        _hash.update(os.path.abspath(path).encode("utf-8"))
+        _hash.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        _hash.update(f"{type(dataset_item.media).__name__}".encode("utf-8"))
+        _hash.update(f"{getattr(roi, 'x1', 0)}:{getattr(roi, 'y1', 0)}".encode("utf-8"))
+        _hash.update(f"{getattr(roi, 'x2', 1)}:{getattr(roi, 'y2', 1)}".encode("utf-8"))
+        return _hash.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], f"{key}.npy")
+
+    def _list_samples(self) -> List[Tuple[float, int, str]]:
+        """List the modification time, the size and the path of the cached samples."""
+        samples = []
+        for dirpath, _, filenames in os.walk(self._cache_dir):
+            for filename in filenames:
+                if not filename.endswith(".npy"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                samples.append((stat.st_mtime, stat.st_size, path))
+        return samples
+
+    def _evict(self) -> None:
+        """Remove the least recently used samples until the cache is below 90% of its size limit."""
+        samples = sorted(self._list_samples())
+        used_bytes = sum(size for _, size, _ in samples)
+        for _, size, path in samples:
+            if used_bytes <= 0.9 * self._max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # removed by another process
+                pass
+            used_bytes -= size
+        self._used_bytes = used_bytes
+
+    def get(self, key: Optional[str]) -> Optional[np.ndarray]:
+        """Try to look up the cached sample with the given key.
+
+        Returns:
+            Optional[np.ndarray]: Copy-on-write memory map of the sample if it is cached.
+        """
+        if key is None:
+            return None
+
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            data = np.load(path, mmap_mode="c", allow_pickle=False)
+            # mark the sample as recently used for the eviction
+            os.utime(path)
+            return data
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skip loading the corrupted cache {path} \nError msg: {e}")
+            return None
+
+    def put(self, key: Optional[str], data: np.ndarray) -> bool:
+        """Try to store the sample with the given key.
+
+        Returns:
+            bool: True if the sample is newly stored.
+        """
+        if key is None:
+            return False
+
+        path = self._get_path(key)
+        if os.path.exists(path) or data.nbytes > self._max_size:
+            return False
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(data), allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Skip caching to {path} \nError msg: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        self._used_bytes += os.path.getsize(path)
+        if self._used_bytes > self._max_size:
+            self._evict()
+        return True
+
+    def clear(self) -> None:
+        """Remove all the cached samples."""
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._used_bytes = 0
+
+
+class DiskCacheHandlerSingleton:
+    """A singleton class to create, delete and get DiskCacheHandlerBase."""
+
+    instance: DiskCacheHandlerBase
+
+    @classmethod
+    def get(cls) -> DiskCacheHandlerBase:
+        """Get the created DiskCacheHandlerBase.
+
+        If no one is created before, raise DiskCacheHandlerError.
+        """
+        if not hasattr(cls, "instance"):
+            cls_name = cls.__class__.__name__
+            raise DiskCacheHandlerError(f"Before calling {cls_name}.get(), you should call {cls_name}.create() first.")
+
+        return cls.instance
+
+    @classmethod
+    def create(
+        cls, mode: str, cache_dir: str = DECODED_CACHE, max_size: int = DEFAULT_DISK_CACHE_SIZE
+    ) -> DiskCacheHandlerBase:
+        """Create a new DiskCacheHandlerBase instance.
+
+        Args:
+            mode (str): There are two options: null or persistent.
+            cache_dir (str): The directory to store the samples if mode is persistent.
+            max_size (int): The maximum size of the cached samples if mode is persistent (bytes).
+        """
+        if mode == "null":
+            cls.instance = DiskCacheHandlerBase()
+        elif mode == "persistent":
+            logger.info(f"Decoded samples are cached to {cache_dir}.")
+            cls.instance = DiskCacheHandler(cache_dir, max_size)
+        else:
+            raise DiskCacheHandlerError(f"{mode} is unknown mode.")
+
+        return cls.instance
+
+    @classmethod
+    def delete(cls) -> None:
+        """Delete the existing DiskCacheHandlerBase instance."""
+        if hasattr(cls, "instance"):
+            del cls.instance
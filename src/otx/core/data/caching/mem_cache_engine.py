@@ -0,0 +1,245 @@
+"""Memory pool allocator and eviction policies for the memory cache handler."""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import abc
+import heapq
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type
+
+# (offset, nbytes, dtype, shape, meta)
+CacheAddr = Tuple[int, int, Any, Tuple[int, ...], Optional[Dict]]
+
+
+class FreeListAllocator:
+    """First-fit free-list allocator over a contiguous memory pool.
+
+    It only manages offsets, the actual bytes live in the buffer owned by the cache handler.
+    Adjacent free blocks are coalesced when a block is released,
+    so that evicting neighbouring items can produce a larger contiguous region.
+
+    Args:
+        mem_size (int): The size of memory pool (bytes).
+    """
+
+    def __init__(self, mem_size: int):
+        # Sorted by offset: [(offset, size), ...]
+        self._free_blocks: List[Tuple[int, int]] = [(0, mem_size)] if mem_size > 0 else []
+        self._used_bytes = 0
+
+    @property
+    def used_bytes(self) -> int:
+        """Get the number of allocated bytes."""
+        return self._used_bytes
+
+    def allocate(self, size: int) -> Optional[int]:
+        """Allocate a block of the given size.
+
+        Returns:
+            Optional[int]: The offset of the allocated block or None if there is no fitting free block.
+        """
+        for idx, (offset, block_size) in enumerate(self._free_blocks):
+            if block_size < size:
+                continue
+            if block_size == size:
+                del self._free_blocks[idx]
+            else:
+                self._free_blocks[idx] = (offset + size, block_size - size)
+            self._used_bytes += size
+            return offset
+        return None
+
+    def release(self, offset: int, size: int) -> None:
+        """Release the allocated block and coalesce it with its free neighbours."""
+        self._used_bytes -= size
+        blocks = self._free_blocks
+        idx = bisect_left(blocks, (offset, size))
+
+        if idx < len(blocks) and offset + size == blocks[idx][0]:
+            size += blocks[idx][1]
+            del blocks[idx]
+        if idx > 0 and blocks[idx - 1][0] + blocks[idx - 1][1] == offset:
+            offset = blocks[idx - 1][0]
+            size += blocks[idx - 1][1]
+            del blocks[idx - 1]
+
+        insort(blocks, (offset, size))
+
+
+class EvictionPolicy(abc.ABC):
+    """Base class of the policies choosing the item to evict from the memory cache."""
+
+    @abc.abstractmethod
+    def touch(self, key: Hashable, size: int, cost: float) -> None:
+        """Record an access (or an insertion) of the item."""
+
+    @abc.abstractmethod
+    def remove(self, key: Hashable) -> None:
+        """Forget the item."""
+
+    @abc.abstractmethod
+    def victim(self) -> Optional[Hashable]:
+        """Return the next item to evict."""
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """Evict the least recently used item first."""
+
+    def __init__(self):
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def touch(self, key: Hashable, size: int, cost: float) -> None:  # pylint: disable=unused-argument
+        """Record an access (or an insertion) of the item."""
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Forget the item."""
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        """Return the next item to evict."""
+        return next(iter(self._order), None)
+
+
+class CostAwareEvictionPolicy(EvictionPolicy):
+    """Evict the item with the lowest decoding cost per byte first (GreedyDual-Size).
+
+    Each item gets a priority of ``inflation + cost / size``.
+    When an item is evicted, ``inflation`` becomes its priority,
+    so that items which are not accessed for a long time age out eventually even if they are expensive.
+    """
+
+    def __init__(self):
+        self._inflation = 0.0
+        self._priorities: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = count()
+
+    def touch(self, key: Hashable, size: int, cost: float) -> None:
+        """Record an access (or an insertion) of the item."""
+        priority = self._inflation + cost / max(size, 1)
+        self._priorities[key] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), key))
+
+        if len(self._heap) > 2 * len(self._priorities) + 1024:
+            # Drop stale entries so that the heap does not grow with the number of accesses
+            self._heap = [entry for entry in self._heap if self._priorities.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def remove(self, key: Hashable) -> None:
+        """Forget the item, the stale heap entry is dropped lazily."""
+        self._priorities.pop(key, None)
+
+    def victim(self) -> Optional[Hashable]:
+        """Return the next item to evict."""
+        while self._heap:
+            priority, _, key = self._heap[0]
+            if self._priorities.get(key) == priority:
+                self._inflation = priority
+                return key
+            heapq.heappop(self._heap)
+        return None
+
+
+EVICTION_POLICIES: Dict[str, Type[EvictionPolicy]] = {
+    "lru": LRUEvictionPolicy,
+    "cost": CostAwareEvictionPolicy,
+}
+
+
+class MemCacheEngine:
+    """Bookkeeping of the memory cache: item index, allocation, eviction and statistics.
+
+    The engine never touches the cached bytes.
+    It tells the handler where an item lives (``lookup()``) or where a new item should be written (``allocate()``).
+
+    Args:
+        mem_size (int): The size of memory pool (bytes).
+        eviction_policy (str): "lru" or "cost". "cost" keeps the items which were expensive to decode per byte.
+    """
+
+    def __init__(self, mem_size: int, eviction_policy: str = "lru"):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"{eviction_policy} is unknown eviction policy, use one of {list(EVICTION_POLICIES)}.")
+
+        self._mem_size = mem_size
+        self._allocator = FreeListAllocator(mem_size)
+        self._policy: EvictionPolicy = EVICTION_POLICIES[eviction_policy]()
+        self._index: Dict[Hashable, Tuple[CacheAddr, float]] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "rejections": 0}
+
+    def num_items(self) -> int:
+        """Get the number of cached items."""
+        return len(self._index)
+
+    def used_bytes(self) -> int:
+        """Get the number of bytes occupied by the cached items."""
+        return self._allocator.used_bytes
+
+    def lookup(self, key: Hashable, update_stats: bool = True) -> Optional[CacheAddr]:
+        """Look up the address of the cached item and mark it as recently used."""
+        entry = self._index.get(key)
+
+        if entry is None:
+            if update_stats:
+                self._stats["misses"] += 1
+            return None
+
+        addr, cost = entry
+        self._policy.touch(key, addr[1], cost)
+        if update_stats:
+            self._stats["hits"] += 1
+        return addr
+
+    def allocate(
+        self,
+        key: Hashable,
+        nbytes: int,
+        dtype: Any,
+        shape: Tuple[int, ...],
+        meta: Optional[Dict] = None,
+        cost: float = 1.0,
+    ) -> Optional[int]:
+        """Reserve a memory block for the new item, evicting other items if required.
+
+        Returns:
+            Optional[int]: The offset to write the item or None if the item cannot be stored.
+        """
+        if key in self._index:
+            return None
+
+        if nbytes > self._mem_size:
+            self._stats["rejections"] += 1
+            return None
+
+        offset = self._allocator.allocate(nbytes)
+        while offset is None:
+            victim = self._policy.victim()
+            if victim is None:
+                self._stats["rejections"] += 1
+                return None
+            self._evict(victim)
+            offset = self._allocator.allocate(nbytes)
+
+        self._index[key] = ((offset, nbytes, dtype, shape, meta), cost)
+        self._policy.touch(key, nbytes, cost)
+        return offset
+
+    def _evict(self, key: Hashable) -> None:
+        (offset, nbytes, *_), _ = self._index.pop(key)
+        self._policy.remove(key)
+        self._allocator.release(offset, nbytes)
+        self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics (hits, misses, evictions, rejections, items and used bytes)."""
+        return {**self._stats, "items": len(self._index), "used_bytes": self.used_bytes()}
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss, eviction and rejection counters."""
+        for key in self._stats:
+            self._stats[key] = 0
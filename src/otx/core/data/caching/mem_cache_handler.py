@@ -5,7 +5,6 @@
 
 import ctypes as ct
 import multiprocessing as mp
-from multiprocessing.managers import DictProxy
 from typing import Any, Dict, Optional, Tuple, Union
 
 import numpy as np
@@ -14,6 +13,9 @@ from multiprocess.synchronize import Lock
 
 from otx.algorithms.common.utils.logger import get_logger
 
+from .mem_cache_engine import MemCacheEngine
+from .shared_mem_cache_engine import SharedMemCacheEngine
+
 logger = get_logger()
 GIB = 1024**3
 
@@ -30,21 +32,26 @@ class MemCacheHandlerBase:
     """Base class for memory cache handler.
 
     It will be combined with LoadImageFromOTXDataset to store/retrieve the samples in memory.
+    If the memory pool is full, the items are evicted according to the eviction policy.
+
+    Args:
+        mem_size (int): The size of memory pool (bytes).
+        eviction_policy (str): "lru" evicts the least recently used item first.
+            "cost" evicts the item with the lowest decoding cost per byte first.
     """
 
-    def __init__(self, mem_size: int):
-        self._init_data_structs(mem_size)
+    def __init__(self, mem_size: int, eviction_policy: str = "lru"):
+        self._init_data_structs(mem_size, eviction_policy)
 
-    def _init_data_structs(self, mem_size: int):
+    def _init_data_structs(self, mem_size: int, eviction_policy: str):
         self._arr = (ct.c_uint8 * mem_size)()
-        self._cur_page = ct.c_size_t(0)
-        self._cache_addr: Union[Dict, DictProxy] = {}
+        self._engine: MemCacheEngine = MemCacheEngine(mem_size, eviction_policy)
         self._lock: Union[Lock, _DummyLock] = _DummyLock()
         self._freeze = ct.c_bool(False)
 
     def __len__(self):
         """Get the number of cached items."""
-        return len(self._cache_addr)
+        return self._engine.num_items()
 
     @property
     def mem_size(self) -> int:
@@ -54,65 +61,84 @@ class MemCacheHandlerBase:
     def get(self, key: Any) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
         """Try to look up the cached item with the given key.
 
+        Hits and misses are counted only if the handler is not frozen.
+
         Args:
             key (Any): A key for looking up the cached item
 
         Returns:
             If succeed return (np.ndarray, Dict), otherwise return (None, None)
         """
-        if self.mem_size == 0 or key not in self._cache_addr:
+        if self.mem_size == 0:
             return None, None
 
-        addr = self._cache_addr[key]
+        with self._lock:
+            addr = self._engine.lookup(key, not self._freeze.value)
+            if addr is None:
+                return None, None
 
-        offset, count, dtype, shape, strides, meta = addr
+            offset, nbytes, dtype, shape, meta = addr
+            # Copy out because the memory block can be reused after the item is evicted
+            data = np.frombuffer(self._arr, dtype=np.uint8, count=nbytes, offset=offset).copy()
 
-        data = np.frombuffer(self._arr, dtype=dtype, count=count, offset=offset)
-        return np.lib.stride_tricks.as_strided(data, shape, strides), meta
+        return data.view(dtype).reshape(shape), meta
 
-    def put(self, key: Any, data: np.ndarray, meta: Optional[Dict] = None) -> Optional[int]:
+    def put(
+        self, key: Any, data: np.ndarray, meta: Optional[Dict] = None, cost: Optional[float] = None
+    ) -> Optional[int]:
         """Try to store np.ndarray and metadata with a key to the reserved memory pool.
 
         Args:
             key (Any): A key to store the cached item
             data (np.ndarray): A data sample to store
             meta (Optional[Dict]): A metadata of the data sample
+            cost (Optional[float]): The cost (e.g. seconds) to produce the data sample again.
+                It is used by the "cost" eviction policy. If not given, all items are equally costly.
 
         Returns:
-            Optional[int]: If succeed return the address of cached item in memory pool
+            Optional[int]: If succeed return the end address of cached item in memory pool
         """
-        if self._freeze.value:
+        if self._freeze.value or self.mem_size == 0:
             return None
 
+        data = np.ascontiguousarray(data)
         data_bytes = data.size * data.itemsize
 
         with self._lock:
-            new_page = self._cur_page.value + data_bytes
-
-            if key in self._cache_addr or new_page > self.mem_size:
+            offset = self._engine.allocate(key, data_bytes, data.dtype, data.shape, meta, 1.0 if cost is None else cost)
+            if offset is None:
                 return None
 
-            offset = ct.byref(self._arr, self._cur_page.value)
-            ct.memmove(offset, data.ctypes.data, data_bytes)
+            ct.memmove(ct.byref(self._arr, offset), data.ctypes.data, data_bytes)
+            return offset + data_bytes
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the cache statistics.
+
+        Returns:
+            Dict[str, int]: Counters of "hits", "misses", "evictions" and "rejections"
+                (items which could not be stored) since the last reset,
+                and the current number of "items" and "used_bytes".
+        """
+        return self._engine.stats()
 
-            self._cache_addr[key] = (
-                self._cur_page.value,
-                data.size,
-                data.dtype,
-                data.shape,
-                data.strides,
-                meta,
-            )
-            self._cur_page.value = new_page
-            return new_page
+    def reset_stats(self) -> None:
+        """Reset the hit, miss, eviction and rejection counters."""
+        self._engine.reset_stats()
 
     def __repr__(self):
         """Representation for the current handler status."""
-        perc = 100.0 * self._cur_page.value / self.mem_size if self.mem_size > 0 else 0.0
+        stats = self.get_stats()
+        used_bytes = stats["used_bytes"]
+        perc = 100.0 * used_bytes / self.mem_size if self.mem_size > 0 else 0.0
+        num_accesses = stats["hits"] + stats["misses"]
+        hit_rate = 100.0 * stats["hits"] / num_accesses if num_accesses > 0 else 0.0
         return (
             f"{self.__class__.__name__} "
-            f"uses {self._cur_page.value} / {self.mem_size} ({perc:.1f}%) memory pool and "
-            f"store {len(self)} items."
+            f"uses {used_bytes} / {self.mem_size} ({perc:.1f}%) memory pool and "
+            f"store {stats['items']} items. "
+            f"hits: {stats['hits']}, misses: {stats['misses']} ({hit_rate:.1f}% hit rate), "
+            f"evictions: {stats['evictions']}, rejections: {stats['rejections']}."
         )
 
     def freeze(self):
@@ -135,20 +161,47 @@ class MemCacheHandlerForMP(MemCacheHandlerBase):
     """Memory caching handler for multi processing.
 
     Use if PyTorch's DataLoader.num_workers > 0.
+    The index lives in shared memory as well as the memory pool,
+    so that looking up an item from the DataLoader workers requires neither IPC nor lock.
     """
 
-    def _init_data_structs(self, mem_size: int):
-        self._arr = mp.Array(ct.c_uint8, mem_size, lock=False)
-        self._cur_page = mp.Value(ct.c_size_t, 0, lock=False)
-
-        self._manager = mp.Manager()
-        self._cache_addr: DictProxy = self._manager.dict()
-        self._lock = mp.Lock()
+    def _init_data_structs(self, mem_size: int, eviction_policy: str):
+        self._engine: SharedMemCacheEngine = SharedMemCacheEngine(mem_size, eviction_policy)  # type: ignore[assignment]
+        self._arr = self._engine.pool
         self._freeze = mp.Value(ct.c_bool, False, lock=False)
 
-    def __del__(self):
-        """When deleting, manager should also be shutdowned."""
-        self._manager.shutdown()
+    def get(self, key: Any) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+        """Try to look up the cached item with the given key.
+
+        Args:
+            key (Any): A key for looking up the cached item
+
+        Returns:
+            If succeed return (np.ndarray, Dict), otherwise return (None, None)
+        """
+        if self.mem_size == 0:
+            return None, None
+
+        return self._engine.get(key, not self._freeze.value)
+
+    def put(
+        self, key: Any, data: np.ndarray, meta: Optional[Dict] = None, cost: Optional[float] = None
+    ) -> Optional[int]:
+        """Try to store np.ndarray and metadata with a key to the reserved memory pool.
+
+        Args:
+            key (Any): A key to store the cached item
+            data (np.ndarray): A data sample to store
+            meta (Optional[Dict]): A metadata of the data sample
+            cost (Optional[float]): The cost (e.g. seconds) to produce the data sample again.
+
+        Returns:
+            Optional[int]: If succeed return the end address of cached item in memory pool
+        """
+        if self._freeze.value or self.mem_size == 0:
+            return None
+
+        return self._engine.put(key, np.ascontiguousarray(data), meta, 1.0 if cost is None else cost)
 
 
 class MemCacheHandlerError(Exception):
@@ -174,12 +227,13 @@ class MemCacheHandlerSingleton:
         return cls.instance
 
     @classmethod
-    def create(cls, mode: str, mem_size: int) -> MemCacheHandlerBase:
+    def create(cls, mode: str, mem_size: int, eviction_policy: str = "lru") -> MemCacheHandlerBase:
         """Create a new MemCacheHandlerBase instance.
 
         Args:
             mode (str): There are two options: null, multiprocessing or singleprocessing.
             mem_size (int): The size of memory pool (bytes).
+            eviction_policy (str): There are two options: lru or cost.
         """
 
         # COPY FROM mmcv.runner.get_dist_info
@@ -208,9 +262,9 @@ class MemCacheHandlerSingleton:
             cls.instance = MemCacheHandlerBase(mem_size=0)
             cls.instance.freeze()
         elif mode == "multiprocessing":
-            cls.instance = MemCacheHandlerForMP(mem_size)
+            cls.instance = MemCacheHandlerForMP(mem_size, eviction_policy)
         elif mode == "singleprocessing":
-            cls.instance = MemCacheHandlerForSP(mem_size)
+            cls.instance = MemCacheHandlerForSP(mem_size, eviction_policy)
         else:
             raise MemCacheHandlerError(f"{mode} is unknown mode.")
 
@@ -0,0 +1,369 @@
+"""Memory cache engine living in shared memory so that DataLoader workers can look up items without IPC."""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import ctypes as ct
+import hashlib
+import multiprocessing as mp
+import os
+import pickle
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from .mem_cache_engine import EVICTION_POLICIES
+
+# The pickled (dtype, shape, meta) header is kept in the record if it is small enough,
+# so that the memory pool is used only for the data itself in most cases.
+_INLINE_HEADER_NBYTES = 192
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("seq", np.uint64),
+        ("state", np.uint64),
+        ("key_hi", np.uint64),
+        ("key_lo", np.uint64),
+        ("offset", np.uint64),
+        ("header_nbytes", np.uint64),
+        ("nbytes", np.uint64),
+        ("score", np.float64),
+        ("cost", np.float64),
+        ("header", f"V{_INLINE_HEADER_NBYTES}"),
+    ]
+)
+
+_EMPTY, _USED, _DELETED = 0, 1, 2
+_STAT_NAMES = ("hits", "misses", "evictions", "rejections")
+_NUM_STAT_ROWS = 64
+_MAX_LOAD_FACTOR = 0.7
+_AVG_ITEM_SIZE_HINT = 64 * 1024
+_MAX_READ_RETRIES = 16
+
+
+def _digest_key(key: Hashable) -> Tuple[int, int]:
+    """Hash the key to 128 bits which are stable across processes unlike the built-in hash()."""
+    digest = hashlib.blake2b(pickle.dumps(key, protocol=4), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+def _get_pool_nbytes(header_nbytes: int, nbytes: int) -> int:
+    return nbytes if header_nbytes <= _INLINE_HEADER_NBYTES else header_nbytes + nbytes
+
+
+def _get_default_capacity(mem_size: int) -> int:
+    num_items = max(1024, int(mem_size / _AVG_ITEM_SIZE_HINT / _MAX_LOAD_FACTOR))
+    return 1 << (num_items - 1).bit_length()
+
+
+class SharedMemCacheEngine:
+    """Memory cache engine whose index, allocator and data pool are all placed in shared memory.
+
+    The index is an open-addressing hash table of fixed-size records (``RECORD_DTYPE``).
+    Writers are serialized by a lock, but readers never take it.
+    Instead, each record has a sequence number (seqlock) which is odd while a writer modifies the record
+    or reuses the memory block of the record. A reader copies the item out of the pool
+    and retries if the sequence number has changed in the meantime.
+    Rebuilding the table is guarded by a table-wide generation number in the same manner.
+
+    Args:
+        mem_size (int): The size of memory pool (bytes).
+        eviction_policy (str): "lru" or "cost". "cost" keeps the items which were expensive to decode per byte.
+        capacity (Optional[int]): The number of hash table records. It is rounded up to a power of two.
+            If not given, it is derived from mem_size.
+    """
+
+    def __init__(self, mem_size: int, eviction_policy: str = "lru", capacity: Optional[int] = None):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"{eviction_policy} is unknown eviction policy, use one of {list(EVICTION_POLICIES)}.")
+
+        capacity = _get_default_capacity(mem_size) if capacity is None else 1 << (max(capacity, 2) - 1).bit_length()
+
+        self._cost_aware = eviction_policy == "cost"
+        self._capacity = capacity
+        self._max_items = int(capacity * _MAX_LOAD_FACTOR)
+
+        self.pool = mp.RawArray(ct.c_uint8, mem_size)
+        self._table = mp.RawArray(ct.c_uint8, capacity * RECORD_DTYPE.itemsize)
+        self._free_list = mp.RawArray(ct.c_int64, 2 * (capacity + 1))
+        self._stats = mp.RawArray(ct.c_uint64, _NUM_STAT_ROWS * len(_STAT_NAMES))
+
+        self._generation = mp.RawValue(ct.c_uint64, 0)
+        self._num_used = mp.RawValue(ct.c_int64, 0)
+        self._num_deleted = mp.RawValue(ct.c_int64, 0)
+        self._num_free_blocks = mp.RawValue(ct.c_int64, 1 if mem_size > 0 else 0)
+        self._used_bytes = mp.RawValue(ct.c_int64, 0)
+        self._inflation = mp.RawValue(ct.c_double, 0.0)
+        self._lock = mp.Lock()
+
+        self._init_views()
+        self._free_offsets[0] = 0
+        self._free_sizes[0] = mem_size
+
+    def _init_views(self):
+        self._pool_np = np.frombuffer(self.pool, dtype=np.uint8)
+        self._records = np.frombuffer(self._table, dtype=RECORD_DTYPE)
+        self._free_offsets = np.frombuffer(self._free_list, dtype=np.int64)[: self._capacity + 1]
+        self._free_sizes = np.frombuffer(self._free_list, dtype=np.int64)[self._capacity + 1 :]
+        self._stats_np = np.frombuffer(self._stats, dtype=np.uint64).reshape(_NUM_STAT_ROWS, len(_STAT_NAMES))
+
+    def __getstate__(self):
+        """Numpy views cannot be pickled, they are re-created on unpickling instead."""
+        state = self.__dict__.copy()
+        for name in ("_pool_np", "_records", "_free_offsets", "_free_sizes", "_stats_np"):
+            state.pop(name)
+        return state
+
+    def __setstate__(self, state):
+        """Re-create numpy views over the shared memory."""
+        self.__dict__.update(state)
+        self._init_views()
+
+    @property
+    def capacity(self) -> int:
+        """Get the number of hash table records."""
+        return self._capacity
+
+    def num_items(self) -> int:
+        """Get the number of cached items."""
+        return self._num_used.value
+
+    def used_bytes(self) -> int:
+        """Get the number of bytes occupied by the cached items."""
+        return self._used_bytes.value
+
+    def _count(self, name: str, value: int = 1):
+        # Each process mostly increments its own row, so that non-atomic increments rarely collide.
+        self._stats_np[os.getpid() % _NUM_STAT_ROWS, _STAT_NAMES.index(name)] += value
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics (hits, misses, evictions, rejections, items and used bytes)."""
+        totals = self._stats_np.sum(axis=0)
+        stats = {name: int(total) for name, total in zip(_STAT_NAMES, totals)}
+        return {**stats, "items": self.num_items(), "used_bytes": self.used_bytes()}
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss, eviction and rejection counters."""
+        self._stats_np[:] = 0
+
+    def _find(self, key_hi: int, key_lo: int) -> Optional[int]:
+        states = self._records["state"]
+        keys_hi = self._records["key_hi"]
+        keys_lo = self._records["key_lo"]
+        mask = self._capacity - 1
+        idx = key_lo & mask
+
+        for _ in range(self._capacity):
+            state = states[idx]
+            if state == _EMPTY:
+                return None
+            if state == _USED and keys_hi[idx] == key_hi and keys_lo[idx] == key_lo:
+                return idx
+            idx = (idx + 1) & mask
+
+        return None
+
+    def _get_score(self, cost: float, nbytes: int) -> float:
+        if self._cost_aware:
+            return self._inflation.value + cost / max(nbytes, 1)
+        return time.monotonic()
+
+    def get(self, key: Hashable, update_stats: bool = True) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+        """Look up the cached item without taking the writer lock.
+
+        Returns:
+            If succeed return (np.ndarray, Dict), otherwise return (None, None)
+        """
+        key_hi, key_lo = _digest_key(key)
+
+        for _ in range(_MAX_READ_RETRIES):
+            generation = self._generation.value
+            if generation % 2 == 1:
+                continue
+
+            idx = self._find(key_hi, key_lo)
+            if idx is None:
+                if self._generation.value != generation:
+                    continue
+                break
+
+            record = self._records[idx].item()
+            seq, state, rec_key_hi, rec_key_lo, offset, header_nbytes, nbytes, _, cost, inline_header = record
+            if seq % 2 == 1 or state != _USED or rec_key_hi != key_hi or rec_key_lo != key_lo:
+                continue
+
+            pool_nbytes = _get_pool_nbytes(header_nbytes, nbytes)
+            block = self._pool_np[offset : offset + pool_nbytes].copy()
+
+            if self._records["seq"][idx] != seq or self._generation.value != generation:
+                continue
+
+            # The copy is consistent, it is safe to decode it now
+            if pool_nbytes == nbytes:
+                header = inline_header[:header_nbytes]
+            else:
+                header, block = block[:header_nbytes].tobytes(), block[header_nbytes:]
+            dtype, shape, meta = pickle.loads(header)
+            self._records["score"][idx] = self._get_score(cost, pool_nbytes)
+            if update_stats:
+                self._count("hits")
+            return block.view(dtype).reshape(shape), meta
+
+        if update_stats:
+            self._count("misses")
+        return None, None
+
+    def put(self, key: Hashable, data: np.ndarray, meta: Optional[Dict] = None, cost: float = 1.0) -> Optional[int]:
+        """Store the item, evicting other items if required.
+
+        Args:
+            key (Hashable): A key to store the cached item
+            data (np.ndarray): A C-contiguous data sample to store
+            meta (Optional[Dict]): A metadata of the data sample
+            cost (float): The cost to produce the data sample again
+
+        Returns:
+            Optional[int]: If succeed return the end address of cached item in memory pool
+        """
+        key_hi, key_lo = _digest_key(key)
+        header = pickle.dumps((data.dtype, data.shape, meta), protocol=pickle.HIGHEST_PROTOCOL)
+        header_nbytes = len(header)
+        total_nbytes = _get_pool_nbytes(header_nbytes, data.nbytes)
+        data_offset = total_nbytes - data.nbytes
+
+        with self._lock:
+            if self._find(key_hi, key_lo) is not None:
+                return None
+
+            if total_nbytes > len(self._pool_np):
+                self._count("rejections")
+                return None
+
+            while self._num_used.value >= self._max_items:
+                self._evict(self._select_victim())
+
+            if self._num_used.value + self._num_deleted.value >= self._max_items:
+                self._rebuild()
+
+            offset = self._allocate(total_nbytes)
+            while offset is None:
+                if self._num_used.value == 0:
+                    self._count("rejections")
+                    return None
+                self._evict(self._select_victim())
+                offset = self._allocate(total_nbytes)
+
+            if data_offset > 0:
+                self._pool_np[offset : offset + data_offset] = np.frombuffer(header, dtype=np.uint8)
+            self._pool_np[offset + data_offset : offset + total_nbytes] = data.reshape(-1).view(np.uint8)
+
+            idx = self._find_slot_to_insert(key_lo)
+            if self._records["state"][idx] == _DELETED:
+                self._num_deleted.value -= 1
+
+            records = self._records
+            seq = int(records["seq"][idx])
+            records["seq"][idx] = seq + 1
+            records["key_hi"][idx] = key_hi
+            records["key_lo"][idx] = key_lo
+            records["offset"][idx] = offset
+            records["header_nbytes"][idx] = header_nbytes
+            records["nbytes"][idx] = data.nbytes
+            records["cost"][idx] = cost
+            if data_offset == 0:
+                records["header"][idx] = np.void(header.ljust(_INLINE_HEADER_NBYTES, b"\0"))
+            records["score"][idx] = self._get_score(cost, total_nbytes)
+            records["state"][idx] = _USED
+            records["seq"][idx] = seq + 2
+
+            self._num_used.value += 1
+            return offset + total_nbytes
+
+    def _find_slot_to_insert(self, key_lo: int) -> int:
+        states = self._records["state"]
+        mask = self._capacity - 1
+        idx = key_lo & mask
+        while states[idx] == _USED:
+            idx = (idx + 1) & mask
+        return idx
+
+    def _select_victim(self) -> int:
+        scores = np.where(self._records["state"] == _USED, self._records["score"], np.inf)
+        return int(np.argmin(scores))
+
+    def _evict(self, idx: int) -> None:
+        records = self._records
+        seq = int(records["seq"][idx])
+        records["seq"][idx] = seq + 1
+        records["state"][idx] = _DELETED
+        if self._cost_aware:
+            self._inflation.value = float(records["score"][idx])
+        self._release(
+            int(records["offset"][idx]),
+            _get_pool_nbytes(int(records["header_nbytes"][idx]), int(records["nbytes"][idx])),
+        )
+        records["seq"][idx] = seq + 2
+
+        self._num_used.value -= 1
+        self._num_deleted.value += 1
+        self._count("evictions")
+
+    def _rebuild(self) -> None:
+        """Re-insert the used records to a fresh table to get rid of the deleted ones."""
+        self._generation.value += 1
+
+        used = self._records[self._records["state"] == _USED].copy()
+        self._records[:] = np.zeros(1, dtype=RECORD_DTYPE)
+        for record in used:
+            self._records[self._find_slot_to_insert(int(record["key_lo"]))] = record
+        self._num_deleted.value = 0
+
+        self._generation.value += 1
+
+    def _allocate(self, size: int) -> Optional[int]:
+        num_blocks = self._num_free_blocks.value
+        offsets, sizes = self._free_offsets, self._free_sizes
+
+        candidates = np.flatnonzero(sizes[:num_blocks] >= size)
+        if len(candidates) == 0:
+            return None
+
+        idx = candidates[0]
+        offset = int(offsets[idx])
+        if sizes[idx] == size:
+            offsets[idx : num_blocks - 1] = offsets[idx + 1 : num_blocks]
+            sizes[idx : num_blocks - 1] = sizes[idx + 1 : num_blocks]
+            self._num_free_blocks.value -= 1
+        else:
+            offsets[idx] += size
+            sizes[idx] -= size
+
+        self._used_bytes.value += size
+        return offset
+
+    def _release(self, offset: int, size: int) -> None:
+        num_blocks = self._num_free_blocks.value
+        offsets, sizes = self._free_offsets, self._free_sizes
+        self._used_bytes.value -= size
+
+        idx = int(np.searchsorted(offsets[:num_blocks], offset))
+        merge_next = idx < num_blocks and offset + size == offsets[idx]
+        merge_prev = idx > 0 and offsets[idx - 1] + sizes[idx - 1] == offset
+
+        if merge_prev and merge_next:
+            sizes[idx - 1] += size + sizes[idx]
+            offsets[idx : num_blocks - 1] = offsets[idx + 1 : num_blocks]
+            sizes[idx : num_blocks - 1] = sizes[idx + 1 : num_blocks]
+            self._num_free_blocks.value -= 1
+        elif merge_prev:
+            sizes[idx - 1] += size
+        elif merge_next:
+            offsets[idx] = offset
+            sizes[idx] += size
+        else:
+            offsets[idx + 1 : num_blocks + 1] = offsets[idx:num_blocks]
+            sizes[idx + 1 : num_blocks + 1] = sizes[idx:num_blocks]
+            offsets[idx] = offset
+            sizes[idx] = size
+            self._num_free_blocks.value += 1
@@ -4,19 +4,186 @@
 #
 
 import hashlib
+import json
 import os
 import shutil
-import stat
-from typing import List, Optional
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
+import pyarrow as pa
 from datumaro.components.dataset import Dataset as DatumDataset
 from datumaro.components.progress_reporting import SimpleProgressReporter
+from datumaro.plugins.data_formats.arrow.format import DatumaroArrow
+from datumaro.plugins.data_formats.arrow.mapper.dataset_item import DatasetItemMapper
 
 from otx.core.file import OTX_CACHE
 
 DATASET_CACHE = os.path.join(OTX_CACHE, "dataset")
 
 
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _scan_media_stats(paths: Iterable[str], num_workers: int = 0) -> Dict[str, Tuple[int, int]]:
+    """Get (size, mtime_ns) of the media files by scanning each parent directory once."""
+    paths_by_dir: Dict[str, Set[str]] = defaultdict(set)
+    for path in paths:
+        paths_by_dir[os.path.dirname(path)].add(os.path.basename(path))
+
+    def _scan(directory: str) -> Dict[str, Tuple[int, int]]:
+        names = paths_by_dir[directory]
+        stats = {}
+        try:
+            with os.scandir(directory or ".") as entries:
+                for entry in entries:
+                    if entry.name in names:
+                        stat = entry.stat()
+                        stats[os.path.join(directory, entry.name)] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return stats
+
+    media_stats: Dict[str, Tuple[int, int]] = {}
+    with ThreadPoolExecutor(max_workers=max(num_workers, 1)) as executor:
+        for stats in executor.map(_scan, paths_by_dir.keys()):
+            media_stats.update(stats)
+    return media_stats
+
+
+def _get_item_key(subset: str, item_id: str) -> str:
+    return json.dumps([subset, item_id])
+
+
+def _get_item_signatures(dataset: DatumDataset, num_workers: int = 0) -> Dict[str, str]:
+    """Get a signature of the media and annotations of each item.
+
+    Media files are identified by their path, size and modification time,
+    in-memory media by their contents.
+    """
+    items = list(dataset)
+    media_stats = _scan_media_stats(
+        [item.media.path for item in items if getattr(item.media, "path", None)],
+        num_workers,
+    )
+
+    signatures = {}
+    for item in items:
+        _hash = hashlib.sha256()
+        record = DatasetItemMapper.forward(item, media={"encoder": "NONE"})
+        _hash.update(record["annotations"])
+        _hash.update(record["attributes"])
+
+        path = getattr(item.media, "path", None)
+        if path:
+            _hash.update(f"{path}:{media_stats.get(path)}".encode("utf-8"))
+        elif getattr(item.media, "bytes", None) is not None:
+            _hash.update(item.media.bytes)
+        elif getattr(item.media, "data", None) is not None:
+            _hash.update(np.ascontiguousarray(item.media.data).tobytes())
+
+        signatures[_get_item_key(item.subset, item.id)] = _hash.hexdigest()
+    return signatures
+
+
+def _get_schema_hash(dataset: DatumDataset) -> str:
+    """Shards can be combined only if the categories, infos and media type are identical."""
+    metadata = DatumaroArrow.create_schema_with_metadata(dataset).metadata
+    _hash = hashlib.sha256()
+    for key in sorted(metadata):
+        _hash.update(key)
+        _hash.update(metadata[key])
+    return _hash.hexdigest()
+
+
+def _read_shard_keys(shard_path: str) -> List[str]:
+    with pa.memory_map(shard_path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        ids = table.column(DatumaroArrow.ID_FIELD).to_pylist()
+        subsets = table.column(DatumaroArrow.SUBSET_FIELD).to_pylist()
+    return [_get_item_key(subset, item_id) for subset, item_id in zip(subsets, ids)]
+
+
+def _drop_shard_items(shard_path: str, keys: Set[str]) -> bool:
+    """Rewrite the shard without the given items. Return False if the shard became empty and was removed."""
+    with pa.memory_map(shard_path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        ids = table.column(DatumaroArrow.ID_FIELD).to_pylist()
+        subsets = table.column(DatumaroArrow.SUBSET_FIELD).to_pylist()
+        mask = pa.array([_get_item_key(subset, item_id) not in keys for subset, item_id in zip(subsets, ids)])
+        table = table.filter(mask)
+
+    if len(table) == 0:
+        os.remove(shard_path)
+        return False
+
+    tmp_path = f"{shard_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, shard_path)
+    return True
+
+
+def _load_manifest(cache_dir: str) -> Optional[Dict]:
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    # Every shard should be intact
+    for shard, mtime_ns in manifest["shards"].items():
+        shard_path = os.path.join(cache_dir, shard)
+        if not os.path.exists(shard_path) or os.stat(shard_path).st_mtime_ns != mtime_ns:
+            return None
+    return manifest
+
+
+def _save_manifest(cache_dir: str, manifest: Dict) -> None:
+    manifest["shards"] = {
+        shard: os.stat(os.path.join(cache_dir, shard)).st_mtime_ns
+        for shard in sorted({shard for _, shard in manifest["items"].values()})
+    }
+    tmp_path = os.path.join(cache_dir, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_FILE))
+
+
+def _export(dataset: DatumDataset, cache_dir: str, scheme: str, num_workers: int, prefix: str) -> List[str]:
+    """Export the dataset to new shards and return their file names.
+
+    The shards are written to a temporary directory next to the cache directory first
+    and moved into it one by one, so that an interrupted export never leaves a partial shard behind.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(cache_dir))
+    try:
+        dataset.export(
+            tmp_dir,
+            "arrow",
+            save_media=True,
+            image_ext=scheme,
+            num_workers=num_workers,
+            prefix=prefix,
+            progress_reporter=SimpleProgressReporter(0, 10),
+        )
+        shards = sorted(file for file in os.listdir(tmp_dir) if file.endswith(".arrow"))
+        for shard in shards:
+            os.replace(os.path.join(tmp_dir, shard), os.path.join(cache_dir, shard))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return shards
+
+
 def arrow_cache_helper(
     dataset: DatumDataset,
     scheme: str,
@@ -26,6 +193,11 @@ def arrow_cache_helper(
 ) -> List[str]:
     """A helper for dumping Datumaro arrow format.
 
+    The cache directory is keyed by the source path and the scheme, and its contents are updated incrementally.
+    A manifest keeps the signature (media size and modification time, annotations) of each item
+    and the shard it is stored in. Only new or changed items are exported into extra shards,
+    and deleted or changed items are dropped from their previous shards.
+
     Args:
         dataset: Datumaro dataset to export in apache arrow.
         scheme: Datumaro apache arrow image encoding scheme.
@@ -35,27 +207,9 @@ def arrow_cache_helper(
     """
 
     def get_hash(dataset, scheme):
-        source_path = dataset.data_path
         _hash = hashlib.sha256()
-        _hash.update(f"{source_path}".encode("utf-8"))
-        _hash.update(f"{len(dataset)}".encode("utf-8"))
+        _hash.update(f"{dataset.data_path}".encode("utf-8"))
         _hash.update(f"{scheme}".encode("utf-8"))
-        if source_path:
-            _hash.update(str(os.stat(source_path)[stat.ST_MTIME]).encode("utf-8"))
-            if os.path.isdir(source_path):
-                for root, dirs, files in os.walk(source_path):
-                    for file in files:
-                        file = os.path.join(root, file)
-                        _hash.update(str(os.stat(file)[stat.ST_MTIME]).encode("utf-8"))
-                    for _dir in dirs:
-                        _dir = os.path.join(root, _dir)
-                        _hash.update(str(os.stat(_dir)[stat.ST_MTIME]).encode("utf-8"))
-        return _hash.hexdigest()
-
-    def get_file_hash(file):
-        _hash = hashlib.sha256()
-        _hash.update(str(file).encode("utf-8"))
-        _hash.update(str(os.stat(file)[stat.ST_MTIME]).encode("utf-8"))
         return _hash.hexdigest()
 
     cache_dir = os.path.join(cache_dir, get_hash(dataset, scheme))
@@ -63,43 +217,53 @@ def arrow_cache_helper(
         shutil.rmtree(cache_dir)
     os.makedirs(cache_dir, exist_ok=True)
 
-    cache_paths = []
-    cache_hit = []
-    for cache_path in os.listdir(cache_dir):
-        if not cache_path.endswith(".arrow"):
-            continue
-        cache_hit.append(False)
-        cache_path = os.path.join(cache_dir, cache_path)
-        cache_paths.append(cache_path)
-        hash_path = f"{cache_path}.hash"
-        if os.path.exists(cache_path) and os.path.exists(hash_path):
-            with open(hash_path, "r", encoding="utf-8") as f:
-                if get_file_hash(cache_path) == f.read():
-                    cache_hit[-1] = True
-
-    if cache_hit and all(cache_hit):
-        return cache_paths
-
-    dataset.export(
-        cache_dir,
-        "arrow",
-        save_media=True,
-        image_ext=scheme,
-        num_workers=num_workers,
-        progress_reporter=SimpleProgressReporter(0, 10),
-    )
+    signatures = _get_item_signatures(dataset, num_workers)
+    schema_hash = _get_schema_hash(dataset)
+    manifest = _load_manifest(cache_dir)
 
-    cache_paths = []
-    for cache_path in os.listdir(cache_dir):
-        if not cache_path.endswith(".arrow"):
-            continue
-        cache_path = os.path.join(cache_dir, cache_path)
-        cache_paths.append(cache_path)
-        hash_path = f"{cache_path}.hash"
-        with open(hash_path, "w", encoding="utf-8") as f:
-            f.write(get_file_hash(cache_path))
+    if manifest is None or manifest["schema"] != schema_hash:
+        for file in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, file))
+        manifest = {"version": MANIFEST_VERSION, "schema": schema_hash, "num_exports": 0, "items": {}}
+        updated_keys = set(signatures.keys())
+        removed_keys: Set[str] = set()
+    else:
+        # Drop the shards of an export interrupted before its manifest was saved
+        for file in os.listdir(cache_dir):
+            if file.endswith(".arrow") and file not in manifest["shards"]:
+                os.remove(os.path.join(cache_dir, file))
 
-    return cache_paths
+        stored_items = manifest["items"]
+        updated_keys = {key for key, signature in signatures.items() if stored_items.get(key, [None])[0] != signature}
+        removed_keys = (set(stored_items.keys()) - set(signatures.keys())) | (updated_keys & set(stored_items.keys()))
+
+        keys_by_shard: Dict[str, Set[str]] = defaultdict(set)
+        for key in removed_keys:
+            keys_by_shard[stored_items.pop(key)[1]].add(key)
+        for shard, keys in keys_by_shard.items():
+            _drop_shard_items(os.path.join(cache_dir, shard), keys)
+
+    if updated_keys:
+        if len(updated_keys) == len(dataset):
+            delta = dataset
+        else:
+            delta = DatumDataset.from_iterable(
+                [item for item in dataset if _get_item_key(item.subset, item.id) in updated_keys],
+                categories=dataset.categories(),
+                media_type=dataset.media_type(),
+            )
+            # Store the media paths relative to the source path as the other shards do
+            delta._source_path = dataset.data_path  # pylint: disable=protected-access
+        prefix = f"datum{manifest['num_exports']}"
+        manifest["num_exports"] += 1
+        for shard in _export(delta, cache_dir, scheme, num_workers, prefix):
+            for key in _read_shard_keys(os.path.join(cache_dir, shard)):
+                manifest["items"][key] = [signatures[key], shard]
+
+    if updated_keys or removed_keys:
+        _save_manifest(cache_dir, manifest)
+
+    return [os.path.join(cache_dir, shard) for shard in manifest.get("shards", {})]
 
 
 def init_arrow_cache(dataset: DatumDataset, scheme: Optional[str] = None, **kwargs) -> DatumDataset:
@@ -113,5 +277,7 @@ def init_arrow_cache(dataset: DatumDataset, scheme: Optional[str] = None, **kwar
     if scheme is None or scheme == "NONE":
         return dataset
     cache_paths = arrow_cache_helper(dataset, scheme, **kwargs)
+    if not cache_paths:
+        return dataset
     dataset = DatumDataset.import_from(os.path.dirname(cache_paths[0]), "arrow")
     return dataset
@@ -5,17 +5,29 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import gc
+import hashlib
 import inspect
+import io
+import os
+import pickle
+import struct
+from bisect import bisect_right
 from collections import OrderedDict
 from copy import deepcopy
 from dataclasses import asdict
+from functools import lru_cache
 from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import _collections_abc
 import networkx as nx
+import numpy as np
+import torch
 from openvino.runtime import Model
 
+from otx import __version__
 from otx.algorithms.common.utils.logger import get_logger
+from otx.core.file import OTX_CACHE
 
 from ..ops.op import Operation
 from ..ops.utils import convert_op_to_torch
@@ -25,6 +37,12 @@ from ..utils import get_op_name
 
 logger = get_logger()
 
+GRAPH_CACHE = os.path.join(OTX_CACHE, "ov_graph")
+DEFAULT_GRAPH_CACHE_SIZE = 4 * 1024**3
+
+GRAPH_FILE_MAGIC = b"OTXGRAPH"
+TENSOR_ALIGNMENT = 64
+
 
 class SortedDictKeysView(_collections_abc.KeysView):
     """SortedDictKeysView class."""
@@ -76,15 +94,27 @@ class SortedDict(dict):
     def __init__(self, sort_key, *args, **kwargs):
         self._sort_key = sort_key
         self._sorted_keys = []
+        # sort values of _sorted_keys to insert the new keys with a binary search
+        self._sort_values = []
         super().__init__(self, *args, **kwargs)
 
+    def __reduce__(self):
+        """Sorteddict's reduce function, the edge data are restored as they are instead of through setitem."""
+        return self.__class__, (self._sort_key,), (dict(super().items()), self._sorted_keys, self._sort_values)
+
+    def __setstate__(self, state):
+        """Sorteddict's setstate function."""
+        items, self._sorted_keys, self._sort_values = state
+        super().update(items)
+
     def __setitem__(self, key, value):
         """Sorteddict's setitem function."""
         assert len(value) == 1
         edge_key, edge_attr = next(iter(value.items()))
         sort_value = float("inf") if self._sort_key not in edge_attr else edge_attr[self._sort_key]
-        self._sorted_keys.append([sort_value, key, edge_key])
-        self._sorted_keys.sort(key=lambda x: x[0])
+        index = bisect_right(self._sort_values, sort_value)
+        self._sort_values.insert(index, sort_value)
+        self._sorted_keys.insert(index, [sort_value, key, edge_key])
         if key in self:
             assert edge_key not in self[key]
             self[key].update(value)
@@ -98,6 +128,7 @@ class SortedDict(dict):
             if key_in == key:
                 break
         self._sorted_keys.pop(i)  # pylint: disable=undefined-loop-variable
+        self._sort_values.pop(i)  # pylint: disable=undefined-loop-variable
 
     def __iter__(self):
         """Sorteddict's iter function."""
@@ -133,6 +164,7 @@ class SortedDict(dict):
         """Sorteddict's clear function."""
         super().clear()
         self._sorted_keys = []
+        self._sort_values = []
 
     def pop(self, key, default=NOOP()):
         """Sorteddict's pop function."""
@@ -145,6 +177,7 @@ class SortedDict(dict):
             if key_in == key:
                 break
         self._sorted_keys.pop(i)  # pylint: disable=undefined-loop-variable
+        self._sort_values.pop(i)  # pylint: disable=undefined-loop-variable
 
         return value
 
@@ -177,6 +210,14 @@ class SortedDictHelper(dict):
         self._sort_key = sort_key
         super().__init__(*args, **kwargs)
 
+    def __reduce__(self):
+        """Sorteddicthelper's reduce function, the sorted dicts are restored as they are."""
+        return self.__class__, (self._sort_key,), dict(super().items())
+
+    def __setstate__(self, state):
+        """Sorteddicthelper's setstate function."""
+        super().update(state)
+
     def __setitem__(self, key, value):
         """Sorteddicthelper's setitem function."""
         super().__setitem__(key, SortedDict(self._sort_key))
@@ -184,11 +225,103 @@ class SortedDictHelper(dict):
             self[key][v_key] = v_value
 
 
+def get_graph_cache_path(model_path: str, weight_path: str) -> str:
+    """Get the path of the cached graph of an IR, keyed by the hash of its files and the OTX version."""
+    _hash = hashlib.sha256(__version__.encode())
+    for path in (model_path, weight_path):
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):  # pylint: disable=cell-var-from-loop
+                _hash.update(chunk)
+    return os.path.join(GRAPH_CACHE, f"{_hash.hexdigest()}.graph")
+
+
+def evict_graph_cache(max_size: int = DEFAULT_GRAPH_CACHE_SIZE, cache_dir: str = GRAPH_CACHE) -> None:
+    """Remove the least recently used graphs of the cache until its size is within max_size.
+
+    A cached graph is touched when it is loaded, the whole cache can be cleaned up by deleting cache_dir.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    graphs = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".graph"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            graphs.append((stat.st_mtime, stat.st_size, entry.path))
+    used = sum(size for _, size, _ in graphs)
+    for _, size, path in sorted(graphs):
+        if used <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        used -= size
+
+
+def _align(size: int) -> int:
+    return -(-size // TENSOR_ALIGNMENT) * TENSOR_ALIGNMENT
+
+
+class _GraphPickler(pickle.Pickler):
+    """Pickler storing the tensors out of the pickle, so that they can be memory-mapped when loaded."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays: List[np.ndarray] = []
+        self.size = 0
+
+    def persistent_id(self, obj):
+        """Returns the location of a tensor in the data section, None to pickle the other objects."""
+        # parameters are pickled with their data, which is a tensor
+        if type(obj) is not torch.Tensor or obj.requires_grad:  # pylint: disable=unidiomatic-typecheck
+            return None
+        try:
+            array = np.ascontiguousarray(obj.numpy())
+        except TypeError:
+            # dtypes without numpy equivalent, e.g. bfloat16
+            return None
+        offset = self.size
+        self.arrays.append(array)
+        self.size += _align(array.nbytes)
+        # the shape of the tensor, as ascontiguousarray makes the scalars 1-d
+        return offset, array.dtype.str, tuple(obj.shape)
+
+
+class _GraphUnpickler(pickle.Unpickler):
+    """Unpickler creating the tensors from the memory-mapped data section, they are paged in when accessed."""
+
+    def __init__(self, file, data: np.ndarray):
+        super().__init__(file)
+        self.data = data
+
+    def persistent_load(self, pid):
+        """Returns the tensor at a location in the data section."""
+        offset, dtype, shape = pid
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes == 0:
+            return torch.from_numpy(np.empty(shape, dtype))
+        return torch.from_numpy(self.data[offset : offset + nbytes].view(dtype).reshape(shape))
+
+
+@lru_cache(maxsize=None)
+def _get_num_forward_inputs(forward: Any) -> Optional[int]:
+    """Returns the number of inputs of the forward function of an operation, None if it takes varargs."""
+    spec = inspect.getfullargspec(forward)
+    return None if spec.varargs is not None else len(spec.args[1:])
+
+
 class Graph(nx.MultiDiGraph):
     """Graph class."""
 
     adjlist_outer_dict_factory = SortedDictHelper
 
+    # Number of the changes of the nodes and the edges, the graphs cached before it was added start from 0
+    _version = 0
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -198,6 +331,36 @@ class Graph(nx.MultiDiGraph):
 
         self._normalize_nodes = []
 
+    @property
+    def version(self) -> int:
+        """Counter of the changes of the nodes and the edges, to find out whether the graph was edited."""
+        return self._version
+
+    def add_node(self, node_for_adding, **attr):
+        """Graph's add_node function."""
+        super().add_node(node_for_adding, **attr)
+        self._version += 1
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        """Graph's add_nodes_from function."""
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self._version += 1
+
+    def remove_nodes_from(self, nodes):
+        """Graph's remove_nodes_from function."""
+        super().remove_nodes_from(nodes)
+        self._version += 1
+
+    def remove_edge(self, u, v, key=None):
+        """Graph's remove_edge function."""
+        super().remove_edge(u, v, key)
+        self._version += 1
+
+    def clear(self):
+        """Graph's clear function."""
+        super().clear()
+        self._version += 1
+
     @staticmethod
     def from_ov(ov_model: Model) -> "Graph":
         """Graph's from_ov function."""
@@ -208,40 +371,49 @@ class Graph(nx.MultiDiGraph):
         parents_dict: Dict[str, List[Optional[List]]] = {}
         children_dict: Dict[str, List[Optional[List]]] = {}
 
-        for ov_op in ov_ops:
-            op_name = get_op_name(ov_op)
-            node = convert_op_to_torch(ov_op)
-
-            graph.add_node(
-                node,
-                name=op_name,
-                type=node.type,
-                version=node.version,
-                attrs=node.attrs,
-            )
-            ops_dict[op_name] = node
-
-            children_dict[op_name] = []
-            for out_port in ov_op.outputs():
-                out_port_id = out_port.get_index()
-                for in_port in out_port.get_target_inputs():
-                    in_port_id = in_port.get_index()
-                    children_dict[op_name].append([out_port_id, in_port_id, get_op_name(in_port.get_node())])
+        # the conversion only allocates objects, the garbage collector would scan them repeatedly for nothing
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for ov_op in ov_ops:
+                op_name = get_op_name(ov_op)
+                node = convert_op_to_torch(ov_op)
+
+                graph.add_node(
+                    node,
+                    name=op_name,
+                    type=node.type,
+                    version=node.version,
+                    attrs=node.attrs,
+                )
+                ops_dict[op_name] = node
 
-            parents_dict[op_name] = []
-            for in_port in ov_op.inputs():
-                in_port_id = in_port.get_index()
-                out_port = in_port.get_source_output()
-                out_port_id = out_port.get_index()
-                parents_dict[op_name].append([out_port_id, in_port_id, get_op_name(out_port.get_node())])
+                children_dict[op_name] = []
+                for out_port in ov_op.outputs():
+                    out_port_id = out_port.get_index()
+                    for in_port in out_port.get_target_inputs():
+                        in_port_id = in_port.get_index()
+                        children_dict[op_name].append([out_port_id, in_port_id, get_op_name(in_port.get_node())])
+
+                parents_dict[op_name] = []
+                for in_port in ov_op.inputs():
+                    in_port_id = in_port.get_index()
+                    out_port = in_port.get_source_output()
+                    out_port_id = out_port.get_index()
+                    parents_dict[op_name].append([out_port_id, in_port_id, get_op_name(out_port.get_node())])
+        finally:
+            if gc_enabled:
+                gc.enable()
 
         # validate graph
-        for node, children in children_dict.items():
-            for _, _, child in children:
-                assert node in [i[-1] for i in parents_dict[child]], f"{node} is not a parent of {child}"
-        for node, parents in parents_dict.items():
-            for _, _, parent in parents:
-                assert node in [i[-1] for i in children_dict[parent]], f"{node} is not a child of {parent}"
+        parent_names = {node: {parent for _, _, parent in parents} for node, parents in parents_dict.items()}
+        child_names = {node: {child for _, _, child in children} for node, children in children_dict.items()}
+        for node, children in child_names.items():
+            for child in children:
+                assert node in parent_names[child], f"{node} is not a parent of {child}"
+        for node, parents in parent_names.items():
+            for parent in parents:
+                assert node in child_names[parent], f"{node} is not a child of {parent}"
 
         # add edges
         for src, tgts in children_dict.items():
@@ -258,6 +430,51 @@ class Graph(nx.MultiDiGraph):
 
         return graph
 
+    def save(self, path: str):
+        """Graph's save function.
+
+        The file holds a header, the pickled graph and then the data of the tensors, which are memory-mapped by
+        load. The file is replaced atomically.
+        """
+        buffer = io.BytesIO()
+        pickler = _GraphPickler(buffer)
+        pickler.dump(self)
+        header = GRAPH_FILE_MAGIC + struct.pack("<Q", buffer.tell())
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(header)
+                file.write(buffer.getbuffer())
+                file.write(bytes(_align(file.tell()) - file.tell()))
+                for array in pickler.arrays:
+                    file.write(array.reshape(-1).view(np.uint8))
+                    file.write(bytes(_align(array.nbytes) - array.nbytes))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def load(path: str) -> "Graph":
+        """Graph's load function, the tensors are memory-mapped copy-on-write from the file."""
+        with open(path, "rb") as file:
+            header = file.read(len(GRAPH_FILE_MAGIC) + 8)
+            if header[: len(GRAPH_FILE_MAGIC)] != GRAPH_FILE_MAGIC:
+                raise ValueError(f"{path} is not a graph file.")
+            (pickle_size,) = struct.unpack("<Q", header[len(GRAPH_FILE_MAGIC) :])
+            pickle_data = file.read(pickle_size)
+        data_offset = _align(len(header) + pickle_size)
+        if os.path.getsize(path) > data_offset:
+            data = np.memmap(path, dtype=np.uint8, mode="c", offset=data_offset)
+        else:
+            data = np.empty(0, dtype=np.uint8)
+        graph = _GraphUnpickler(io.BytesIO(pickle_data), data).load()
+        if not isinstance(graph, Graph):
+            raise TypeError(f"{path} is not a graph.")
+        return graph
+
     def get_edge_data(self, node_from: Operation, node_to: Operation, default=None) -> Optional[List[Dict[Any, Any]]]:
         """Graph's get_edge_data function."""
         edge_data = super().get_edge_data(node_from, node_to, None, default)
@@ -287,6 +504,7 @@ class Graph(nx.MultiDiGraph):
                                 edges_to_keep.append([predecessor, successor, edge_attrs])
 
         super().remove_node(node)
+        self._version += 1
         for edge in edges_to_keep:
             node_from, node_to, attrs = edge
             self.add_edge(node_from, node_to, **attrs)
@@ -325,13 +543,14 @@ class Graph(nx.MultiDiGraph):
         if out_port is None:
             out_port = 0
 
+        occupied = [
+            edge["in_port"]
+            for predecessor in self.predecessors(node_to)
+            for edge in self.get_edge_data(predecessor, node_to)
+        ]
+        assert len(occupied) == len(set(occupied))
+
         if in_port is None:
-            occupied = [
-                edge["in_port"]
-                for predecessor in self.predecessors(node_to)
-                for edge in self.get_edge_data(predecessor, node_to)
-            ]
-            assert len(occupied) == len(set(occupied))
             if occupied:
                 for i in range(max(occupied)):
                     if i not in occupied:
@@ -341,27 +560,20 @@ class Graph(nx.MultiDiGraph):
                 in_port = len(occupied)
 
         # validate in_port
-        spec = inspect.getfullargspec(node_to.forward)
-        if spec.varargs is None:
-            valid_range = list(range(len(spec.args[1:])))
+        num_inputs = _get_num_forward_inputs(type(node_to).forward)
+        if num_inputs is not None:
+            valid_range = list(range(num_inputs))
             if in_port not in valid_range:
                 raise ValueError(f"in_port {in_port} is not in valid range {valid_range} " f"for {node_to.name}.")
-        occupied = []
-        predecessors = list(self.predecessors(node_to))
-        if predecessors:
-            occupied = [
-                edge["in_port"] for predecessor in predecessors for edge in self.get_edge_data(predecessor, node_to)
-            ]
-            assert len(occupied) == len(set(occupied))
-        if occupied:
-            if in_port in occupied:
-                raise ValueError(f"in_port {in_port} is occupied for {node_to.name}.")
+        if in_port in occupied:
+            raise ValueError(f"in_port {in_port} is occupied for {node_to.name}.")
 
         # out_port validation is not able to do
 
         # add edge
         key = f"{in_port}{out_port}"
         super().add_edge(node_from, node_to, key=key, in_port=in_port, out_port=out_port, **kwargs)
+        self._version += 1
 
     def predecessors(
         self,
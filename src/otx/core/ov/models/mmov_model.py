@@ -36,6 +36,7 @@ class MMOVModel(OVModel, ParserMixin):
             inputs=inputs,
             outputs=outputs,
             parser=parser,
+            use_graph_cache=kwargs.get("use_graph_cache", False),
             **parser_kwargs,
         )
 
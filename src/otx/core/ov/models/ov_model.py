@@ -8,9 +8,9 @@
 import math
 import os
 import tempfile
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from copy import deepcopy
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
 
 import openvino.runtime as ov
 import torch
@@ -19,13 +19,14 @@ from torch.nn import init
 from otx.algorithms.common.utils.logger import get_logger
 
 from ..graph import Graph
+from ..graph.graph import evict_graph_cache, get_graph_cache_path
 from ..graph.utils import (
     handle_merging_into_batchnorm,
     handle_paired_batchnorm,
     handle_reshape,
 )
 from ..ops.builder import OPS
-from ..utils import load_ov_model, normalize_name
+from ..utils import get_ov_model_paths, load_ov_model, normalize_name
 
 CONNECTION_SEPARATOR = "||"
 
@@ -33,6 +34,30 @@ CONNECTION_SEPARATOR = "||"
 logger = get_logger()
 
 
+class ExecutionStep(NamedTuple):
+    """Step of the execution plan of OVModel.
+
+    The nodes are referenced by name, so that the plan stays valid for the copies of the model.
+
+    Attributes:
+        name (str): name of the node to run
+        type (str): type of the node
+        input_slots (Optional[Tuple[Tuple[str, int], ...]]): (producer node name, output port) of each input port
+            of the node in order, None for a Parameter or a Constant node
+        features_to_free (Tuple[str, ...]): features which are not used anymore after this step
+    """
+
+    name: str
+    type: str
+    input_slots: Optional[Tuple[Tuple[str, int], ...]]
+    features_to_free: Tuple[str, ...]
+
+
+def _select_output(feature: Any, out_port: int) -> Any:
+    """Returns the output of a feature at an output port, a single-output feature is used as is."""
+    return feature[out_port] if isinstance(feature, tuple) else feature
+
+
 class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
     """OVModel class."""
 
@@ -48,6 +73,7 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
         paired_bn: bool = True,
         init_weight: Union[bool, Callable] = False,
         verify_shape: bool = True,
+        use_graph_cache: bool = False,
     ):
         super().__init__()
         self._model_path_or_model = model_path_or_model
@@ -62,9 +88,10 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
         self._inputs: List[str] = []
         self._outputs: List[str] = []
         self._feature_dict = OrderedDict()
+        self._execution_plan: Optional[List[ExecutionStep]] = None
 
         # build graph
-        graph = self.build_graph(model_path_or_model, weight_path)
+        graph = self.build_graph(model_path_or_model, weight_path, use_cache=use_graph_cache)
         self._graph = graph
         if remove_normalize:
             graph.remove_normalize_nodes()
@@ -101,6 +128,7 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
 
         # build torch module
         self.model = self.build_torch_module(graph)
+        self._graph_version = graph.version
 
         if init_weight:
             if not isinstance(init_weight, Callable):
@@ -177,6 +205,16 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
         """Property features."""
         return self._feature_dict
 
+    @property
+    def features_to_keep(self):
+        """Property features_to_keep, the execution plan is rebuilt when it is set."""
+        return self._features_to_keep
+
+    @features_to_keep.setter
+    def features_to_keep(self, features_to_keep: Optional[List]):
+        self._features_to_keep = features_to_keep
+        self._execution_plan = None
+
     @property
     def input_shapes(self):
         """Property input_shapes."""
@@ -188,8 +226,13 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
         return self._output_shapes
 
     @staticmethod
-    def build_graph(model_path_or_model, weight_path=None):
-        """Function build_graph."""
+    def build_graph(model_path_or_model, weight_path=None, use_cache=False):
+        """Function build_graph.
+
+        If use_cache, the converted graph is cached in GRAPH_CACHE keyed by the hash of the IR, so that it is loaded
+        instead of converted next time. The least recently used graphs are removed once the cache exceeds
+        DEFAULT_GRAPH_CACHE_SIZE.
+        """
         with tempfile.TemporaryDirectory() as tempdir:
             if isinstance(model_path_or_model, ov.Model):
                 assert weight_path is None, "if openvino model is given 'weight_path' must be None"
@@ -200,9 +243,25 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
                 )
                 model_path_or_model = os.path.join(tempdir, "model.xml")
                 weight_path = os.path.join(tempdir, "model.bin")
+            model_path, weight_path = get_ov_model_paths(model_path_or_model, weight_path)
+
+            cache_path = get_graph_cache_path(model_path, weight_path) if use_cache else None
+            if cache_path is not None and os.path.exists(cache_path):
+                try:
+                    graph = Graph.load(cache_path)
+                    os.utime(cache_path)
+                    return graph
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.warning(f"Failed to load the cached graph {cache_path}, convert the model again: {e}")
             # TODO: reshape decompose ir graph
-            ov_model = load_ov_model(model_path_or_model, weight_path, False)
+            ov_model = load_ov_model(model_path, weight_path, False)
         graph = Graph.from_ov(ov_model)
+        if cache_path is not None:
+            try:
+                graph.save(cache_path)
+                evict_graph_cache(cache_dir=os.path.dirname(cache_path))
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Failed to cache the graph to {cache_path}: {e}")
         return graph
 
     @staticmethod
@@ -424,53 +483,93 @@ class OVModel(torch.nn.Module):  # pylint: disable=too-many-instance-attributes
                 inputs[key] = arg
         return inputs
 
-    def forward(self, *args, **kwargs):
-        """Function forward."""
-        self._feature_dict.clear()
-        inputs = self._build_forward_inputs(*args, **kwargs)
-
-        done = {}
-        for node_name, node in self.model.items():
-            done[node_name] = {node.name: False for node in self._graph.successors(node)}
+    def build_execution_plan(self) -> List[ExecutionStep]:
+        """Compile the graph into a flat schedule of the nodes.
 
+        The port mapping of the inputs of each node is resolved once, and each feature is freed after its last
+        consumer unless it is in features_to_keep.
+        """
+        plan = []
+        last_consumers = {}
         for node_name, node in self.model.items():
             predecessors_with_edge = list(self._graph.predecessors(node, with_edge_data=True))
             if not predecessors_with_edge:
-                if node.type == "Parameter":
-                    self._feature_dict[node_name] = node(inputs[node_name])
-                elif node.type == "Constant":
-                    self._feature_dict[node_name] = node()
-                else:
+                if node.type not in ("Parameter", "Constant"):
                     raise ValueError(
                         f"Broken graph. Node {node_name} is a type of {node.type} " "but it has no in edges."
                     )
+                plan.append(ExecutionStep(node_name, node.type, None, ()))
+                continue
+
+            input_slots = {}
+            for input_node, edges in predecessors_with_edge:
+                for edge in edges:
+                    assert edge["in_port"] not in input_slots
+                    input_slots[edge["in_port"]] = (input_node.name, edge["out_port"])
+                last_consumers[input_node.name] = node_name
+            assert sorted(input_slots) == list(range(len(input_slots)))
+            input_slots = tuple(input_slots[i] for i in range(len(input_slots)))
+            plan.append(ExecutionStep(node_name, node.type, input_slots, ()))
+
+        features_to_keep = set(self._features_to_keep) if self._features_to_keep is not None else set()
+        features_to_free = defaultdict(list)
+        for feature_name, consumer_name in last_consumers.items():
+            if feature_name not in features_to_keep:
+                features_to_free[consumer_name].append(feature_name)
+        return [step._replace(features_to_free=tuple(features_to_free[step.name])) for step in plan]
+
+    def _get_execution_plan(self) -> List[ExecutionStep]:
+        """Returns the execution plan, it is rebuilt along with the torch module if the graph was edited."""
+        if self._graph_version != self._graph.version:
+            self.model = self.build_torch_module(self._graph)
+            self._graph_version = self._graph.version
+            self._execution_plan = None
+        if self._execution_plan is None:
+            self._execution_plan = self.build_execution_plan()
+        return self._execution_plan
+
+    def forward(self, *args, **kwargs):
+        """Function forward."""
+        self._feature_dict.clear()
+        inputs = self._build_forward_inputs(*args, **kwargs)
+
+        features = self._feature_dict
+        for node_name, node_type, input_slots, features_to_free in self._get_execution_plan():
+            node = self.model[node_name]
+            if input_slots is None:
+                features[node_name] = node(inputs[node_name]) if node_type == "Parameter" else node()
             else:
-                input_nodes, edges = list(map(list, zip(*predecessors_with_edge)))
-                input_node_names = [input_node.name for input_node in input_nodes]
-
-                input_features = [edge["in_port"] for edges_ in edges for edge in edges_]
-                assert len(input_features) == len(set(input_features))
-                input_features = [None for _ in input_features]
-                for idx, input_node_name in enumerate(input_node_names):
-                    if self._features_to_keep is not None and input_node_name in self._features_to_keep:
-                        input_feature = self._feature_dict.get(input_node_name)
-                    else:
-                        input_feature = self._feature_dict.pop(input_node_name)
-                        done[input_node_name][node_name] = True
-                        if not all(done[input_node_name].values()):
-                            self._feature_dict[input_node_name] = input_feature
-
-                    if isinstance(input_feature, tuple):
-                        for edges_ in edges[idx]:
-                            input_features[edges_["in_port"]] = input_feature[edges_["out_port"]]
-                    else:
-                        for edges_ in edges[idx]:
-                            input_features[edges_["in_port"]] = input_feature
-                assert all(input_feature is not None for input_feature in input_features)
-                self._feature_dict[node_name] = node(*input_features)
+                features[node_name] = node(
+                    *[_select_output(features[input_name], out_port) for input_name, out_port in input_slots]
+                )
+                for feature_name in features_to_free:
+                    del features[feature_name]
 
         outputs = OrderedDict()
         for output_name in self._outputs:
-            outputs[output_name] = self._feature_dict[output_name]
+            outputs[output_name] = features[output_name]
 
         return outputs
+
+    def to_graph_module(self) -> torch.fx.GraphModule:
+        """Emit the execution plan as a torch.fx.GraphModule returning the outputs, e.g. for torch.compile.
+
+        The graph module takes the inputs positionally in the order of inputs. It shares the nodes of this model,
+        but it does not fill the features.
+        """
+        graph = torch.fx.Graph()
+        values = {input_name: graph.placeholder(f"input_{idx}") for idx, input_name in enumerate(self._inputs)}
+        # node names are not always valid python identifiers
+        modules = {}
+        for idx, (node_name, node_type, input_slots, _) in enumerate(self._get_execution_plan()):
+            if input_slots is None:
+                args = (values[node_name],) if node_type == "Parameter" else ()
+            else:
+                args = tuple(
+                    graph.call_function(_select_output, (values[input_name], out_port))
+                    for input_name, out_port in input_slots
+                )
+            modules[f"node_{idx}"] = self.model[node_name]
+            values[node_name] = graph.call_module(f"node_{idx}", args)
+        graph.output({output_name: values[output_name] for output_name in self._outputs})
+        return torch.fx.GraphModule(modules, graph)
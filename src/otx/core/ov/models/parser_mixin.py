@@ -27,6 +27,7 @@ class ParserMixin:
         inputs: Optional[Union[Dict[str, Union[str, List[str]]], List[str], str]] = None,
         outputs: Optional[Union[Dict[str, Union[str, List[str]]], List[str], str]] = None,
         parser: Optional[Union[str, Callable]] = None,
+        use_graph_cache: bool = False,
         **kwargs,
     ) -> Tuple[Union[str, List[str]], Union[str, List[str]]]:
         """Parse function of ParserMixin class."""
@@ -35,7 +36,7 @@ class ParserMixin:
             parser = PARSERS.get(parser)
 
         if not inputs or not outputs:
-            graph = OVModel.build_graph(model_path_or_model, weight_path)
+            graph = OVModel.build_graph(model_path_or_model, weight_path, use_cache=use_graph_cache)
             parsed = parser(graph, **kwargs)
 
             if not isinstance(parsed, dict) or ("inputs" not in parsed and "outputs" not in parsed):
@@ -10,7 +10,10 @@ from .builder import OPS
 
 def get_dynamic_shape(output):
     """Getter function for dynamic shape."""
-    shape = [str(i) for i in output.get_partial_shape()]
+    partial_shape = output.get_partial_shape()
+    if partial_shape.is_static:
+        return list(partial_shape.to_shape())
+    shape = [str(i) for i in partial_shape]
     for i, shape_ in enumerate(shape):
         try:
             shape_ = int(shape_)
@@ -7,7 +7,7 @@
 
 import errno
 import os
-from typing import Optional
+from typing import Optional, Tuple
 
 from openvino.runtime import Core, Model, Node
 
@@ -80,8 +80,8 @@ def to_dynamic_model(ov_model: Model) -> Model:
     return ov_model
 
 
-def load_ov_model(model_path: str, weight_path: Optional[str] = None, convert_dynamic: bool = False) -> Model:
-    """Load ov_model from model_path."""
+def get_ov_model_paths(model_path: str, weight_path: Optional[str] = None) -> Tuple[str, str]:
+    """Get the paths of the xml and bin files of the model, downloading OMZ models if needed."""
     model_path = str(model_path)
     if model_path.startswith("omz://"):
         model_path = model_path.replace("omz://", "")
@@ -97,6 +97,12 @@ def load_ov_model(model_path: str, weight_path: Optional[str] = None, convert_dy
         raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), model_path)
     if not os.path.exists(weight_path):
         raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), weight_path)
+    return model_path, weight_path
+
+
+def load_ov_model(model_path: str, weight_path: Optional[str] = None, convert_dynamic: bool = False) -> Model:
+    """Load ov_model from model_path."""
+    model_path, weight_path = get_ov_model_paths(model_path, weight_path)
 
     ie_core = Core()
     ov_model = ie_core.read_model(model=model_path, weights=weight_path)
@@ -0,0 +1,136 @@
+"""Benchmark of the Datumaro -> DatasetEntity conversion of the detection dataset adapter.
+
+It converts a synthetic COCO-like dataset with the previous implementation (per-annotation entities,
+list-based label tracking and point-by-point polygon normalization) and with the current one,
+serially and with conversion workers.
+
+Usage:
+    python tests/perf/benchmark_dataset_adapter.py --num-items 20000 --num-workers 0 4 8
+"""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import argparse
+import gc
+import time
+from typing import List
+
+import numpy as np
+from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories
+from datumaro.components.annotation import Polygon as DatumPolygon
+from datumaro.components.dataset import Dataset as DatumDataset
+from datumaro.components.dataset_base import DatasetItem as DatumDatasetItem
+from datumaro.components.media import Image as DatumImage
+
+from otx.api.entities.annotation import Annotation
+from otx.api.entities.dataset_item import DatasetItemEntityWithID
+from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.model_template import TaskType
+from otx.api.entities.scored_label import ScoredLabel
+from otx.api.entities.shapes.polygon import Point, Polygon
+from otx.api.entities.shapes.rectangle import Rectangle
+from otx.api.entities.subset import Subset
+from otx.core.data.adapter.detection_dataset_adapter import DetectionDatasetAdapter
+
+IMAGE_SIZE = (480, 640)
+
+
+def make_dataset(num_items: int, num_objects: int, num_points: int, num_classes: int) -> DatumDataset:
+    """Create a dataset whose objects have a bbox and a polygon, like COCO instances."""
+    rng = np.random.default_rng(0)
+    height, width = IMAGE_SIZE
+    items = []
+    for idx in range(num_items):
+        annotations = []
+        for _ in range(num_objects):
+            x, y = rng.uniform(0, width - 100), rng.uniform(0, height - 100)
+            label = int(rng.integers(num_classes))
+            annotations.append(Bbox(x, y, rng.uniform(1, 100), rng.uniform(1, 100), label=label))
+            points = rng.uniform(0, 100, (num_points, 2)) + (x, y)
+            annotations.append(DatumPolygon(points.ravel().tolist(), label=label))
+        media = DatumImage.from_file(path=f"images/{idx:012d}.jpg", size=IMAGE_SIZE)
+        items.append(DatumDatasetItem(id=f"{idx:012d}", media=media, annotations=annotations))
+    categories = LabelCategories.from_iterable([f"class_{idx}" for idx in range(num_classes)])
+    return DatumDataset.from_iterable(items, categories={AnnotationType.label: categories})
+
+
+def create_adapter(task_type: TaskType, dataset: DatumDataset, num_workers: int) -> DetectionDatasetAdapter:
+    """Create an adapter of the in-memory dataset, without importing it from disk."""
+    adapter = DetectionDatasetAdapter.__new__(DetectionDatasetAdapter)
+    adapter.task_type = task_type
+    adapter.domain = task_type.domain
+    adapter.is_train_phase = True
+    adapter.num_workers = num_workers
+    adapter.lazy = False
+    adapter.dataset = {Subset.TRAINING: dataset}
+    return adapter
+
+
+def legacy_get_otx_dataset(adapter: DetectionDatasetAdapter) -> DatasetEntity:
+    """Previous conversion, which creates the entities of each annotation in the main process."""
+    adapter.label_entities = adapter._prepare_label_information(adapter.dataset)["label_entities"]
+    dataset_items = []
+    used_labels: List[int] = []
+    for subset, subset_data in adapter.dataset.items():
+        for _, datumaro_items in subset_data.subsets().items():
+            for datumaro_item in datumaro_items:
+                image = adapter.datum_media_2_otx_media(datumaro_item.media)
+                shapes = []
+                for ann in datumaro_item.annotations:
+                    if adapter.task_type is TaskType.INSTANCE_SEGMENTATION and ann.type == AnnotationType.polygon:
+                        if adapter._is_normal_polygon(ann):
+                            points = [
+                                Point(x=ann.points[i] / image.width, y=ann.points[i + 1] / image.height)
+                                for i in range(0, len(ann.points), 2)
+                            ]
+                            labels = [ScoredLabel(label=adapter.label_entities[ann.label])]
+                            shapes.append(Annotation(Polygon(points), labels=labels))
+                    if adapter.task_type is TaskType.DETECTION and ann.type == AnnotationType.bbox:
+                        x1, y1, x2, y2 = ann.points
+                        if adapter._is_normal_bbox(x1, y1, x2, y2):
+                            rectangle = Rectangle(
+                                x1 / image.width, y1 / image.height, x2 / image.width, y2 / image.height
+                            )
+                            labels = [ScoredLabel(label=adapter.label_entities[ann.label])]
+                            shapes.append(Annotation(rectangle, labels=labels))
+                    if ann.label not in used_labels:
+                        used_labels.append(ann.label)
+                dataset_items.append(
+                    DatasetItemEntityWithID(
+                        image, adapter._get_ann_scene_entity(shapes), subset=subset, id_=datumaro_item.id
+                    )
+                )
+    adapter.remove_unused_label_entities(used_labels)
+    return DatasetEntity(items=dataset_items)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-items", type=int, default=20000)
+    parser.add_argument("--num-objects", type=int, default=7, help="objects per image, 7.3 on average in COCO")
+    parser.add_argument("--num-points", type=int, default=24, help="vertices per polygon")
+    parser.add_argument("--num-classes", type=int, default=80)
+    parser.add_argument("--num-workers", type=int, nargs="+", default=[0, 4])
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    dataset = make_dataset(args.num_items, args.num_objects, args.num_points, args.num_classes)
+    print(f"created {args.num_items} items in {time.perf_counter() - start_time:.1f} s")
+
+    for task_type in (TaskType.DETECTION, TaskType.INSTANCE_SEGMENTATION):
+        runs = {"previous": lambda: legacy_get_otx_dataset(create_adapter(task_type, dataset, 0))}
+        for num_workers in args.num_workers:
+            runs[f"{num_workers} workers"] = lambda num_workers=num_workers: create_adapter(
+                task_type, dataset, num_workers
+            ).get_otx_dataset()
+        for name, run in runs.items():
+            gc.collect()
+            start_time = time.perf_counter()
+            run()
+            print(f"{task_type.name:>22s} {name:>12s}: {time.perf_counter() - start_time:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
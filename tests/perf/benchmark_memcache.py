@@ -0,0 +1,110 @@
+"""Micro-benchmark of the memory cache lookups from multiple DataLoader-like worker processes.
+
+It compares the shared memory index of MemCacheHandlerForMP
+with an index hosted in a multiprocessing manager process (the previous implementation).
+
+Usage:
+    python tests/perf/benchmark_memcache.py --num-workers 8 --num-items 1000
+"""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import argparse
+import ctypes as ct
+import multiprocessing as mp
+import time
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+from otx.core.data.caching.mem_cache_engine import MemCacheEngine
+from otx.core.data.caching.mem_cache_handler import MemCacheHandlerForMP
+
+
+class _EngineManager(BaseManager):
+    pass
+
+
+_EngineManager.register("MemCacheEngine", MemCacheEngine)
+
+
+class ManagerIndexedCache:
+    """Cache whose index is looked up through IPC to a manager process."""
+
+    def __init__(self, mem_size: int):
+        self._arr = mp.RawArray(ct.c_uint8, mem_size)
+        self._manager = _EngineManager()
+        self._manager.start()  # pylint: disable=consider-using-with
+        self._engine = self._manager.MemCacheEngine(mem_size)  # pylint: disable=no-member
+        self._lock = mp.Lock()
+
+    def get(self, key):
+        with self._lock:
+            addr = self._engine.lookup(key)
+            if addr is None:
+                return None, None
+            offset, nbytes, dtype, shape, meta = addr
+            data = np.frombuffer(self._arr, dtype=np.uint8, count=nbytes, offset=offset).copy()
+        return data.view(dtype).reshape(shape), meta
+
+    def put(self, key, data, meta=None):
+        with self._lock:
+            offset = self._engine.allocate(key, data.nbytes, data.dtype, data.shape, meta)
+            if offset is None:
+                return None
+            ct.memmove(ct.byref(self._arr, offset), data.ctypes.data, data.nbytes)
+            return offset + data.nbytes
+
+    def shutdown(self):
+        self._manager.shutdown()
+
+
+def _worker(cache, keys, num_iters, barrier):
+    barrier.wait()
+    for it in range(num_iters):
+        cache.get(keys[it % len(keys)])
+
+
+def run(cache, keys, num_workers: int, num_iters: int) -> float:
+    """Return the number of lookups per second of all workers."""
+    ctx = mp.get_context("fork")
+    barrier = ctx.Barrier(num_workers + 1)
+    workers = [ctx.Process(target=_worker, args=(cache, keys, num_iters, barrier)) for _ in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start_time = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return num_workers * num_iters / (time.perf_counter() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-workers", type=int, default=8)
+    parser.add_argument("--num-items", type=int, default=1000)
+    parser.add_argument("--num-iters", type=int, default=5000)
+    parser.add_argument("--item-shape", type=int, nargs=3, default=[64, 64, 3])
+    args = parser.parse_args()
+
+    data = np.random.randint(0, 256, size=args.item_shape, dtype=np.uint8)
+    keys = [(f"/dataset/images/{idx:08d}.jpg", f"roi_{idx}") for idx in range(args.num_items)]
+    meta = {"img_shape": data.shape, "ori_shape": data.shape}
+    mem_size = 2 * args.num_items * data.nbytes
+
+    caches = {
+        "manager index": ManagerIndexedCache(mem_size),
+        "shared memory index": MemCacheHandlerForMP(mem_size),
+    }
+    for name, cache in caches.items():
+        for key in keys:
+            cache.put(key, data, meta)
+        throughput = run(cache, keys, args.num_workers, args.num_iters)
+        print(f"{name:>20s}: {throughput:12.1f} hits/s ({args.num_workers} workers)")
+
+    caches["manager index"].shutdown()
+
+
+if __name__ == "__main__":
+    main()
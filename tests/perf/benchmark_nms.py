@@ -0,0 +1,98 @@
+"""Benchmark of the NMS in otx.api.utils.nms against the previous implementation.
+
+The boxes are spread over a large image like the merged predictions of the tiles.
+
+Usage:
+    python tests/perf/benchmark_nms.py --num-boxes 1000 5000 10000 20000
+"""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import argparse
+import time
+
+import numpy as np
+
+from otx.api.utils.nms import multiclass_nms, nms, soft_nms
+
+
+def legacy_nms(boxes, scores, thresh):
+    """Previous implementation comparing each kept box with all the remaining boxes."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        width = np.maximum(0.0, np.minimum(x2[i], x2[order[1:]]) - np.maximum(x1[i], x1[order[1:]]))
+        height = np.maximum(0.0, np.minimum(y2[i], y2[order[1:]]) - np.maximum(y1[i], y1[order[1:]]))
+        intersection = width * height
+        union = areas[i] + areas[order[1:]] - intersection
+        overlap = np.divide(intersection, union, out=np.zeros_like(intersection, dtype=float), where=union != 0)
+        order = order[np.where(overlap <= thresh)[0] + 1]
+    return keep
+
+
+def legacy_multiclass_nms(detections, iou_threshold=0.45, max_num=200):
+    """Previous multi-class NMS with the coordinate offset per class."""
+    labels, scores, boxes = detections[:, 0], detections[:, 1], detections[:, 2:]
+    offsets = labels.astype(boxes.dtype) * (boxes.max() + 1)
+    keep = legacy_nms(boxes + offsets[:, None], scores, iou_threshold)
+    if max_num > 0:
+        keep = keep[:max_num]
+    keep = np.array(keep)
+    return detections[keep], keep
+
+
+def generate_detections(rng, num_boxes, image_size, max_side, num_classes):
+    """Generate random detections in (label, score, x1, y1, x2, y2) format."""
+    xy = rng.uniform(0, image_size, (num_boxes, 2))
+    wh = rng.uniform(4, max_side, (num_boxes, 2))
+    labels = rng.integers(0, num_classes, num_boxes)
+    scores = rng.random(num_boxes)
+    return np.concatenate([labels[:, None], scores[:, None], xy, xy + wh], axis=1).astype(np.float32)
+
+
+def measure(func, repeat):
+    """Return the best elapsed time of the function in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-boxes", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    parser.add_argument("--image-size", type=int, default=4000)
+    parser.add_argument("--max-side", type=int, default=120)
+    parser.add_argument("--num-classes", type=int, default=5)
+    parser.add_argument("--iou-threshold", type=float, default=0.45)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'boxes':>8} {'legacy nms':>12} {'nms':>10} {'legacy mc':>12} {'multiclass':>12} {'soft-nms':>10}")
+    for num_boxes in args.num_boxes:
+        detections = generate_detections(rng, num_boxes, args.image_size, args.max_side, args.num_classes)
+        boxes, scores = detections[:, 2:], detections[:, 1]
+        assert [int(i) for i in legacy_nms(boxes, scores, args.iou_threshold)] == nms(boxes, scores, args.iou_threshold)
+
+        timings = [
+            measure(lambda: legacy_nms(boxes, scores, args.iou_threshold), args.repeat),
+            measure(lambda: nms(boxes, scores, args.iou_threshold), args.repeat),
+            measure(lambda: legacy_multiclass_nms(detections, args.iou_threshold, 0), args.repeat),
+            measure(lambda: multiclass_nms(detections, args.iou_threshold, 0), args.repeat),
+            measure(lambda: soft_nms(boxes, scores), args.repeat),
+        ]
+        print(f"{num_boxes:>8} " + " ".join(f"{t * 1000:>10.1f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput benchmark of the tiled OpenVINO detection inference.
+
+It compares the sequential tiled inference (one image after another)
+with the pipelined async inference where tiles of consecutive images share the infer requests
+and the merge of an image runs while the next image is tiled.
+
+Usage:
+    python tests/perf/benchmark_tiled_inference.py --model outputs/openvino/openvino.xml \
+        --template src/otx/algorithms/detection/configs/detection/mobilenetv2_atss/template.yaml \
+        --num-classes 3 --image-size 2048 --tile-size 400
+"""
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from otx.algorithms.common.utils.utils import get_default_async_reqs_num
+from otx.algorithms.detection.adapters.openvino.task import (
+    OpenVINODetectionInferencer,
+    OpenVINOTileClassifierWrapper,
+)
+from otx.algorithms.detection.configs.base import DetectionConfig
+from otx.algorithms.detection.utils import generate_label_schema
+from otx.api.configuration.helper import create
+from otx.api.entities.label import Domain
+from otx.api.entities.model_template import parse_model_template
+
+
+def build_inferencer(args) -> OpenVINOTileClassifierWrapper:
+    """Build the tiled detection inferencer of the exported model."""
+    model_template = parse_model_template(args.template)
+    hyper_parameters = create(model_template.hyper_parameters.data)
+    params = DetectionConfig(header=hyper_parameters.header)
+    label_schema = generate_label_schema([f"class_{i}" for i in range(args.num_classes)], Domain.DETECTION)
+    weight_file = os.path.splitext(args.model)[0] + ".bin"
+    inferencer = OpenVINODetectionInferencer(
+        params, label_schema, args.model, weight_file, args.device, get_default_async_reqs_num()
+    )
+    return OpenVINOTileClassifierWrapper(inferencer, args.tile_size, args.overlap, args.max_number)
+
+
+def run_sync(inferencer: OpenVINOTileClassifierWrapper, images) -> float:
+    """Return the throughput (images/s) of the sequential tiled inference."""
+    start = time.perf_counter()
+    for image in images:
+        inferencer.predict(image)
+    return len(images) / (time.perf_counter() - start)
+
+
+def run_async(inferencer: OpenVINOTileClassifierWrapper, images) -> float:
+    """Return the throughput (images/s) of the pipelined tiled inference."""
+    results = {}
+
+    def _handler(idx, annotations, features):
+        results[idx] = (annotations, features)
+
+    start = time.perf_counter()
+    for idx, image in enumerate(images):
+        inferencer.enqueue_prediction(image, idx, _handler)
+    inferencer.await_all()
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(images)
+    return len(images) / elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Path to the exported openvino.xml")
+    parser.add_argument("--template", required=True, help="Path to the model template.yaml")
+    parser.add_argument("--num-classes", type=int, default=3)
+    parser.add_argument("--device", default="CPU")
+    parser.add_argument("--num-images", type=int, default=16)
+    parser.add_argument("--image-size", type=int, default=2048)
+    parser.add_argument("--tile-size", type=int, default=400)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--max-number", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inferencer = build_inferencer(args)
+    rng = np.random.default_rng(0)
+    images = [
+        rng.integers(0, 255, (args.image_size, args.image_size, 3), dtype=np.uint8) for _ in range(args.num_images)
+    ]
+
+    # Warm up
+    run_sync(inferencer, images[:1])
+    run_async(inferencer, images[:1])
+
+    sync_fps = max(run_sync(inferencer, images) for _ in range(args.repeat))
+    async_fps = max(run_async(inferencer, images) for _ in range(args.repeat))
+    print(f"image: {args.image_size}x{args.image_size}, tile_size: {args.tile_size}, overlap: {args.overlap}")
+    print(f"sequential: {sync_fps:.2f} images/s")
+    print(f"pipelined : {async_fps:.2f} images/s ({async_fps / sync_fps:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
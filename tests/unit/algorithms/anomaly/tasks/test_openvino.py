@@ -14,14 +14,18 @@ import pytest
 
 from otx.algorithms.anomaly.tasks.openvino import OpenVINOTask
 from otx.algorithms.anomaly.tasks.train import TrainingTask
+from otx.api.entities.dataset_item import DatasetItemEntity
 from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.image import Image
 from otx.api.entities.inference_parameters import InferenceParameters
+from otx.api.entities.annotation import AnnotationSceneEntity, AnnotationSceneKind
 from otx.api.entities.label import Domain, LabelEntity
 from otx.api.entities.label_schema import LabelSchemaEntity
 from otx.api.entities.model import ModelEntity, ModelOptimizationType
 from otx.api.entities.model_template import TaskType
 from otx.api.entities.optimization_parameters import OptimizationParameters
 from otx.api.entities.resultset import ResultSetEntity
+from otx.api.entities.shapes.polygon import Polygon
 from otx.api.entities.subset import Subset
 from otx.api.entities.task_environment import TaskEnvironment
 from otx.api.usecases.tasks.interfaces.export_interface import ExportType
@@ -141,3 +145,116 @@ class TestOpenVINOTask:
         metadata = openvino_task.get_metadata()
         for key in new_metadata.keys():
             assert metadata[key] == np.zeros(1, dtype=np.float32)
+
+    @pytest.mark.parametrize("enable_async_inference", [True, False])
+    @pytest.mark.parametrize("is_evaluation", [True, False])
+    @pytest.mark.parametrize("task_type", [TaskType.ANOMALY_CLASSIFICATION, TaskType.ANOMALY_SEGMENTATION])
+    @patch.multiple(OpenVINOTask, get_config=MagicMock(), load_inferencer=MagicMock())
+    def test_infer(self, mocker, task_type, is_evaluation, enable_async_inference):
+        """Checks that the predictions of the asynchronous inference are added to their dataset items."""
+        anomaly_maps = [np.zeros((8, 8), dtype=np.float32) for _ in range(4)]
+        for anomaly_map in anomaly_maps[1::2]:
+            anomaly_map[2:6, 2:6] = 1.0
+
+        inferencer = mocker.MagicMock(num_requests=2)
+        inferencer.pre_process.side_effect = lambda image: image[..., 0]
+        inferencer.forward.side_effect = lambda image: {"output": image}
+        inferencer.get_metadata.return_value = {}
+        inferencer.post_process.side_effect = lambda predictions, metadata: {
+            "pred_score": float(predictions["output"].max()),
+            "anomaly_map": predictions["output"],
+        }
+        pending = []
+        inferencer.enqueue_prediction.side_effect = lambda image, id, handler: pending.append(
+            (handler, id, {"output": image[..., 0]}, {})
+        )
+        # infer requests complete in reverse order
+        inferencer.await_all.side_effect = lambda: [handler(*args) for handler, *args in reversed(pending)]
+        OpenVINOTask.load_inferencer.return_value = inferencer
+
+        anomalous_label = LabelEntity("Anomalous", is_anomalous=True, domain=Domain.ANOMALY_SEGMENTATION)
+        normal_label = LabelEntity("Normal", domain=Domain.ANOMALY_SEGMENTATION)
+        model_template = mocker.MagicMock(task_type=task_type)
+        task_environment = TaskEnvironment(
+            model_template=model_template,
+            model=mocker.MagicMock(),
+            hyper_parameters=mocker.MagicMock(),
+            label_schema=LabelSchemaEntity.from_labels([anomalous_label, normal_label]),
+        )
+        openvino_task = OpenVINOTask(task_environment)
+
+        dataset = DatasetEntity(
+            [
+                DatasetItemEntity(
+                    Image(data=np.repeat(anomaly_map[..., None], 3, axis=-1)),
+                    AnnotationSceneEntity([], AnnotationSceneKind.PREDICTION),
+                )
+                for anomaly_map in anomaly_maps
+            ]
+        )
+        openvino_task.infer(
+            dataset, InferenceParameters(is_evaluation=is_evaluation, enable_async_inference=enable_async_inference)
+        )
+
+        assert inferencer.enqueue_prediction.call_count == (len(dataset) if enable_async_inference else 0)
+        for idx, dataset_item in enumerate(dataset):
+            expected_label = anomalous_label if idx % 2 else normal_label
+            assert [label.name for label in dataset_item.get_roi_labels()] == [expected_label.name]
+            if task_type == TaskType.ANOMALY_SEGMENTATION:
+                polygons = [
+                    annotation for annotation in dataset_item.get_annotations() if isinstance(annotation.shape, Polygon)
+                ]
+                assert len(polygons) == idx % 2
+            heatmaps = [metadata.data for metadata in dataset_item.get_metadata()]
+            # the anomaly maps are only dropped when evaluating classification
+            assert len(heatmaps) == (0 if is_evaluation and task_type == TaskType.ANOMALY_CLASSIFICATION else 1)
+            if heatmaps:
+                assert np.array_equal(heatmaps[0].numpy, (anomaly_maps[idx] * 255).astype(np.uint8))
+
+    @pytest.mark.parametrize("await_fails", [False, True])
+    @patch.multiple(OpenVINOTask, get_config=MagicMock(), load_inferencer=MagicMock())
+    def test_infer_awaits_requests_on_error(self, mocker, await_fails):
+        """Checks that the running infer requests are awaited before the first error is raised on an error."""
+        inferencer = mocker.MagicMock(num_requests=2)
+        inferencer.get_metadata.return_value = {}
+        inferencer.post_process.return_value = {"pred_score": 0.0, "anomaly_map": np.zeros((8, 8), dtype=np.float32)}
+        pending = []
+
+        def enqueue_prediction(image, id, handler):
+            if id == 2:
+                raise RuntimeError("enqueue failed")
+            pending.append((handler, id, {"output": image[..., 0]}, {}))
+
+        inferencer.enqueue_prediction.side_effect = enqueue_prediction
+
+        def await_all():
+            for handler, *args in pending:
+                handler(*args)
+            if await_fails:
+                raise RuntimeError("await failed")
+
+        inferencer.await_all.side_effect = await_all
+        OpenVINOTask.load_inferencer.return_value = inferencer
+        add_prediction = mocker.patch.object(OpenVINOTask, "_add_prediction")
+
+        task_environment = TaskEnvironment(
+            model_template=mocker.MagicMock(task_type=TaskType.ANOMALY_CLASSIFICATION),
+            model=mocker.MagicMock(),
+            hyper_parameters=mocker.MagicMock(),
+            label_schema=mocker.MagicMock(),
+        )
+        openvino_task = OpenVINOTask(task_environment)
+        dataset = DatasetEntity(
+            [
+                DatasetItemEntity(
+                    Image(data=np.zeros((8, 8, 3), dtype=np.uint8)),
+                    AnnotationSceneEntity([], AnnotationSceneKind.PREDICTION),
+                )
+                for _ in range(4)
+            ]
+        )
+        with pytest.raises(RuntimeError, match="enqueue failed"):
+            openvino_task.infer(dataset, InferenceParameters(enable_async_inference=True))
+
+        inferencer.await_all.assert_called_once()
+        assert add_prediction.call_count == 2
@@ -13,7 +13,7 @@ class TestTilingSamplingHook:
     """Test class for TileSamplingHook."""
 
     @e2e_pytest_unit
-    def test_before_epoch(self, mocker):
+    def test_before_epoch(self):
         "Test function for before_poch function."
 
         class MockTileDataset:
@@ -22,6 +22,9 @@ class TestTilingSamplingHook:
                 self.sample_num = 4
                 self.tiles = [1, 2, 3, 4]
 
+            def sample_tiles(self):
+                return [5, 6, 7, 8]
+
         class MockDataset:
             def __init__(self, tile_dataset):
                 self.tile_dataset = tile_dataset
@@ -37,9 +40,6 @@ class TestTilingSamplingHook:
         hook = TileSamplingHook()
         tile_dataset = MockTileDataset()
         runner = MockRunner(MockDataLoader(MockDataset(tile_dataset)))
-        mocker.patch(
-            "otx.algorithms.detection.adapters.mmdet.hooks.tile_sampling_hook.sample", return_value=[5, 6, 7, 8]
-        )
         hook.before_epoch(runner)
         assert tile_dataset.tiles[0] == 5
         assert tile_dataset.tiles[1] == 6
@@ -15,6 +15,7 @@ from otx.algorithms.detection.adapters.openvino.task import (
     OpenVINODetectionTask,
     OpenVINOMaskInferencer,
     OpenVINORotatedRectInferencer,
+    OpenVINOTileClassifierWrapper,
 )
 from otx.algorithms.detection.configs.base import DetectionConfig
 from otx.algorithms.detection.utils import generate_label_schema
@@ -141,6 +142,69 @@ class TestOpenVINORotatedRectInferencer:
         assert returned_value == (None, {"foo": "bar"})
 
 
+class TestOpenVINOTileClassifierWrapper:
+    class FakeAsyncPipeline:
+        def __init__(self):
+            self.completed_results = {}
+            self.callback_exceptions = []
+
+        def submit_data(self, inputs, id, meta={}):
+            self.completed_results[id] = (inputs, meta, {}, 0.0)
+
+        def get_raw_result(self, id):
+            return self.completed_results.pop(id, None)
+
+        def await_all(self):
+            pass
+
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker) -> None:
+        classes = ("rectangle", "ellipse", "triangle")
+        task_type = TaskType.DETECTION
+        model_template = parse_model_template(os.path.join(DEFAULT_DET_TEMPLATE_DIR, "template.yaml"))
+        hyper_parameters = create(model_template.hyper_parameters.data)
+        params = DetectionConfig(header=hyper_parameters.header)
+        label_schema = generate_label_schema(classes, task_type_to_label_domain(task_type))
+        mocker.patch("otx.algorithms.detection.adapters.openvino.task.OpenvinoAdapter")
+        mocked_model = mocker.patch.object(Model, "create_model")
+        adapter_mock = mocker.Mock(set_callback=mocker.Mock(return_value=None))
+        mocked_model.return_value = mocker.MagicMock(spec=Model, inference_adapter=adapter_mock)
+        mocked_tiler = mocker.patch("otx.algorithms.detection.adapters.openvino.task.DetectionTiler")
+        tiler = mocked_tiler.return_value
+        tiler.execution_mode = "async"
+        tiler.async_pipeline = self.FakeAsyncPipeline()
+        tiler._tile.side_effect = lambda image: [[0, 0, 2, 2], [2, 0, 4, 2]]
+        tiler._filter_tiles.side_effect = lambda image, coords: coords
+        tiler._crop_tile.side_effect = lambda image, coord: image[coord[1] : coord[3], coord[0] : coord[2]]
+        tiler._postprocess_tile.side_effect = lambda predictions, coord: coord
+        tiler._merge_results.side_effect = lambda results, shape: mocker.MagicMock(tiles=results)
+        self.tiler = tiler
+        self.ov_inferencer = OpenVINOTileClassifierWrapper(OpenVINODetectionInferencer(params, label_schema, ""))
+
+    @e2e_pytest_unit
+    def test_enqueue_prediction(self, mocker):
+        """Test that the tiles of all the images are merged in the submission order."""
+        mocker.patch.object(self.ov_inferencer.converter, "convert_to_annotation", side_effect=lambda d, metadata: d)
+        self.ov_inferencer.get_saliency_map = mocker.MagicMock()
+        results = []
+        for idx in range(5):
+            self.ov_inferencer.enqueue_prediction(np.zeros((2, 4, 3)), idx, lambda *args: results.append(args))
+        self.ov_inferencer.await_all()
+
+        assert [result[0] for result in results] == list(range(5))
+        assert all(result[1].tiles == [[0, 0, 2, 2], [2, 0, 4, 2]] for result in results)
+        assert self.ov_inferencer.model.postprocess.call_count == 10
+        assert not self.tiler.async_pipeline.completed_results
+
+    @e2e_pytest_unit
+    def test_enqueue_prediction_raises_merge_error(self, mocker):
+        """Test that an error on the merge thread is raised to the caller."""
+        self.tiler._merge_results.side_effect = RuntimeError("merge failed")
+        with pytest.raises(RuntimeError):
+            self.ov_inferencer.enqueue_prediction(np.zeros((2, 4, 3)), 0, mocker.MagicMock())
+            self.ov_inferencer.await_all()
+
+
 class TestOpenVINODetectionTask:
     @pytest.fixture(autouse=True)
     def setup(self, mocker, otx_model) -> None:
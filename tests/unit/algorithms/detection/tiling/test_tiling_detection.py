@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+from copy import deepcopy
 from typing import List
 
 import numpy as np
@@ -17,6 +18,7 @@ from torch import nn
 from otx.algorithms.common.adapters.mmcv.utils.config_utils import OTXConfig
 from otx.algorithms.common.adapters.mmdeploy.apis import MMdeployExporter
 from otx.algorithms.common.utils.data import get_dataset
+from otx.algorithms.detection.adapters.mmdet.datasets.tiling import Tile, get_tile_boxes, tile_boxes_overlap
 from otx.algorithms.detection.adapters.mmdet.task import MMDetectionTask
 from otx.algorithms.detection.adapters.mmdet.utils import build_detector, patch_tiling
 from otx.api.configuration.helper import create
@@ -450,3 +452,117 @@ class TestTilingDetection:
 
         # check max output prediction size is changed
         assert hp.tiling_parameters.tile_max_number != default_tile_max_number
+
+    @e2e_pytest_unit
+    def test_tile_boxes_overlap(self):
+        tile_boxes = get_tile_boxes(height=10, width=15, tile_size=10, stride=8)
+        assert tile_boxes.tolist() == [[0, 0, 10, 10], [8, 0, 15, 10], [0, 8, 10, 10], [8, 8, 15, 10]]
+
+        boxes = np.array([[1, 1, 5, 5], [9, 1, 14, 5], [0, 1, 5, 5]], dtype=np.float32)
+        matches = tile_boxes_overlap(tile_boxes, boxes)
+        assert matches.shape == (4, 3)
+        assert matches.tolist() == [[True, False, False], [False, True, False], [False, False, False], [False] * 3]
+
+    def instance_segmentation_data_cfg(self, otx_dataset: DatasetEntity, labels: List[LabelEntity], **kwargs):
+        """Get the training data config of an instance segmentation dataset."""
+        return ConfigDict(
+            dict(
+                type="ImageTilingDataset",
+                pipeline=[dict(type="Collect", keys=["img", "gt_bboxes", "gt_labels", "gt_masks"])],
+                dataset=dict(
+                    type="OTXDetDataset",
+                    pipeline=[
+                        dict(type="LoadImageFromOTXDataset"),
+                        dict(
+                            type="LoadAnnotationFromOTXDataset",
+                            with_bbox=True,
+                            with_mask=True,
+                            domain="instance_segmentation",
+                            min_size=-1,
+                        ),
+                    ],
+                    otx_dataset=otx_dataset,
+                    labels=labels,
+                ),
+                **self.tile_cfg,
+                **kwargs
+            )
+        )
+
+    @e2e_pytest_unit
+    def test_lazy_tile_masks(self):
+        otx_dataset, labels = create_otx_dataset(
+            self.height, self.width, self.label_names, Domain.INSTANCE_SEGMENTATION
+        )
+        train_data_cfg = self.instance_segmentation_data_cfg(otx_dataset, labels)
+        dataset = build_dataset(train_data_cfg)
+        tile_dataset = dataset.tile_dataset
+        for idx, tile in enumerate(tile_dataset.tiles):
+            # masks are not cropped until the tile is used
+            assert "gt_masks" not in tile
+            data = tile_dataset[idx]
+            assert "gt_mask_indices" not in data
+            assert len(data["gt_masks"]) == len(data["gt_bboxes"])
+            x_1, y_1, x_2, y_2 = tile["tile_box"]
+            assert data["gt_masks"].height == y_2 - y_1
+            assert data["gt_masks"].width == x_2 - x_1
+
+    @e2e_pytest_unit
+    def test_tile_masks_cropped_on_evaluation(self, mocker):
+        otx_dataset, labels = create_otx_dataset(
+            self.height, self.width, self.label_names, Domain.INSTANCE_SEGMENTATION
+        )
+        spy_get_tile_masks = mocker.spy(Tile, "get_tile_masks")
+        dataset = build_dataset(self.instance_segmentation_data_cfg(otx_dataset, labels))
+        # no tile masks are cropped to build the evaluator
+        spy_get_tile_masks.assert_not_called()
+        assert dataset.evaluator.annotation is None
+
+        ann_infos = dataset.evaluator.get_annotation()
+        assert len(ann_infos) == len(dataset)
+        for ann_info, tile in zip(ann_infos, dataset.tile_dataset.tiles):
+            assert len(ann_info["masks"]) == len(ann_info["bboxes"])
+            x_1, y_1, x_2, y_2 = tile["tile_box"]
+            assert ann_info["masks"].height == y_2 - y_1
+            assert ann_info["masks"].width == x_2 - x_1
+
+    @e2e_pytest_unit
+    def test_lazy_tiling_evaluator(self, mocker):
+        otx_dataset, labels = create_otx_dataset(
+            self.height, self.width, self.label_names, Domain.INSTANCE_SEGMENTATION
+        )
+        for _ in range(2):
+            otx_dataset.append(deepcopy(otx_dataset[0]))
+        spy_get_ann_info = mocker.spy(Tile, "get_ann_info")
+        dataset = build_dataset(self.instance_segmentation_data_cfg(otx_dataset, labels, lazy=True, sampling_ratio=0.5))
+        # no tile annotation is built at construction
+        spy_get_ann_info.assert_not_called()
+
+        tile_dataset = dataset.tile_dataset
+        spy_prepare_train_img = mocker.spy(tile_dataset.dataset, "prepare_train_img")
+        ann_infos = dataset.evaluator.get_annotation()
+        assert spy_get_ann_info.call_count == len(dataset)
+        # each image is loaded once for all of its tiles
+        assert spy_prepare_train_img.call_count == len({tile["dataset_idx"] for tile in tile_dataset.tiles})
+        for idx, ann_info in enumerate(ann_infos):
+            assert np.array_equal(ann_info["bboxes"], tile_dataset.get_ann_info(idx)["bboxes"])
+
+    @e2e_pytest_unit
+    def test_lazy_tiling(self):
+        eager_dataset = build_dataset(self.train_data_cfg)
+        self.train_data_cfg.lazy = True
+        lazy_dataset = build_dataset(self.train_data_cfg)
+
+        assert "img" not in lazy_dataset.tile_dataset.cached_results[0]
+        assert len(lazy_dataset) == len(eager_dataset)
+        for idx in range(len(eager_dataset)):
+            eager_tile = eager_dataset.tile_dataset[idx]
+            lazy_tile = lazy_dataset.tile_dataset[idx]
+            assert eager_tile["tile_box"] == lazy_tile["tile_box"]
+            assert np.array_equal(eager_tile["img"], lazy_tile["img"])
+            assert np.array_equal(eager_tile["gt_bboxes"], lazy_tile["gt_bboxes"])
+            assert np.array_equal(eager_tile["gt_labels"], lazy_tile["gt_labels"])
+
+        self.train_data_cfg.sampling_ratio = 0.5
+        lazy_dataset = build_dataset(self.train_data_cfg)
+        assert len(lazy_dataset) == max(int(len(lazy_dataset.tile_dataset.tiles_all) * 0.5), 1)
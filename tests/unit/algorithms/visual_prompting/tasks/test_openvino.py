@@ -113,21 +113,20 @@ class TestOpenVINOVisualPromptingInferencer:
     @e2e_pytest_unit
     def test_predict(self, mocker):
         """Teset predict."""
-        mocker_pre_process = mocker.patch.object(
+        mocker_pre_process_image = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "pre_process_image", return_value=(torch.zeros((1, 3, 2, 2)), {})
+        )
+        mocker_pre_process_prompts = mocker.patch.object(
             OpenVINOVisualPromptingInferencer,
-            "pre_process",
-            return_value=(
-                torch.zeros((1, 3, 2, 2)),
-                {},
-                [
-                    {
-                        "point_coords": [np.array([[[1, 1], [2, 2]]])],
-                        "point_labels": [1, 2],
-                        "label": LabelEntity(name="fake", domain="VISUALPROMPTING"),
-                        "orig_size": (4, 4),
-                    }
-                ],
-            ),
+            "pre_process_prompts",
+            return_value=[
+                {
+                    "point_coords": [np.array([[[1, 1], [2, 2]]])],
+                    "point_labels": [1, 2],
+                    "label": LabelEntity(name="fake", domain="VISUALPROMPTING"),
+                    "orig_size": (4, 4),
+                }
+            ],
         )
         mocker_forward = mocker.patch.object(
             OpenVINOVisualPromptingInferencer, "forward", return_value={"image_embeddings": np.empty((4, 2, 2))}
@@ -138,16 +137,101 @@ class TestOpenVINOVisualPromptingInferencer:
         mocker_post_process = mocker.patch.object(
             OpenVINOVisualPromptingInferencer, "post_process", return_value=(self.fake_annotation, None, None)
         )
-        fake_input = mocker.Mock(spec=DatasetItemEntity)
+        fake_input = mocker.Mock(spec=DatasetItemEntity, numpy=np.zeros((4, 4, 3), dtype=np.uint8))
 
         returned_value = self.visual_prompting_ov_inferencer.predict(fake_input)
 
-        mocker_pre_process.assert_called_once()
+        mocker_pre_process_image.assert_called_once()
+        mocker_pre_process_prompts.assert_called_once()
         mocker_forward.assert_called_once()
         mocker_forward_decoder.assert_called_once()
         mocker_post_process.assert_called_once()
         assert returned_value == self.fake_annotation
 
+    @e2e_pytest_unit
+    @pytest.mark.parametrize("is_batched,num_decoder_calls", [(True, 1), (False, 3)])
+    def test_predict_with_prompts(self, mocker, is_batched: bool, num_decoder_calls: int):
+        """Test predict decodes all the prompts at once if the decoder has a dynamic prompt dimension."""
+        prompts = [
+            {
+                "point_coords": np.full((1, 2, 2), idx, dtype=np.float32),
+                "point_labels": np.full((1, 2), idx, dtype=np.float32),
+                "mask_input": np.zeros((1, 1, 256, 256), dtype=np.float32),
+                "has_mask_input": np.zeros((1, 1), dtype=np.float32),
+                "label": LabelEntity(name="fake", domain="VISUALPROMPTING"),
+                "orig_size": (4, 4),
+            }
+            for idx in range(3)
+        ]
+        mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "pre_process_image", return_value=(torch.zeros((1, 3, 2, 2)), {})
+        )
+        mocker.patch.object(OpenVINOVisualPromptingInferencer, "pre_process_prompts", return_value=prompts)
+        mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "forward", return_value={"image_embeddings": np.empty((1, 4, 2, 2))}
+        )
+        mocker_forward_decoder = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer,
+            "forward_decoder",
+            side_effect=lambda inputs: {"iou_predictions": inputs["point_labels"][:, :1]},
+        )
+        mocker_post_process = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "post_process", return_value=(self.fake_annotation, None, None)
+        )
+        self.visual_prompting_ov_inferencer.model["decoder"].inputs = {
+            name: mocker.Mock(shape=[-1 if is_batched else 1])
+            for name in ("point_coords", "point_labels", "mask_input", "has_mask_input")
+        }
+        self.visual_prompting_ov_inferencer.decoder_batched = self.visual_prompting_ov_inferencer.is_decoder_batched()
+
+        returned_value = self.visual_prompting_ov_inferencer.predict(
+            mocker.Mock(spec=DatasetItemEntity, numpy=np.zeros((4, 4, 3), dtype=np.uint8))
+        )
+
+        assert self.visual_prompting_ov_inferencer.decoder_batched == is_batched
+        assert mocker_forward_decoder.call_count == num_decoder_calls
+        if is_batched:
+            assert mocker_forward_decoder.call_args.args[0]["point_coords"].shape == (3, 2, 2)
+        assert mocker_post_process.call_count == 3
+        for idx, call in enumerate(mocker_post_process.call_args_list):
+            assert call.args[0]["iou_predictions"].tolist() == [[idx]]
+            assert call.args[1]["original_size"] == (4, 4)
+        assert returned_value == self.fake_annotation * 3
+
+    @e2e_pytest_unit
+    def test_predict_with_cached_embeddings(self, mocker):
+        """Test predict reuses the image pre-processing and embeddings of an equal image."""
+        mocker_pre_process_image = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer,
+            "pre_process_image",
+            side_effect=lambda image: (torch.zeros((1, 3, 2, 2)), {"original_shape": image.shape}),
+        )
+        mocker_pre_process_prompts = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer,
+            "pre_process_prompts",
+            side_effect=lambda item, meta: [{"label": None, "orig_size": (4, 4)}],
+        )
+        mocker_forward = mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "forward", return_value={"image_embeddings": np.empty((1, 4, 2, 2))}
+        )
+        mocker.patch.object(OpenVINOVisualPromptingInferencer, "forward_decoder", return_value=None)
+        mocker.patch.object(
+            OpenVINOVisualPromptingInferencer, "post_process", return_value=(self.fake_annotation, None, None)
+        )
+        image = np.zeros((4, 4, 3), dtype=np.uint8)
+
+        self.visual_prompting_ov_inferencer.predict(mocker.Mock(spec=DatasetItemEntity, numpy=image))
+        # an equal image loaded again into new objects hits the cache
+        self.visual_prompting_ov_inferencer.predict(mocker.Mock(spec=DatasetItemEntity, numpy=image.copy()))
+        mocker_pre_process_image.assert_called_once()
+        mocker_forward.assert_called_once()
+        assert mocker_pre_process_prompts.call_count == 2
+        assert mocker_pre_process_prompts.call_args.args[1] == {"original_shape": (4, 4, 3)}
+
+        self.visual_prompting_ov_inferencer.predict(mocker.Mock(spec=DatasetItemEntity, numpy=np.ones_like(image)))
+        assert mocker_forward.call_count == 2
+        assert len(self.visual_prompting_ov_inferencer.embedding_cache) == 2
+
     @e2e_pytest_unit
     def test_forward(self):
         """Test forward."""
@@ -14,6 +14,7 @@
 
 from operator import attrgetter
 
+import numpy as np
 import pytest
 
 from otx.api.entities.shapes.polygon import Point, Polygon
@@ -170,6 +171,32 @@ class TestPolygon:
         with pytest.raises(ValueError):
             Polygon(empty_points_list)
 
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_polygon_from_numpy(self):
+        """
+        <b>Description:</b>
+        Check Polygon created from an array of coordinates
+
+        <b>Input data:</b>
+        Array of coordinates, some out of the normalized range
+
+        <b>Expected results:</b>
+        Test passes if the polygon has the same points as a polygon created from Point instances
+        """
+        coordinates = np.array([[0.5, 0.0], [0.75, 0.2], [0.6, 0.1], [1.5, -0.5]])
+        polygon = Polygon.from_numpy(coordinates, modification_date=self.modification_date)
+        expected_polygon = Polygon(
+            [Point(x, y) for x, y in coordinates.tolist()], modification_date=self.modification_date
+        )
+        assert polygon == expected_polygon
+        assert (polygon.min_x, polygon.max_x, polygon.min_y, polygon.max_y) == (0.5, 1.0, 0.0, 0.2)
+        assert all(isinstance(point, Point) for point in polygon.points)
+
+        with pytest.raises(ValueError):
+            Polygon.from_numpy(np.zeros((0, 2)))
+
     @pytest.mark.priority_medium
     @pytest.mark.unit
     @pytest.mark.reqids(Requirements.REQ_1)
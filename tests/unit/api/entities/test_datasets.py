@@ -2,13 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import copy
 from typing import List
 
 import pytest
 
 from otx.api.entities.annotation import AnnotationSceneEntity, AnnotationSceneKind
-from otx.api.entities.dataset_item import DatasetItemEntity
-from otx.api.entities.datasets import DatasetEntity, DatasetPurpose
+from otx.api.entities.dataset_item import DatasetItemEntity, DatasetItemEntityWithID
+from otx.api.entities.datasets import DatasetEntity, DatasetPurpose, LazyDatasetEntity
+from otx.api.entities.id import ID
 from otx.api.entities.label import LabelEntity
 from otx.api.entities.subset import Subset
 from tests.unit.api.constants.components import OtxSdkComponent
@@ -670,3 +672,231 @@ class TestDatasetEntity:
         assert isinstance(actual_empty_labels, list)
         assert segmentation_empty_label in actual_empty_labels
         assert detection_label in actual_empty_labels
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_dataset_entity_indexes(self):
+        """
+        <b>Description:</b>
+        Check that the indexes of DatasetEntity follow the changes of the dataset and of its items
+
+        <b>Input data:</b>
+        DatasetEntity class object with items of several subsets, with and without id
+
+        <b>Expected results:</b>
+        Test passes if the subsets, the positions of the ids and of the labels are the same as found by scanning
+        the items, after appending, removing and changing the subset, the id and the annotations of items. Subsets
+        share the items of the dataset, removing items keeps the index and changing an item of another dataset does
+        not invalidate it
+        """
+
+        def check_indexes(dataset):
+            for subset in Subset:
+                assert dataset.get_subset(subset)._items == [item for item in dataset if item.subset == subset]
+            combined_subsets = [Subset.TRAINING, Subset.VALIDATION, Subset.TESTING]
+            assert dataset.get_combined_subset(combined_subsets)._items == [
+                item for item in dataset if item.subset in combined_subsets
+            ]
+            for label in labels:
+                for include_empty in (False, True):
+                    assert dataset.get_indices_with_label(label, include_empty) == [
+                        index
+                        for index, item in enumerate(dataset)
+                        if label in item.annotation_scene.get_labels(include_empty)
+                    ]
+
+        labels = self.labels()
+        dataset = self.dataset()
+        items_with_id = []
+        for index, subset in enumerate([Subset.TRAINING, Subset.VALIDATION, Subset.TRAINING, Subset.UNLABELED]):
+            items_with_id.append(
+                DatasetItemEntityWithID(
+                    media=self.generate_random_image(),
+                    annotation_scene=self.annotations_entity(),
+                    subset=subset,
+                    id_=str(index),
+                )
+            )
+            dataset.append(items_with_id[-1])
+        check_indexes(dataset)
+        assert dataset.get_index_by_id(items_with_id[1].id_) == 4
+        with pytest.raises(ValueError):
+            dataset.get_index_by_id(ID("missing"))
+
+        # a subset shares the items of the dataset until either of them is changed
+        training_subset = dataset.get_subset(Subset.TRAINING)
+        assert training_subset._items._items is dataset._items
+        dataset.append(self.dataset_item())
+        assert training_subset._items == [items_with_id[0], items_with_id[2]]
+        dataset.remove_at_indices([len(dataset) - 1])
+
+        items_with_id[0].subset = Subset.TESTING
+        items_with_id[2].id_ = ID("renamed")
+        items_with_id[3].annotation_scene = AnnotationSceneEntity(annotations=[], kind=AnnotationSceneKind.ANNOTATION)
+        items_with_id[1].append_annotations(self.annotations_entity().annotations)
+        check_indexes(dataset)
+        assert dataset.get_index_by_id(ID("renamed")) == 5
+
+        # changing an item of another dataset does not invalidate the index
+        other_dataset = self.dataset()
+        other_dataset.get_subset(Subset.TRAINING)
+        index = dataset._index
+        other_dataset[0].subset = Subset.TESTING
+        assert dataset._index is index and index.is_valid(dataset._items)
+
+        dataset.remove(items_with_id[1])
+        check_indexes(dataset)
+        dataset.remove_at_indices([0, -1])
+        assert dataset._items[-2:] == [items_with_id[0], items_with_id[2]]
+        check_indexes(dataset)
+        assert dataset.get_index_by_id(ID("renamed")) == 3
+        with pytest.raises(ValueError):
+            dataset.remove(items_with_id[1])
+        # an item equal to an item of the dataset is removed like the item
+        dataset.remove(copy.copy(items_with_id[2]))
+        assert len(dataset) == 3
+        # the index is updated, not rebuilt, by the removals that follow
+        index = dataset._get_index()
+        for item in list(dataset)[:2]:
+            dataset.remove(item)
+        assert dataset._index is index and dataset._items == [items_with_id[0]]
+        check_indexes(dataset)
+
+
+@pytest.mark.components(OtxSdkComponent.OTX_API)
+class TestLazyDatasetEntity:
+    @staticmethod
+    def lazy_dataset(cache_size: int = 2):
+        created_keys = []
+
+        def create_item(key):
+            created_keys.append(key)
+            return DatasetItemEntity(
+                media=DatasetItemParameters.generate_random_image(),
+                annotation_scene=DatasetItemParameters().annotations_entity(),
+                subset=Subset.TRAINING if key < 3 else Subset.VALIDATION,
+            )
+
+        subsets = [Subset.TRAINING] * 3 + [Subset.VALIDATION] * 2
+        return LazyDatasetEntity(list(range(5)), create_item, subsets, cache_size=cache_size), created_keys
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_lazy_dataset_entity_fetch(self):
+        """
+        <b>Description:</b>
+        Check that LazyDatasetEntity creates its items when they are accessed
+
+        <b>Input data:</b>
+        LazyDatasetEntity of 5 keys with a cache of 2 items
+
+        <b>Expected results:</b>
+        Test passes if no item is created until it is accessed, the cached items are reused, the least recently
+        used item is evicted and the dataset can not be created with a subset missing
+        """
+        dataset, created_keys = self.lazy_dataset()
+        assert len(dataset) == 5
+        assert created_keys == []
+        assert repr(dataset) == "LazyDatasetEntity(size=5, purpose=INFERENCE)"
+
+        first_item = dataset[0]
+        assert dataset[0] is first_item
+        dataset[1]
+        dataset[0]
+        dataset[2]  # evicts the item 1
+        assert dataset[0] is first_item
+        dataset[1]
+        assert created_keys == [0, 1, 2, 1]
+
+        assert len(dataset[1:4]) == 3
+        assert len(list(dataset)) == 5
+        assert dataset == dataset
+
+        last_item = dataset[4]
+        dataset.remove(last_item)
+        assert len(dataset) == 4
+        with pytest.raises(ValueError):
+            dataset.remove(last_item)
+        with pytest.raises(ValueError):
+            LazyDatasetEntity([0, 1], lambda key: None, [Subset.TRAINING])
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_lazy_dataset_entity_subsets(self):
+        """
+        <b>Description:</b>
+        Check that the subsets of LazyDatasetEntity are lazy
+
+        <b>Input data:</b>
+        LazyDatasetEntity of 3 training and 2 validation keys
+
+        <b>Expected results:</b>
+        Test passes if the subsets and the added datasets hold the expected items without creating them, and
+        share the cache of the dataset
+        """
+        dataset, created_keys = self.lazy_dataset()
+        training_subset = dataset.get_subset(Subset.TRAINING)
+        combined_subset = dataset.get_combined_subset([Subset.TRAINING, Subset.VALIDATION])
+        assert isinstance(training_subset, LazyDatasetEntity)
+        assert len(training_subset) == 3
+        assert len(dataset.get_subset(Subset.TESTING)) == 0
+        assert len(combined_subset) == 5
+        assert created_keys == []
+
+        assert all(item.subset == Subset.TRAINING for item in training_subset)
+        assert combined_subset[2] is training_subset[2]
+        assert created_keys == [0, 1, 2]
+
+        other_item = DatasetItemParameters().dataset_item()
+        added_dataset = dataset + [other_item]
+        assert isinstance(added_dataset, LazyDatasetEntity)
+        assert len(added_dataset) == 6
+        assert added_dataset[5] is other_item
+        dataset.append(other_item)
+        assert dataset[5] is other_item
+        dataset.remove(other_item)
+        assert len(dataset) == 5
+        assert created_keys == [0, 1, 2]
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_lazy_dataset_entity_changed_items(self):
+        """
+        <b>Description:</b>
+        Check that LazyDatasetEntity keeps the items which are referenced or changed, and finds them by their key
+
+        <b>Input data:</b>
+        LazyDatasetEntity of 5 keys with a cache of 1 item
+
+        <b>Expected results:</b>
+        Test passes if a referenced item is not created again, a changed item is kept after it is evicted from the
+        cache, a copy of an item is not kept and an evicted item is removed from the dataset and its subsets
+        """
+        dataset, created_keys = self.lazy_dataset(cache_size=1)
+        first_item = dataset[0]
+        dataset[1]  # evicts the item 0
+        assert dataset[0] is first_item
+        assert created_keys == [0, 1]
+
+        dataset[1].append_annotations(DatasetItemParameters().annotations())
+        changed_annotations = dataset[1].annotation_scene
+        dataset[2]  # evicts the item 1
+        assert dataset[1].annotation_scene is changed_annotations
+        assert created_keys == [0, 1, 1, 2]
+
+        copy.copy(dataset[3]).subset = Subset.TESTING
+        dataset[4]  # evicts the item 3
+        assert dataset[3].subset == Subset.VALIDATION
+        assert created_keys == [0, 1, 1, 2, 3, 4, 3]
+
+        training_subset = dataset.get_subset(Subset.TRAINING)
+        dataset.remove(first_item)
+        training_subset.remove(first_item)
+        assert len(dataset) == 4
+        assert len(training_subset) == 2
+        with pytest.raises(ValueError):
+            dataset.remove(first_item)
@@ -45,18 +45,20 @@ class TestInferenceParameters:
         infer_params = InferenceParameters()
 
         assert dataclasses.is_dataclass(infer_params)
-        assert len(dataclasses.fields(infer_params)) == 6
+        assert len(dataclasses.fields(infer_params)) == 7
         assert dataclasses.fields(infer_params)[0].name == "is_evaluation"
         assert dataclasses.fields(infer_params)[1].name == "update_progress"
         assert dataclasses.fields(infer_params)[2].name == "explainer"
         assert dataclasses.fields(infer_params)[3].name == "process_saliency_maps"
         assert dataclasses.fields(infer_params)[4].name == "explain_predicted_classes"
         assert dataclasses.fields(infer_params)[5].name == "enable_async_inference"
+        assert dataclasses.fields(infer_params)[6].name == "profiler"
         assert type(infer_params.is_evaluation) is bool
         assert type(infer_params.process_saliency_maps) is bool
         assert type(infer_params.explain_predicted_classes) is bool
         assert callable(infer_params.update_progress)
         assert type(infer_params.explainer) is str
+        assert infer_params.profiler is None
         with pytest.raises(AttributeError):
             str(infer_params.WRONG)
 
@@ -7,6 +7,7 @@ from datetime import datetime
 
 import numpy as np
 import pytest
+from sklearn.metrics import confusion_matrix as sklearn_confusion_matrix
 
 from otx.api.configuration import ConfigurableParameters
 from otx.api.entities.annotation import (
@@ -438,6 +439,121 @@ class TestAccuracyFunctions:
         with pytest.raises(ValueError):
             compute_unnormalized_confusion_matrices_from_resultset(result_set)
 
+    @staticmethod
+    def set_based_confusion_matrices(resultset: ResultSetEntity) -> list:
+        """Returns the (label names, matrix) of each label group as computed from the label index sets before."""
+        label_schema = resultset.model.configuration.get_label_schema()
+        labels_with_empty = label_schema.get_labels(include_empty=True)
+        true_label_idx = []
+        predicted_label_idx = []
+        for gt_item, pred_item in zip(resultset.ground_truth_dataset, resultset.prediction_dataset):
+            true_label_idx.append(
+                {labels_with_empty.index(label) for label in gt_item.get_roi_labels(labels_with_empty)}
+            )
+            predicted_label_idx.append(
+                {labels_with_empty.index(label) for label in pred_item.get_roi_labels(labels_with_empty)}
+            )
+
+        task_labels = label_schema.get_labels(include_empty=False)
+        matrices = []
+        for label_group in label_schema.get_groups():
+            map_task_labels_idx_to_group_idx = {
+                task_labels.index(label): i_group for i_group, label in enumerate(label_group.labels)
+            }
+            set_group_labels_idx = set(map_task_labels_idx_to_group_idx.keys())
+            group_label_names = [task_labels[label_idx].name for label_idx in set_group_labels_idx]
+            if len(group_label_names) == 1:
+                y_true = [int(not set_group_labels_idx.issubset(true_labels)) for true_labels in true_label_idx]
+                y_pred = [int(not set_group_labels_idx.issubset(pred_labels)) for pred_labels in predicted_label_idx]
+                column_labels = group_label_names + [f"~ {group_label_names[0]}"]
+                group_label_names = column_labels.copy()
+            else:
+                undefined_idx = len(group_label_names)
+                y_true = [
+                    map_task_labels_idx_to_group_idx[list(labels & set_group_labels_idx)[0]]
+                    if labels & set_group_labels_idx
+                    else undefined_idx
+                    for labels in true_label_idx
+                ]
+                y_pred = [
+                    map_task_labels_idx_to_group_idx[list(labels & set_group_labels_idx)[0]]
+                    if labels & set_group_labels_idx
+                    else undefined_idx
+                    for labels in predicted_label_idx
+                ]
+                column_labels = group_label_names + ["Other"]
+            matrix_data = sklearn_confusion_matrix(y_true, y_pred, labels=list(range(len(column_labels))))
+            if column_labels[-1] == "Other":
+                matrix_data = np.delete(matrix_data, -1, 0)
+                if sum(matrix_data[:, -1]) == 0:
+                    matrix_data = np.delete(matrix_data, -1, 1)
+            matrices.append((group_label_names, matrix_data))
+        return matrices
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_compute_unnormalized_confusion_matrices_matches_label_sets(self):
+        """
+        <b>Description:</b>
+        Check that "compute_unnormalized_confusion_matrices_from_resultset" function returns the matrices computed from
+        the label index sets before
+
+        <b>Input data:</b>
+        ResultSetEntity-class object with multiclass and single label groups, items without labels and items with
+        several labels of a multiclass group
+
+        <b>Expected results:</b>
+        Test passes if the label names and the values of each confusion matrix are equal to the ones computed from the
+        label index sets
+        """
+        labels = [LabelEntity(name=name, domain=Domain.CLASSIFICATION, id=ID(f"{name}_label")) for name in "abcde"]
+        label_by_name = {label.name: label for label in labels}
+        label_schema = LabelSchemaEntity(
+            label_groups=[
+                LabelGroup(name="abc", labels=labels[:3]),
+                LabelGroup(name="d", labels=[labels[3]]),
+                LabelGroup(name="e", labels=[labels[4]]),
+            ]
+        )
+        model = ModelEntity(
+            train_dataset=DatasetEntity(),
+            configuration=ModelConfiguration(ConfigurableParameters(header="Test params"), label_schema),
+        )
+        gt_and_pred_label_names = [
+            ("a", "a"),
+            ("b", "a"),
+            ("ab", "b"),
+            ("bc", "cb"),
+            ("", "c"),
+            ("d", ""),
+            ("ade", "ae"),
+            ("ce", "cd"),
+            ("c", "c"),
+        ]
+
+        def dataset_item(label_names: str) -> DatasetItemEntity:
+            roi = Annotation(
+                shape=Rectangle.generate_full_box(), labels=[ScoredLabel(label_by_name[name]) for name in label_names]
+            )
+            return DatasetItemEntity(
+                media=CommonActions.image,
+                annotation_scene=AnnotationSceneEntity(annotations=[], kind=AnnotationSceneKind.ANNOTATION),
+                roi=roi,
+            )
+
+        result_set = ResultSetEntity(
+            model=model,
+            ground_truth_dataset=DatasetEntity([dataset_item(gt) for gt, _ in gt_and_pred_label_names]),
+            prediction_dataset=DatasetEntity([dataset_item(pred) for _, pred in gt_and_pred_label_names]),
+        )
+        expected_matrices = self.set_based_confusion_matrices(result_set)
+        confusion_matrices = compute_unnormalized_confusion_matrices_from_resultset(result_set)
+        assert len(confusion_matrices) == len(expected_matrices)
+        for confusion_matrix, (expected_labels, expected_matrix) in zip(confusion_matrices, expected_matrices):
+            assert confusion_matrix.row_labels == expected_labels
+            assert np.array_equal(confusion_matrix.matrix_values, expected_matrix)
+
 
 @pytest.mark.components(OtxSdkComponent.OTX_API)
 class TestAccuracy:
@@ -18,6 +18,7 @@ import pytest
 from otx.api.entities.label import Domain, LabelEntity
 from otx.api.entities.shapes.rectangle import Rectangle
 from otx.api.usecases.evaluation.basic_operations import (
+    SegmentationConfusionMatrix,
     divide_arrays_with_possible_zeros,
     get_intersections_and_cardinalities,
     intersection_box,
@@ -81,6 +82,41 @@ class TestBasicOperationsFunctions:
         assert cardinalities.get(non_assigned_label) == 0
         assert cardinalities.get(None) == 51
 
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_segmentation_confusion_matrix(self):
+        """
+        <b>Description:</b>
+        Check "SegmentationConfusionMatrix" class
+
+        <b>Input data:</b>
+        "references" masks array, "predictions" masks array, "labels" list of "LabelEntity" class objects
+
+        <b>Expected results:</b>
+        Test passes if the accumulated confusion matrix and the metrics derived from it are equal to expected
+        """
+        label_1 = LabelEntity(name="label_1", domain=Domain.SEGMENTATION)
+        label_2 = LabelEntity(name="label_2", domain=Domain.SEGMENTATION)
+        confusion_matrix = SegmentationConfusionMatrix([label_1, label_2])
+        confusion_matrix.update(np.array([[0, 1], [1, 2]]), np.array([[0, 1], [2, 2]]))
+        # Values outside of the label range are counted as "other", matching "other" pixels are intersections
+        confusion_matrix.update(np.array([[1, 5], [5, 0]]), np.array([[1, 5], [4, 1]]))
+        assert confusion_matrix.matrix.tolist() == [
+            [1, 1, 0, 0],
+            [0, 2, 1, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 2],
+        ]
+        intersections, cardinalities = confusion_matrix.get_intersections_and_cardinalities()
+        assert intersections == {label_1: 2, label_2: 1, None: 4}
+        assert cardinalities == {label_1: 6, label_2: 3, None: 13}
+        assert confusion_matrix.get_dice_per_label() == {label_1: 4 / 6, label_2: 2 / 3}
+        assert confusion_matrix.get_iou_per_label() == {label_1: 0.5, label_2: 0.5}
+        assert confusion_matrix.get_mean_iou() == 0.5
+        with pytest.raises(ValueError):
+            confusion_matrix.update(np.zeros((2, 2)), np.zeros((2, 3)))
+
     @pytest.mark.priority_medium
     @pytest.mark.unit
     @pytest.mark.reqids(Requirements.REQ_1)
@@ -40,6 +40,7 @@ from otx.api.entities.scored_label import ScoredLabel
 from otx.api.entities.shapes.ellipse import Ellipse
 from otx.api.entities.shapes.rectangle import Rectangle
 from otx.api.usecases.evaluation.f_measure import (
+    BOX_DTYPE,
     FMeasure,
     _AggregatedResults,
     _FMeasureCalculator,
@@ -47,8 +48,10 @@ from otx.api.usecases.evaluation.f_measure import (
     _OverallResults,
     _ResultCounters,
     bounding_box_intersection_over_union,
+    boxes_to_array,
     get_iou_matrix,
     get_n_false_negatives,
+    get_n_false_negatives_per_prefix,
     intersection_box,
 )
 from tests.unit.api.constants.components import OtxSdkComponent
@@ -139,6 +142,36 @@ class TestFMeasureFunctions:
             [0.0, 0.1, 0.0, 0.08],
         ]
         assert np.array_equal(get_iou_matrix(boxes_1, boxes_2), expected_matrix)
+        # Checking array returned by "get_iou_matrix" for boxes stored in structured arrays
+        class_ids: dict = {}
+        array_1 = boxes_to_array([(*box, "class", 1.0) for box in boxes_1], class_ids)
+        array_2 = boxes_to_array([(*box, "class", 1.0) for box in boxes_2], class_ids)
+        assert np.array_equal(get_iou_matrix(array_1, array_2), expected_matrix)
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_boxes_to_array(self):
+        """
+        <b>Description:</b>
+        Check "boxes_to_array" function
+
+        <b>Input data:</b>
+        List of box tuples and mapping from class names to class ids
+
+        <b>Expected results:</b>
+        Test passes if structured array returned by "boxes_to_array" function is equal to expected and
+        class names are mapped to class ids case-insensitively
+        """
+        class_ids = {"class_1": 0}
+        boxes = boxes_to_array(
+            [(0.1, 0.2, 0.3, 0.4, "class_2", 0.5), (0.2, 0.3, 0.4, 0.5, "CLASS_1", 0.9)],
+            class_ids,
+        )
+        assert boxes.dtype == BOX_DTYPE
+        assert class_ids == {"class_1": 0, "class_2": 1}
+        assert boxes.tolist() == [(0.1, 0.2, 0.3, 0.4, 1, 0.5), (0.2, 0.3, 0.4, 0.5, 0, 0.9)]
+        assert boxes_to_array([], class_ids).shape == (0,)
 
     @pytest.mark.priority_medium
     @pytest.mark.unit
@@ -167,6 +200,32 @@ class TestFMeasureFunctions:
         # "iou_threshold"
         assert get_n_false_negatives(iou_matrix, 0.09) == 2
 
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_get_n_false_negatives_per_prefix(self):
+        """
+        <b>Description:</b>
+        Check "get_n_false_negatives_per_prefix" function
+
+        <b>Input data:</b>
+        IoU-matrix np.array and order of the predicted boxes
+
+        <b>Expected results:</b>
+        Test passes if values returned by "get_n_false_negatives_per_prefix" function are equal to
+        "get_n_false_negatives" applied on the first k predicted boxes in the given order
+        """
+        rng = np.random.default_rng(0)
+        iou_matrix = np.round(rng.random((6, 8)), 1)
+        for order in (np.arange(8), rng.permutation(8), rng.permutation(8)[:5]):
+            for iou_threshold in (0.3, 0.5, 0.8):
+                expected = [len(iou_matrix)] + [
+                    get_n_false_negatives(iou_matrix[:, order[:k]], iou_threshold) for k in range(1, len(order) + 1)
+                ]
+                assert get_n_false_negatives_per_prefix(iou_matrix, order, iou_threshold).tolist() == expected
+        assert get_n_false_negatives_per_prefix(np.zeros((3, 0)), np.zeros(0, dtype=int), 0.5).tolist() == [3]
+        assert get_n_false_negatives_per_prefix(np.zeros((0, 2)), np.arange(2), 0.5).tolist() == [0, 0, 0]
+
 
 @pytest.mark.components(OtxSdkComponent.OTX_API)
 class TestMetrics:
@@ -405,6 +464,14 @@ class TestFMeasureCalculator:
             prediction_boxes_per_image=self.prediction_boxes_per_image(),
         )
 
+    @staticmethod
+    def boxes_as_tuples(calculator: _FMeasureCalculator, boxes_per_image: list) -> list:
+        class_names = {class_id: class_name for class_name, class_id in calculator.class_ids.items()}
+        return [
+            [(x1, y1, x2, y2, class_names[class_id], score) for x1, y1, x2, y2, class_id, score in boxes.tolist()]
+            for boxes in boxes_per_image
+        ]
+
     @pytest.mark.priority_medium
     @pytest.mark.unit
     @pytest.mark.reqids(Requirements.REQ_1)
@@ -426,8 +493,19 @@ class TestFMeasureCalculator:
             ground_truth_boxes_per_image=ground_truth_boxes_per_image,
             prediction_boxes_per_image=prediction_boxes_per_image,
         )
-        assert f_measure_calculator.ground_truth_boxes_per_image == ground_truth_boxes_per_image
-        assert f_measure_calculator.prediction_boxes_per_image == prediction_boxes_per_image
+        for boxes in (
+            f_measure_calculator.ground_truth_boxes_per_image + f_measure_calculator.prediction_boxes_per_image
+        ):
+            assert boxes.dtype == BOX_DTYPE
+        assert f_measure_calculator.class_ids == {"class_1": 0, "class_2": 1, "class_3": 2}
+        assert (
+            self.boxes_as_tuples(f_measure_calculator, f_measure_calculator.ground_truth_boxes_per_image)
+            == ground_truth_boxes_per_image
+        )
+        assert (
+            self.boxes_as_tuples(f_measure_calculator, f_measure_calculator.prediction_boxes_per_image)
+            == prediction_boxes_per_image
+        )
         assert f_measure_calculator.confidence_range == [0.025, 1.0, 0.025]
         assert f_measure_calculator.nms_range == [0.1, 1, 0.05]
         assert f_measure_calculator.default_confidence_threshold == 0.35
@@ -528,15 +606,18 @@ class TestFMeasureCalculator:
         f_measure_calculator = self.f_measure_calculator()
         boxes_per_image = f_measure_calculator.prediction_boxes_per_image
         # Checking value returned by "__filter_confidence" for "confidence_threshold" equal to 0.0
-        assert (
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
             f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
                 boxes_per_image, 0.0
-            )
-            == boxes_per_image
-        )
+            ),
+        ) == self.boxes_as_tuples(f_measure_calculator, boxes_per_image)
         # Checking value returned by "__filter_confidence" for "confidence_threshold" equal to filter some boxes
-        assert f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
-            boxes_per_image, 0.92
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
+                boxes_per_image, 0.92
+            ),
         ) == [
             [(0.5, 0.05, 0.8, 0.85, "class_1", 0.93)],
             [
@@ -544,8 +625,11 @@ class TestFMeasureCalculator:
                 (0.45, 0.05, 0.95, 0.5, "class_3", 0.94),
             ],
         ]
-        assert f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
-            boxes_per_image, 0.93
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
+                boxes_per_image, 0.93
+            ),
         ) == [
             [],
             [
@@ -554,8 +638,11 @@ class TestFMeasureCalculator:
             ],
         ]
         # Checking value returned by "__filter_confidence" for "confidence_threshold" equal to 1.0
-        assert f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
-            boxes_per_image, 1.0
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_confidence(  # type: ignore[attr-defined]
+                boxes_per_image, 1.0
+            ),
         ) == [
             [],
             [],
@@ -583,8 +670,11 @@ class TestFMeasureCalculator:
         f_measure_calculator = self.f_measure_calculator()
         boxes_per_image = f_measure_calculator.prediction_boxes_per_image
         # Checking list returned by "__filter_class" to get class represented in one image
-        assert f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
-            boxes_per_image, "class_2"
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
+                boxes_per_image, f_measure_calculator.class_ids["class_2"]
+            ),
         ) == [
             [
                 (0.1, 0.15, 0.35, 0.75, "class_2", 0.92),
@@ -593,8 +683,11 @@ class TestFMeasureCalculator:
             [],
         ]
         # Checking list returned by "__filter_class" to get class represented in several images
-        assert f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
-            boxes_per_image, "class_1"
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
+                boxes_per_image, f_measure_calculator.class_ids["class_1"]
+            ),
         ) == [
             [
                 (0.45, 0.2, 0.75, 0.85, "class_1", 0.92),
@@ -606,8 +699,11 @@ class TestFMeasureCalculator:
             ],
         ]
         # Checking list returned by "__filter_class" to get class that is not represented in any of images
-        assert f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
-            boxes_per_image, "class_6"
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_class(  # type: ignore[attr-defined]
+                boxes_per_image, len(f_measure_calculator.class_ids)
+            ),
         ) == [
             [],
             [],
@@ -636,15 +732,18 @@ class TestFMeasureCalculator:
         boxes_per_image = f_measure_calculator.prediction_boxes_per_image
         critical_nms = [[0.5, 0.55, 0.65, 0.6], [0.6, 0.55, 0.5, 0.65]]
         # Checking list returned by "__filter_nms" for "nms_threshold" that not filters any boxes
-        assert (
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
             f_measure_calculator._FMeasureCalculator__filter_nms(  # type: ignore[attr-defined]
                 boxes_per_image, critical_nms, 1.0
-            )
-            == boxes_per_image
-        )
+            ),
+        ) == self.boxes_as_tuples(f_measure_calculator, boxes_per_image)
         # Checking list returned by "__filter_nms" for "nms_threshold" that filters some boxes
-        assert f_measure_calculator._FMeasureCalculator__filter_nms(  # type: ignore[attr-defined]
-            boxes_per_image, critical_nms, 0.6
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_nms(  # type: ignore[attr-defined]
+                boxes_per_image, critical_nms, 0.6
+            ),
         ) == [
             [
                 (0.45, 0.2, 0.75, 0.85, "class_1", 0.92),
@@ -656,8 +755,11 @@ class TestFMeasureCalculator:
             ],
         ]
         # Checking list returned by "__filter_nms" for "nms_threshold" that filters all boxes
-        assert f_measure_calculator._FMeasureCalculator__filter_nms(  # type: ignore[attr-defined]
-            boxes_per_image, critical_nms, 0.1
+        assert self.boxes_as_tuples(
+            f_measure_calculator,
+            f_measure_calculator._FMeasureCalculator__filter_nms(  # type: ignore[attr-defined]
+                boxes_per_image, critical_nms, 0.1
+            ),
         ) == [
             [],
             [],
@@ -696,6 +798,8 @@ class TestFMeasureCalculator:
                 (0.7, 0.1, 1.0, 0.6, "class_4", 0.94),
             ],
         ]
+        class_ids: dict = {}
+        boxes_per_image = [boxes_to_array(boxes, class_ids) for boxes in boxes_per_image]
         # Checking list returned by "__get_critical_nms" when "cross_class_nms" is "False"
         assert f_measure_calculator._FMeasureCalculator__get_critical_nms(  # type: ignore[attr-defined]
             boxes_per_image, False
@@ -876,6 +980,7 @@ class TestFMeasureCalculator:
                 boxes_pair_for_nms = _FMeasureCalculator(
                     calculator.ground_truth_boxes_per_image,
                     predict_boxes_per_image_nms,
+                    class_ids=calculator.class_ids,
                 )
                 result_point = boxes_pair_for_nms.evaluate_classes(
                     classes=["class_1", "class_2"],
@@ -1532,11 +1637,15 @@ class TestFMeasure:
         }
         label_schema_labels = result_set.model.configuration.get_label_schema().get_labels(include_empty=False)
         classes = [label.name for label in label_schema_labels]
+        class_ids = {label.name.lower(): class_id for class_id, label in enumerate(label_schema_labels)}
         boxes_pair = _FMeasureCalculator(
-            f_measure._FMeasure__get_boxes_from_dataset_as_list(ground_dataset, labels),  # type: ignore[attr-defined]
-            f_measure._FMeasure__get_boxes_from_dataset_as_list(  # type: ignore[attr-defined]
-                prediction_dataset, labels
+            f_measure._FMeasure__get_boxes_from_dataset_as_arrays(  # type: ignore[attr-defined]
+                ground_dataset, class_ids
+            ),
+            f_measure._FMeasure__get_boxes_from_dataset_as_arrays(  # type: ignore[attr-defined]
+                prediction_dataset, class_ids
             ),
+            class_ids=class_ids,
         )
         result = boxes_pair.evaluate_detections(
             result_based_nms_threshold=True,
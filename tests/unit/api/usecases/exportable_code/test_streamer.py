@@ -6,9 +6,11 @@ import tempfile
 from pathlib import Path
 from time import sleep
 
+import numpy as np
 import pytest
 
 from otx.api.usecases.exportable_code.streamer import (
+    BaseStreamer,
     CameraStreamer,
     DirStreamer,
     ImageStreamer,
@@ -17,6 +19,7 @@ from otx.api.usecases.exportable_code.streamer import (
     VideoStreamer,
     get_streamer,
 )
+from otx.api.usecases.exportable_code.streamer.streamer import MediaType
 from tests.test_helpers import (
     generate_random_image_folder,
     generate_random_single_image,
@@ -27,6 +30,19 @@ from tests.unit.api.constants.components import OtxSdkComponent
 from tests.unit.api.constants.requirements import Requirements
 
 
+class FramesStreamer(BaseStreamer):
+    """Streams the given frames."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def __iter__(self):
+        yield from self.frames
+
+    def get_type(self):
+        return MediaType.VIDEO
+
+
 @pytest.mark.components(OtxSdkComponent.OTX_API)
 class TestStreamer:
     @staticmethod
@@ -351,3 +367,43 @@ class TestStreamer:
                     break
 
             assert frame_count == 5
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize("mode", ["process", "thread"])
+    def test_threaded_streamer_modes(self, mode):
+        """
+        <b>Description:</b>
+        Check that ThreadedStreamer returns the frames of the streamer in order in both modes
+
+        <b>Input data:</b>
+        Frames of different sizes and types
+
+        <b>Expected results:</b>
+        Test passes if ThreadedStreamer returns all the frames unchanged, including the frames which do not fit in
+        the slots of the shared memory sized from the first frame
+
+        <b>Steps</b>
+        1. Create ThreadedStreamer in the given mode
+        2. Retrieve all the frames from ThreadedStreamer
+        3. Check that an unknown mode raises ValueError
+        """
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (36, 48, 3), dtype=np.uint8) for _ in range(10)]
+        frames[3] = rng.integers(0, 255, (72, 48, 3), dtype=np.uint8)
+        frames[5] = rng.integers(0, 255, (12, 8, 3), dtype=np.uint8)
+        frames[7] = rng.random((36, 48, 3)).astype(np.float32)
+
+        streamer = ThreadedStreamer(FramesStreamer(frames), buffer_size=2, mode=mode)
+        streamed_frames = list(streamer)
+        assert len(streamed_frames) == len(frames)
+        for streamed_frame, frame in zip(streamed_frames, frames):
+            assert streamed_frame.dtype == frame.dtype
+            assert np.array_equal(streamed_frame, frame)
+
+        assert list(ThreadedStreamer(FramesStreamer([]), mode=mode)) == []
+
+        with pytest.raises(ValueError):
+            ThreadedStreamer(FramesStreamer(frames), mode="unknown")
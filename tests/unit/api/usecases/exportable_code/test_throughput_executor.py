@@ -0,0 +1,243 @@
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import threading
+import time
+from contextlib import nullcontext
+
+import numpy as np
+import pytest
+from openvino.model_api.models import MaskRCNNModel
+from openvino.model_api.tilers import InstanceSegmentationTiler
+
+from otx.api.usecases.exportable_code.demo.demo_package.executors import throughput
+from otx.api.usecases.exportable_code.demo.demo_package.executors.throughput import (
+    ThroughputExecutor,
+)
+from otx.api.usecases.exportable_code.demo.demo_package.model_container import (
+    ModelContainer,
+)
+from otx.api.usecases.exportable_code.streamer import BaseStreamer
+from otx.api.usecases.exportable_code.streamer.streamer import MediaType
+from tests.unit.api.constants.components import OtxSdkComponent
+from tests.unit.api.constants.requirements import Requirements
+
+
+class FramesStreamer(BaseStreamer):
+    def __init__(self, frames):
+        self.frames = frames
+
+    def __iter__(self):
+        yield from self.frames
+
+    def get_type(self):
+        return MediaType.DIR
+
+
+class FakeAdapter:
+    """Infer requests completing in a random order on other threads."""
+
+    def __init__(self, num_requests):
+        self.async_queue = [None] * num_requests
+        self.callback = None
+        self.threads = []
+
+    def set_callback(self, callback):
+        self.callback = callback
+
+    def copy_raw_result(self, request):
+        return request
+
+    def infer_async(self, inputs, callback_data):
+        def run():
+            time.sleep(np.random.uniform(0, 0.01))
+            self.callback(inputs * 2, callback_data)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+
+    def await_all(self):
+        for thread in self.threads:
+            thread.join()
+
+
+class FakeCoreModel:
+    def __init__(self):
+        self.inference_adapter = FakeAdapter(num_requests=3)
+
+    def preprocess(self, inputs):
+        return inputs.sum(), {"shape": inputs.shape}
+
+    def infer_async_raw(self, inputs, callback_data):
+        self.inference_adapter.infer_async(inputs, callback_data)
+
+    def postprocess(self, outputs, meta):
+        return outputs
+
+    def await_all(self):
+        self.inference_adapter.await_all()
+
+
+class FakeModelContainer:
+    """Model splitting each frame into two tiles of which the predictions are summed."""
+
+    task_type = None
+    labels = None
+    model_parameters = None
+
+    def __init__(self):
+        self.core_model = FakeCoreModel()
+
+    def split(self, frame):
+        return [(frame[:1], [0]), (frame[1:], [1])]
+
+    def tile_postprocessing(self):
+        return nullcontext()
+
+    def merge(self, frame, predictions, coords):
+        assert coords == [[0], [1]]
+        return sum(predictions), {"original_shape": frame.shape}
+
+
+class EchoAdapter(FakeAdapter):
+    """Infer requests returning their inputs as raw results."""
+
+    def infer_async(self, inputs, callback_data):
+        thread = threading.Thread(target=self.callback, args=(inputs, callback_data))
+        thread.start()
+        self.threads.append(thread)
+
+    def get_rt_info(self, path):
+        raise RuntimeError("Cannot get runtime attribute. Path to runtime attribute is incorrect.")
+
+
+class FakeMaskRCNNModel(MaskRCNNModel):
+    """MaskRCNN predicting an object in the middle of every input, its raw mask being the input channel."""
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        self.inference_adapter = EchoAdapter(num_requests=3)
+        self.model_loaded = True
+        self.labels = ["background", "object"]
+        self.is_segmentoly = False
+        self.output_blob_name = {"labels": "labels", "boxes": "boxes", "masks": "masks"}
+        self.outputs = {}
+        self.orig_width = self.orig_height = 8
+        self.resize_type = "standard"
+        self.confidence_threshold = 0.5
+        self.postprocess_semantic_masks = True
+
+    def preprocess(self, inputs):
+        height, width = inputs.shape[:2]
+        box = [width / 4, height / 4, 3 * width / 4, 3 * height / 4]
+        raw_outputs = {
+            "labels": np.zeros(1, dtype=np.int64),
+            "boxes": np.array([[coord * 8 / size for coord, size in zip(box, (width, height) * 2)] + [0.9]]),
+            "masks": np.resize(inputs[..., 0], (1, 8, 8)).astype(np.float32),
+        }
+        return raw_outputs, {"original_shape": inputs.shape}
+
+    def infer_sync(self, dict_data):
+        return dict_data
+
+    def infer_async_raw(self, inputs, callback_data):
+        self.inference_adapter.infer_async(inputs, callback_data)
+
+    def await_all(self):
+        self.inference_adapter.await_all()
+
+
+class FakeConverter:
+    def convert_to_annotation(self, predictions, metadata):
+        return predictions
+
+
+class FakeVisualizer:
+    output = None
+
+    def __init__(self):
+        self.shown = []
+
+    def draw(self, frame, annotation, meta):
+        return annotation
+
+    def show(self, image):
+        self.shown.append(image)
+
+    def is_quit(self):
+        return False
+
+    def video_delay(self, elapsed_time, streamer):
+        pass
+
+
+@pytest.mark.components(OtxSdkComponent.OTX_API)
+class TestThroughputExecutor:
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_throughput_executor(self, monkeypatch):
+        """
+        <b>Description:</b>
+        Check that ThroughputExecutor shows the predictions of the frames in their input order
+
+        <b>Input data:</b>
+        Fake model whose infer requests complete in a random order
+
+        <b>Expected results:</b>
+        Test passes if the merged predictions of the tiles of all the frames are shown in order
+        and the latency of every stage is measured
+        """
+        frames = [np.full((2, 4), idx, dtype=np.int64) for idx in range(20)]
+        monkeypatch.setattr(throughput, "get_streamer", lambda input_stream, loop: FramesStreamer(frames))
+        monkeypatch.setattr(throughput, "create_output_converter", lambda *args: FakeConverter())
+        monkeypatch.setattr(throughput, "dump_frames", lambda *args: None)
+
+        visualizer = FakeVisualizer()
+        executor = ThroughputExecutor(FakeModelContainer(), visualizer, num_workers=3)
+        assert executor.max_queue_size == 6
+        executor.run("frames")
+
+        assert visualizer.shown == [frame.sum() * 2 for frame in frames]
+        for stage in executor.metrics.STAGES:
+            assert executor.metrics.get_latency(stage) is not None
+        assert executor.metrics.num_frames == len(frames)
+        assert executor.metrics.get_fps() > 0
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_throughput_executor_instance_segmentation_tiling(self, monkeypatch):
+        """
+        <b>Description:</b>
+        Check that ThroughputExecutor merges the tiles of instance segmentation as the tiler does
+
+        <b>Input data:</b>
+        Model container with an InstanceSegmentationTiler over a fake MaskRCNN model
+
+        <b>Expected results:</b>
+        Test passes if the masks of the frames are the same as predicted by the tiler, and the postprocessing mode
+        of the model is restored after running
+        """
+        frames = [np.random.randint(0, 2, (16, 24, 3)).astype(np.uint8) for _ in range(4)]
+        monkeypatch.setattr(throughput, "get_streamer", lambda input_stream, loop: FramesStreamer(frames))
+        monkeypatch.setattr(throughput, "create_output_converter", lambda *args: FakeConverter())
+        monkeypatch.setattr(throughput, "dump_frames", lambda *args: None)
+
+        core_model = FakeMaskRCNNModel()
+        model = ModelContainer.__new__(ModelContainer)
+        model.core_model = core_model
+        model.tiler = InstanceSegmentationTiler(core_model, {"tile_size": 8, "tiles_overlap": 0.0}, "sync")
+        model._task_type = model._labels = model.model_parameters = None
+        visualizer = FakeVisualizer()
+        ThroughputExecutor(model, visualizer).run("frames")
+
+        assert core_model.postprocess_semantic_masks
+        assert len(visualizer.shown) == len(frames)
+        for frame, prediction in zip(frames, visualizer.shown):
+            expected_objects = model.tiler(frame).segmentedObjects
+            assert len(prediction.segmentedObjects) == len(expected_objects) > 1
+            for predicted_object, expected_object in zip(prediction.segmentedObjects, expected_objects):
+                assert predicted_object.mask.shape == frame.shape[:2]
+                assert np.array_equal(predicted_object.mask, expected_object.mask)
@@ -0,0 +1,182 @@
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import numpy as np
+import pytest
+
+from otx.api.entities.annotation import (
+    Annotation,
+    AnnotationSceneEntity,
+    AnnotationSceneKind,
+)
+from otx.api.entities.dataset_item import DatasetItemEntity
+from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.id import ID
+from otx.api.entities.image import Image
+from otx.api.entities.inference_parameters import InferenceParameters
+from otx.api.entities.label import Domain, LabelEntity
+from otx.api.entities.metadata import FloatMetadata, FloatType, VideoMetadata
+from otx.api.entities.result_media import ResultMediaEntity
+from otx.api.entities.scored_label import ScoredLabel
+from otx.api.entities.shapes.ellipse import Ellipse
+from otx.api.entities.shapes.polygon import Point, Polygon
+from otx.api.entities.shapes.rectangle import Rectangle
+from otx.api.entities.tensor import TensorEntity
+from otx.api.utils.inference_utils import PredictionStore, stream_infer
+from tests.unit.api.constants.components import OtxSdkComponent
+from tests.unit.api.constants.requirements import Requirements
+
+LABELS = [
+    LabelEntity(name="cat", domain=Domain.DETECTION, id=ID("0")),
+    LabelEntity(name="dog", domain=Domain.DETECTION, id=ID("1")),
+]
+
+
+class FakeTask:
+    """Task predicting shapes, a saliency map and a representation vector depending on the item index."""
+
+    def __init__(self):
+        self.chunk_sizes = []
+
+    def infer(self, dataset, inference_parameters):
+        self.chunk_sizes.append(len(dataset))
+        for progress, dataset_item in enumerate(dataset, 1):
+            index = int(dataset_item.numpy[0, 0, 0])
+            label = ScoredLabel(LABELS[index % 2], probability=index / 100)
+            dataset_item.append_annotations(
+                [
+                    Annotation(Rectangle(0.1, 0.2, 0.3, 0.4), labels=[label]),
+                    Annotation(Polygon([Point(0.1, 0.1), Point(0.5, 0.1), Point(0.3, index / 100)]), labels=[label]),
+                ]
+            )
+            if index % 3 == 0:
+                dataset_item.append_annotations([Annotation(Ellipse(0.0, 0.0, 0.5, 0.5), labels=[])])
+            dataset_item.append_metadata_item(TensorEntity("representation_vector", np.full(4, index, np.float32)))
+            dataset_item.append_metadata_item(
+                ResultMediaEntity(
+                    name="Saliency Map",
+                    type="saliency_map",
+                    annotation_scene=dataset_item.annotation_scene,
+                    numpy=np.full((2, 2), index, np.uint8),
+                    label=LABELS[0],
+                )
+            )
+            dataset_item.append_metadata_item(FloatMetadata("score", index / 10, FloatType.ACTIVE_SCORE))
+            inference_parameters.update_progress(int(progress / len(dataset) * 100), None)
+        return dataset
+
+
+def create_dataset(num_items):
+    return DatasetEntity(
+        [
+            DatasetItemEntity(
+                Image(data=np.full((4, 4, 3), index, np.uint8)),
+                AnnotationSceneEntity([], AnnotationSceneKind.ANNOTATION),
+                metadata=[],
+            )
+            for index in range(num_items)
+        ]
+    )
+
+
+@pytest.mark.components(OtxSdkComponent.OTX_API)
+class TestInferenceUtils:
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_stream_infer(self):
+        """
+        <b>Description:</b>
+        Check that stream_infer infers the dataset chunk by chunk
+
+        <b>Input data:</b>
+        Dataset of 10 items inferred in chunks of 4 items
+
+        <b>Expected results:</b>
+        Test passes if the chunks hold the predictions of the items in order, the progress is reported over
+        the whole dataset and the input items are not modified
+        """
+        dataset = create_dataset(10)
+        dataset[0].append_metadata_item(VideoMetadata("video", 0, False))
+        task = FakeTask()
+        progress = []
+        inference_parameters = InferenceParameters(update_progress=lambda value, score=None: progress.append(value))
+        chunks = list(stream_infer(task, dataset, inference_parameters, chunk_size=4))
+
+        assert task.chunk_sizes == [4, 4, 2]
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        predicted_items = [dataset_item for chunk in chunks for dataset_item in chunk]
+        for index, dataset_item in enumerate(predicted_items):
+            assert dataset_item.media is dataset[index].media
+            assert dataset_item.annotation_scene.kind == AnnotationSceneKind.PREDICTION
+        assert isinstance(predicted_items[0].get_metadata()[0].data, VideoMetadata)
+        assert progress[-1] == 100
+        assert progress == sorted(progress)
+        for dataset_item in dataset:
+            assert dataset_item.get_annotations() == []
+        assert len(dataset[0].get_metadata()) == 1
+
+        with pytest.raises(ValueError):
+            next(stream_infer(task, dataset, chunk_size=0))
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_prediction_store(self, tmp_path):
+        """
+        <b>Description:</b>
+        Check that PredictionStore restores the stored predictions
+
+        <b>Input data:</b>
+        Predictions of 10 items stored in shards of 4 items
+
+        <b>Expected results:</b>
+        Test passes if the shapes, labels and metadata of all the items are restored in order, including
+        after reopening the store
+        """
+        dataset = create_dataset(10)
+        store = PredictionStore(str(tmp_path), labels=LABELS)
+        for chunk in stream_infer(FakeTask(), dataset, chunk_size=4):
+            store.append(chunk)
+        assert len(store) == 10
+        assert len(store.get_shard_paths()) == 3
+
+        expected = [dataset_item for chunk in stream_infer(FakeTask(), dataset, chunk_size=4) for dataset_item in chunk]
+        for labels in (LABELS, []):
+            predictions = list(PredictionStore(str(tmp_path), labels=labels))
+            assert [index for index, _, _ in predictions] == list(range(10))
+            for (index, scene, metadata), expected_item in zip(predictions, expected):
+                assert scene.kind == AnnotationSceneKind.PREDICTION
+                expected_annotations = expected_item.get_annotations()
+                assert len(scene.annotations) == len(expected_annotations)
+                for annotation, expected_annotation in zip(scene.annotations, expected_annotations):
+                    assert type(annotation.shape) is type(expected_annotation.shape)
+                    if isinstance(annotation.shape, Polygon):
+                        assert annotation.shape.points == expected_annotation.shape.points
+                    else:
+                        shape, expected_shape = annotation.shape, expected_annotation.shape
+                        assert (shape.x1, shape.y1, shape.x2, shape.y2) == (
+                            expected_shape.x1,
+                            expected_shape.y1,
+                            expected_shape.x2,
+                            expected_shape.y2,
+                        )
+                    assert [(label.name, label.probability) for label in annotation.get_labels()] == [
+                        (label.name, label.probability) for label in expected_annotation.get_labels()
+                    ]
+                    if labels:
+                        assert all(label.label in LABELS for label in annotation.get_labels())
+
+                vector, saliency_map, score = metadata
+                assert isinstance(vector, TensorEntity) and np.array_equal(vector.numpy, np.full(4, index))
+                assert isinstance(saliency_map, ResultMediaEntity)
+                assert saliency_map.type == "saliency_map" and saliency_map.label.name == "cat"
+                assert saliency_map.numpy.dtype == np.uint8 and np.all(saliency_map.numpy == index)
+                assert saliency_map.annotation_scene is scene
+                assert score == FloatMetadata("score", index / 10, FloatType.ACTIVE_SCORE)
+
+        store = PredictionStore(str(tmp_path), compress=False)
+        store.append(create_dataset(2))
+        assert len(store) == 12
+        assert [index for index, scene, _ in store][-2:] == [10, 11]
@@ -0,0 +1,141 @@
+"""This UnitTest tests NMS functionality"""
+
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import numpy as np
+import pytest
+
+from otx.api.utils.nms import batched_nms, multiclass_nms, nms, soft_nms
+from tests.unit.api.constants.components import OtxSdkComponent
+from tests.unit.api.constants.requirements import Requirements
+
+
+def reference_nms(boxes, scores, thresh):
+    """Previous NMS implementation comparing each kept box with all the remaining boxes."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        width = np.maximum(0.0, np.minimum(x2[i], x2[order[1:]]) - np.maximum(x1[i], x1[order[1:]]))
+        height = np.maximum(0.0, np.minimum(y2[i], y2[order[1:]]) - np.maximum(y1[i], y1[order[1:]]))
+        intersection = width * height
+        union = areas[i] + areas[order[1:]] - intersection
+        overlap = np.divide(intersection, union, out=np.zeros_like(intersection, dtype=float), where=union != 0)
+        order = order[np.where(overlap <= thresh)[0] + 1]
+    return keep
+
+
+def reference_soft_nms(boxes, scores, sigma, score_threshold):
+    """Gaussian soft-NMS updating all the remaining scores at each step."""
+    scores = scores.astype(float).copy()
+    remaining = list(range(len(boxes)))
+    keep = []
+    while remaining:
+        best = max(remaining, key=lambda idx: (scores[idx], -idx))
+        if scores[best] < score_threshold:
+            break
+        keep.append(best)
+        remaining.remove(best)
+        for idx in remaining:
+            width = max(0.0, min(boxes[best, 2], boxes[idx, 2]) - max(boxes[best, 0], boxes[idx, 0]))
+            height = max(0.0, min(boxes[best, 3], boxes[idx, 3]) - max(boxes[best, 1], boxes[idx, 1]))
+            intersection = width * height
+            areas = (boxes[[best, idx], 2] - boxes[[best, idx], 0]) * (boxes[[best, idx], 3] - boxes[[best, idx], 1])
+            overlap = intersection / (areas.sum() - intersection)
+            scores[idx] *= np.exp(-(overlap**2) / sigma)
+    return keep
+
+
+def generate_boxes(rng, num_boxes, size=300, max_side=80):
+    xy = rng.uniform(0, size, (num_boxes, 2))
+    wh = rng.uniform(1, max_side, (num_boxes, 2))
+    boxes = np.concatenate([xy, xy + wh], axis=1).astype(np.float32)
+    scores = rng.random(num_boxes).astype(np.float32)
+    return boxes, scores
+
+
+@pytest.mark.components(OtxSdkComponent.OTX_API)
+class TestNMS:
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    @pytest.mark.parametrize("thresh", [0.0, 0.3, 0.5, 1.0])
+    def test_nms(self, thresh):
+        """Checks that NMS keeps the same boxes as the previous implementation"""
+        rng = np.random.default_rng(0)
+        for num_boxes in (0, 1, 50, 500):
+            boxes, scores = generate_boxes(rng, num_boxes)
+            assert nms(boxes, scores, thresh) == reference_nms(boxes, scores, thresh)
+
+        # duplicated and touching boxes
+        boxes, scores = generate_boxes(rng, 300)
+        boxes = np.round(boxes / 20) * 20
+        assert nms(boxes, scores, thresh) == reference_nms(boxes, scores, thresh)
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_nms_max_num(self):
+        """Checks that NMS stops after max_num boxes are kept"""
+        boxes, scores = generate_boxes(np.random.default_rng(1), 500)
+        keep = reference_nms(boxes, scores, 0.5)
+        assert nms(boxes, scores, 0.5, max_num=10) == keep[:10]
+        assert nms(boxes, scores, 0.5, max_num=len(boxes)) == keep
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_batched_nms(self):
+        """Checks that boxes of different classes do not suppress each other"""
+        boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [1, 1, 10, 10], [50, 50, 60, 60]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7, 0.6], dtype=np.float32)
+        labels = np.array([0, 1, 0, 1])
+        assert nms(boxes, scores, 0.5) == [0, 3]
+        assert batched_nms(boxes, scores, labels, 0.5) == [0, 1, 3]
+
+        rng = np.random.default_rng(2)
+        boxes, scores = generate_boxes(rng, 500)
+        labels = rng.integers(0, 5, len(boxes))
+        offsets = labels.astype(boxes.dtype) * (boxes.max() + 1)
+        keep = reference_nms(boxes + offsets[:, None], scores, 0.45)
+        assert batched_nms(boxes, scores, labels, 0.45) == keep
+
+        detections = np.concatenate([labels[:, None], scores[:, None], boxes], axis=1)
+        dets, indices = multiclass_nms(detections, iou_threshold=0.45, max_num=20)
+        assert indices.tolist() == keep[:20]
+        assert np.array_equal(dets, detections[keep[:20]])
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_multiclass_nms_empty(self):
+        """Checks that multi-class NMS accepts no detections"""
+        dets, indices = multiclass_nms(np.zeros((0, 6), dtype=np.float32))
+        assert dets.shape == (0, 6)
+        assert len(indices) == 0
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_soft_nms(self):
+        """Checks that soft-NMS decays the scores of the overlapping boxes"""
+        boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 9], [20, 20, 30, 30]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+        keep, decayed = soft_nms(boxes, scores, method="linear", iou_threshold=0.3)
+        assert keep == [0, 2, 1]
+        assert np.allclose(decayed, [0.9, 0.7, 0.8 * 0.1])
+
+        keep, _ = soft_nms(boxes, scores, method="linear", iou_threshold=0.3, score_threshold=0.1)
+        assert keep == [0, 2]
+
+        boxes, scores = generate_boxes(np.random.default_rng(3), 100)
+        keep, _ = soft_nms(boxes, scores, sigma=0.5, score_threshold=0.05)
+        assert keep == reference_soft_nms(boxes, scores, sigma=0.5, score_threshold=0.05)
+
+        with pytest.raises(ValueError):
+            soft_nms(boxes, scores, method="unknown")
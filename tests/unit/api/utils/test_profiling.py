@@ -0,0 +1,95 @@
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import json
+import threading
+
+import pytest
+
+from otx.api.utils.profiling import InferenceProfiler
+from tests.unit.api.constants.components import OtxSdkComponent
+from tests.unit.api.constants.requirements import Requirements
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+@pytest.mark.components(OtxSdkComponent.OTX_API)
+class TestInferenceProfiler:
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_stage_latencies(self, tmp_path):
+        """
+        <b>Description:</b>
+        Check that InferenceProfiler summarizes the latencies of the stages
+
+        <b>Input data:</b>
+        Latencies recorded from several threads and measured stages
+
+        <b>Expected results:</b>
+        Test passes if the histograms of the stages are exported to JSON, and a disabled profiler records nothing
+        """
+        profiler = InferenceProfiler()
+
+        def record_latencies():
+            for latency in range(1, 101):
+                profiler.record("forward", latency / 1e3)
+
+        threads = [threading.Thread(target=record_latencies) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with profiler.measure("convert"):
+            pass
+
+        summary = profiler.get_summary()
+        forward = summary["stages"]["forward"]
+        assert forward["count"] == 400
+        assert forward["mean_ms"] == pytest.approx(50.5)
+        assert forward["p50_ms"] == pytest.approx(50.5)
+        assert forward["p95_ms"] == pytest.approx(95.05)
+        assert forward["p99_ms"] == pytest.approx(99.01)
+        assert forward["max_ms"] == pytest.approx(100)
+        assert summary["stages"]["convert"]["count"] == 1
+        assert "forward" in profiler.report() and "convert" in profiler.report()
+
+        profiler.export(str(tmp_path / "profile.json"))
+        with open(tmp_path / "profile.json", encoding="UTF-8") as file:
+            assert json.load(file) == summary
+
+        profiler.reset()
+        assert profiler.get_summary() == {"stages": {}}
+        disabled_profiler = InferenceProfiler(enabled=False)
+        with disabled_profiler.measure("forward"):
+            disabled_profiler.record("convert", 1.0)
+        assert disabled_profiler.get_summary() == {"stages": {}}
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_capture_profile(self):
+        """
+        <b>Description:</b>
+        Check that InferenceProfiler captures a cProfile profile
+
+        <b>Input data:</b>
+        Recursive function run in the capture_profile context
+
+        <b>Expected results:</b>
+        Test passes if the function is in the top functions of the profile, and an unknown capture mode is rejected
+        """
+        profiler = InferenceProfiler(capture="cprofile", top_k=5)
+        with profiler.capture_profile():
+            fibonacci(15)
+
+        profile = profiler.get_summary()["cprofile"]
+        assert len(profile) <= 5
+        fibonacci_stats = [stats for stats in profile if stats["function"].endswith("(fibonacci)")]
+        assert fibonacci_stats and fibonacci_stats[0]["calls"] == 1973
+
+        with pytest.raises(ValueError):
+            InferenceProfiler(capture="perf")
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import warnings
+from copy import copy
 
 import cv2
 import numpy as np
@@ -21,8 +22,10 @@ from otx.api.entities.shapes.ellipse import Ellipse
 from otx.api.entities.shapes.polygon import Point, Polygon
 from otx.api.entities.shapes.rectangle import Rectangle
 from otx.api.utils.segmentation_utils import (
+    MaskCache,
     create_annotation_from_segmentation_map,
     create_hard_prediction_from_soft_prediction,
+    create_polygons_from_segmentation_map,
     get_subcontours,
     mask_from_annotation,
     mask_from_dataset_item,
@@ -194,6 +197,84 @@ class TestSegmentationUtils:
         mask = mask_from_dataset_item(dataset_item=dataset_item, labels=labels)
         assert np.array_equal(mask, expected_mask)
 
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_mask_from_dataset_item_cache(self):
+        """
+        <b>Description:</b>
+        Check that "mask_from_dataset_item" function caches the masks of the user annotations
+
+        <b>Input data:</b>
+        "DatasetItemEntity" class objects with user annotations and predictions, "MaskCache" class object
+
+        <b>Expected results:</b>
+        Test passes if the cached masks are equal to the created ones, the cache is only used for user annotations
+        and a mask is created again when the annotations or the labels change
+        """
+        rectangle_label = self.rectangle_label()
+        polygon_label = self.polygon_label()
+        annotations = [
+            Annotation(shape=Rectangle(x1=0.5, y1=0.7, x2=0.9, y2=0.9), labels=[ScoredLabel(rectangle_label)]),
+            Annotation(
+                shape=Polygon(points=[Point(x=0.1, y=0.1), Point(x=0.1, y=0.3), Point(x=0.4, y=0.4)]),
+                labels=[ScoredLabel(polygon_label)],
+            ),
+        ]
+        image = Image(np.random.randint(low=0, high=255, size=(48, 64, 3)))
+        dataset_item = DatasetItemEntity(
+            media=image,
+            annotation_scene=AnnotationSceneEntity(annotations=annotations, kind=AnnotationSceneKind.ANNOTATION),
+        )
+        labels = [rectangle_label, polygon_label]
+        cache = MaskCache()
+        expected_mask = mask_from_dataset_item(dataset_item, labels, cache=None)
+        assert np.array_equal(mask_from_dataset_item(dataset_item, labels, cache=cache), expected_mask)
+        assert len(cache) == 1
+        # Checking that the cached mask is returned as a new array
+        mask = mask_from_dataset_item(dataset_item, labels, cache=cache)
+        assert np.array_equal(mask, expected_mask)
+        mask[:] = 0
+        assert np.array_equal(mask_from_dataset_item(dataset_item, labels, cache=cache), expected_mask)
+        assert len(cache) == 1
+        # Checking that an item created again with equal annotations, e.g. by a lazy dataset, hits the cache
+        same_item = DatasetItemEntity(
+            media=Image(image.numpy.copy()),
+            annotation_scene=AnnotationSceneEntity(
+                annotations=[
+                    Annotation(shape=copy(annotation.shape), labels=annotation.get_labels())
+                    for annotation in annotations
+                ],
+                kind=AnnotationSceneKind.ANNOTATION,
+            ),
+        )
+        assert np.array_equal(mask_from_dataset_item(same_item, labels, cache=cache), expected_mask)
+        assert len(cache) == 1
+        # Checking that a mask is created again when the labels order or the annotations change
+        mask = mask_from_dataset_item(dataset_item, labels[::-1], cache=cache)
+        assert np.array_equal(mask, mask_from_dataset_item(dataset_item, labels[::-1], cache=None))
+        assert len(cache) == 2
+        dataset_item.annotation_scene.annotations = annotations[:1]
+        mask = mask_from_dataset_item(dataset_item, labels, cache=cache)
+        assert np.array_equal(mask, mask_from_dataset_item(dataset_item, labels, cache=None))
+        assert not np.array_equal(mask, expected_mask)
+        assert len(cache) == 3
+        # Checking that the predictions are not cached
+        prediction_item = DatasetItemEntity(
+            media=image,
+            annotation_scene=AnnotationSceneEntity(annotations=annotations, kind=AnnotationSceneKind.PREDICTION),
+        )
+        assert np.array_equal(mask_from_dataset_item(prediction_item, labels, cache=cache), expected_mask)
+        assert len(cache) == 3
+        # Checking that the least recently used masks are removed above the size limit
+        cache.max_bytes = cache.nbytes - 1
+        cache.put("key", expected_mask)
+        assert len(cache) < 4
+        assert cache.nbytes <= cache.max_bytes
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
     @pytest.mark.priority_medium
     @pytest.mark.unit
     @pytest.mark.reqids(Requirements.REQ_1)
@@ -564,3 +645,40 @@ class TestSegmentationUtils:
             expected_label="true_label",
             expected_probability=0.91071,
         )
+
+    @pytest.mark.priority_medium
+    @pytest.mark.unit
+    @pytest.mark.reqids(Requirements.REQ_1)
+    def test_create_polygons_from_segmentation_map(self):
+        """
+        <b>Description:</b>
+        Check "create_polygons_from_segmentation_map" function
+
+        <b>Input data:</b>
+        "hard_prediction" array, "soft_prediction" array, "label_map" dictionary, "num_workers" value
+
+        <b>Expected results:</b>
+        Test passes if polygons returned by "create_polygons_from_segmentation_map" function are in the order of the
+        labels and match the annotations created by "create_annotation_from_segmentation_map" for any number of
+        workers
+        """
+        hard_prediction = np.zeros((20, 30), dtype=np.uint8)
+        cv2.rectangle(hard_prediction, (2, 2), (8, 8), 2, -1)
+        cv2.circle(hard_prediction, (20, 10), 5, 1, -1)
+        cv2.rectangle(hard_prediction, (12, 15), (28, 18), 2, -1)
+        soft_prediction = np.random.default_rng(0).random((20, 30, 3))
+        labels = {0: "background", 1: "circle", 2: "rectangle"}
+
+        annotations = create_annotation_from_segmentation_map(hard_prediction, soft_prediction, labels)
+        for num_workers in (None, 1, 2):
+            polygons = create_polygons_from_segmentation_map(hard_prediction, soft_prediction, labels, num_workers)
+            assert [label_index for label_index, _, _ in polygons] == [1, 2, 2]
+            assert len(polygons) == len(annotations)
+            for (label_index, points, probability), annotation in zip(polygons, annotations):
+                assert points.shape == (len(annotation.shape.points), 2)
+                assert annotation.shape.points == [Point(x, y) for x, y in points.tolist()]
+                annotation_labels = annotation._Annotation__labels  # type: ignore[attr-defined]
+                assert annotation_labels[0].label == labels[label_index]
+                assert annotation_labels[0].probability == probability
+                mask = (hard_prediction == label_index).astype(np.uint8)
+                assert 0.0 < probability <= soft_prediction[:, :, label_index][mask > 0].max()
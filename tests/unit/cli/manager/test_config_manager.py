@@ -639,6 +639,17 @@ class TestConfigManager:
         assert "train_data_roots" in dataset_config
         assert "val_data_roots" in dataset_config
         assert "test_data_roots" in dataset_config
+        assert dataset_config["num_workers"] == 0
+
+        hyper_parameters = mocker.MagicMock()
+        hyper_parameters.algo_backend.num_conversion_workers = 2
+        hyper_parameters.learning_parameters.num_workers = 4
+        dataset_config = config_manager.get_dataset_config(["train"], hyper_parameters)
+        assert dataset_config["num_workers"] == 2
+        assert dataset_config["cache_config"]["num_workers"] == 4
+        config_manager.data_config["options"] = {"num_workers": 3}
+        dataset_config = config_manager.get_dataset_config(["train"], hyper_parameters)
+        assert dataset_config["num_workers"] == 3
 
 
 class TestConfigManagerEncryptionKey:
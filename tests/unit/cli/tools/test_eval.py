@@ -1,7 +1,12 @@
 import argparse
 
+import numpy as np
 import pytest
 
+from otx.api.entities.dataset_item import DatasetItemEntity
+from otx.api.entities.image import Image
+from otx.api.entities.metadata import FloatMetadata, MetadataItemEntity
+from otx.api.entities.tensor import TensorEntity
 from otx.cli.tools import eval as target_package
 from otx.cli.tools.eval import get_args, main
 from tests.test_suite.e2e_test_system import e2e_pytest_unit
@@ -32,12 +37,27 @@ def test_get_args(mocker):
     assert parsed_args.workspace == "work/dir/path"
 
 
+@e2e_pytest_unit
+def test_get_args_profile_capture_requires_profile(mocker):
+    mocker.patch("sys.argv", ["otx", "--profile-capture", "cprofile"])
+    mocker.patch.object(
+        target_package, "get_parser_and_hprams_data", return_value=[argparse.ArgumentParser(), {"param": "test"}, []]
+    )
+    mocker.patch.object(target_package, "add_hyper_parameters_sub_parser", return_value=argparse.ArgumentParser())
+
+    with pytest.raises(SystemExit):
+        get_args()
+
+
 @pytest.fixture
 def mock_args(mocker, tmp_path):
     mock_args = mocker.MagicMock()
     mock_args.test_data_roots = "fake_test_data_root"
     mock_args.load_weights = "fake_load_weights.xml"
     mock_args.workspace = tmp_path / "work_dir"
+    mock_args.profile = None
+    mock_args.infer_chunk_size = 0
+    mock_args.save_predictions = None
 
     def mock_contains(self, val):
         return val in self.__dict__
@@ -140,3 +160,39 @@ def test_main(
 
     ret = main()
     assert ret["retcode"] == 0
+
+
+@e2e_pytest_unit
+def test_main_infer_chunks(mocker, mock_args, mock_config_manager, mock_dataset_adapter, mock_task, tmp_path):
+    mock_args.infer_chunk_size = 2
+    mock_args.save_predictions = str(tmp_path / "predictions")
+    mocker.patch.object(target_package, "read_model", return_value=mocker.MagicMock())
+    mocker.patch.object(target_package, "TaskEnvironment", return_value=mocker.MagicMock())
+    mocker.patch.object(target_package, "ResultSetEntity", return_value=mocker.MagicMock())
+    mock_dataset = mocker.patch.object(target_package, "DatasetEntity")
+    score = MetadataItemEntity(FloatMetadata("score", 0.5))
+    predicted_items = [
+        DatasetItemEntity(
+            media=Image(np.zeros((4, 4, 3), dtype=np.uint8)),
+            annotation_scene=mocker.MagicMock(),
+            metadata=[score, MetadataItemEntity(TensorEntity("representation_vector", np.zeros(8)))],
+        )
+        for _ in range(3)
+    ]
+    mock_stream_infer = mocker.patch.object(
+        target_package, "stream_infer", return_value=[predicted_items[:2], predicted_items[2:]]
+    )
+    mock_store = mocker.patch.object(target_package, "PredictionStore")
+    mocker.patch("json.dump")
+    mocker.patch("builtins.open")
+
+    ret = main()
+
+    assert ret["retcode"] == 0
+    mock_task.infer.assert_not_called()
+    assert mock_stream_infer.call_args[0][-1] == 2
+    assert mock_store.return_value.append.call_count == 2
+    # the representation vectors are dropped once the chunks are stored
+    assert [call.args[0] for call in mock_dataset.return_value.append.call_args_list] == predicted_items
+    for predicted_item in predicted_items:
+        assert predicted_item.get_metadata() == [score]
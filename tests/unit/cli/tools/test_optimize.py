@@ -35,6 +35,18 @@ def test_get_args(mocker):
     assert parsed_args.workspace == "work_dir_path"
 
 
+@e2e_pytest_unit
+def test_get_args_profile_capture_requires_profile(mocker):
+    mocker.patch("sys.argv", ["otx", "--profile-capture", "cprofile"])
+    mocker.patch.object(
+        target_package, "get_parser_and_hprams_data", return_value=[argparse.ArgumentParser(), {"param": "test"}, []]
+    )
+    mocker.patch.object(target_package, "add_hyper_parameters_sub_parser", return_value=argparse.ArgumentParser())
+
+    with pytest.raises(SystemExit):
+        get_args()
+
+
 @pytest.fixture
 def mock_args(mocker, tmp_path):
     mock_args = mocker.MagicMock()
@@ -43,6 +55,7 @@ def mock_args(mocker, tmp_path):
     mock_args.load_weights = "fake_load_weights_path"
     mock_args.output = tmp_path / "save/model"
     mock_args.workspace = tmp_path / "work_dir_path"
+    mock_args.profile = None
 
     def mock_contains(self, val):
         return val in self.__dict__
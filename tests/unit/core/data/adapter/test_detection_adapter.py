@@ -2,10 +2,13 @@
 # Copyright (C) 2023 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 #
+import gc
 import os
 
+import pytest
+
 from otx.api.entities.annotation import NullAnnotationSceneEntity
-from otx.api.entities.datasets import DatasetEntity
+from otx.api.entities.datasets import DatasetEntity, LazyDatasetEntity
 from otx.api.entities.label_schema import LabelSchemaEntity
 from otx.api.entities.model_template import TaskType
 from otx.api.entities.subset import Subset
@@ -171,3 +174,101 @@ class TestOTXDetectionDatasetAdapter:
         assert Subset.TESTING in instance_seg_test_dataset_adapter.dataset
         assert isinstance(instance_seg_test_dataset_adapter.get_otx_dataset(), DatasetEntity)
         assert isinstance(instance_seg_test_dataset_adapter.get_label_schema(), LabelSchemaEntity)
+
+    @e2e_pytest_unit
+    @pytest.mark.parametrize("task", ["detection", "instance_segmentation"])
+    def test_get_otx_dataset_with_workers(self, task):
+        task_type: TaskType = TASK_NAME_TO_TASK_TYPE[task]
+        data_root_dict: dict = TASK_NAME_TO_DATA_ROOT[task]
+
+        train_data_roots: str = os.path.join(self.root_path, data_root_dict["train"])
+        val_data_roots: str = os.path.join(self.root_path, data_root_dict["val"])
+
+        def get_otx_dataset(num_workers):
+            dataset_adapter = DetectionDatasetAdapter(
+                task_type=task_type,
+                train_data_roots=train_data_roots,
+                val_data_roots=val_data_roots,
+                num_workers=num_workers,
+            )
+            dataset_adapter.conversion_chunk_size = 2
+            otx_dataset = dataset_adapter.get_otx_dataset()
+            items = [
+                (
+                    item.id_,
+                    item.subset,
+                    [
+                        (str(annotation.shape), annotation.get_labels()[0].label)
+                        for annotation in item.get_annotations()
+                    ],
+                )
+                for item in otx_dataset
+            ]
+            return items, dataset_adapter.label_entities
+
+        items, label_entities = get_otx_dataset(num_workers=0)
+        items_with_workers, label_entities_with_workers = get_otx_dataset(num_workers=2)
+
+        assert [item[:2] for item in items_with_workers] == [item[:2] for item in items]
+        assert [label.name for label in label_entities_with_workers] == [label.name for label in label_entities]
+        for (_, _, annotations), (_, _, annotations_with_workers) in zip(items, items_with_workers):
+            assert [shape for shape, _ in annotations_with_workers] == [shape for shape, _ in annotations]
+            # the labels of the annotations are the label entities of the adapter
+            for _, label in annotations_with_workers:
+                assert any(label is label_entity for label_entity in label_entities_with_workers)
+
+    @e2e_pytest_unit
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_convert_items_gc(self, num_workers):
+        data_root_dict: dict = TASK_NAME_TO_DATA_ROOT["detection"]
+        dataset_adapter = DetectionDatasetAdapter(
+            task_type=TASK_NAME_TO_TASK_TYPE["detection"],
+            train_data_roots=os.path.join(self.root_path, data_root_dict["train"]),
+            num_workers=num_workers,
+        )
+        dataset_adapter.conversion_chunk_size = 2
+
+        # the garbage collector is only paused while a chunk is converted, not while the caller has the items
+        assert gc.isenabled()
+        num_items = 0
+        for _, _, conversion in dataset_adapter._convert_items():
+            assert gc.isenabled()
+            assert conversion.keep
+            num_items += 1
+        assert num_items == sum(len(subset_data) for subset_data in dataset_adapter.dataset.values())
+
+    @e2e_pytest_unit
+    @pytest.mark.parametrize("task", ["detection", "instance_segmentation"])
+    def test_get_otx_dataset_lazy(self, task):
+        task_type: TaskType = TASK_NAME_TO_TASK_TYPE[task]
+        data_root_dict: dict = TASK_NAME_TO_DATA_ROOT[task]
+
+        train_data_roots: str = os.path.join(self.root_path, data_root_dict["train"])
+        val_data_roots: str = os.path.join(self.root_path, data_root_dict["val"])
+
+        def get_items(otx_dataset):
+            return [
+                (item.id_, item.subset, [(str(ann.shape), ann.get_labels()[0].label) for ann in item.get_annotations()])
+                for item in otx_dataset
+            ]
+
+        dataset_adapter = DetectionDatasetAdapter(
+            task_type=task_type, train_data_roots=train_data_roots, val_data_roots=val_data_roots
+        )
+        lazy_dataset_adapter = DetectionDatasetAdapter(
+            task_type=task_type, train_data_roots=train_data_roots, val_data_roots=val_data_roots, lazy=True
+        )
+        lazy_otx_dataset = lazy_dataset_adapter.get_otx_dataset()
+
+        assert isinstance(lazy_otx_dataset, LazyDatasetEntity)
+        items = get_items(dataset_adapter.get_otx_dataset())
+        lazy_items = get_items(lazy_otx_dataset)
+        label_names = [label.name for label in dataset_adapter.label_entities]
+        assert [label.name for label in lazy_dataset_adapter.label_entities] == label_names
+        assert [item[:2] for item in lazy_items] == [item[:2] for item in items]
+        for (_, _, annotations), (_, _, lazy_annotations) in zip(items, lazy_items):
+            assert [shape for shape, _ in lazy_annotations] == [shape for shape, _ in annotations]
+            assert [label.name for _, label in lazy_annotations] == [label.name for _, label in annotations]
+        assert len(lazy_otx_dataset.get_subset(Subset.TRAINING)) == len(
+            [item for item in items if item[1] == Subset.TRAINING]
+        )
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import multiprocessing as mp
 import string
 
 import numpy as np
@@ -9,6 +10,8 @@ import pytest
 import psutil
 
 from otx.core.data.caching import MemCacheHandlerSingleton
+from otx.core.data.caching.mem_cache_engine import FreeListAllocator
+from otx.core.data.caching.shared_mem_cache_engine import SharedMemCacheEngine
 
 
 @pytest.fixture
@@ -72,20 +75,157 @@ class TestMemCacheHandler:
         MemCacheHandlerSingleton.create(mode, mem_size)
         handler = MemCacheHandlerSingleton.get()
 
-        for idx, (key, data, meta) in enumerate(fxt_data_list):
-            if idx < len(fxt_data_list) // 2:
-                assert handler.put(key, data, meta) > 0
-            else:
-                assert handler.put(key, data, meta) is None
+        for key, data, meta in fxt_data_list:
+            assert handler.put(key, data, meta) > 0
 
         for idx, (key, data, meta) in enumerate(fxt_data_list):
             get_data, get_meta = handler.get(key)
 
             if idx < len(fxt_data_list) // 2:
+                # Least recently used items are evicted
+                assert get_data is None
+            else:
                 assert np.array_equal(get_data, data)
                 assert get_meta == meta
-            else:
-                assert get_data is None
 
         # Unfully (half) cached
         assert len(handler) == len(fxt_data_list) // 2
+
+        stats = handler.get_stats()
+        assert stats["evictions"] == len(fxt_data_list) // 2
+        assert stats["hits"] == len(fxt_data_list) // 2
+        assert stats["misses"] == len(fxt_data_list) // 2
+
+        handler.reset_stats()
+        assert handler.get_stats()["hits"] == 0
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_lru_eviction(self, mode, fxt_data_list):
+        mem_size = get_data_list_size(fxt_data_list[:2])
+        MemCacheHandlerSingleton.create(mode, mem_size)
+        handler = MemCacheHandlerSingleton.get()
+
+        (key_0, data_0, _), (key_1, data_1, _), (key_2, data_2, _) = fxt_data_list[:3]
+        handler.put(key_0, data_0)
+        handler.put(key_1, data_1)
+        # Access key_0 so that key_1 becomes the least recently used one
+        handler.get(key_0)
+        handler.put(key_2, data_2)
+
+        assert handler.get(key_1)[0] is None
+        assert np.array_equal(handler.get(key_0)[0], data_0)
+        assert np.array_equal(handler.get(key_2)[0], data_2)
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_cost_aware_eviction(self, mode, fxt_data_list):
+        mem_size = get_data_list_size(fxt_data_list[:2])
+        MemCacheHandlerSingleton.create(mode, mem_size, eviction_policy="cost")
+        handler = MemCacheHandlerSingleton.get()
+
+        (key_0, data_0, _), (key_1, data_1, _), (key_2, data_2, _) = fxt_data_list[:3]
+        handler.put(key_0, data_0, cost=10.0)
+        handler.put(key_1, data_1, cost=1.0)
+        handler.put(key_2, data_2, cost=1.0)
+
+        # The cheapest one is evicted even though key_0 is the oldest
+        assert handler.get(key_1)[0] is None
+        assert np.array_equal(handler.get(key_0)[0], data_0)
+        assert np.array_equal(handler.get(key_2)[0], data_2)
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_freeze(self, mode, fxt_data_list):
+        mem_size = get_data_list_size(fxt_data_list)
+        MemCacheHandlerSingleton.create(mode, mem_size)
+        handler = MemCacheHandlerSingleton.get()
+        handler.freeze()
+
+        for key, data, meta in fxt_data_list:
+            assert handler.put(key, data, meta) is None
+            assert handler.get(key) == (None, None)
+
+        assert len(handler) == 0
+        # Accesses while frozen are not counted
+        assert handler.get_stats()["misses"] == 0
+
+    def test_too_large_item(self, fxt_data_list):
+        key, data, meta = fxt_data_list[0]
+        MemCacheHandlerSingleton.create("singleprocessing", data.size - 1)
+        handler = MemCacheHandlerSingleton.get()
+
+        assert handler.put(key, data, meta) is None
+        assert handler.get_stats()["rejections"] == 1
+
+
+class TestFreeListAllocator:
+    def test_allocate_and_release(self):
+        allocator = FreeListAllocator(100)
+
+        assert allocator.allocate(40) == 0
+        assert allocator.allocate(40) == 40
+        assert allocator.allocate(40) is None
+
+        allocator.release(0, 40)
+        assert allocator.used_bytes == 40
+        assert allocator.allocate(50) is None
+
+        # Released blocks are coalesced with the free tail
+        allocator.release(40, 40)
+        assert allocator.used_bytes == 0
+        assert allocator.allocate(100) == 0
+
+
+def _put_and_get_repeatedly(engine, worker_idx, num_errors):
+    for it in range(200):
+        key = f"key_{(it + worker_idx) % 20}"
+        expected = np.full([8, 8, 3], (it + worker_idx) % 20, dtype=np.uint8)
+        data, meta = engine.get(key)
+        if data is None:
+            engine.put(key, expected, {"key": key})
+        elif not np.array_equal(data, expected) or meta != {"key": key}:
+            num_errors.value += 1
+
+
+class TestSharedMemCacheEngine:
+    def test_rebuild_table(self):
+        engine = SharedMemCacheEngine(mem_size=1024, capacity=4)
+        data = np.zeros([4, 4], dtype=np.uint8)
+
+        for idx in range(10):
+            assert engine.put(f"key_{idx}", data + idx) is not None
+
+        assert engine.num_items() <= engine.capacity
+        assert np.array_equal(engine.get("key_9")[0], data + 9)
+        assert engine.get("key_0") == (None, None)
+
+    def test_large_meta(self):
+        engine = SharedMemCacheEngine(mem_size=4096)
+        data = np.ones([4, 4], dtype=np.float32)
+        meta = {"bboxes": np.arange(200, dtype=np.float32)}
+
+        assert engine.put("key", data, meta) is not None
+        get_data, get_meta = engine.get("key")
+        assert np.array_equal(get_data, data)
+        assert np.array_equal(get_meta["bboxes"], meta["bboxes"])
+        # The header does not fit into the record, so it occupies the memory pool too
+        assert engine.used_bytes() > data.nbytes
+
+        engine.put("key_2", np.zeros([32, 32], dtype=np.float32))
+        assert engine.get("key") == (None, None)
+        assert engine.used_bytes() == 32 * 32 * 4
+
+    def test_concurrent_workers(self):
+        ctx = mp.get_context("fork")
+        # Only a half of the items fits, so workers keep evicting each other's items
+        engine = SharedMemCacheEngine(mem_size=10 * 8 * 8 * 3)
+        num_errors = ctx.Value("i", 0)
+
+        workers = [ctx.Process(target=_put_and_get_repeatedly, args=(engine, idx, num_errors)) for idx in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert num_errors.value == 0
+        stats = engine.stats()
+        assert stats["hits"] + stats["misses"] == 4 * 200
+        assert stats["evictions"] > 0
@@ -0,0 +1,114 @@
+# Copyright (C) 2023 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from otx.api.entities.annotation import Annotation, NullAnnotationSceneEntity
+from otx.api.entities.dataset_item import DatasetItemEntity
+from otx.api.entities.image import Image
+from otx.api.entities.shapes.rectangle import Rectangle
+from otx.core.data.caching import DiskCacheHandlerError, DiskCacheHandlerSingleton
+from otx.core.data.caching.disk_cache_handler import DiskCacheHandler
+
+
+@pytest.fixture
+def fxt_image_path(tmp_path):
+    img = np.random.randint(0, 256, size=[16, 16, 3], dtype=np.uint8)
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, img)
+    return path
+
+
+class TestDiskCacheHandler:
+    def test_get_key(self, tmp_path, fxt_image_path):
+        handler = DiskCacheHandler(str(tmp_path / "cache"))
+        item = DatasetItemEntity(media=Image(file_path=fxt_image_path), annotation_scene=NullAnnotationSceneEntity())
+
+        key = handler.get_key(item)
+        # Content-addressed, so a new item of the same source gets the same key
+        assert key == handler.get_key(
+            DatasetItemEntity(media=Image(file_path=fxt_image_path), annotation_scene=NullAnnotationSceneEntity())
+        )
+
+        roi = Annotation(Rectangle(x1=0.0, y1=0.0, x2=0.5, y2=0.5), labels=[])
+        assert key != handler.get_key(
+            DatasetItemEntity(
+                media=Image(file_path=fxt_image_path), annotation_scene=NullAnnotationSceneEntity(), roi=roi
+            )
+        )
+
+        # Modified source invalidates the key
+        os.utime(fxt_image_path, ns=(0, 0))
+        assert key != handler.get_key(item)
+
+        # In-memory media cannot be addressed
+        assert (
+            handler.get_key(
+                DatasetItemEntity(media=Image(data=np.zeros([4, 4, 3])), annotation_scene=NullAnnotationSceneEntity())
+            )
+            is None
+        )
+
+    def test_put_and_get(self, tmp_path, fxt_image_path):
+        handler = DiskCacheHandler(str(tmp_path / "cache"))
+        item = DatasetItemEntity(media=Image(file_path=fxt_image_path), annotation_scene=NullAnnotationSceneEntity())
+        key = handler.get_key(item)
+        data = item.numpy
+
+        assert handler.get(key) is None
+        assert handler.put(key, data)
+        assert not handler.put(key, data)
+
+        cached = handler.get(key)
+        assert isinstance(cached, np.memmap)
+        assert np.array_equal(cached, data)
+        # Copy-on-write, so that in-place transforms do not corrupt the cache
+        cached[:] = 0
+        assert np.array_equal(DiskCacheHandler(str(tmp_path / "cache")).get(key), data)
+
+        handler.clear()
+        assert handler.get(key) is None
+
+    def test_eviction(self, tmp_path, fxt_image_path):
+        data = np.zeros([16, 16, 3], dtype=np.uint8)
+        # with the 128 bytes of the .npy header
+        sample_size = data.nbytes + 128
+        handler = DiskCacheHandler(str(tmp_path / "cache"), max_size=3 * sample_size)
+        keys = [f"{idx:064x}" for idx in range(4)]
+
+        for idx, key in enumerate(keys[:3]):
+            assert handler.put(key, data)
+            os.utime(handler._get_path(key), (idx, idx))
+        # key_0 becomes the most recently used one
+        assert handler.get(keys[0]) is not None
+        assert handler.put(keys[3], data)
+
+        assert handler.used_bytes <= 0.9 * 3 * sample_size
+        assert handler.get(keys[1]) is None
+        assert handler.get(keys[0]) is not None
+        assert handler.get(keys[3]) is not None
+        # The size of the existing samples is counted by a new handler
+        assert DiskCacheHandler(str(tmp_path / "cache")).used_bytes == handler.used_bytes
+        # Too large to be cached
+        assert not handler.put(keys[1], np.zeros(4 * sample_size, dtype=np.uint8))
+
+    def test_singleton(self, tmp_path):
+        DiskCacheHandlerSingleton.delete()
+        with pytest.raises(DiskCacheHandlerError):
+            DiskCacheHandlerSingleton.get()
+
+        handler = DiskCacheHandlerSingleton.create("null")
+        assert handler.get(handler.get_key(None)) is None
+        assert not handler.put(None, np.zeros(1))
+
+        handler = DiskCacheHandlerSingleton.create("persistent", str(tmp_path))
+        assert isinstance(DiskCacheHandlerSingleton.get(), DiskCacheHandler)
+
+        with pytest.raises(DiskCacheHandlerError):
+            DiskCacheHandlerSingleton.create("unknown")
+        DiskCacheHandlerSingleton.delete()
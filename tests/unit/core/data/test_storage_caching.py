@@ -5,6 +5,7 @@
 
 from copy import deepcopy
 import os
+import shutil
 import stat
 import tempfile
 import time
@@ -16,7 +17,7 @@ from datumaro.components.dataset import Dataset
 from datumaro.components.dataset_base import DatasetItem
 from datumaro.components.media import Image
 
-from otx.core.data.caching.storage_cache import init_arrow_cache
+from otx.core.data.caching.storage_cache import _scan_media_stats, arrow_cache_helper, init_arrow_cache
 
 
 @pytest.fixture
@@ -130,3 +131,107 @@ class TestStorageCache:
 
             for file in os.listdir(cached_dataset.data_path):
                 assert mapping[file] != os.stat(os.path.join(cached_dataset.data_path, file))[stat.ST_MTIME]
+
+    def test_incremental_update(self, fxt_datumaro_dataset):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cache_paths = arrow_cache_helper(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            mapping = {path: os.stat(path).st_mtime_ns for path in cache_paths}
+
+            source_dataset = deepcopy(fxt_datumaro_dataset)
+            source_dataset.remove(0, "test")
+            source_dataset.put(
+                DatasetItem(
+                    id=64,
+                    subset="test",
+                    media=Image.from_numpy(data=np.random.randint(0, 255, (5, 5, 3)), ext=".png"),
+                    annotations=[Label(0)],
+                )
+            )
+
+            cache_paths = arrow_cache_helper(source_dataset, scheme="AS-IS", cache_dir=tempdir)
+            # Only the new item is exported into an extra shard
+            new_paths = [path for path in cache_paths if path not in mapping]
+            assert len(new_paths) == 1
+            assert len(Dataset.import_from(new_paths[0], "arrow")) == 1
+
+            cached_dataset = init_arrow_cache(source_dataset, scheme="AS-IS", cache_dir=tempdir)
+            assert len(cached_dataset) == len(source_dataset)
+            for item in source_dataset:
+                cached_item = cached_dataset.get(item.id, item.subset)
+                assert cached_item.annotations == item.annotations
+                assert cached_item.media == item.media
+            assert cached_dataset.get(0, "test") is None
+
+    def test_changed_annotations(self, fxt_datumaro_dataset):
+        with tempfile.TemporaryDirectory() as tempdir:
+            init_arrow_cache(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+
+            source_dataset = deepcopy(fxt_datumaro_dataset)
+            item = source_dataset.get(1, "test")
+            source_dataset.put(item.wrap(annotations=[Label(2)]))
+
+            cached_dataset = init_arrow_cache(source_dataset, scheme="AS-IS", cache_dir=tempdir)
+            assert len(cached_dataset) == len(source_dataset)
+            assert cached_dataset.get(1, "test").annotations == [Label(2)]
+
+    def test_appended_item(self, fxt_datumaro_dataset):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cache_paths = arrow_cache_helper(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            mapping = {path: os.stat(path).st_mtime_ns for path in cache_paths}
+
+            source_dataset = deepcopy(fxt_datumaro_dataset)
+            source_dataset.put(
+                DatasetItem(
+                    id=64,
+                    subset="test",
+                    media=Image.from_numpy(data=np.random.randint(0, 255, (5, 5, 3)), ext=".png"),
+                    annotations=[Label(1)],
+                )
+            )
+
+            cache_paths = arrow_cache_helper(source_dataset, scheme="AS-IS", cache_dir=tempdir)
+            # The cache stays in the same directory and the existing shards are untouched
+            assert all(path in cache_paths and os.stat(path).st_mtime_ns == mtime for path, mtime in mapping.items())
+            new_paths = [path for path in cache_paths if path not in mapping]
+            assert len(new_paths) == 1
+            new_items = list(Dataset.import_from(new_paths[0], "arrow"))
+            assert [(item.id, item.subset) for item in new_items] == [("64", "test")]
+
+    def test_in_memory_datasets_share_cache(self, fxt_datumaro_dataset):
+        with tempfile.TemporaryDirectory() as tempdir:
+            other_dataset = deepcopy(fxt_datumaro_dataset)
+            other_dataset.remove(0, "test")
+
+            cache_paths = arrow_cache_helper(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            other_paths = arrow_cache_helper(other_dataset, scheme="AS-IS", cache_dir=tempdir)
+            assert os.path.dirname(cache_paths[0]) == os.path.dirname(other_paths[0])
+
+            cached_dataset = init_arrow_cache(other_dataset, scheme="AS-IS", cache_dir=tempdir)
+            assert len(cached_dataset) == len(other_dataset)
+            cached_dataset = init_arrow_cache(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            assert len(cached_dataset) == len(fxt_datumaro_dataset)
+
+    def test_interrupted_export(self, fxt_datumaro_dataset):
+        with tempfile.TemporaryDirectory() as tempdir:
+            cache_paths = arrow_cache_helper(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            cache_dir = os.path.dirname(cache_paths[0])
+            # A shard moved in by an export that did not get to save its manifest
+            shutil.copy(cache_paths[0], os.path.join(cache_dir, "orphan-0.arrow"))
+
+            cached_dataset = init_arrow_cache(deepcopy(fxt_datumaro_dataset), scheme="AS-IS", cache_dir=tempdir)
+            assert len(cached_dataset) == len(fxt_datumaro_dataset)
+            assert not os.path.exists(os.path.join(cache_dir, "orphan-0.arrow"))
+            # No temporary export directory is left behind
+            assert sorted(os.listdir(tempdir)) == [os.path.basename(cache_dir)]
+
+
+def test_scan_media_stats(tmp_path):
+    paths = []
+    for idx in range(3):
+        path = tmp_path / f"{idx}.bin"
+        path.write_bytes(b"0" * idx)
+        paths.append(str(path))
+
+    stats = _scan_media_stats(paths + [str(tmp_path / "missing.bin")], num_workers=2)
+    assert set(stats.keys()) == set(paths)
+    assert [stats[path][0] for path in paths] == [0, 1, 2]
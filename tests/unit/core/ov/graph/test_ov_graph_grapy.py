@@ -2,14 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import os
 from copy import deepcopy
 from random import shuffle
 
 import numpy as np
 import openvino.runtime as ov
 import pytest
+import torch
 
-from otx.core.ov.graph.graph import Graph, SortedDict
+from otx.core.ov.graph.graph import Graph, SortedDict, evict_graph_cache
 from tests.test_suite.e2e_test_system import e2e_pytest_unit
 
 
@@ -181,3 +183,40 @@ class TestGraph:
         self.graph.clean_up()
 
         assert n_nodes > len(self.graph)
+
+    @e2e_pytest_unit
+    def test_save_load(self, tmp_path):
+        path = str(tmp_path / "model.graph")
+        self.graph.save(path)
+        graph = Graph.load(path)
+
+        assert [node.name for node in graph] == [node.name for node in self.graph]
+        for node, loaded_node in zip(self.graph.topological_sort(), graph.topological_sort()):
+            assert node.name == loaded_node.name
+            assert [(predecessor.name, edges) for predecessor, edges in self.graph.predecessors(node, True)] == [
+                (predecessor.name, edges) for predecessor, edges in graph.predecessors(loaded_node, True)
+            ]
+            for key, value in node.state_dict().items():
+                assert torch.equal(value, loaded_node.state_dict()[key])
+
+        param = ov.opset10.parameter([1, 4], ov.Type.f32, name="in")
+        split = ov.opset10.split(param, ov.opset10.constant(np.int64(1)), 2)
+        Graph.from_ov(ov.Model([ov.opset10.result(split.output(0))], [param], "model")).save(path)
+        constants = [node.data for node in Graph.load(path) if node.type == "Constant"]
+        assert [constant.shape for constant in constants] == [torch.Size([])]
+
+        with open(path, "wb") as file:
+            file.write(b"corrupted")
+        with pytest.raises(ValueError):
+            Graph.load(path)
+
+    @e2e_pytest_unit
+    def test_evict_graph_cache(self, tmp_path):
+        for idx in range(4):
+            path = tmp_path / f"{idx}.graph"
+            path.write_bytes(b"0" * 100)
+            os.utime(path, (idx, idx))
+        (tmp_path / "other.txt").write_bytes(b"0" * 1000)
+
+        evict_graph_cache(max_size=250, cache_dir=str(tmp_path))
+        assert sorted(os.listdir(tmp_path)) == ["2.graph", "3.graph", "other.txt"]
@@ -43,3 +43,56 @@ class TestOVModel:
             shape = [1 if i == -1 else i for i in shape]
             data[key] = torch.randn(shape)
         model(**data)
+
+    @e2e_pytest_unit
+    def test_execution_plan(self):
+
+        param = ov.opset10.parameter([1, 4, 8, 8], ov.Type.f32, name="in")
+        split = ov.opset10.split(param, ov.opset10.constant(np.int64(1)), 2, name="split")
+        node = ov.opset10.add(split.output(0), split.output(1), name="add")
+        node = ov.opset10.subtract(node, split.output(1), name="subtract")
+        result = ov.opset10.result(node, name="out")
+        ov_model = ov.Model([result], [param], "model")
+
+        data = torch.randn(1, 4, 8, 8)
+        for features_to_keep, features in ((None, ["out"]), (["split"], ["split", "out"])):
+            model = OVModel(model_path_or_model=ov_model, features_to_keep=features_to_keep)
+            plan = {step.name: step for step in model.build_execution_plan()}
+            assert plan["add"].input_slots == (("split", 0), ("split", 1))
+            assert plan["subtract"].input_slots == (("add", 0), ("split", 1))
+            assert ("split" in plan["subtract"].features_to_free) == (features_to_keep is None)
+
+            outputs = model(data)
+            assert torch.allclose(outputs["out"], data[:, :2])
+            assert sorted(model.features.keys()) == sorted(features)
+            assert torch.equal(model.to_graph_module()(data)["out"], outputs["out"])
+
+    @e2e_pytest_unit
+    def test_execution_plan_rebuild(self):
+
+        param = ov.opset10.parameter([1, 4, 8, 8], ov.Type.f32, name="in")
+        split = ov.opset10.split(param, ov.opset10.constant(np.int64(1)), 2, name="split")
+        node = ov.opset10.add(split.output(0), split.output(1), name="add")
+        result = ov.opset10.result(node, name="out")
+        ov_model = ov.Model([result], [param], "model")
+
+        data = torch.randn(1, 4, 8, 8)
+        model = OVModel(model_path_or_model=ov_model)
+        model(data)
+        assert "split" not in model.features
+
+        model.features_to_keep = ["split"]
+        model(data)
+        assert "split" in model.features
+
+        # edit the graph: swap the inputs of the add node
+        split_node, add_node = model.model["split"], model.model["add"]
+        plan = model._execution_plan
+        for edge in model._graph.get_edge_data(split_node, add_node):
+            model._graph.remove_edge(split_node, add_node, key=f"{edge['in_port']}{edge['out_port']}")
+        model._graph.add_edge(split_node, add_node, out_port=0, in_port=1)
+        model._graph.add_edge(split_node, add_node, out_port=1, in_port=0)
+        outputs = model(data)
+        assert model._execution_plan is not plan
+        assert {step.name: step for step in model._execution_plan}["add"].input_slots == (("split", 1), ("split", 0))
+        assert torch.allclose(outputs["out"], data[:, 2:] + data[:, :2])